@@ -820,18 +820,26 @@ export default function EmployeesPage() {
 
   const fetchTimesheets = async () => {
     try {
-      const response = await fetch(`/api/timesheets?entity_id=${selectedEntityId}`);
-      
-      if (!response.ok) {
-        const errorText = await response.text();
-        console.error('Failed to fetch timesheets:', response.status, errorText);
-        toast.error(`Failed to fetch timesheets: ${response.status} ${errorText}`);
-        setTimesheets([]);
-        return;
-      }
-      
-      const data = await response.json();
-      setTimesheets(data.timesheets || []);
+      const all: any[] = [];
+      let cursor: string | null = null;
+      do {
+        const params = new URLSearchParams({ entity_id: String(selectedEntityId), limit: '500' });
+        if (cursor) params.set('cursor', cursor);
+        const response = await fetch(`/api/timesheets?${params}`);
+
+        if (!response.ok) {
+          const errorText = await response.text();
+          console.error('Failed to fetch timesheets:', response.status, errorText);
+          toast.error(`Failed to fetch timesheets: ${response.status} ${errorText}`);
+          setTimesheets([]);
+          return;
+        }
+
+        const data = await response.json();
+        all.push(...(data.timesheets || []));
+        cursor = data.next_cursor || null;
+      } while (cursor);
+      setTimesheets(all);
     } catch (error) {
       console.error('Failed to fetch timesheets:', error);
       toast.error('Failed to fetch timesheets. Please check your connection.');
@@ -0,0 +1,58 @@
+"""Add account_period_balances posting-time balance ledger
+
+Revision ID: account_period_balances
+Revises: je_keyset_pagination_index
+Create Date: 2025-12-03 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'account_period_balances'
+down_revision = 'je_keyset_pagination_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Per-account, per-month running debit/credit totals, backfilled from posted lines"""
+    op.create_table(
+        'account_period_balances',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('entity_id', sa.Integer(), sa.ForeignKey('accounting_entities.id')),
+        sa.Column('account_id', sa.Integer(), sa.ForeignKey('chart_of_accounts.id')),
+        sa.Column('period_year', sa.Integer(), nullable=False),
+        sa.Column('period_month', sa.Integer(), nullable=False),
+        sa.Column('debit_total', sa.Numeric(15, 2), server_default='0'),
+        sa.Column('credit_total', sa.Numeric(15, 2), server_default='0'),
+        sa.Column('updated_at', sa.DateTime()),
+        sa.UniqueConstraint('account_id', 'period_year', 'period_month', name='uq_apb_account_period'),
+    )
+    op.create_index(
+        'idx_apb_entity_period', 'account_period_balances', ['entity_id', 'period_year', 'period_month']
+    )
+
+    # Statements and trial balances read only this ledger, so seed it with
+    # every entry posted before the upgrade in one grouped pass
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        year = "CAST(strftime('%Y', je.entry_date) AS INTEGER)"
+        month = "CAST(strftime('%m', je.entry_date) AS INTEGER)"
+    else:
+        year = "CAST(EXTRACT(YEAR FROM je.entry_date) AS INTEGER)"
+        month = "CAST(EXTRACT(MONTH FROM je.entry_date) AS INTEGER)"
+    op.execute(
+        "INSERT INTO account_period_balances "
+        "(entity_id, account_id, period_year, period_month, debit_total, credit_total, updated_at) "
+        f"SELECT je.entity_id, l.account_id, {year}, {month}, "
+        "COALESCE(SUM(l.debit_amount), 0), COALESCE(SUM(l.credit_amount), 0), CURRENT_TIMESTAMP "
+        "FROM journal_entry_lines l JOIN journal_entries je ON je.id = l.journal_entry_id "
+        "WHERE je.status = 'posted' "
+        f"GROUP BY je.entity_id, l.account_id, {year}, {month}"
+    )
+
+
+def downgrade():
+    op.drop_index('idx_apb_entity_period', 'account_period_balances')
+    op.drop_table('account_period_balances')
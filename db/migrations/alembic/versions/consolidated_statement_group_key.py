@@ -0,0 +1,48 @@
+"""Key consolidated_financial_statements by parent group and period end
+
+Revision ID: consolidated_statement_group_key
+Revises: dashboard_snapshots
+Create Date: 2025-12-12 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'consolidated_statement_group_key'
+down_revision = 'dashboard_snapshots'
+branch_labels = None
+depends_on = None
+
+# The original unique constraint was unnamed; name it for batch mode
+NAMING = {"uq": "uq_%(table_name)s_%(column_0_name)s"}
+
+
+def upgrade():
+    """Replace UNIQUE(fiscal_year, fiscal_period, period_type) with one row per parent group"""
+    inspector = sa.inspect(op.get_bind())
+    if 'consolidated_financial_statements' not in inspector.get_table_names():
+        return
+    # Older duplicates of a group/period keep only their newest row
+    op.execute(
+        "DELETE FROM consolidated_financial_statements WHERE id NOT IN ("
+        "SELECT MAX(id) FROM consolidated_financial_statements "
+        "GROUP BY parent_entity_id, period_type, as_of_date)"
+    )
+    with op.batch_alter_table(
+        'consolidated_financial_statements', schema=None, naming_convention=NAMING
+    ) as batch_op:
+        batch_op.drop_constraint('uq_consolidated_financial_statements_fiscal_year', type_='unique')
+        batch_op.create_unique_constraint(
+            'uq_consol_group_period', ['parent_entity_id', 'period_type', 'as_of_date']
+        )
+
+
+def downgrade():
+    with op.batch_alter_table(
+        'consolidated_financial_statements', schema=None, naming_convention=NAMING
+    ) as batch_op:
+        batch_op.drop_constraint('uq_consol_group_period', type_='unique')
+        batch_op.create_unique_constraint(
+            'uq_consolidated_financial_statements_fiscal_year', ['fiscal_year', 'fiscal_period', 'period_type']
+        )
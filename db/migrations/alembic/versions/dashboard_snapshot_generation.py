@@ -0,0 +1,25 @@
+"""Add a writer generation counter to dashboard_snapshots
+
+Revision ID: dashboard_snapshot_generation
+Revises: consolidated_statement_group_key
+Create Date: 2025-12-12 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'dashboard_snapshot_generation'
+down_revision = 'consolidated_statement_group_key'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('dashboard_snapshots', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('generation', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('dashboard_snapshots', schema=None) as batch_op:
+        batch_op.drop_column('generation')
@@ -0,0 +1,31 @@
+"""Add dashboard_snapshots for versioned dashboard metrics
+
+Revision ID: dashboard_snapshots
+Revises: mercury_sync_state
+Create Date: 2025-12-09 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'dashboard_snapshots'
+down_revision = 'mercury_sync_state'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'dashboard_snapshots',
+        sa.Column('scope', sa.String(50), primary_key=True),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('is_stale', sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column('period_month', sa.String(7)),
+        sa.Column('computed_at', sa.DateTime()),
+    )
+
+
+def downgrade():
+    op.drop_table('dashboard_snapshots')
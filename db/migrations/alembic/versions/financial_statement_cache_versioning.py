@@ -0,0 +1,54 @@
+"""Key financial_statement_cache by period end date and ledger version
+
+Revision ID: financial_statement_cache_versioning
+Revises: account_period_balances
+Create Date: 2025-12-05 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'financial_statement_cache_versioning'
+down_revision = 'account_period_balances'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add entity_ledger_versions and recreate the (never populated) statement cache"""
+    op.create_table(
+        'entity_ledger_versions',
+        sa.Column('entity_id', sa.Integer(), sa.ForeignKey('accounting_entities.id'), primary_key=True),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+
+    inspector = sa.inspect(op.get_bind())
+    if 'financial_statement_cache' in inspector.get_table_names():
+        op.drop_table('financial_statement_cache')
+    op.create_table(
+        'financial_statement_cache',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('entity_id', sa.Integer(), sa.ForeignKey('accounting_entities.id')),
+        sa.Column('period_id', sa.Integer(), sa.ForeignKey('accounting_periods.id'), nullable=True),
+        sa.Column('period_end_date', sa.Date(), nullable=False),
+        sa.Column('statement_type', sa.String(50), nullable=False),
+        sa.Column('statement_data', sa.JSON(), nullable=False),
+        sa.Column('ledger_version', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('is_consolidated', sa.Boolean(), server_default=sa.false()),
+        sa.Column('created_by_id', sa.Integer(), sa.ForeignKey('partners.id'), nullable=True),
+        sa.Column('created_at', sa.DateTime()),
+        sa.UniqueConstraint('entity_id', 'period_end_date', 'statement_type', 'is_consolidated'),
+    )
+    op.create_index(
+        'idx_fs_cache_entity_period', 'financial_statement_cache', ['entity_id', 'period_end_date']
+    )
+    op.create_index('idx_fs_cache_type', 'financial_statement_cache', ['statement_type'])
+
+
+def downgrade():
+    op.drop_index('idx_fs_cache_type', 'financial_statement_cache')
+    op.drop_index('idx_fs_cache_entity_period', 'financial_statement_cache')
+    op.drop_table('financial_statement_cache')
+    op.drop_table('entity_ledger_versions')
@@ -0,0 +1,25 @@
+"""Add (entity_id, entry_date, id) index for journal entry keyset pagination
+
+Revision ID: je_keyset_pagination_index
+Revises: 3bdfcc54edfe
+Create Date: 2025-12-01 09:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'je_keyset_pagination_index'
+down_revision = '3bdfcc54edfe'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Composite index backing GET /api/accounting/journal-entries/ pages"""
+    op.create_index(
+        'idx_je_entity_date_id', 'journal_entries', ['entity_id', 'entry_date', 'id']
+    )
+
+
+def downgrade():
+    op.drop_index('idx_je_entity_date_id', 'journal_entries')
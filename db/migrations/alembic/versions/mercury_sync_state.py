@@ -0,0 +1,40 @@
+"""Add mercury_sync_state for incremental, paginated Mercury sync
+
+Revision ID: mercury_sync_state
+Revises: financial_statement_cache_versioning
+Create Date: 2025-12-08 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'mercury_sync_state'
+down_revision = 'financial_statement_cache_versioning'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Per-account high-water mark and resumable page cursor"""
+    op.create_table(
+        'mercury_sync_state',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('entity_id', sa.Integer(), sa.ForeignKey('accounting_entities.id'), nullable=False),
+        sa.Column('mercury_account_id', sa.String(100), nullable=False),
+        sa.Column('high_water_mark', sa.DateTime()),
+        sa.Column('last_transaction_id', sa.String(100)),
+        sa.Column('cursor_start', sa.Date()),
+        sa.Column('cursor_offset', sa.Integer()),
+        sa.Column('last_sync_at', sa.DateTime()),
+        sa.Column('last_sync_status', sa.String(50)),
+        sa.Column('last_run_fetched', sa.Integer(), server_default='0'),
+        sa.Column('last_run_inserted', sa.Integer(), server_default='0'),
+        sa.Column('last_run_pages', sa.Integer(), server_default='0'),
+        sa.Column('updated_at', sa.DateTime()),
+        sa.UniqueConstraint('entity_id', 'mercury_account_id', name='uq_mercury_sync_state_account'),
+    )
+
+
+def downgrade():
+    op.drop_table('mercury_sync_state')
@@ -19,7 +19,7 @@ sys.path.insert(0, os.path.abspath('.'))
 from sqlalchemy import select, update, text
 from services.api.database import get_db
 from services.api.models_accounting import ChartOfAccounts
-from services.api.services.xbrl_taxonomy_service import get_xbrl_service
+from services.api.services.xbrl_taxonomy_service import build_index, get_xbrl_service
 from typing import Dict, Optional, List
 import logging
 
@@ -199,6 +199,7 @@ def find_best_xbrl_match(
 def map_all_accounts():
     """Map all COA accounts to XBRL elements"""
     db = next(get_db())
+    build_index()  # offline script: compile the index here if missing or stale
     xbrl_service = get_xbrl_service()
 
     try:
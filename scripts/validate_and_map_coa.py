@@ -22,7 +22,7 @@ sys.path.insert(0, os.path.abspath('.'))
 from sqlalchemy import select, delete
 from services.api.database import get_db
 from services.api.models_accounting import ChartOfAccounts
-from services.api.services.xbrl_taxonomy_service import get_xbrl_service
+from services.api.services.xbrl_taxonomy_service import build_index, get_xbrl_service
 from typing import Dict, Optional, List
 from decimal import Decimal
 import logging
@@ -373,6 +373,7 @@ def find_xbrl_mapping(account: ChartOfAccounts, xbrl_service) -> Optional[Dict]:
 def validate_and_map_coa():
     """Validate all COA accounts and map to XBRL"""
     db = next(get_db())
+    build_index()  # offline script: compile the index here if missing or stale
     xbrl_service = get_xbrl_service()
 
     try:
@@ -17,7 +17,10 @@ import json
 import urllib.request
 import urllib.error
 
+from services.api.schema_bootstrap import schema_ensurer
 
+
+@schema_ensurer("agent_runs")
 def ensure_agent_tables(db: Session) -> None:
     db.execute(sa_text(
         """
@@ -12,7 +12,7 @@ from typing import Optional, Dict, Any
 from fastapi import HTTPException, Security, status, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
-from .clerk_auth import verify_clerk_jwt, verify_clerk_session_cookie
+from .clerk_auth import verify_clerk_jwt_async, verify_clerk_session_cookie_async
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
@@ -115,7 +115,7 @@ async def get_current_partner(request: Request, credentials: HTTPAuthorizationCr
             # Fallback to Clerk session cookie
             sess = request.cookies.get('__session')
             if sess:
-                claims = verify_clerk_session_cookie(sess)
+                claims = await verify_clerk_session_cookie_async(sess)
                 if claims and claims.get('sub'):
                     email = (
                         claims.get('email') or ''
@@ -141,7 +141,7 @@ async def get_current_partner(request: Request, credentials: HTTPAuthorizationCr
         # First try Clerk JWT verification
         claims = None
         try:
-            claims = verify_clerk_jwt(token)
+            claims = await verify_clerk_jwt_async(token)
         except Exception:
             claims = None
 
@@ -192,7 +192,7 @@ async def get_current_partner(request: Request, credentials: HTTPAuthorizationCr
         # Try Clerk session verification as fallback (token might be a session token)
         if not claims:
             try:
-                claims2 = verify_clerk_session_cookie(token)
+                claims2 = await verify_clerk_session_cookie_async(token)
             except Exception:
                 claims2 = None
             if claims2 and claims2.get('sub'):
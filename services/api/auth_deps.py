@@ -21,7 +21,7 @@ import logging
 from fastapi import Depends, HTTPException, Request, Security, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
-from .clerk_auth import verify_clerk_jwt, verify_clerk_session_cookie
+from .clerk_auth import verify_clerk_jwt_async, verify_clerk_session_cookie_async
 
 logger = logging.getLogger(__name__)
 
@@ -91,7 +91,7 @@ async def require_clerk_user(
     # 1) Try Clerk JWT (Authorization bearer). If present but invalid, reject.
     if token:
         try:
-            claims = verify_clerk_jwt(token)
+            claims = await verify_clerk_jwt_async(token)
         except Exception:
             claims = None
         if claims and claims.get("sub"):
@@ -113,7 +113,7 @@ async def require_clerk_user(
         sess = None
     if sess:
         try:
-            sclaims = verify_clerk_session_cookie(sess)
+            sclaims = await verify_clerk_session_cookie_async(sess)
         except Exception:
             sclaims = None
         if sclaims and sclaims.get("sub"):
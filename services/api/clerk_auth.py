@@ -6,107 +6,339 @@ Environment variables expected:
   CLERK_JWKS_URL   - e.g., https://<your-subdomain>.clerk.accounts.dev/.well-known/jwks.json
   CLERK_ISSUER     - e.g., https://<your-subdomain>.clerk.accounts.dev
   CLERK_AUDIENCE   - optional; recommended to match Clerk JWT template audience (e.g., 'backend')
+
+Steady-state verification does no network I/O:
+  - JWKS keys are indexed by kid with their PEM built once per fetch
+  - a background task refreshes JWKS before the 1-hour TTL expires
+  - concurrent refreshes (and concurrent session verifications of the same
+    token) are single-flighted
+  - verified claims are cached briefly, keyed by a hash of the token
+Async callers should use the *_async variants; the sync functions remain for
+sync code paths and only touch the network when the key cache is cold.
 """
 
 import os
 import time
 import json
+import asyncio
+import hashlib
 import logging
-from typing import Any, Dict, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
+import httpx
 import requests
 from jose import jwt, jwk
 from jose.utils import base64url_decode
+from .diagnostics import register_stats
 
 logger = logging.getLogger(__name__)
 
-_JWKS_CACHE: Dict[str, Any] = {"keys": None, "ts": 0}
+JWKS_TTL_SECONDS = 3600
+# Refresh this long before the TTL expires
+JWKS_REFRESH_MARGIN_SECONDS = 300
+# Unknown kid (key rotation) may force a refetch at most this often
+JWKS_MIN_REFETCH_SECONDS = 60
+CLAIMS_CACHE_TTL_SECONDS = int(os.getenv("CLERK_CLAIMS_CACHE_TTL", "60"))
+CLAIMS_CACHE_MAX_ENTRIES = 10000
 
+# Raw JWKS document plus the kid -> PEM index built from it
+_JWKS_CACHE: Dict[str, Any] = {"keys": None, "ts": 0, "url": None}
+_KEY_INDEX: Dict[str, str] = {}
+_jwks_lock = threading.Lock()
+_async_jwks_lock: Optional[asyncio.Lock] = None
+_refresher_task: Optional["asyncio.Task"] = None
 
-def _fetch_jwks(jwks_url: str) -> Dict[str, Any]:
-    now = time.time()
-    if _JWKS_CACHE["keys"] is not None and now - _JWKS_CACHE["ts"] < 3600:
-        return _JWKS_CACHE["keys"]
-    resp = requests.get(jwks_url, timeout=5)
-    resp.raise_for_status()
-    data = resp.json()
-    _JWKS_CACHE["keys"] = data
-    _JWKS_CACHE["ts"] = now
-    return data
+# sha256(token) -> (expires_at, claims)
+_CLAIMS_CACHE: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+# sha256(token) -> in-flight session verification
+_SESSION_INFLIGHT: Dict[str, "asyncio.Future"] = {}
 
+_stats = {"claims_hits": 0, "claims_misses": 0, "jwks_fetches": 0, "session_api_calls": 0}
 
-def verify_clerk_jwt(token: str) -> Optional[Dict[str, Any]]:
-    jwks_url = os.getenv("CLERK_JWKS_URL", "").strip()
-    issuer = os.getenv("CLERK_ISSUER", "").strip()
-    audience = os.getenv("CLERK_AUDIENCE", "backend").strip()
-    if not jwks_url or not issuer:
-        # In test/dev, allow a local HS256 fallback to keep tests unblocked
-        if os.getenv('PYTEST_CURRENT_TEST') or os.getenv('ALLOW_LOCAL_TEST_JWT'):
-            try:
-                from services.api.config import SECRET_KEY as _LOCAL_SECRET
-                return jwt.decode(token, _LOCAL_SECRET, algorithms=['HS256'])
-            except Exception:
-                return None
-        logger.warning("CLERK_JWKS_URL or CLERK_ISSUER not configured; skipping Clerk verification")
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_auth_cache_stats() -> Dict[str, Any]:
+    return {
+        **_stats,
+        "claims_cached": len(_CLAIMS_CACHE),
+        "keys_cached": len(_KEY_INDEX),
+        "jwks_age_seconds": (time.time() - _JWKS_CACHE["ts"]) if _JWKS_CACHE["keys"] is not None else None,
+    }
+
+
+register_stats("clerk_auth", get_auth_cache_stats)
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(timeout=5.0)
+    return _http_client
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _cached_claims(token: str) -> Optional[Dict[str, Any]]:
+    key = _token_key(token)
+    hit = _CLAIMS_CACHE.get(key)
+    if hit is None:
+        _stats["claims_misses"] += 1
         return None
-    try:
-        jwks = _fetch_jwks(jwks_url)
-        headers = jwt.get_unverified_header(token)
-        kid = headers.get('kid')
-        alg = headers.get('alg') or 'RS256'
+    expires_at, claims = hit
+    if expires_at <= time.time():
+        _CLAIMS_CACHE.pop(key, None)
+        _stats["claims_misses"] += 1
+        return None
+    _stats["claims_hits"] += 1
+    return claims
+
+
+def _cache_claims(token: str, claims: Dict[str, Any], ttl: int = CLAIMS_CACHE_TTL_SECONDS) -> None:
+    now = time.time()
+    expires_at = now + ttl
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        # Never serve a token past its own expiry
+        expires_at = min(expires_at, float(exp))
+    if expires_at <= now:
+        return
+    key = _token_key(token)
+    _CLAIMS_CACHE[key] = (expires_at, claims)
+    _CLAIMS_CACHE.move_to_end(key)
+    while len(_CLAIMS_CACHE) > CLAIMS_CACHE_MAX_ENTRIES:
+        _CLAIMS_CACHE.popitem(last=False)
+
+
+def clear_auth_caches() -> None:
+    _CLAIMS_CACHE.clear()
+    _KEY_INDEX.clear()
+    _JWKS_CACHE.update({"keys": None, "ts": 0, "url": None})
+
+
+def _index_jwks(jwks_url: str, data: Dict[str, Any]) -> None:
+    """Build PEMs once per fetch so verification never reconstructs keys"""
+    index: Dict[str, str] = {}
+    for k in data.get('keys', []):
+        kid = k.get('kid')
         if not kid:
-            logger.debug('Clerk JWT missing kid header')
-            return None
-        key = None
-        for k in jwks.get('keys', []):
-            if k.get('kid') == kid:
-                key = k
-                break
-        if not key:
-            logger.debug('No matching JWKS key for kid=%s', kid)
-            return None
+            continue
+        try:
+            index[kid] = jwk.construct(k).to_pem().decode('utf-8')
+        except Exception as e:
+            logger.debug('Skipping unusable JWKS key kid=%s: %s', kid, str(e))
+    _KEY_INDEX.clear()
+    _KEY_INDEX.update(index)
+    _JWKS_CACHE.update({"keys": data, "ts": time.time(), "url": jwks_url})
+    _stats["jwks_fetches"] += 1
+
+
+def _jwks_fresh(jwks_url: str) -> bool:
+    return (
+        _JWKS_CACHE["keys"] is not None
+        and _JWKS_CACHE["url"] == jwks_url
+        and time.time() - _JWKS_CACHE["ts"] < JWKS_TTL_SECONDS
+    )
+
+
+def _fetch_jwks(jwks_url: str, force: bool = False) -> Dict[str, Any]:
+    """Sync fetch (cold start / sync callers); single-flighted across threads"""
+    if not force and _jwks_fresh(jwks_url):
+        return _JWKS_CACHE["keys"]
+    with _jwks_lock:
+        if not force and _jwks_fresh(jwks_url):
+            return _JWKS_CACHE["keys"]
+        resp = requests.get(jwks_url, timeout=5)
+        resp.raise_for_status()
+        data = resp.json()
+        _index_jwks(jwks_url, data)
+        return data
+
+
+async def refresh_jwks_async(jwks_url: Optional[str] = None, force: bool = False) -> Dict[str, Any]:
+    """Async JWKS fetch; a burst of callers shares one request"""
+    global _async_jwks_lock
+    jwks_url = jwks_url or os.getenv("CLERK_JWKS_URL", "").strip()
+    if not force and _jwks_fresh(jwks_url):
+        return _JWKS_CACHE["keys"]
+    if _async_jwks_lock is None:
+        _async_jwks_lock = asyncio.Lock()
+    started = time.time()
+    async with _async_jwks_lock:
+        # Someone else refreshed while we waited
+        if _JWKS_CACHE["url"] == jwks_url and _JWKS_CACHE["ts"] >= started and _JWKS_CACHE["keys"] is not None:
+            return _JWKS_CACHE["keys"]
+        if not force and _jwks_fresh(jwks_url):
+            return _JWKS_CACHE["keys"]
+        resp = await _get_http_client().get(jwks_url)
+        resp.raise_for_status()
+        data = resp.json()
+        _index_jwks(jwks_url, data)
+        return data
 
-        # Verify signature manually using JWK
-        # Build PEM from JWK for jose to verify with the correct algorithm (supports RSA/EC)
-        public_key = jwk.construct(key)
-        key_pem = public_key.to_pem().decode('utf-8')
 
-        verify_aud = os.getenv('CLERK_VERIFY_AUDIENCE', '1').strip() not in ('0','false','False')
-        aud_list = [a.strip() for a in (audience or '').split(',') if a.strip()]
-        decode_opts = { 'verify_at_hash': False }
+async def _jwks_refresh_loop() -> None:
+    while True:
+        jwks_url = os.getenv("CLERK_JWKS_URL", "").strip()
+        if not jwks_url:
+            return
         try:
-            if verify_aud and aud_list:
-                return jwt.decode(
-                    token,
-                    key_pem,
-                    algorithms=[alg],
-                    issuer=issuer,
-                    audience=aud_list[0] if len(aud_list)==1 else aud_list,
-                    options=decode_opts,
-                )
-            # Relaxed aud (dev or unspecified)
+            await refresh_jwks_async(jwks_url, force=True)
+            delay = JWKS_TTL_SECONDS - JWKS_REFRESH_MARGIN_SECONDS
+        except Exception as e:
+            logger.warning('Background JWKS refresh failed: %s', str(e))
+            delay = 30
+        await asyncio.sleep(delay)
+
+
+def start_jwks_refresher() -> bool:
+    """Start proactive background JWKS refresh (call from app startup)"""
+    global _refresher_task
+    if not os.getenv("CLERK_JWKS_URL", "").strip():
+        return False
+    if _refresher_task is None or _refresher_task.done():
+        _refresher_task = asyncio.get_running_loop().create_task(_jwks_refresh_loop())
+    return True
+
+
+async def stop_jwks_refresher() -> None:
+    global _refresher_task, _http_client
+    if _refresher_task is not None:
+        _refresher_task.cancel()
+        try:
+            await _refresher_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _refresher_task = None
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
+
+def _needs_key_fetch(jwks_url: str, kid: Optional[str]) -> bool:
+    if not _jwks_fresh(jwks_url):
+        return True
+    # Unknown kid usually means Clerk rotated keys; refetch, but rate-limited
+    return bool(kid) and kid not in _KEY_INDEX and time.time() - _JWKS_CACHE["ts"] > JWKS_MIN_REFETCH_SECONDS
+
+
+def _local_test_decode(token: str) -> Optional[Dict[str, Any]]:
+    # In test/dev, allow a local HS256 fallback to keep tests unblocked
+    if os.getenv('PYTEST_CURRENT_TEST') or os.getenv('ALLOW_LOCAL_TEST_JWT'):
+        try:
+            from services.api.config import SECRET_KEY as _LOCAL_SECRET
+            return jwt.decode(token, _LOCAL_SECRET, algorithms=['HS256'])
+        except Exception:
+            return None
+    return None
+
+
+def _decode_with_cached_key(token: str, issuer: str, audience: str) -> Optional[Dict[str, Any]]:
+    headers = jwt.get_unverified_header(token)
+    kid = headers.get('kid')
+    alg = headers.get('alg') or 'RS256'
+    if not kid:
+        logger.debug('Clerk JWT missing kid header')
+        return None
+    key_pem = _KEY_INDEX.get(kid)
+    if not key_pem:
+        logger.debug('No matching JWKS key for kid=%s', kid)
+        return None
+
+    verify_aud = os.getenv('CLERK_VERIFY_AUDIENCE', '1').strip() not in ('0','false','False')
+    aud_list = [a.strip() for a in (audience or '').split(',') if a.strip()]
+    decode_opts = { 'verify_at_hash': False }
+    try:
+        if verify_aud and aud_list:
             return jwt.decode(
                 token,
                 key_pem,
                 algorithms=[alg],
                 issuer=issuer,
-                options={**decode_opts, 'verify_aud': False},
+                audience=aud_list[0] if len(aud_list)==1 else aud_list,
+                options=decode_opts,
             )
-        except Exception as inner:
-            logger.debug('Clerk JWT pem decode failed (%s): %s', alg, str(inner))
-            # Test/dev fallback to local HS256 token
-            try:
-                if os.getenv('PYTEST_CURRENT_TEST') or os.getenv('ALLOW_LOCAL_TEST_JWT'):
-                    from services.api.config import SECRET_KEY as _LOCAL_SECRET
-                    return jwt.decode(token, _LOCAL_SECRET, algorithms=['HS256'])
-            except Exception:
-                pass
-            return None
+        # Relaxed aud (dev or unspecified)
+        return jwt.decode(
+            token,
+            key_pem,
+            algorithms=[alg],
+            issuer=issuer,
+            options={**decode_opts, 'verify_aud': False},
+        )
+    except Exception as inner:
+        logger.debug('Clerk JWT pem decode failed (%s): %s', alg, str(inner))
+        # Test/dev fallback to local HS256 token
+        return _local_test_decode(token)
+
+
+def _clerk_settings() -> Tuple[str, str, str]:
+    return (
+        os.getenv("CLERK_JWKS_URL", "").strip(),
+        os.getenv("CLERK_ISSUER", "").strip(),
+        os.getenv("CLERK_AUDIENCE", "backend").strip(),
+    )
+
+
+def verify_clerk_jwt(token: str) -> Optional[Dict[str, Any]]:
+    jwks_url, issuer, audience = _clerk_settings()
+    if not jwks_url or not issuer:
+        if os.getenv('PYTEST_CURRENT_TEST') or os.getenv('ALLOW_LOCAL_TEST_JWT'):
+            return _local_test_decode(token)
+        logger.warning("CLERK_JWKS_URL or CLERK_ISSUER not configured; skipping Clerk verification")
+        return None
+    cached = _cached_claims(token)
+    if cached is not None:
+        return cached
+    try:
+        kid = jwt.get_unverified_header(token).get('kid')
+        if _needs_key_fetch(jwks_url, kid):
+            _fetch_jwks(jwks_url, force=_jwks_fresh(jwks_url))
+        claims = _decode_with_cached_key(token, issuer, audience)
+        if claims:
+            _cache_claims(token, claims)
+        return claims
+    except Exception as e:
+        logger.debug('Clerk JWT verification error: %s', str(e))
+        return None
+
+
+async def verify_clerk_jwt_async(token: str) -> Optional[Dict[str, Any]]:
+    """Non-blocking variant: JWKS misses are fetched with httpx, single-flighted"""
+    jwks_url, issuer, audience = _clerk_settings()
+    if not jwks_url or not issuer:
+        return verify_clerk_jwt(token)
+    cached = _cached_claims(token)
+    if cached is not None:
+        return cached
+    try:
+        kid = jwt.get_unverified_header(token).get('kid')
+        if _needs_key_fetch(jwks_url, kid):
+            await refresh_jwks_async(jwks_url, force=_jwks_fresh(jwks_url))
+        claims = _decode_with_cached_key(token, issuer, audience)
+        if claims:
+            _cache_claims(token, claims)
+        return claims
     except Exception as e:
         logger.debug('Clerk JWT verification error: %s', str(e))
         return None
 
 
+def _primary_email(user_json: Dict[str, Any]) -> str:
+    email = ''
+    peid = (user_json.get('primary_email_address_id') or '').strip()
+    for e in (user_json.get('email_addresses') or []):
+        if e.get('id') == peid and e.get('email_address'):
+            email = e.get('email_address'); break
+    if not email and (user_json.get('email_addresses') or []):
+        email = (user_json.get('email_addresses')[0] or {}).get('email_address') or ''
+    return email
+
+
 def verify_clerk_session_cookie(session_token: str) -> Optional[Dict[str, Any]]:
     """Verify Clerk session cookie via Clerk Management API.
     Returns minimal claims dict with 'sub' and may include 'email' when fetched.
@@ -115,7 +347,11 @@ def verify_clerk_session_cookie(session_token: str) -> Optional[Dict[str, Any]]:
         sk = os.getenv('CLERK_SECRET_KEY', '').strip()
         if not sk or not session_token:
             return None
+        cached = _cached_claims(session_token)
+        if cached is not None:
+            return cached
         # Verify the session token
+        _stats["session_api_calls"] += 1
         resp = requests.post(
             'https://api.clerk.dev/v1/sessions/verify',
             headers={
@@ -141,16 +377,89 @@ def verify_clerk_session_cookie(session_token: str) -> Optional[Dict[str, Any]]:
                 timeout=5,
             )
             if u.status_code == 200:
-                uj = u.json() or {}
-                peid = (uj.get('primary_email_address_id') or '').strip()
-                for e in (uj.get('email_addresses') or []):
-                    if e.get('id') == peid and e.get('email_address'):
-                        email = e.get('email_address'); break
-                if not email and (uj.get('email_addresses') or []):
-                    email = (uj.get('email_addresses')[0] or {}).get('email_address') or ''
+                email = _primary_email(u.json() or {})
         except Exception:
             pass
-        return {'sub': user_id, 'email': email}
+        claims = {'sub': user_id, 'email': email}
+        _cache_claims(session_token, claims)
+        return claims
+    except Exception as e:
+        logger.debug('Clerk session cookie verification error: %s', str(e))
+        return None
+
+
+async def _verify_session_remote(session_token: str, sk: str) -> Optional[Dict[str, Any]]:
+    client = _get_http_client()
+    _stats["session_api_calls"] += 1
+    resp = await client.post(
+        'https://api.clerk.dev/v1/sessions/verify',
+        headers={'Authorization': f'Bearer {sk}', 'Content-Type': 'application/json'},
+        json={'token': session_token},
+    )
+    if resp.status_code != 200:
+        logger.debug('Clerk session verify failed: %s %s', resp.status_code, resp.text)
+        return None
+    data = resp.json() or {}
+    user_id = data.get('claims', {}).get('sub') or data.get('user_id')
+    if not user_id:
+        return None
+    email = await fetch_clerk_user_email_async(user_id)
+    claims = {'sub': user_id, 'email': email}
+    _cache_claims(session_token, claims)
+    return claims
+
+
+async def verify_clerk_session_cookie_async(session_token: str) -> Optional[Dict[str, Any]]:
+    """Non-blocking session verification; concurrent calls for one token share a request"""
+    sk = os.getenv('CLERK_SECRET_KEY', '').strip()
+    if not sk or not session_token:
+        return None
+    cached = _cached_claims(session_token)
+    if cached is not None:
+        return cached
+    key = _token_key(session_token)
+    inflight = _SESSION_INFLIGHT.get(key)
+    if inflight is not None:
+        try:
+            return await asyncio.shield(inflight)
+        except Exception:
+            return None
+    future = asyncio.get_running_loop().create_future()
+    _SESSION_INFLIGHT[key] = future
+    try:
+        claims = await _verify_session_remote(session_token, sk)
+        future.set_result(claims)
+        return claims
     except Exception as e:
         logger.debug('Clerk session cookie verification error: %s', str(e))
+        future.set_result(None)
         return None
+    finally:
+        _SESSION_INFLIGHT.pop(key, None)
+
+
+# user_id -> (expires_at, email)
+_EMAIL_CACHE: Dict[str, Tuple[float, str]] = {}
+
+
+async def fetch_clerk_user_email_async(user_id: str) -> str:
+    """Primary email for a Clerk user (cached; '' when unavailable)"""
+    hit = _EMAIL_CACHE.get(user_id)
+    if hit and hit[0] > time.time():
+        return hit[1]
+    sk = os.getenv('CLERK_SECRET_KEY', '').strip()
+    if not sk or not user_id:
+        return ''
+    email = ''
+    try:
+        resp = await _get_http_client().get(
+            f'https://api.clerk.dev/v1/users/{user_id}',
+            headers={'Authorization': f'Bearer {sk}'},
+        )
+        if resp.status_code == 200:
+            email = _primary_email(resp.json() or {})
+    except Exception:
+        pass
+    if email:
+        _EMAIL_CACHE[user_id] = (time.time() + JWKS_TTL_SECONDS, email)
+    return email
@@ -44,6 +44,37 @@ def get_database_path():
 DATABASE_PATH = get_database_path()
 DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
 
+# Connection pool / SQLite tuning (overridable per deployment)
+def get_db_pool_settings():
+    """Pool sizing and SQLite pragmas shared by the sync and async engines"""
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "statement_cache_size": int(os.getenv("DB_STATEMENT_CACHE_SIZE", "512")),
+        "sqlite_mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        "sqlite_busy_timeout_ms": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        "sqlite_cache_size_kib": int(os.getenv("SQLITE_CACHE_SIZE_KIB", "65536")),
+        # NullPool keeps tests from holding SQLite file handles between cases
+        "use_null_pool": bool(os.getenv("PYTEST_CURRENT_TEST")) or os.getenv("DB_POOL", "").lower() == "null",
+    }
+
+
+def apply_sqlite_pragmas(dbapi_connection, settings=None):
+    """WAL journal, NORMAL sync, memory-mapped I/O; run on every new SQLite connection"""
+    settings = settings or get_db_pool_settings()
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={settings['sqlite_mmap_size']}")
+        cursor.execute(f"PRAGMA busy_timeout={settings['sqlite_busy_timeout_ms']}")
+        cursor.execute(f"PRAGMA cache_size=-{settings['sqlite_cache_size_kib']}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
 # JWT Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "ngi-capital-secret-key-2025-secure-internal-app")
 ALGORITHM = "HS256"
@@ -3,12 +3,13 @@ Database configuration for NGI Capital Internal System
 """
 
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 
 # Import configuration helper to compute DB path dynamically
-from .config import get_database_path
+from .config import get_database_path, get_db_pool_settings, apply_sqlite_pragmas
+from .schema_bootstrap import schema_ensurer
 
 # Import the single declarative Base from models to avoid duplicate metadata
 from .models import Base
@@ -18,6 +19,7 @@ from . import models_accounting
 from . import models_accounting_part2
 from . import models_accounting_part3
 from . import models_learning
+from .diagnostics import register_stats
 
 # Lazily initialized engine/session to allow switching to pytest DB after import
 _engine = None
@@ -43,24 +45,76 @@ def _ensure_engine():
                 _engine.dispose()
             except Exception:
                 pass
-        _engine = create_engine(
-            url,
-            connect_args={"check_same_thread": False} if "sqlite" in url else {},
-            echo=False,
-            poolclass=NullPool if url.startswith("sqlite") else None,
-        )
+        _engine = _create_engine(url)
         _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
         _current_url = url
 
 
-def get_db():
-    """
-    Dependency to get database session.
-    Ensures the session is closed after use.
-    """
+def _create_engine(url: str):
+    """Queue-pooled engine; SQLite connections run in WAL mode with tuned pragmas"""
+    settings = get_db_pool_settings()
+    is_sqlite = url.startswith("sqlite")
+    connect_args = {}
+    if is_sqlite:
+        connect_args = {
+            "check_same_thread": False,
+            "cached_statements": settings["statement_cache_size"],
+        }
+    if settings["use_null_pool"]:
+        return create_engine(url, connect_args=connect_args, echo=False, poolclass=NullPool)
+
+    engine = create_engine(
+        url,
+        connect_args=connect_args,
+        echo=False,
+        pool_size=settings["pool_size"],
+        max_overflow=settings["max_overflow"],
+        pool_timeout=settings["pool_timeout"],
+        pool_recycle=settings["pool_recycle"],
+        pool_pre_ping=not is_sqlite,
+    )
+    if is_sqlite:
+        event.listen(engine, "connect", lambda conn, _record: apply_sqlite_pragmas(conn, settings))
+    return engine
+
+
+def get_session_factory():
+    """Session factory bound to the (pooled) sync engine, for code outside request DI"""
     _ensure_engine()
-    db = _SessionLocal()
-    # In tests, ensure permissive minimal tables that some tests rely on exist
+    return _SessionLocal
+
+
+def warm_pool(connections: int = None) -> int:
+    """Open pool_size connections up front so the first requests skip connect/pragmas"""
+    _ensure_engine()
+    if isinstance(_engine.pool, NullPool):
+        return 0
+    count = connections or get_db_pool_settings()["pool_size"]
+    conns = [_engine.connect() for _ in range(count)]
+    for conn in conns:
+        conn.close()
+    return count
+
+
+def get_pool_stats() -> dict:
+    """Snapshot of the sync engine's pool for health/metrics endpoints"""
+    if _engine is None:
+        return {"initialized": False}
+    pool = _engine.pool
+    stats = {"initialized": True, "pool_class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        fn = getattr(pool, name, None)
+        if callable(fn):
+            stats[name] = fn()
+    return stats
+
+
+register_stats("db_pool", get_pool_stats)
+
+
+@schema_ensurer("pytest_minimal_tables")
+def _ensure_test_tables(db):
+    """In tests, ensure permissive minimal tables that some tests rely on exist"""
     try:
         import os as _os
         if _os.getenv('PYTEST_CURRENT_TEST'):
@@ -146,63 +200,37 @@ def get_db():
     except Exception:
         pass
 
-    # Harden schema evolution for investor management tables in all environments.
-    # Some older databases created investor_reports without new columns expected by the API.
-    # Ensure the columns exist to prevent OperationalError: no such column: period
-    try:
-        from sqlalchemy import text as _text
-        cols = [r[0] for r in db.execute(_text("SELECT name FROM pragma_table_info('investor_reports')")).fetchall()]
-        def _add_ir(col: str, type_: str):
-            if col not in cols:
-                db.execute(_text(f"ALTER TABLE investor_reports ADD COLUMN {col} {type_}"))
-        # Add columns introduced by the newer investor management module
-        _add_ir('period', 'TEXT')
-        _add_ir('type', 'TEXT')
-        _add_ir('status', 'TEXT')
-        _add_ir('owner_user_id', 'TEXT')
-        _add_ir('current_doc_url', 'TEXT')
-        # Keep due_date in case legacy table missed it (older schema used DATE, either works)
-        if 'due_date' not in cols:
-            db.execute(_text("ALTER TABLE investor_reports ADD COLUMN due_date TEXT"))
-        # Backfill sensible defaults for nulls to satisfy strict client schemas
-        try:
-            db.execute(_text("UPDATE investor_reports SET type = COALESCE(type,'Quarterly') WHERE type IS NULL"))
-            db.execute(_text("UPDATE investor_reports SET status = COALESCE(status,'Draft') WHERE status IS NULL"))
-            # Use YYYY (due year) as a basic period fallback if missing
-            db.execute(_text("UPDATE investor_reports SET period = CASE WHEN period IS NULL OR period = '' THEN COALESCE(strftime('%Y', due_date),'') ELSE period END"))
-        except Exception:
-            pass
-        db.commit()
-    except Exception:
-        pass
+
+def get_db():
+    """
+    Dependency to get database session.
+    Ensures the session is closed after use.
+    """
+    _ensure_engine()
+    db = _SessionLocal()
+    _ensure_test_tables(db)
     try:
         yield db
     finally:
         db.close()
-        # In tests/development with SQLite on Windows, proactively dispose the engine
-        # to release file handles between tests to avoid file locking issues.
-        try:
-            if _engine is not None and _current_url and _current_url.startswith("sqlite"):
-                _engine.dispose()
-                # If using a pytest-specific DB file, drop engine to release OS locks fully
-                import re as _re
-                if _re.search(r"test_ngi_capital\.db$", _current_url):
-                    try:
-                        _engine.dispose()
-                    except Exception:
-                        pass
-                    # Reset engine so next get_db() recreates a fresh one
-                    globals()['_engine'] = None
-                    globals()['_SessionLocal'] = None
-                    globals()['_current_url'] = None
-        except Exception:
-            pass
-        # Encourage prompt GC of SQLite connections on Windows
-        try:
-            import gc as _gc
-            _gc.collect()
-        except Exception:
-            pass
+        # Tests run on NullPool against per-test SQLite files; drop the engine so
+        # Windows releases the file lock. Pooled (non-test) engines are reused.
+        if os.getenv('PYTEST_CURRENT_TEST'):
+            try:
+                if _engine is not None and _current_url and _current_url.startswith("sqlite"):
+                    _engine.dispose()
+                    import re as _re
+                    if _re.search(r"test_ngi_capital\.db$", _current_url):
+                        globals()['_engine'] = None
+                        globals()['_SessionLocal'] = None
+                        globals()['_current_url'] = None
+            except Exception:
+                pass
+            try:
+                import gc as _gc
+                _gc.collect()
+            except Exception:
+                pass
 
 
 def init_db():
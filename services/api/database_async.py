@@ -3,6 +3,7 @@ NGI Capital - Async Database Configuration
 Provides async SQLAlchemy engine and sessions for accounting module
 """
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.pool import NullPool
@@ -20,6 +21,7 @@ from . import models_expenses_payroll
 from . import models_fixed_assets
 from . import models_period_close
 from . import models_learning
+from .diagnostics import register_stats
 
 # Lazy initialization of async engine and session factory
 async_engine = None
@@ -51,14 +53,71 @@ def get_async_engine():
     """Get or create the async engine"""
     global async_engine
     if async_engine is None:
+        from .config import get_db_pool_settings, apply_sqlite_pragmas
+
         ASYNC_DATABASE_URL = get_async_database_url()
-        async_engine = create_async_engine(
-            ASYNC_DATABASE_URL,
-            echo=False,
-            poolclass=NullPool if "sqlite" in ASYNC_DATABASE_URL else None,
-        )
+        settings = get_db_pool_settings()
+        is_sqlite = "sqlite" in ASYNC_DATABASE_URL
+        connect_args = {}
+        if is_sqlite:
+            connect_args = {"cached_statements": settings["statement_cache_size"]}
+        elif "asyncpg" in ASYNC_DATABASE_URL:
+            connect_args = {"prepared_statement_cache_size": settings["statement_cache_size"]}
+
+        if settings["use_null_pool"]:
+            async_engine = create_async_engine(
+                ASYNC_DATABASE_URL, echo=False, connect_args=connect_args, poolclass=NullPool
+            )
+        else:
+            async_engine = create_async_engine(
+                ASYNC_DATABASE_URL,
+                echo=False,
+                connect_args=connect_args,
+                pool_size=settings["pool_size"],
+                max_overflow=settings["max_overflow"],
+                pool_timeout=settings["pool_timeout"],
+                pool_recycle=settings["pool_recycle"],
+                pool_pre_ping=not is_sqlite,
+            )
+            if is_sqlite:
+                event.listen(
+                    async_engine.sync_engine,
+                    "connect",
+                    lambda conn, _record: apply_sqlite_pragmas(conn, settings),
+                )
     return async_engine
 
+
+async def warm_async_pool(connections: int = None) -> int:
+    """Open pool_size connections at startup so first requests skip connect/pragmas"""
+    from .config import get_db_pool_settings
+
+    engine = get_async_engine()
+    if isinstance(engine.pool, NullPool):
+        return 0
+    count = connections or get_db_pool_settings()["pool_size"]
+    conns = [await engine.connect() for _ in range(count)]
+    for conn in conns:
+        await conn.close()
+    return count
+
+
+def get_async_pool_stats() -> dict:
+    """Snapshot of the async engine's pool for health/metrics endpoints"""
+    if async_engine is None:
+        return {"initialized": False}
+    pool = async_engine.pool
+    stats = {"initialized": True, "pool_class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        fn = getattr(pool, name, None)
+        if callable(fn):
+            stats[name] = fn()
+    return stats
+
+
+register_stats("db_pool_async", get_async_pool_stats)
+
+
 def get_async_session_factory():
     """Get or create the async session factory"""
     global AsyncSessionLocal
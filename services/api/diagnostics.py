@@ -0,0 +1,36 @@
+"""
+Runtime diagnostics registry.
+
+Modules that keep in-process counters (caches, pools, background jobs,
+import/export activity) register a zero-argument stats function here under a
+short name when they are imported. The authenticated GET /api/diagnostics
+endpoint returns every registered source in one payload, so new features add
+a register_stats() call instead of another public health route.
+
+Author: NGI Capital Development Team
+Date: December 2025
+"""
+
+import logging
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+_providers: Dict[str, Callable[[], Any]] = {}
+
+
+def register_stats(name: str, provider: Callable[[], Any]) -> None:
+    """Expose `provider()` under `name`; re-registering a name replaces it"""
+    _providers[name] = provider
+
+
+def collect_stats() -> Dict[str, Any]:
+    """Snapshot every registered source; one failing source does not hide the rest"""
+    payload: Dict[str, Any] = {}
+    for name in sorted(_providers):
+        try:
+            payload[name] = _providers[name]()
+        except Exception as e:
+            logger.warning(f"Diagnostics source {name} failed: {e}")
+            payload[name] = {"error": str(e)}
+    return payload
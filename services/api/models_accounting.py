@@ -331,6 +331,7 @@ class JournalEntry(Base):
         Index("idx_je_status", "status"),
         Index("idx_je_date", "entry_date"),
         Index("idx_je_number", "entry_number"),
+        Index("idx_je_entity_date_id", "entity_id", "entry_date", "id"),
     )
 
 
@@ -394,6 +395,65 @@ class JournalEntryLine(Base):
         UniqueConstraint("journal_entry_id", "line_number"),
     )
 
+
+class AccountPeriodBalance(Base):
+    """
+    Posting-time balance ledger: running debit/credit totals per account per
+    calendar month of entry_date. Maintained when an entry is posted or
+    unposted (see services/account_balance_ledger.py)
+    """
+    __tablename__ = "account_period_balances"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    entity_id: Mapped[int] = mapped_column(Integer, ForeignKey("accounting_entities.id"))
+    account_id: Mapped[int] = mapped_column(Integer, ForeignKey("chart_of_accounts.id"))
+    period_year: Mapped[int] = mapped_column(Integer, nullable=False)
+    period_month: Mapped[int] = mapped_column(Integer, nullable=False)  # 1-12
+
+    debit_total: Mapped[Decimal] = mapped_column(Numeric(15, 2), default=Decimal("0.00"))
+    credit_total: Mapped[Decimal] = mapped_column(Numeric(15, 2), default=Decimal("0.00"))
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=get_pst_now, onupdate=get_pst_now)
+
+    __table_args__ = (
+        Index("idx_apb_entity_period", "entity_id", "period_year", "period_month"),
+        UniqueConstraint("account_id", "period_year", "period_month", name="uq_apb_account_period"),
+    )
+
+
+class EntityLedgerVersion(Base):
+    """
+    Per-entity ledger version, bumped on every post, unpost and period
+    reopen. Cached financial statements are valid only for the version they
+    were built against
+    """
+    __tablename__ = "entity_ledger_versions"
+
+    entity_id: Mapped[int] = mapped_column(Integer, ForeignKey("accounting_entities.id"), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=get_pst_now, onupdate=get_pst_now)
+
+
+class DashboardSnapshot(Base):
+    """
+    Precomputed /api/dashboard/metrics payload. Writers that change the inputs
+    (JE posting/approval, bank sync, transaction approvals) flag it stale in
+    their own transaction and bump the generation; the next read recomputes,
+    bumps the version when the payload changed, and clears the flag only if
+    no writer bumped the generation meanwhile. The version doubles as the
+    HTTP ETag
+    """
+    __tablename__ = "dashboard_snapshots"
+
+    scope: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    is_stale: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    generation: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    period_month: Mapped[Optional[str]] = mapped_column(String(7))  # YYYY-MM the monthly figures cover
+    computed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+
+
 class RecurringJournalTemplate(Base):
     """
     Templates for recurring entries (monthly rent, depreciation, etc.)
@@ -238,6 +238,40 @@ class BankTransaction(Base):
     )
 
 
+class MercurySyncState(Base):
+    """
+    Durable per-account Mercury sync cursor
+    high_water_mark bounds the next incremental fetch; cursor_* lets an
+    interrupted paginated run resume from the last committed page
+    """
+    __tablename__ = "mercury_sync_state"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    entity_id: Mapped[int] = mapped_column(Integer, ForeignKey("accounting_entities.id"), nullable=False)
+    mercury_account_id: Mapped[str] = mapped_column(String(100), nullable=False)
+
+    # Latest postedAt seen on a completed run
+    high_water_mark: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    last_transaction_id: Mapped[Optional[str]] = mapped_column(String(100))
+
+    # In-flight pagination (NULL when the last run completed)
+    cursor_start: Mapped[Optional[date]] = mapped_column(Date)
+    cursor_offset: Mapped[Optional[int]] = mapped_column(Integer)
+
+    last_sync_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    last_sync_status: Mapped[Optional[str]] = mapped_column(String(50))
+    # success, failed, in_progress
+    last_run_fetched: Mapped[int] = mapped_column(Integer, default=0)
+    last_run_inserted: Mapped[int] = mapped_column(Integer, default=0)
+    last_run_pages: Mapped[int] = mapped_column(Integer, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=get_pst_now, onupdate=get_pst_now)
+
+    __table_args__ = (
+        UniqueConstraint("entity_id", "mercury_account_id", name="uq_mercury_sync_state_account"),
+    )
+
+
 class BankTransactionMatch(Base):
     """
     Many-to-many relationship between bank transactions and journal entries
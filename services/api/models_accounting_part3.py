@@ -433,7 +433,7 @@ class ConsolidatedFinancialStatement(Base):
     __table_args__ = (
         Index("idx_consol_period", "fiscal_year", "fiscal_period"),
         Index("idx_consol_status", "status"),
-        UniqueConstraint("fiscal_year", "fiscal_period", "period_type"),
+        UniqueConstraint("parent_entity_id", "period_type", "as_of_date", name="uq_consol_group_period"),
     )
 
 
@@ -476,25 +476,28 @@ class TrialBalance(Base):
 class FinancialStatementCache(Base):
     """
     Generated financial statements cache
-    Performance optimization for repeated access
+    Performance optimization for repeated access; a row is served only while
+    ledger_version matches the entity's current EntityLedgerVersion
     """
     __tablename__ = "financial_statement_cache"
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     entity_id: Mapped[int] = mapped_column(Integer, ForeignKey("accounting_entities.id"))
-    period_id: Mapped[int] = mapped_column(Integer, ForeignKey("accounting_periods.id"))
+    period_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("accounting_periods.id"))
+    period_end_date: Mapped[date] = mapped_column(Date, nullable=False)
     
     statement_type: Mapped[str] = mapped_column(String(50), nullable=False)
-    # balance_sheet, income_statement, cash_flow, equity, comprehensive_income, notes
+    # balance_sheet, income_statement, cash_flow, equity, comprehensive_income, notes, all_statements
     statement_data: Mapped[dict] = mapped_column(JSON, nullable=False)
+    ledger_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     
     is_consolidated: Mapped[bool] = mapped_column(Boolean, default=False)
-    created_by_id: Mapped[int] = mapped_column(Integer, ForeignKey("partners.id"))
+    created_by_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("partners.id"))
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     
     __table_args__ = (
-        Index("idx_fs_cache_entity_period", "entity_id", "period_id"),
+        Index("idx_fs_cache_entity_period", "entity_id", "period_end_date"),
         Index("idx_fs_cache_type", "statement_type"),
-        UniqueConstraint("entity_id", "period_id", "statement_type", "is_consolidated"),
+        UniqueConstraint("entity_id", "period_end_date", "statement_type", "is_consolidated"),
     )
 
@@ -0,0 +1,138 @@
+"""
+Partner identity resolution for auth dependencies.
+
+Maps a login email (legacy JWT `sub`) or a Clerk subject to the partner record
+through an in-process TTL cache backed by the pooled SQLAlchemy session, so
+authenticated requests do not open a database connection (or call Clerk) each
+time. Entries are dropped whenever a Partners row is inserted, updated or
+deleted through the ORM; raw-SQL writers call invalidate_partner().
+
+Author: NGI Capital Development Team
+Date: December 2025
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect, text as sa_text
+
+from .models import Partners
+from .diagnostics import register_stats
+
+logger = logging.getLogger(__name__)
+
+PARTNER_CACHE_TTL_SECONDS = int(os.getenv("PARTNER_CACHE_TTL", "300"))
+# Unknown emails are cached briefly so dev/test fallbacks stay cheap
+PARTNER_NEGATIVE_TTL_SECONDS = 30
+
+# lower(email) -> (expires_at, partner dict or None)
+_by_email: Dict[str, Tuple[float, Optional[Dict[str, Any]]]] = {}
+# Clerk subject -> (expires_at, lower(email))
+_email_by_subject: Dict[str, Tuple[float, str]] = {}
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def get_partner_cache_stats() -> Dict[str, int]:
+    return {**_stats, "cached_partners": len(_by_email), "cached_subjects": len(_email_by_subject)}
+
+
+register_stats("partner_identity", get_partner_cache_stats)
+
+
+def invalidate_partner(email: Optional[str] = None) -> None:
+    """Drop one partner (by email) or, with no email, the whole cache"""
+    with _lock:
+        _stats["invalidations"] += 1
+        if email is None:
+            _by_email.clear()
+            _email_by_subject.clear()
+            return
+        key = email.strip().lower()
+        _by_email.pop(key, None)
+        for sub in [s for s, (_, e) in _email_by_subject.items() if e == key]:
+            _email_by_subject.pop(sub, None)
+
+
+def _load_partner(db, email: str) -> Optional[Dict[str, Any]]:
+    row = db.execute(
+        sa_text(
+            "SELECT id, name, email, ownership_percentage FROM partners "
+            "WHERE lower(email) = :email AND is_active = 1"
+        ),
+        {"email": email},
+    ).fetchone()
+    if not row:
+        return None
+    return {
+        "id": row[0],
+        "name": row[1],
+        "email": row[2],
+        "ownership_percentage": float(row[3] or 0),
+    }
+
+
+def resolve_partner_by_email(email: str, db=None) -> Optional[Dict[str, Any]]:
+    """Active partner for an email, from cache or one pooled-session query"""
+    if not email:
+        return None
+    key = email.strip().lower()
+    hit = _by_email.get(key)
+    if hit and hit[0] > time.time():
+        _stats["hits"] += 1
+        return dict(hit[1]) if hit[1] else None
+    _stats["misses"] += 1
+
+    owns_session = db is None
+    try:
+        if owns_session:
+            from .database import get_session_factory
+            db = get_session_factory()()
+        partner = _load_partner(db, key)
+    except Exception as e:
+        # Missing table (fresh dev DB) behaves like an unknown partner
+        logger.debug("Partner lookup failed for %s: %s", key, str(e))
+        partner = None
+    finally:
+        if owns_session and db is not None:
+            db.close()
+
+    ttl = PARTNER_CACHE_TTL_SECONDS if partner else PARTNER_NEGATIVE_TTL_SECONDS
+    with _lock:
+        _by_email[key] = (time.time() + ttl, partner)
+    return dict(partner) if partner else None
+
+
+async def resolve_partner_for_clerk(subject: str, email_hint: str = "") -> Tuple[str, Optional[Dict[str, Any]]]:
+    """(email, partner) for a Clerk subject; Clerk is only asked once per TTL"""
+    email = (email_hint or "").strip().lower()
+    if "@" not in email and subject:
+        hit = _email_by_subject.get(subject)
+        if hit and hit[0] > time.time():
+            email = hit[1]
+        else:
+            from .clerk_auth import fetch_clerk_user_email_async
+            email = (await fetch_clerk_user_email_async(subject) or "").strip().lower()
+    if subject and "@" in email:
+        with _lock:
+            _email_by_subject[subject] = (time.time() + PARTNER_CACHE_TTL_SECONDS, email)
+    if "@" not in email:
+        return email, None
+    return email, resolve_partner_by_email(email)
+
+
+def _on_partner_change(mapper, connection, target) -> None:
+    invalidate_partner(getattr(target, "email", None))
+    # An email change must also evict the old address
+    try:
+        for old_email in inspect(target).attrs.email.history.deleted or ():
+            invalidate_partner(old_email)
+    except Exception:
+        pass
+
+
+for _evt in ("after_insert", "after_update", "after_delete"):
+    event.listen(Partners, _evt, _on_partner_change)
@@ -6,7 +6,7 @@ Author: NGI Capital Development Team
 Date: October 3, 2025
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, func, desc
 from typing import List, Optional
@@ -25,8 +25,12 @@ from ..models_accounting_part2 import (
 )
 # Import Mercury service functions
 # Updated services: use the implemented Mercury and matching services
-from ..services.mercury_sync_service import MercurySyncService
+from ..services.mercury_sync_service import MercurySyncService, SyncAlreadyRunning, mercury_sync_guard
+from ..services.dashboard_snapshot import mark_dashboard_stale
 from ..services.transaction_matching_service import TransactionMatchingService
+from ..services.bank_auto_match_job import (
+    create_auto_match_job, get_auto_match_job, run_auto_match_job
+)
 # Import Bank Reconciliation Service
 from ..services.bank_reconciliation_service import BankReconciliationService
 import logging
@@ -247,7 +251,11 @@ async def sync_transactions(
             raise HTTPException(status_code=404, detail="Bank account not found")
 
         service = MercurySyncService(db)
-        result = await service.sync_transactions(account_row.entity_id, days_back=request.days_back or 30)
+        try:
+            with mercury_sync_guard(account_row.entity_id, service.account_id):
+                result = await service.sync_transactions(account_row.entity_id, days_back=request.days_back or 30)
+        except SyncAlreadyRunning as e:
+            raise HTTPException(status_code=409, detail=str(e))
 
         # Refresh balances from Mercury and persist
         try:
@@ -257,6 +265,7 @@ async def sync_transactions(
                 account_row.available_balance = Decimal(str(details.get("availableBalance", account_row.available_balance or 0)))
                 account_row.last_sync_at = get_pst_now()
                 account_row.last_sync_status = "success"
+                await mark_dashboard_stale(db)
                 await db.commit()
         except Exception as _:
             # Non-fatal: keep sync result even if balance refresh fails
@@ -275,24 +284,54 @@ async def sync_transactions(
 @router.post("/accounts/{account_id}/auto-match")
 async def auto_match(
     account_id: int,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Placeholder auto-match using TransactionMatchingService suggestions.
-    Currently returns counts without performing writes.
+    Start a bulk auto-match job for the account's unmatched transactions.
+    Returns a job id immediately; poll /auto-match/jobs/{job_id} for progress.
+    """
+    bank_account = await db.get(BankAccount, account_id)
+    if not bank_account:
+        raise HTTPException(status_code=404, detail="Bank account not found")
+
+    job = create_auto_match_job(account_id)
+    background_tasks.add_task(run_auto_match_job, job["job_id"])
+    return {
+        "success": True,
+        "message": "Auto-match started",
+        "job_id": job["job_id"],
+        "status": job["status"],
+    }
+
+
+@router.get("/accounts/{account_id}/auto-match/jobs/{job_id}")
+async def get_auto_match_job_status(account_id: int, job_id: str):
+    """Progress and throughput of an auto-match job"""
+    job = get_auto_match_job(job_id)
+    if not job or job["bank_account_id"] != account_id:
+        raise HTTPException(status_code=404, detail="Auto-match job not found")
+    return job
+
+
+@router.get("/accounts/{account_id}/auto-match/suggestions")
+async def auto_match_suggestions(
+    account_id: int,
+    time_budget_ms: int = Query(2000, ge=100, le=30000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Document -> transaction suggestions using TransactionMatchingService's
+    bounded matcher. Does not perform writes.
     """
     try:
-        # Count unmatched transactions as a health check
-        result = await db.execute(
-            select(func.count(BankTransaction.id)).where(
-                and_(
-                    BankTransaction.bank_account_id == account_id,
-                    BankTransaction.status == "unmatched"
-                )
-            )
-        )
-        unmatched = int(result.scalar() or 0)
-        return {"success": True, "matched": 0, "unmatched": unmatched}
+        service = TransactionMatchingService(db)
+        result = await service.suggest_matches_for_account(account_id, time_budget_ms=time_budget_ms)
+        if not result.get("success"):
+            raise HTTPException(status_code=404, detail=result.get("message", "Bank account not found"))
+        return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Auto-match failed: {str(e)}")
 
@@ -6,14 +6,17 @@ Multi-entity financial consolidation with intercompany eliminations
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, or_, func
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 
+from ..auth_deps import require_clerk_user as _require_clerk_user
 from ..database_async import get_async_db
-from ..models_accounting import AccountingEntity, ChartOfAccounts, JournalEntry, JournalEntryLine
+from ..models_accounting import AccountingEntity
 from ..models_accounting_part3 import IntercompanyTransaction, ConsolidatedFinancialStatement
+from ..partner_identity import resolve_partner_by_email
+from ..services.consolidation_engine import ConsolidationEngine
 
 router = APIRouter(prefix="/accounting/consolidated-reporting", tags=["accounting-consolidated"])
 
@@ -69,131 +72,54 @@ async def generate_consolidated_financials(
     period_start: str,
     period_end: str,
     parent_entity_id: int,
-    include_subsidiaries: List[int],
+    include_subsidiaries: Optional[List[int]] = None,
+    user=Depends(_require_clerk_user),
     db: AsyncSession = Depends(get_async_db)
 ):
     """
     Generate consolidated financial statements
-    Combines parent + all subsidiaries with intercompany eliminations
+    Combines parent + all subsidiaries with intercompany eliminations.
+    Without include_subsidiaries the whole entity_relationships tree under
+    the parent is consolidated.
     """
-    period_start_date = datetime.fromisoformat(period_start)
-    period_end_date = datetime.fromisoformat(period_end)
-    
-    # Get parent entity
-    parent_stmt = select(AccountingEntity).where(AccountingEntity.id == parent_entity_id)
-    parent_result = await db.execute(parent_stmt)
-    parent_entity = parent_result.scalar_one_or_none()
+    try:
+        period_start_date = date.fromisoformat(period_start)
+        period_end_date = date.fromisoformat(period_end)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
+    parent_entity = await db.get(AccountingEntity, parent_entity_id)
     if not parent_entity:
         raise HTTPException(status_code=404, detail="Parent entity not found")
-    
-    # Get all entities to consolidate
-    all_entity_ids = [parent_entity_id] + include_subsidiaries
-    
-    # Build consolidated trial balance
-    consolidated_accounts = {}
-    
-    for entity_id in all_entity_ids:
-        # Get all journal entries for this entity in the period
-        entries_stmt = select(JournalEntry).where(
-            and_(
-                JournalEntry.entity_id == entity_id,
-                JournalEntry.entry_date >= period_start_date,
-                JournalEntry.entry_date <= period_end_date,
-                JournalEntry.status == "Posted"
-            )
-        )
-        entries_result = await db.execute(entries_stmt)
-        entries = entries_result.scalars().all()
-        
-        # Aggregate by account
-        for entry in entries:
-            lines_stmt = select(JournalEntryLine).where(JournalEntryLine.journal_entry_id == entry.id)
-            lines_result = await db.execute(lines_stmt)
-            lines = lines_result.scalars().all()
-            
-            for line in lines:
-                account_stmt = select(ChartOfAccounts).where(ChartOfAccounts.id == line.account_id)
-                account_result = await db.execute(account_stmt)
-                account = account_result.scalar_one_or_none()
-                
-                if account:
-                    account_key = f"{account.account_number}_{account.account_name}"
-                    
-                    if account_key not in consolidated_accounts:
-                        consolidated_accounts[account_key] = {
-                            "account_number": account.account_number,
-                            "account_name": account.account_name,
-                            "account_type": account.account_type,
-                            "debit": Decimal("0.00"),
-                            "credit": Decimal("0.00")
-                        }
-                    
-                    if line.debit_amount:
-                        consolidated_accounts[account_key]["debit"] += line.debit_amount
-                    if line.credit_amount:
-                        consolidated_accounts[account_key]["credit"] += line.credit_amount
-    
-    # Get intercompany transactions for elimination
-    ic_stmt = select(IntercompanyTransaction).where(
-        and_(
-            IntercompanyTransaction.transaction_date >= period_start_date,
-            IntercompanyTransaction.transaction_date <= period_end_date,
-            or_(
-                IntercompanyTransaction.source_entity_id.in_(all_entity_ids),
-                IntercompanyTransaction.target_entity_id.in_(all_entity_ids)
-            )
+
+    partner = resolve_partner_by_email((user or {}).get("email") or "")
+    if partner is None:
+        raise HTTPException(status_code=403, detail="Only partners can generate consolidated financials")
+    
+    try:
+        result = await ConsolidationEngine(db).consolidate(
+            parent_entity_id,
+            period_start_date,
+            period_end_date,
+            entity_ids=include_subsidiaries,
+            generated_by_id=partner["id"],
         )
-    )
-    ic_result = await db.execute(ic_stmt)
-    ic_transactions = ic_result.scalars().all()
-    
-    total_eliminations = sum(ic.transaction_amount for ic in ic_transactions)
-    
-    # Create consolidated financial statement record
-    consolidated_statement = ConsolidatedFinancialStatement(
-        parent_entity_id=parent_entity_id,
-        period_start=period_start_date,
-        period_end=period_end_date,
-        included_entities=all_entity_ids,
-        consolidation_method="Full Consolidation",
-        intercompany_eliminations=total_eliminations,
-        consolidated_data={
-            "accounts": {k: {
-                "account_number": v["account_number"],
-                "account_name": v["account_name"],
-                "account_type": v["account_type"],
-                "debit": float(v["debit"]),
-                "credit": float(v["credit"]),
-                "balance": float(v["debit"] - v["credit"])
-            } for k, v in consolidated_accounts.items()},
-            "eliminations": {
-                "intercompany_revenue": float(sum(ic.transaction_amount for ic in ic_transactions if ic.transaction_type == "Revenue")),
-                "intercompany_expenses": float(sum(ic.transaction_amount for ic in ic_transactions if ic.transaction_type == "Expense")),
-                "intercompany_receivables": float(sum(ic.transaction_amount for ic in ic_transactions if ic.transaction_type == "Receivable")),
-                "intercompany_payables": float(sum(ic.transaction_amount for ic in ic_transactions if ic.transaction_type == "Payable"))
-            }
-        },
-        generated_by=current_user["email"],
-        generated_at=datetime.now()
-    )
-    db.add(consolidated_statement)
-    await db.commit()
-    await db.refresh(consolidated_statement)
-    
-    # Build financial statements from consolidated data
-    balance_sheet = _build_balance_sheet(consolidated_accounts)
-    income_statement = _build_income_statement(consolidated_accounts)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     
+    balance_sheet = result["balance_sheet"]
+    income_statement = result["income_statement"]
     return {
         "success": True,
-        "consolidated_statement_id": consolidated_statement.id,
+        "consolidated_statement_id": result["consolidated_statement_id"],
         "period": {
             "start": period_start,
             "end": period_end
         },
-        "entities_included": all_entity_ids,
-        "intercompany_eliminations": float(total_eliminations),
+        "entities_included": result["entities_included"],
+        "intercompany_eliminations": result["intercompany_eliminations"],
+        "unmatched_intercompany": result["unmatched_intercompany"],
+        "accounts": result["accounts"],
         "balance_sheet": balance_sheet,
         "income_statement": income_statement,
         "summary": {
@@ -219,8 +145,8 @@ async def get_intercompany_transactions(
     if entity_id:
         query = query.where(
             or_(
-                IntercompanyTransaction.source_entity_id == entity_id,
-                IntercompanyTransaction.target_entity_id == entity_id
+                IntercompanyTransaction.from_entity_id == entity_id,
+                IntercompanyTransaction.to_entity_id == entity_id
             )
         )
     
@@ -237,18 +163,18 @@ async def get_intercompany_transactions(
             {
                 "id": ic.id,
                 "transaction_date": ic.transaction_date.isoformat(),
-                "source_entity_id": ic.source_entity_id,
-                "target_entity_id": ic.target_entity_id,
+                "source_entity_id": ic.from_entity_id,
+                "target_entity_id": ic.to_entity_id,
                 "transaction_type": ic.transaction_type,
-                "transaction_amount": float(ic.transaction_amount),
-                "description": ic.transaction_description,
+                "transaction_amount": float(ic.amount),
+                "description": ic.description,
                 "is_eliminated": ic.is_eliminated,
                 "elimination_entry_id": ic.elimination_entry_id
             }
             for ic in transactions
         ],
         "total_transactions": len(transactions),
-        "total_amount": float(sum(ic.transaction_amount for ic in transactions))
+        "total_amount": float(sum(ic.amount for ic in transactions))
     }
 
 
@@ -265,7 +191,7 @@ async def get_consolidated_history(
     if parent_entity_id:
         query = query.where(ConsolidatedFinancialStatement.parent_entity_id == parent_entity_id)
     
-    query = query.order_by(ConsolidatedFinancialStatement.period_end.desc())
+    query = query.order_by(ConsolidatedFinancialStatement.as_of_date.desc())
     
     result = await db.execute(query)
     statements = result.scalars().all()
@@ -275,65 +201,18 @@ async def get_consolidated_history(
             {
                 "id": stmt.id,
                 "parent_entity_id": stmt.parent_entity_id,
-                "period_start": stmt.period_start.isoformat(),
-                "period_end": stmt.period_end.isoformat(),
-                "included_entities": stmt.included_entities,
-                "consolidation_method": stmt.consolidation_method,
-                "intercompany_eliminations": float(stmt.intercompany_eliminations) if stmt.intercompany_eliminations else 0,
-                "generated_by": stmt.generated_by,
+                "period_start": (stmt.elimination_entries_json or {}).get("period_start"),
+                "period_end": stmt.as_of_date.isoformat(),
+                "period_type": stmt.period_type,
+                "included_entities": [stmt.parent_entity_id] + [
+                    int(e) for e in (stmt.subsidiary_entity_ids or "").split(",") if e
+                ],
+                "status": stmt.status,
+                "intercompany_eliminations": float(stmt.total_eliminations) if stmt.total_eliminations else 0,
+                "generated_by_id": stmt.generated_by_id,
                 "generated_at": stmt.generated_at.isoformat()
             }
             for stmt in statements
         ],
         "total_statements": len(statements)
     }
-
-
-def _build_balance_sheet(accounts_dict):
-    """Helper to build balance sheet from account balances"""
-    assets = Decimal("0.00")
-    liabilities = Decimal("0.00")
-    equity = Decimal("0.00")
-    
-    for account_data in accounts_dict.values():
-        balance = account_data["debit"] - account_data["credit"]
-        account_type = account_data["account_type"]
-        
-        if account_type in ["Assets", "Current Assets", "Non-Current Assets"]:
-            assets += balance
-        elif account_type in ["Liabilities", "Current Liabilities", "Long-term Liabilities"]:
-            liabilities += balance
-        elif account_type in ["Equity", "Shareholders' Equity"]:
-            equity += balance
-    
-    return {
-        "total_assets": float(assets),
-        "total_liabilities": float(liabilities),
-        "total_equity": float(equity),
-        "balance_check": float(assets - liabilities - equity)
-    }
-
-
-def _build_income_statement(accounts_dict):
-    """Helper to build income statement from account balances"""
-    revenue = Decimal("0.00")
-    expenses = Decimal("0.00")
-    
-    for account_data in accounts_dict.values():
-        balance = account_data["credit"] - account_data["debit"]  # Revenue is credit normal
-        account_type = account_data["account_type"]
-        
-        if account_type == "Revenue":
-            revenue += balance
-        elif account_type in ["Operating Expenses", "Cost of Revenue", "Other Expenses"]:
-            expenses += abs(balance)
-    
-    net_income = revenue - expenses
-    
-    return {
-        "total_revenue": float(revenue),
-        "total_expenses": float(expenses),
-        "net_income": float(net_income),
-        "profit_margin": float((net_income / revenue * 100) if revenue > 0 else 0)
-    }
-
@@ -14,6 +14,7 @@ from decimal import Decimal
 from ..database_async import get_async_db
 from ..models_accounting import AccountingEntity, EntityRelationship
 from ..models_accounting_part3 import EntityConversion, EquityConversion
+from ..services.dashboard_snapshot import mark_dashboard_stale
 
 router = APIRouter(prefix="/accounting/entity-conversion", tags=["accounting-entity-conversion"])
 
@@ -82,6 +83,7 @@ async def start_entity_conversion(
     source_entity.metadata["conversion_status"] = "In Progress"
     source_entity.metadata["conversion_id"] = conversion.id
     source_entity.metadata["target_c_corp_id"] = new_entity.id
+    await mark_dashboard_stale(db)
     
     await db.commit()
     await db.refresh(conversion)
@@ -220,6 +222,7 @@ async def complete_conversion(
     for sub in subsidiaries:
         # Create new relationship under C-Corp
         sub.parent_entity_id = target_entity.id
+    await mark_dashboard_stale(db)
     
     await db.commit()
     
@@ -23,12 +23,17 @@ try:
 except ImportError:
     FinancialStatementGenerator = None
     GENERATOR_AVAILABLE = False
+from ..services.financial_statement_cache import FinancialStatementCacheService, cached_statement
 try:
-    from ..services.excel_export import ExcelFinancialStatementExporter
+    from ..services.excel_export import ExcelFinancialStatementExporter, render_financial_statements_workbook
     EXCEL_AVAILABLE = True
 except ImportError:
     ExcelFinancialStatementExporter = None
+    render_financial_statements_workbook = None
     EXCEL_AVAILABLE = False
+from ..services.document_rendering import (
+    XLSX_MEDIA_TYPE, RenderQueueFull, RenderTimeout, file_response, render_document
+)
 
 
 router = APIRouter(
@@ -126,9 +131,14 @@ async def generate_financial_statements(
     
     # Generate statements using real trial balance data
     if FinancialStatementGenerator:
-        generator = FinancialStatementGenerator(db, request.entity_id, period_end)
-        statements = await generator.generate_all_statements()
-        return statements
+        if not request.include_comparatives:
+            return await cached_statement(db, request.entity_id, period_end, "all_statements")
+        generator = FinancialStatementGenerator(
+            db, request.entity_id, period_end, include_comparatives=True
+        )
+        return await FinancialStatementCacheService(db).get_or_build(
+            request.entity_id, period_end, "all_statements_comparative", generator.generate_all_statements
+        )
     else:
         # Fallback: Generate from trial balance directly
         from sqlalchemy import text as sa_text
@@ -324,11 +334,8 @@ async def preview_financial_statements(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
-    # Generate statements
-    generator = FinancialStatementGenerator(db, entity_id, period_end)
-    statements = await generator.generate_all_statements()
-    
-    return statements
+    # Generate statements (served from cache while the ledger is unchanged)
+    return await cached_statement(db, entity_id, period_end, "all_statements")
 
 
 # ============================================================================
@@ -367,8 +374,7 @@ async def export_to_excel(
         # Fallback to simple statement generation
         statements = await _build_statements_from_trial_balance(db, entity_id, period_end)
     else:
-        generator = FinancialStatementGenerator(db, entity_id, period_end)
-        statements = await generator.generate_all_statements()
+        statements = await cached_statement(db, entity_id, period_end, "all_statements")
     
     # Export to Excel
     if not EXCEL_AVAILABLE or ExcelFinancialStatementExporter is None:
@@ -378,8 +384,9 @@ async def export_to_excel(
         )
     
     try:
-        exporter = ExcelFinancialStatementExporter(statements)
-        excel_file = exporter.generate_workbook()
+        workbook_path = await render_document(render_financial_statements_workbook, statements)
+    except (RenderQueueFull, RenderTimeout) as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -392,11 +399,7 @@ async def export_to_excel(
     filename = f"{entity_name}_Financial_Statements_{period_str}.xlsx"
     
     # Return as downloadable file
-    return StreamingResponse(
-        excel_file,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    return file_response(workbook_path, XLSX_MEDIA_TYPE, filename)
 
 
 # ============================================================================
@@ -603,8 +606,7 @@ async def get_balance_sheet(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format")
     
-    generator = FinancialStatementGenerator(db, entity_id, period_end)
-    balance_sheet = await generator.generate_balance_sheet()
+    balance_sheet = await cached_statement(db, entity_id, period_end, "balance_sheet")
     
     return {
         "entity_id": entity_id,
@@ -626,8 +628,7 @@ async def get_income_statement(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format")
     
-    generator = FinancialStatementGenerator(db, entity_id, period_end)
-    income_statement = await generator.generate_income_statement()
+    income_statement = await cached_statement(db, entity_id, period_end, "income_statement")
     
     return {
         "entity_id": entity_id,
@@ -738,18 +739,18 @@ async def create_investor_package(
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
     # Generate complete financial statements
-    generator = FinancialStatementGenerator(db, entity_id, period_end)
-    statements = await generator.generate_all_statements()
+    statements = await cached_statement(db, entity_id, period_end, "all_statements")
     
     # Export to professional Excel format
-    try:
-        exporter = ExcelFinancialStatementExporter(statements)
-        excel_file = exporter.generate_workbook()
-    except ImportError:
+    if not EXCEL_AVAILABLE:
         raise HTTPException(
             status_code=500,
             detail="Excel export requires openpyxl. Please install: pip install openpyxl"
         )
+    try:
+        workbook_path = await render_document(render_financial_statements_workbook, statements)
+    except (RenderQueueFull, RenderTimeout) as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -762,13 +763,8 @@ async def create_investor_package(
     filename = f"{entity_name}_Investor_Package_{period_str}.xlsx"
     
     # Return as downloadable file
-    return StreamingResponse(
-        excel_file,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}",
-            "X-Financial-Period": period_end_date,
-            "X-Entity-Name": entity.entity_name
-        }
-    )
+    return file_response(workbook_path, XLSX_MEDIA_TYPE, filename, headers={
+        "X-Financial-Period": period_end_date,
+        "X-Entity-Name": entity.entity_name
+    })
 
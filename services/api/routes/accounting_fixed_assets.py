@@ -3,7 +3,10 @@ Fixed Assets API Routes - ASC 360 Compliance
 Auto-detection, depreciation automation, and audit package generation
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import os
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func
 from typing import List, Optional
@@ -11,10 +14,13 @@ from datetime import date
 from decimal import Decimal
 from pydantic import BaseModel
 
+from ..auth_deps import require_clerk_user as _require_clerk_user
 from ..database_async import get_async_db
 from services.api.models_fixed_assets import FixedAsset, DepreciationEntry, AssetDisposal, AuditPackage
 from services.api.services.depreciation_service import DepreciationService
-from services.api.services.audit_package_generator import AuditPackageGenerator
+from services.api.services.audit_package_job import (
+    create_audit_package_job, get_audit_package_job, run_audit_package_job
+)
 from services.api.utils.datetime_utils import get_pst_now
 import logging
 
@@ -234,33 +240,73 @@ async def generate_monthly_depreciation(
 
 
 
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
 @router.post("/audit-package/generate")
 async def generate_audit_package(
     entity_id: int,
     year: int,
-    db: AsyncSession = Depends(get_async_db)
+    background_tasks: BackgroundTasks,
+    user=Depends(_require_clerk_user)
 ):
-    """Generate Big 4 audit package for fixed assets"""
+    """
+    Start a Big 4 audit package job for fixed assets.
+    Returns a job id immediately; poll /audit-package/jobs/{job_id} for per-sheet progress.
+    """
     user_email = user.get("email")
     
     # Validate user is authorized partner
     if user_email not in ["lwhitworth@ngicapitaladvisory.com", "anurmamade@ngicapitaladvisory.com"]:
         raise HTTPException(403, "Only partners can generate audit packages")
     
-    try:
-        filepath = await AuditPackageGenerator.generate_fixed_asset_audit_package(
-            entity_id, year, user_email, db
-        )
-        
-        return {
-            "message": "Audit package generated successfully",
-            "filepath": filepath,
-            "year": year,
-            "download_url": f"/api/accounting/fixed-assets/audit-package/download?filepath={filepath}"
-        }
-    except Exception as e:
-        logger.error(f"Failed to generate audit package: {e}")
-        raise HTTPException(500, f"Failed to generate audit package: {str(e)}")
+    job = create_audit_package_job(entity_id, year, user_email)
+    background_tasks.add_task(run_audit_package_job, job["job_id"])
+    return {
+        "message": "Audit package generation started",
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "year": year,
+        "status_url": f"/api/accounting/fixed-assets/audit-package/jobs/{job['job_id']}",
+        "download_url": f"/api/accounting/fixed-assets/audit-package/jobs/{job['job_id']}/download"
+    }
+
+
+@router.get("/audit-package/jobs/{job_id}")
+async def get_audit_package_job_status(job_id: str):
+    """Per-sheet progress of an audit package job"""
+    job = get_audit_package_job(job_id)
+    if not job:
+        raise HTTPException(404, "Audit package job not found")
+    job.pop("user_email", None)
+    return job
+
+
+@router.get("/audit-package/jobs/{job_id}/download")
+async def download_audit_package_job(job_id: str):
+    """Download a finished package; supports HTTP Range for resumable downloads"""
+    job = get_audit_package_job(job_id)
+    if not job:
+        raise HTTPException(404, "Audit package job not found")
+    if job["status"] != "completed":
+        raise HTTPException(409, f"Audit package is {job['status']}")
+    return _package_file_response(job["file_path"])
+
+
+@router.get("/audit-package/{package_id}/download")
+async def download_audit_package(package_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Download a previously generated package; supports HTTP Range"""
+    package = await db.get(AuditPackage, package_id)
+    if not package:
+        raise HTTPException(404, "Audit package not found")
+    return _package_file_response(package.file_path)
+
+
+def _package_file_response(filepath: str) -> FileResponse:
+    if not filepath or not os.path.exists(filepath):
+        raise HTTPException(404, "Audit package file no longer exists")
+    # FileResponse answers Range requests with 206 partial content
+    return FileResponse(filepath, media_type=XLSX_MEDIA_TYPE, filename=os.path.basename(filepath))
 
 
 @router.get("/audit-package/list")
@@ -288,7 +334,7 @@ async def list_audit_packages(
                 "total_net_book_value": float(p.total_net_book_value),
                 "generated_at": p.generated_at.isoformat(),
                 "generated_by_email": p.generated_by_email,
-                "download_url": f"/api/accounting/fixed-assets/audit-package/download?filepath={p.file_path}"
+                "download_url": f"/api/accounting/fixed-assets/audit-package/{p.id}/download"
             }
             for p in packages
         ]
@@ -2,13 +2,15 @@
 Minimal Journal Entries API (manual, dual-approval)
 ---------------------------------------------------
 Workflow: draft -> pending_first_approval -> pending_final_approval -> posted.
-Supports: create/update draft, list/get, submit, approve, reject, link document.
+Supports: create/update draft, list/get, submit, approve, reject, unpost, link document.
+Posting and unposting maintain the account balance ledger in the same transaction.
 No auto-JE creation. Includes ASC (primary_asc_topic) in responses.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, update, delete, and_, func
+from sqlalchemy.orm import Session
+from sqlalchemy import select, desc, update, delete, and_, or_, func
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional
 from datetime import date, datetime
@@ -18,15 +20,19 @@ import logging
 logger = logging.getLogger(__name__)
 
 from ..database_async import get_async_db
+from ..schema_bootstrap import schema_ensurer
 from ..models_accounting import (
     JournalEntry, JournalEntryLine, ChartOfAccounts,
     AccountingEntity, JournalEntryAuditLog, JournalEntryAttachment
 )
 from ..models_accounting_part2 import AccountingDocument
 from ..models_ar import Invoice
+from ..models_period_close import PeriodLock
 from ..models import Partners as Partner
 from ..utils.datetime_utils import get_pst_now
 from ..services.xbrl_taxonomy_service import get_xbrl_service
+from ..services.account_balance_ledger import AccountBalanceLedger
+from ..services.dashboard_snapshot import mark_dashboard_stale
 import os
 
 
@@ -129,82 +135,132 @@ async def _generate_entry_number(db: AsyncSession, fiscal_year: int) -> str:
     count = len(res.scalars().all())
     return f"JE-{fiscal_year}-{(count + 1):06d}"
 
-async def _build_line_responses(db: AsyncSession, je_id: int) -> List[JELineResponse]:
-    res = await db.execute(select(JournalEntryLine).where(JournalEntryLine.journal_entry_id == je_id).order_by(JournalEntryLine.line_number))
-    lines = res.scalars().all()
-    out: List[JELineResponse] = []
-    for ln in lines:
-        acc = await db.execute(select(ChartOfAccounts).where(ChartOfAccounts.id == ln.account_id))
-        acc_row = acc.scalar_one_or_none()
-        out.append(JELineResponse(
-            id=ln.id,
-            line_number=ln.line_number,
-            account_id=ln.account_id,
-            account_number=acc_row.account_number if acc_row else "",
-            account_name=acc_row.account_name if acc_row else "",
-            debit_amount=float(ln.debit_amount),
-            credit_amount=float(ln.credit_amount),
-            description=ln.description,
-            primary_asc_topic=(ln.primary_asc_topic or (acc_row.primary_asc_topic if acc_row else None)),
-            xbrl_element_name=ln.xbrl_element_name,
-            xbrl_standard_label=ln.xbrl_standard_label,
+# Keep IN (...) lists under SQLite's bound-parameter limit
+_HYDRATE_CHUNK = 500
+
+
+def _chunks(ids: List[int]):
+    for i in range(0, len(ids), _HYDRATE_CHUNK):
+        yield ids[i:i + _HYDRATE_CHUNK]
+
+
+async def _build_responses(db: AsyncSession, entries: List[JournalEntry]) -> List[JEResponse]:
+    """
+    Bulk-hydrate journal entry responses.
+    Loads entities, partners, lines (+ accounts) and attachments with one
+    set-based query each (per chunk of ids) instead of per entry / per line.
+    """
+    if not entries:
+        return []
+    je_ids = [e.id for e in entries]
+
+    entity_ids = list({e.entity_id for e in entries})
+    entity_names = {}
+    for chunk in _chunks(entity_ids):
+        res = await db.execute(
+            select(AccountingEntity.id, AccountingEntity.entity_name).where(AccountingEntity.id.in_(chunk))
+        )
+        entity_names.update({row.id: row.entity_name for row in res})
+
+    partner_ids = list({
+        pid for e in entries
+        for pid in (e.created_by_id, e.first_approved_by_id, e.final_approved_by_id)
+        if pid
+    })
+    partner_names = {}
+    for chunk in _chunks(partner_ids):
+        res = await db.execute(select(Partner.id, Partner.name).where(Partner.id.in_(chunk)))
+        partner_names.update({row.id: row.name for row in res})
+
+    lines_by_je = {je_id: [] for je_id in je_ids}
+    for chunk in _chunks(je_ids):
+        res = await db.execute(
+            select(JournalEntryLine, ChartOfAccounts)
+            .outerjoin(ChartOfAccounts, ChartOfAccounts.id == JournalEntryLine.account_id)
+            .where(JournalEntryLine.journal_entry_id.in_(chunk))
+            .order_by(JournalEntryLine.journal_entry_id, JournalEntryLine.line_number)
+        )
+        for ln, acc_row in res:
+            lines_by_je[ln.journal_entry_id].append(JELineResponse(
+                id=ln.id,
+                line_number=ln.line_number,
+                account_id=ln.account_id,
+                account_number=acc_row.account_number if acc_row else "",
+                account_name=acc_row.account_name if acc_row else "",
+                debit_amount=float(ln.debit_amount),
+                credit_amount=float(ln.credit_amount),
+                description=ln.description,
+                primary_asc_topic=(ln.primary_asc_topic or (acc_row.primary_asc_topic if acc_row else None)),
+                xbrl_element_name=ln.xbrl_element_name,
+                xbrl_standard_label=ln.xbrl_standard_label,
+            ))
+
+    attachments_by_je = {je_id: [] for je_id in je_ids}
+    for chunk in _chunks(je_ids):
+        res = await db.execute(
+            select(JournalEntryAttachment, AccountingDocument)
+            .join(AccountingDocument, AccountingDocument.id == JournalEntryAttachment.document_id)
+            .where(JournalEntryAttachment.journal_entry_id.in_(chunk))
+            .order_by(
+                JournalEntryAttachment.journal_entry_id,
+                JournalEntryAttachment.display_order,
+                JournalEntryAttachment.id
+            )
+        )
+        for att, doc in res:
+            attachments_by_je[att.journal_entry_id].append({
+                "document_id": att.document_id,
+                "attachment_id": att.id,
+                "is_primary": att.is_primary,
+                "display_order": att.display_order,
+                "filename": getattr(doc, "filename", None) or getattr(doc, "original_name", None),
+                "original_name": getattr(doc, "original_name", None) or getattr(doc, "filename", None),
+                "category": getattr(doc, "category", None),
+                "upload_date": getattr(doc, "upload_date", None) or getattr(doc, "created_at", None),
+            })
+
+    out: List[JEResponse] = []
+    for je in entries:
+        lines = lines_by_je[je.id]
+        out.append(JEResponse(
+            id=je.id,
+            entry_number=je.entry_number,
+            entity_id=je.entity_id,
+            entity_name=entity_names.get(je.entity_id) or "Unknown Entity",
+            entry_date=je.entry_date,
+            fiscal_year=je.fiscal_year,
+            fiscal_period=je.fiscal_period,
+            entry_type=je.entry_type,
+            memo=je.memo,
+            reference=je.reference,
+            status=je.status,
+            workflow_stage=je.workflow_stage,
+            created_by_name=partner_names.get(je.created_by_id) or "",
+            created_at=je.created_at,
+            first_approved_by_name=partner_names.get(je.first_approved_by_id),
+            final_approved_by_name=partner_names.get(je.final_approved_by_id),
+            posted_at=je.posted_at,
+            is_locked=je.is_locked,
+            document_id=je.document_id,
+            lines=lines,
+            total_debits=float(sum(l.debit_amount for l in lines)),
+            total_credits=float(sum(l.credit_amount for l in lines)),
+            attachments=attachments_by_je[je.id],
+            extracted_data=getattr(je, "extracted_data", None),
         ))
     return out
 
 async def _build_response(db: AsyncSession, je: JournalEntry) -> JEResponse:
-    en = await db.execute(select(AccountingEntity.entity_name).where(AccountingEntity.id == je.entity_id))
-    entity_name = en.scalar_one_or_none() or "Unknown Entity"
-    created_by = await _get_partner_name(db, je.created_by_id)
-    first_name = await _get_partner_name(db, je.first_approved_by_id)
-    final_name = await _get_partner_name(db, je.final_approved_by_id)
-    lines = await _build_line_responses(db, je.id)
-    # Attachments
-    atts_res = await db.execute(
-        select(JournalEntryAttachment, AccountingDocument)
-        .join(AccountingDocument, AccountingDocument.id == JournalEntryAttachment.document_id)
-        .where(JournalEntryAttachment.journal_entry_id == je.id)
-        .order_by(JournalEntryAttachment.display_order, JournalEntryAttachment.id)
-    )
-    attachments = []
-    for att, doc in atts_res:
-        attachments.append({
-            "document_id": att.document_id,
-            "attachment_id": att.id,
-            "is_primary": att.is_primary,
-            "display_order": att.display_order,
-            "filename": getattr(doc, "filename", None) or getattr(doc, "original_name", None),
-            "original_name": getattr(doc, "original_name", None) or getattr(doc, "filename", None),
-            "category": getattr(doc, "category", None),
-            "upload_date": getattr(doc, "upload_date", None) or getattr(doc, "created_at", None),
-        })
-    total_debits = sum(l.debit_amount for l in lines)
-    total_credits = sum(l.credit_amount for l in lines)
-    return JEResponse(
-        id=je.id,
-        entry_number=je.entry_number,
-        entity_id=je.entity_id,
-        entity_name=entity_name,
-        entry_date=je.entry_date,
-        fiscal_year=je.fiscal_year,
-        fiscal_period=je.fiscal_period,
-        entry_type=je.entry_type,
-        memo=je.memo,
-        reference=je.reference,
-        status=je.status,
-        workflow_stage=je.workflow_stage,
-        created_by_name=created_by or "",
-        created_at=je.created_at,
-        first_approved_by_name=first_name,
-        final_approved_by_name=final_name,
-        posted_at=je.posted_at,
-        is_locked=je.is_locked,
-        document_id=je.document_id,
-        lines=lines,
-        total_debits=float(total_debits),
-        total_credits=float(total_credits),
-        attachments=attachments,
-        extracted_data=getattr(je, "extracted_data", None),
-    )
+    return (await _build_responses(db, [je]))[0]
+
+
+def _parse_cursor(cursor: str):
+    """Keyset cursor format: '<entry_date ISO>:<id>'"""
+    try:
+        raw_date, raw_id = cursor.rsplit(":", 1)
+        return date.fromisoformat(raw_date), int(raw_id)
+    except (ValueError, AttributeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 def _validate_lines_basic(lines: List[JELineInput]):
     if len(lines) < 2:
@@ -224,14 +280,38 @@ def _validate_lines_basic(lines: List[JELineInput]):
 
 @router.get("/")
 async def list_journal_entries(
+    response: Response,
     entity_id: int = Query(...),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from X-Next-Cursor"),
     db: AsyncSession = Depends(get_async_db)
 ):
-    res = await db.execute(
-        select(JournalEntry).where(JournalEntry.entity_id == entity_id).order_by(desc(JournalEntry.entry_date), desc(JournalEntry.id))
-    )
-    entries = res.scalars().all()
-    return [await _build_response(db, e) for e in entries]
+    """
+    List journal entries newest first.
+    Without `limit` the full list is returned (legacy behaviour). With `limit`,
+    pages are keyed on (entry_date, id); the next page's cursor is returned in
+    the X-Next-Cursor header (absent on the last page).
+    """
+    query = select(JournalEntry).where(JournalEntry.entity_id == entity_id)
+    if cursor:
+        cursor_date, cursor_id = _parse_cursor(cursor)
+        query = query.where(
+            or_(
+                JournalEntry.entry_date < cursor_date,
+                and_(JournalEntry.entry_date == cursor_date, JournalEntry.id < cursor_id)
+            )
+        )
+    query = query.order_by(desc(JournalEntry.entry_date), desc(JournalEntry.id))
+    if limit:
+        query = query.limit(limit + 1)
+
+    res = await db.execute(query)
+    entries = list(res.scalars().all())
+    if limit and len(entries) > limit:
+        entries = entries[:limit]
+        last = entries[-1]
+        response.headers["X-Next-Cursor"] = f"{last.entry_date.isoformat()}:{last.id}"
+    return await _build_responses(db, entries)
 
 
 @router.get("/{entry_id}")
@@ -550,6 +630,7 @@ async def submit_for_approval(entry_id: int, db: AsyncSession = Depends(get_asyn
         ))
     except Exception:
         pass
+    await mark_dashboard_stale(db)
     await db.commit()
     return {"success": True, "message": "Submitted for approval", "status": je.status, "workflow_stage": je.workflow_stage}
 
@@ -632,6 +713,7 @@ async def approve_and_post(entry_id: int, body: ApprovalBody | None = None, db:
             ))
         except Exception:
             pass
+        await AccountBalanceLedger(db).post_entry(je)
         await db.commit()
         return {"success": True, "message": "Entry approved and posted", "status": je.status, "workflow_stage": je.workflow_stage}
 
@@ -665,10 +747,57 @@ async def post_entry(entry_id: int, db: AsyncSession = Depends(get_async_db)):
         ))
     except Exception:
         pass
+    await AccountBalanceLedger(db).post_entry(je)
     await db.commit()
     return {"success": True, "message": "Entry posted", "status": je.status, "workflow_stage": je.workflow_stage}
 
 
+class UnpostBody(BaseModel):
+    reason: Optional[str] = None
+
+
+@router.post("/{entry_id}/unpost")
+async def unpost_entry(entry_id: int, body: UnpostBody | None = None, db: AsyncSession = Depends(get_async_db)):
+    """Return a posted entry to draft and back its amounts out of the balance ledger"""
+    res = await db.execute(select(JournalEntry).where(JournalEntry.id == entry_id))
+    je = res.scalar_one_or_none()
+    if not je:
+        raise HTTPException(status_code=404, detail="Journal entry not found")
+    if je.status != "posted":
+        raise HTTPException(status_code=400, detail=f"Cannot unpost entry with status: {je.status}")
+    lock = await db.execute(
+        select(PeriodLock.id).where(
+            and_(
+                PeriodLock.entity_id == je.entity_id,
+                PeriodLock.is_locked == True,
+                PeriodLock.lock_start_date <= je.entry_date,
+                PeriodLock.lock_end_date >= je.entry_date,
+            )
+        ).limit(1)
+    )
+    if lock.scalar_one_or_none() is not None:
+        raise HTTPException(status_code=400, detail="Entry falls in a locked period; reopen the period first")
+
+    await AccountBalanceLedger(db).unpost_entry(je)
+    je.status = "draft"
+    je.workflow_stage = 0
+    je.posted_at = None
+    je.is_locked = False
+    je.updated_at = get_pst_now()
+    try:
+        db.add(JournalEntryAuditLog(
+            journal_entry_id=je.id,
+            action="unposted",
+            performed_by_id=None,
+            performed_at=get_pst_now(),
+            comment=(body.reason if body else None) or "unposted"
+        ))
+    except Exception:
+        pass
+    await db.commit()
+    return {"success": True, "message": "Entry unposted", "status": je.status, "workflow_stage": je.workflow_stage}
+
+
 class RejectBody(BaseModel):
     reason: Optional[str] = None
 
@@ -696,6 +825,7 @@ async def reject_entry(entry_id: int, body: RejectBody, db: AsyncSession = Depen
         ))
     except Exception:
         pass
+    await mark_dashboard_stale(db)
     await db.commit()
     return {"success": True, "message": "Entry rejected", "status": je.status, "workflow_stage": je.workflow_stage}
 
@@ -817,13 +947,9 @@ async def xbrl_element(name: str = Query(...)):
 
 # ---------------------- Backfill Attachments (Phase 0) ----------------------
 
-async def _ensure_attachments_table(db: AsyncSession):
-    def _create_table(sync_conn):
-        try:
-            JournalEntryAttachment.__table__.create(bind=sync_conn, checkfirst=True)
-        except Exception:
-            pass
-    await db.run_sync(_create_table)
+@schema_ensurer("journal_entry_attachments")
+def _ensure_attachments_table(db: Session) -> None:
+    JournalEntryAttachment.__table__.create(bind=db.connection(), checkfirst=True)
 
 
 @router.post("/attachments/backfill")
@@ -832,7 +958,7 @@ async def backfill_journal_entry_attachments(db: AsyncSession = Depends(get_asyn
     One-time backfill: copy non-null journal_entries.document_id into attachments.
     Idempotent and safe to run multiple times.
     """
-    await _ensure_attachments_table(db)
+    await db.run_sync(_ensure_attachments_table)
 
     # Find all JEs with a legacy document_id
     res = await db.execute(select(JournalEntry).where(JournalEntry.document_id.is_not(None)))
@@ -925,7 +1051,7 @@ async def attach_documents(entry_id: int, body: AttachDocumentsBody, db: AsyncSe
     if je.is_locked:
         raise HTTPException(status_code=400, detail="Entry is locked; cannot modify attachments")
 
-    await _ensure_attachments_table(db)
+    await db.run_sync(_ensure_attachments_table)
 
     created = 0
     for doc_id in body.document_ids:
@@ -3,7 +3,7 @@ Period Close API Routes
 Month/Quarter/Year-end close workflow management
 """
 
-from fastapi import APIRouter, Query, HTTPException, Depends
+from fastapi import APIRouter, Query, HTTPException, Depends, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, desc
 from datetime import date
@@ -15,6 +15,7 @@ from ..database_async import get_async_db
 from services.api.models_period_close import PeriodClose, PeriodLock, AdjustingEntry
 from services.api.models_accounting import AccountingEntity
 from services.api.services.period_close_service import PeriodCloseService
+from services.api.services.financial_statement_cache import warm_statement_cache
 
 router = APIRouter(prefix="/api/accounting/period-close", tags=["Period Close"])
 logger = logging.getLogger(__name__)
@@ -204,6 +205,7 @@ async def get_period_close_details(
 @router.post("/{close_id}/execute")
 async def execute_period_close(
     close_id: int,
+    background_tasks: BackgroundTasks,
     request: ExecuteCloseRequest = None,
     db: AsyncSession = Depends(get_async_db)
 ):
@@ -217,6 +219,12 @@ async def execute_period_close(
             force=request.force
         )
         
+        # Warm the statement cache for the closed period
+        if result.get("success"):
+            close = await db.get(PeriodClose, close_id)
+            if close:
+                background_tasks.add_task(warm_statement_cache, close.entity_id, close.period_end)
+        
         return result
         
     except Exception as e:
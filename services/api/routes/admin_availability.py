@@ -9,10 +9,12 @@ from datetime import datetime, timedelta
 import json
 
 from services.api.database import get_db
+from services.api.schema_bootstrap import schema_ensurer
 from .advisory import require_ngiadvisory_admin
 
 router = APIRouter()
 
+@schema_ensurer("admin_availability")
 def _ensure_tables(db: Session):
     """Ensure admin availability table exists."""
     db.execute(sa_text("""
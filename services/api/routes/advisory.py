@@ -12,6 +12,7 @@ from datetime import datetime
 from pathlib import Path
 
 from services.api.database import get_db
+from services.api.schema_bootstrap import schema_ensurer
 from services.api.auth_deps import require_clerk_user  # Clerk-only auth dependency
 import logging as _logging
 
@@ -69,6 +70,7 @@ def require_ngiadvisory_admin():
     return _require_admin
 
 
+@schema_ensurer("advisory")
 def _ensure_tables(db: Session):
     # Projects
     db.execute(sa_text(
@@ -16,6 +16,7 @@ from jose import jwt as _jwt
 import os
 
 from services.api.database import get_db
+from services.api.schema_bootstrap import schema_ensurer
 from .advisory import _ensure_tables
 from services.api.agent_client import start_agent_run, ensure_agent_tables
 from services.api.clerk_auth import verify_clerk_jwt as _verify_clerk_jwt, verify_clerk_session_cookie as _verify_clerk_session
@@ -110,6 +111,7 @@ def _check_domain(email: str, allow_all_for_applications: bool = False) -> bool:
     domain = (email.split("@",1)[1] if "@" in email else "").lower()
     return domain in allowed if allowed else default_if_empty
 
+@schema_ensurer("student_telemetry")
 def _ensure_student_telemetry(db: Session) -> None:
     try:
         db.execute(sa_text(
@@ -523,6 +525,7 @@ async def my_memberships(request: Request, db: Session = Depends(get_db)):
 
 
 # -------- Student Profile (theme/resume) --------
+@schema_ensurer("student_profile")
 def _ensure_student_profile_cols(db: Session) -> None:
     # Add student profile columns if missing (idempotent)
     add_cols = (
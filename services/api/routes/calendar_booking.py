@@ -9,12 +9,14 @@ from datetime import datetime, timedelta
 import json
 
 from services.api.database import get_db
+from services.api.schema_bootstrap import schema_ensurer
 from services.api.auth_deps import require_clerk_user
 from ..integrations.google_calendar import create_event
 from ..integrations.email_service import send_interview_confirmation
 
 router = APIRouter()
 
+@schema_ensurer("calendar_booking")
 def _ensure_tables(db: Session):
     """Ensure calendar bookings table exists."""
     db.execute(sa_text("""
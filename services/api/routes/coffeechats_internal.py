@@ -14,6 +14,7 @@ import os
 import secrets
 
 from services.api.database import get_db
+from services.api.schema_bootstrap import schema_ensurer
 from services.api.integrations import google_calendar as gcal
 from .advisory import require_ngiadvisory_admin, _ensure_tables as _ensure_advisory_tables
 from .advisory_public import _extract_student_email, _check_domain
@@ -22,6 +23,7 @@ from .advisory_public import _extract_student_email, _check_domain
 router = APIRouter()
 
 
+@schema_ensurer("coffeechats_internal")
 def _ensure_internal_tables(db: Session) -> None:
     _ensure_advisory_tables(db)
     # Availability blocks per admin
@@ -7,26 +7,27 @@ Schema evolution is done non-destructively for SQLite to avoid breaking
 existing data/tests.
 """
 
+import asyncio
+import io
+import json
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import text as sa_text
+from sqlalchemy import bindparam, text as sa_text
 from pathlib import Path
 from datetime import datetime
 
 from ..database import get_db
+from ..schema_bootstrap import schema_ensurer
 from ..auth_deps import require_clerk_user as _require_clerk_user
+from ..services.csv_export import csv_response
+from ..services.employee_import import import_employee_csv
 
 
 router = APIRouter(prefix="/api", tags=["employees"])
 
 
-def _has_table(db: Session, name: str) -> bool:
-    row = db.execute(sa_text("SELECT name FROM sqlite_master WHERE type='table' AND name = :n"), {"n": name}).fetchone()
-    return bool(row)
-
-
 def _has_column(db: Session, table: str, column: str) -> bool:
     try:
         rows = db.execute(sa_text(f"PRAGMA table_info({table})")).fetchall()
@@ -48,6 +49,7 @@ def _resolve_entity_id(entity: Optional[int] = None, entity_id: Optional[int] =
         return 0
 
 
+@schema_ensurer("hr")
 def _ensure_hr_schema(db: Session) -> None:
     # Teams
     db.execute(
@@ -292,6 +294,16 @@ def _ensure_hr_schema(db: Session) -> None:
         db.execute(sa_text("CREATE INDEX IF NOT EXISTS idx_employees_status ON employees(status)"))
         db.execute(sa_text("CREATE INDEX IF NOT EXISTS idx_employees_type ON employees(employment_type)"))
         db.execute(sa_text("CREATE INDEX IF NOT EXISTS idx_emp_memberships_entity ON employee_entity_memberships(entity_id)"))
+        # Directory listing: count and keyset pages are answered from this index
+        db.execute(sa_text("CREATE INDEX IF NOT EXISTS idx_employees_entity_deleted_id ON employees(entity_id, is_deleted, id)"))
+        db.execute(sa_text("CREATE INDEX IF NOT EXISTS idx_employee_projects_employee ON employee_projects(employee_id, project_id)"))
+        db.execute(sa_text("CREATE INDEX IF NOT EXISTS idx_team_memberships_employee ON team_memberships(employee_id, team_id)"))
+        # Normalized-email lookups (import dedupe)
+        db.execute(sa_text("CREATE INDEX IF NOT EXISTS idx_employees_email_lower ON employees(lower(email))"))
+        # Timesheet pages walk (pay_period_start, id) within an entity, optionally per status
+        db.execute(sa_text("CREATE INDEX IF NOT EXISTS idx_timesheets_entity_status_period ON timesheets(entity_id, status, pay_period_start, id)"))
+        db.execute(sa_text("CREATE INDEX IF NOT EXISTS idx_timesheets_entity_period ON timesheets(entity_id, pay_period_start, id)"))
+        db.execute(sa_text("CREATE INDEX IF NOT EXISTS idx_timesheet_entries_timesheet ON timesheet_entries(timesheet_id, entry_date)"))
     except Exception:
         pass
     
@@ -741,8 +753,43 @@ async def reorder_projects(
     return {"updated": updated}
 
 
+def _employee_scope_sql(eid_param: str = "eid") -> str:
+    """Employees of an entity: primary entity or an entity membership (uses the unique membership index)"""
+    return (
+        f" (e.entity_id = :{eid_param} OR EXISTS (SELECT 1 FROM employee_entity_memberships m "
+        f"WHERE m.employee_id = e.id AND m.entity_id = :{eid_param})) "
+    )
+
+
+def _employee_relations(db: Session, employee_ids: List[int]) -> Dict[int, Dict[str, list]]:
+    """Projects and team memberships for a page of employees in one grouped query"""
+    if not employee_ids:
+        return {}
+    rows = db.execute(
+        sa_text(
+            """
+            SELECT ep.employee_id, 'projects', json_group_array(json_array(p.id, p.name))
+            FROM employee_projects ep JOIN projects p ON p.id = ep.project_id
+            WHERE ep.employee_id IN :ids
+            GROUP BY ep.employee_id
+            UNION ALL
+            SELECT tm.employee_id, 'teams', json_group_array(json_array(tm.team_id, t.name))
+            FROM team_memberships tm JOIN teams t ON t.id = tm.team_id
+            WHERE tm.employee_id IN :ids
+            GROUP BY tm.employee_id
+            """
+        ).bindparams(bindparam("ids", expanding=True)),
+        {"ids": list(employee_ids)},
+    ).fetchall()
+    relations: Dict[int, Dict[str, list]] = {}
+    for employee_id, kind, items in rows:
+        relations.setdefault(employee_id, {})[kind] = json.loads(items)
+    return relations
+
+
 @router.get("/employees")
 async def list_employees(
+    response: Response,
     entity: int | None = Query(None),
     entity_id: int | None = Query(None),
     q: Optional[str] = Query(None),
@@ -751,24 +798,25 @@ async def list_employees(
     type: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     pageSize: int = Query(100, ge=1, le=500),
+    cursor: Optional[int] = Query(None, description="Keyset cursor: id of the last employee on the previous page"),
     partner=Depends(_require_clerk_user),
     db: Session = Depends(get_db),
 ):
+    """
+    Employee directory, newest first.
+
+    Three queries per page: a count, the page itself and one grouped query
+    for projects/team memberships. Pass the X-Next-Cursor header back as
+    `cursor` for keyset pagination; `page` still works as an offset.
+    X-Total-Count carries the number of matching employees.
+    """
     _ensure_hr_schema(db)
     eid = _resolve_entity_id(entity, entity_id)
     if not eid:
         raise HTTPException(status_code=422, detail="entity is required")
     # Build dynamic filtering
-    where = [" (e.is_deleted = 0 OR e.is_deleted IS NULL) "]
-    params: Dict[str, Any] = {"eid": eid, "lim": int(pageSize), "off": int((page - 1) * pageSize)}
-    # Prefer membership scoping if table exists
-    use_memberships = _has_table(db, "employee_entity_memberships")
-    if use_memberships:
-        from_clause = " employees e LEFT JOIN employee_entity_memberships m ON m.employee_id = e.id AND m.entity_id = :eid "
-        where.append(" (e.entity_id = :eid OR m.entity_id IS NOT NULL) ")
-    else:
-        from_clause = " employees e "
-        where.append(" e.entity_id = :eid ")
+    where = [" (e.is_deleted = 0 OR e.is_deleted IS NULL) ", _employee_scope_sql()]
+    params: Dict[str, Any] = {"eid": eid}
     if q:
         where.append(" (lower(e.name) LIKE :q OR lower(coalesce(e.email,'')) LIKE :q OR lower(coalesce(e.title,'')) LIKE :q) ")
         params["q"] = f"%{q.lower()}%"
@@ -782,38 +830,38 @@ async def list_employees(
         where.append(" e.team_id = :tid ")
         params["tid"] = int(team)
     where_sql = " AND ".join(where)
-    sql = f"""
-        SELECT e.id, coalesce(e.legal_name, e.name) as name, e.email, e.title, e.role, e.classification, e.status, e.employment_type,
-               e.start_date, e.end_date, e.team_id, 
-               (SELECT name FROM teams t WHERE t.id = e.team_id) as team_name
-        FROM {from_clause}
-        WHERE {where_sql}
-        ORDER BY e.id DESC
-        LIMIT :lim OFFSET :off
-    """
-    rows = db.execute(sa_text(sql), params).fetchall()
+
+    total = db.execute(sa_text(f"SELECT count(*) FROM employees e WHERE {where_sql}"), params).scalar() or 0
+
+    page_params = {**params, "lim": int(pageSize)}
+    if cursor is not None:
+        page_sql = f"{where_sql} AND e.id < :cursor"
+        page_params["cursor"] = int(cursor)
+        offset_sql = ""
+    else:
+        page_sql = where_sql
+        page_params["off"] = int((page - 1) * pageSize)
+        offset_sql = " OFFSET :off"
+    rows = db.execute(
+        sa_text(
+            f"""
+            SELECT e.id, coalesce(e.legal_name, e.name) as name, e.email, e.title, e.role, e.classification, e.status,
+                   e.employment_type, e.start_date, e.end_date, e.team_id, t.name as team_name
+            FROM employees e
+            LEFT JOIN teams t ON t.id = e.team_id
+            WHERE {page_sql}
+            ORDER BY e.id DESC
+            LIMIT :lim{offset_sql}
+            """
+        ),
+        page_params,
+    ).fetchall()
+    relations = _employee_relations(db, [r[0] for r in rows])
+
     result: List[Dict[str, Any]] = []
     for r in rows:
-        # Get projects
-        projects = db.execute(
-            sa_text(
-                "SELECT p.id, p.name FROM projects p JOIN employee_projects ep ON ep.project_id = p.id WHERE ep.employee_id = :eid"
-            ),
-            {"eid": r[0]},
-        ).fetchall()
-        
-        # Get team memberships (multiple teams)
-        team_memberships = db.execute(
-            sa_text(
-                "SELECT tm.team_id, t.name FROM team_memberships tm JOIN teams t ON t.id = tm.team_id WHERE tm.employee_id = :eid"
-            ),
-            {"eid": r[0]},
-        ).fetchall()
-        
-        # Extract team_ids and team_names arrays
-        team_ids = [tm[0] for tm in team_memberships]
-        team_names = [tm[1] for tm in team_memberships]
-        
+        related = relations.get(r[0], {})
+        team_memberships = related.get("teams", [])
         result.append(
             {
                 "id": r[0],
@@ -831,11 +879,14 @@ async def list_employees(
                 "compensation_type": '',  # Default values for now
                 "hourly_rate": 0,
                 "annual_salary": 0,
-                "team_ids": team_ids,  # New: array of team IDs
-                "team_names": team_names,  # New: array of team names
-                "projects": [{"id": pr[0], "name": pr[1]} for pr in projects],
+                "team_ids": [tm[0] for tm in team_memberships],  # New: array of team IDs
+                "team_names": [tm[1] for tm in team_memberships],  # New: array of team names
+                "projects": [{"id": pr[0], "name": pr[1]} for pr in related.get("projects", [])],
             }
         )
+    response.headers["X-Total-Count"] = str(total)
+    if len(rows) == int(pageSize):
+        response.headers["X-Next-Cursor"] = str(rows[-1][0])
     return result
 
 
@@ -1376,53 +1427,57 @@ async def patch_employee_todo(
 
 @router.post("/employees/import")
 async def import_employees(
-    payload: Dict[str, Any],
+    request: Request,
+    entity: int | None = Query(None),
+    entity_id: int | None = Query(None),
     partner=Depends(_require_clerk_user),
     db: Session = Depends(get_db),
 ):
     """
-    Import employees from CSV text. Columns: name, email, type, start, entity, team
-    Accepts payload.csv as string. Dedupe by email.
+    Import employees from CSV. Columns: name, email, type, start, entity, team
+
+    Send the file as multipart/form-data (`file`); a JSON body with a `csv`
+    string is still accepted. Rows are deduped by email and inserted in
+    batches in one transaction. Returns counts, a per-row issue report and
+    rows/sec.
     """
     _ensure_hr_schema(db)
-    csv_text = payload.get("csv")
-    if not isinstance(csv_text, str) or not csv_text.strip():
-        raise HTTPException(status_code=422, detail="csv required")
-    import csv as _csv
-    from io import StringIO as _SIO
-    reader = _csv.DictReader(_SIO(csv_text))
-    created = 0
-    for row in reader:
-        name = (row.get("name") or "").strip()
-        email = (row.get("email") or "").strip().lower()
-        if not name or not email:
-            continue
-        # Skip if exists
-        exists = db.execute(sa_text("SELECT id FROM employees WHERE lower(email) = :em AND (is_deleted = 0 OR is_deleted IS NULL)"), {"em": email}).fetchone()
-        if exists:
-            continue
-        ent = row.get("entity") or payload.get("entity") or payload.get("entity_id")
-        ent_id = _resolve_entity_id(ent, None)
-        team_id = None
-        tname = (row.get("team") or "").strip()
-        if ent_id and tname:
-            tr = db.execute(sa_text("SELECT id FROM teams WHERE entity_id = :e AND lower(name) = :n"), {"e": ent_id, "n": tname.lower()}).fetchone()
-            if tr:
-                team_id = int(tr[0])
-        db.execute(
-            sa_text("INSERT INTO employees (entity_id, name, legal_name, email, employment_type, start_date, team_id, status, created_at, updated_at) VALUES (:e,:n,:n,:em,:tp,:sd,:tid,'active',datetime('now'),datetime('now'))"),
-            {
-                "e": ent_id or 0,
-                "n": name,
-                "em": email,
-                "tp": row.get("type") or None,
-                "sd": row.get("start") or None,
-                "tid": team_id,
-            },
-        )
-        created += 1
-    db.commit()
-    return {"created": created}
+    default_entity = _resolve_entity_id(entity, entity_id)
+    upload = None
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        # The form parser spools the upload to a temp file; rows are read from it incrementally
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or not hasattr(upload, "file"):
+            raise HTTPException(status_code=422, detail="file required")
+        default_entity = default_entity or _resolve_entity_id(form.get("entity"), form.get("entity_id"))
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    else:
+        try:
+            payload = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=422, detail="csv required")
+        csv_text = payload.get("csv") if isinstance(payload, dict) else None
+        if not isinstance(csv_text, str) or not csv_text.strip():
+            raise HTTPException(status_code=422, detail="csv required")
+        default_entity = default_entity or _resolve_entity_id(payload.get("entity"), payload.get("entity_id"))
+        stream = io.StringIO(csv_text, newline="")
+    try:
+        result = await asyncio.to_thread(import_employee_csv, db, stream, default_entity)
+        db.commit()
+    except UnicodeDecodeError:  # a ValueError subclass, so it must come first
+        db.rollback()
+        raise HTTPException(status_code=422, detail="csv must be UTF-8 encoded")
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        if upload is not None:
+            await upload.close()
+    return result
 
 
 @router.get("/employees/export")
@@ -1432,22 +1487,21 @@ async def export_employees(
     partner=Depends(_require_clerk_user),
     db: Session = Depends(get_db),
 ):
+    """Stream the entity's employees as CSV (same columns the import accepts)"""
     _ensure_hr_schema(db)
     eid = _resolve_entity_id(entity, entity_id)
     if not eid:
         raise HTTPException(status_code=422, detail="entity is required")
-    if _has_table(db, "employee_entity_memberships"):
-        rows = db.execute(sa_text("SELECT e.name, e.email, e.employment_type, e.start_date FROM employees e JOIN employee_entity_memberships m ON m.employee_id = e.id AND m.entity_id = :e WHERE (e.is_deleted = 0 OR e.is_deleted IS NULL)"), {"e": eid}).fetchall()
-    else:
-        rows = db.execute(sa_text("SELECT name, email, employment_type, start_date FROM employees WHERE entity_id = :e AND (is_deleted = 0 OR is_deleted IS NULL)"), {"e": eid}).fetchall()
-    import csv as _csv
-    from io import StringIO as _SIO
-    out = _SIO()
-    w = _csv.writer(out)
-    w.writerow(["name","email","type","start","entity"])
-    for r in rows:
-        w.writerow([r[0], r[1], r[2] or "", r[3] or "", eid])
-    return {"csv": out.getvalue()}
+    sql = f"""
+        SELECT coalesce(e.legal_name, e.name), e.email, coalesce(e.employment_type, ''), coalesce(e.start_date, ''),
+               :eid, coalesce(t.name, '')
+        FROM employees e
+        LEFT JOIN teams t ON t.id = e.team_id
+        WHERE (e.is_deleted = 0 OR e.is_deleted IS NULL) AND {_employee_scope_sql()}
+        ORDER BY e.id
+    """
+    return csv_response(db, sql, {"eid": eid}, ["name", "email", "type", "start", "entity", "team"],
+                        f"employees-{eid}.csv")
 
 
 # ============================================================================
@@ -1497,6 +1551,64 @@ async def create_timesheet(
     return {"id": new_id, "message": "Timesheet created"}
 
 
+# Page size when a cursor is passed without an explicit limit
+_TIMESHEET_PAGE_SIZE = 100
+
+
+def _timesheet_page(db: Session, where: List[str], params: Dict[str, Any], order: str, limit: Optional[int]) -> List[Any]:
+    """One page of timesheets with employee and entry counts (grouped over the page only);
+    limit None returns every matching timesheet"""
+    return db.execute(
+        sa_text(f"""
+            WITH page AS (
+                SELECT t.id, t.employee_id, t.pay_period_start, t.pay_period_end, t.total_hours, t.status,
+                       t.submitted_date, t.approved_date, t.rejected_date, t.rejection_reason
+                FROM timesheets t
+                WHERE {" AND ".join(where)}
+                ORDER BY {order}
+                {"LIMIT :lim" if limit else ""}
+            )
+            SELECT t.*, e.name, e.email, coalesce(c.n, 0)
+            FROM page t
+            LEFT JOIN employees e ON e.id = t.employee_id
+            LEFT JOIN (
+                SELECT timesheet_id, count(*) AS n FROM timesheet_entries
+                WHERE timesheet_id IN (SELECT id FROM page)
+                GROUP BY timesheet_id
+            ) c ON c.timesheet_id = t.id
+            ORDER BY {order}
+        """),
+        {**params, **({"lim": int(limit)} if limit else {})},
+    ).fetchall()
+
+
+def _timesheet_dict(r: Any) -> Dict[str, Any]:
+    return {
+        "id": r[0],
+        "employee_id": r[1],
+        "employee_name": r[10],
+        "employee_email": r[11],
+        "pay_period_start": r[2],
+        "pay_period_end": r[3],
+        "total_hours": r[4],
+        "status": r[5],
+        "submitted_date": r[6],
+        "approved_date": r[7],
+        "rejected_date": r[8],
+        "rejection_reason": r[9],
+        "entries_count": r[12],
+    }
+
+
+def _parse_timesheet_cursor(cursor: str) -> tuple:
+    """Cursors are '<sort value>:<id>' of the last row on the previous page"""
+    value, _, tid = cursor.rpartition(":")
+    try:
+        return value, int(tid)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="invalid cursor")
+
+
 @router.get("/timesheets")
 async def list_timesheets(
     entity: int | None = Query(None),
@@ -1504,10 +1616,13 @@ async def list_timesheets(
     employee_id: Optional[int] = Query(None),
     status: Optional[str] = Query(None),
     pay_period: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     partner=Depends(_require_clerk_user),
     db: Session = Depends(get_db),
 ):
-    """List timesheets with filters"""
+    """List timesheets with filters, newest pay period first; paged by `limit`/`cursor`
+    when either is given, otherwise every match"""
     _ensure_hr_schema(db)
     
     eid = _resolve_entity_id(entity, entity_id)
@@ -1521,47 +1636,92 @@ async def list_timesheets(
     if status:
         where.append("t.status = :status")
         params["status"] = status
+
+    if pay_period:
+        where.append("t.pay_period_start = :pp")
+        params["pp"] = pay_period
+
+    if cursor:
+        params["cps"], params["cid"] = _parse_timesheet_cursor(cursor)
+        where.append("(t.pay_period_start, t.id) < (:cps, :cid)")
+
+    page_size = limit or (_TIMESHEET_PAGE_SIZE if cursor else None)
+    rows = _timesheet_page(db, where, params, "t.pay_period_start DESC, t.id DESC", page_size)
+    result = [_timesheet_dict(r) for r in rows]
+    next_cursor = f"{rows[-1][2]}:{rows[-1][0]}" if page_size and len(rows) == page_size else None
+    return {"timesheets": result, "count": len(result), "next_cursor": next_cursor}
+
+
+@router.get("/timesheets/pending-approval")
+async def get_pending_approvals(
+    entity: int | None = Query(None),
+    entity_id: int | None = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    partner=Depends(_require_clerk_user),
+    db: Session = Depends(get_db),
+):
+    """Get timesheets pending approval for manager/lead, oldest submission first;
+    paged by `limit`/`cursor` when either is given, otherwise every match"""
+    _ensure_hr_schema(db)
     
-    where_sql = " AND ".join(where)
-    
-    rows = db.execute(
-        sa_text(f"""
-            SELECT t.id, t.employee_id, t.pay_period_start, t.pay_period_end, t.total_hours, t.status,
-                   t.submitted_date, t.approved_date, t.rejected_date, t.rejection_reason,
-                   e.name as employee_name, e.email as employee_email
-            FROM timesheets t
-            LEFT JOIN employees e ON e.id = t.employee_id
-            WHERE {where_sql}
-            ORDER BY t.pay_period_start DESC, t.id DESC
-        """),
-        params
-    ).fetchall()
-    
-    result = []
-    for r in rows:
-        # Get entries count
-        entries_count = db.execute(
-            sa_text("SELECT COUNT(*) FROM timesheet_entries WHERE timesheet_id = :tid"),
-            {"tid": r[0]}
-        ).scalar()
-        
-        result.append({
-            "id": r[0],
-            "employee_id": r[1],
-            "employee_name": r[10],
-            "employee_email": r[11],
-            "pay_period_start": r[2],
-            "pay_period_end": r[3],
-            "total_hours": r[4],
-            "status": r[5],
-            "submitted_date": r[6],
-            "approved_date": r[7],
-            "rejected_date": r[8],
-            "rejection_reason": r[9],
-            "entries_count": entries_count
-        })
-    
-    return {"timesheets": result, "count": len(result)}
+    eid = _resolve_entity_id(entity, entity_id)
+    where = ["t.entity_id = :eid", "t.status = 'submitted'"]
+    params: Dict[str, Any] = {"eid": eid}
+    if cursor:
+        params["csd"], params["cid"] = _parse_timesheet_cursor(cursor)
+        where.append("(coalesce(t.submitted_date, ''), t.id) > (:csd, :cid)")
+
+    page_size = limit or (_TIMESHEET_PAGE_SIZE if cursor else None)
+    rows = _timesheet_page(db, where, params, "coalesce(t.submitted_date, '') ASC, t.id ASC", page_size)
+    result = [_timesheet_dict(r) for r in rows]
+    next_cursor = f"{rows[-1][6] or ''}:{rows[-1][0]}" if page_size and len(rows) == page_size else None
+    return {"timesheets": result, "count": len(result), "next_cursor": next_cursor}
+
+
+@router.get("/timesheets/export")
+async def export_timesheets(
+    entity: int | None = Query(None),
+    entity_id: int | None = Query(None),
+    employee_id: Optional[int] = Query(None),
+    status: Optional[str] = Query(None),
+    start: Optional[str] = Query(None, description="Earliest pay_period_start (YYYY-MM-DD)"),
+    end: Optional[str] = Query(None, description="Latest pay_period_start (YYYY-MM-DD)"),
+    partner=Depends(_require_clerk_user),
+    db: Session = Depends(get_db),
+):
+    """Stream timesheet entries as CSV, one row per daily entry"""
+    _ensure_hr_schema(db)
+    eid = _resolve_entity_id(entity, entity_id)
+    if not eid:
+        raise HTTPException(status_code=422, detail="entity is required")
+    where = ["t.entity_id = :eid"]
+    params: Dict[str, Any] = {"eid": eid}
+    if employee_id:
+        where.append("t.employee_id = :emp")
+        params["emp"] = employee_id
+    if status:
+        where.append("t.status = :status")
+        params["status"] = status
+    if start:
+        where.append("t.pay_period_start >= :start")
+        params["start"] = start
+    if end:
+        where.append("t.pay_period_start <= :end")
+        params["end"] = end
+    sql = f"""
+        SELECT t.id, e.name, e.email, t.pay_period_start, t.pay_period_end, t.status, t.total_hours,
+               te.entry_date, te.hours, p.name, te.notes
+        FROM timesheets t
+        LEFT JOIN employees e ON e.id = t.employee_id
+        LEFT JOIN timesheet_entries te ON te.timesheet_id = t.id
+        LEFT JOIN projects p ON p.id = te.project_id
+        WHERE {" AND ".join(where)}
+        ORDER BY t.pay_period_start DESC, t.id DESC, te.entry_date
+    """
+    header = ["timesheet_id", "employee_name", "employee_email", "pay_period_start", "pay_period_end", "status",
+              "total_hours", "entry_date", "hours", "project", "notes"]
+    return csv_response(db, sql, params, header, f"timesheets-{eid}.csv")
 
 
 @router.get("/timesheets/{timesheet_id}")
@@ -1811,45 +1971,6 @@ async def reject_timesheet(
     return {"message": "Timesheet rejected"}
 
 
-@router.get("/timesheets/pending-approval")
-async def get_pending_approvals(
-    entity: int | None = Query(None),
-    entity_id: int | None = Query(None),
-    partner=Depends(_require_clerk_user),
-    db: Session = Depends(get_db),
-):
-    """Get all timesheets pending approval for manager/lead"""
-    _ensure_hr_schema(db)
-    
-    eid = _resolve_entity_id(entity, entity_id)
-    
-    rows = db.execute(
-        sa_text("""
-            SELECT t.id, t.employee_id, t.pay_period_start, t.pay_period_end, t.total_hours,
-                   t.submitted_date, e.name as employee_name
-            FROM timesheets t
-            LEFT JOIN employees e ON e.id = t.employee_id
-            WHERE t.entity_id = :eid AND t.status = 'submitted'
-            ORDER BY t.submitted_date ASC
-        """),
-        {"eid": eid}
-    ).fetchall()
-    
-    result = []
-    for r in rows:
-        result.append({
-            "id": r[0],
-            "employee_id": r[1],
-            "employee_name": r[6],
-            "pay_period_start": r[2],
-            "pay_period_end": r[3],
-            "total_hours": r[4],
-            "submitted_date": r[5]
-        })
-    
-    return {"timesheets": result, "count": len(result)}
-
-
 # ============================================================================
 # ADVISORY-SPECIFIC ENDPOINTS (Projects & Auto-Creation)
 # ============================================================================
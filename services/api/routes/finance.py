@@ -9,6 +9,7 @@ from sqlalchemy import text as sa_text
 from datetime import datetime, timezone
 
 from ..database import get_db
+from ..schema_bootstrap import schema_ensurer
 from ..auth_deps import require_clerk_user as _require_clerk_user
 
 router = APIRouter(prefix="/api/finance", tags=["finance"])
@@ -293,6 +294,7 @@ async def cap_table_summary(entity_id: int | None = None, partner=Depends(_requi
 
 
 # Forecasting: scenarios and assumptions (simple tables created on demand)
+@schema_ensurer("finance_forecast")
 def _ensure_forecast_schema(db: Session):
     db.execute(sa_text(
         """
@@ -5,12 +5,10 @@ Compliant with US GAAP and California state requirements
 """
 
 from fastapi import APIRouter, HTTPException, status, Depends, Query
-from fastapi.responses import Response
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 import logging
-import io
 from enum import Enum
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
@@ -21,6 +19,10 @@ from ..models import (
 )
 # Use new accounting models instead
 from ..models_accounting import ChartOfAccounts, JournalEntry, JournalEntryLine
+from ..services.document_rendering import (
+    PDF_MEDIA_TYPE, XLSX_MEDIA_TYPE, RenderQueueFull, RenderTimeout, file_response, render_document
+)
+from ..services.statement_package_renderer import render_statements_excel, render_statements_pdf
 
 logger = logging.getLogger(__name__)
 
@@ -865,11 +867,6 @@ async def export_financial_statements_excel(
     Includes all 5 GAAP statements plus notes
     """
     try:
-        import io
-        import pandas as pd
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill
-        
         # Generate all statements
         start_date, end_date = _fiscal_period_to_dates(period, fiscal_year)
         
@@ -885,103 +882,18 @@ async def export_financial_statements_excel(
         # Get equity statement
         eq_data = await get_equity_statement(str(entity_id), ReportingPeriod.MTD, fiscal_year or 2026)
         
-        # Create Excel workbook
-        wb = Workbook()
-        
-        # Remove default sheet
-        wb.remove(wb.active)
-        
-        # Income Statement sheet
-        ws_is = wb.create_sheet("Income Statement")
-        ws_is.append(["NGI Capital LLC", "Income Statement"])
-        ws_is.append([f"For the period {start_date} to {end_date}"])
-        ws_is.append([])
-        ws_is.append(["Revenue", ""])
-        for line in is_data["revenue_lines"]:
-            ws_is.append([f"  {line['account_name']}", f"${line['amount']:,.2f}"])
-        ws_is.append([f"Total Revenue", f"${is_data['total_revenue']:,.2f}"])
-        ws_is.append([])
-        ws_is.append(["Expenses", ""])
-        for line in is_data["expense_lines"]:
-            ws_is.append([f"  {line['account_name']}", f"${line['amount']:,.2f}"])
-        ws_is.append([f"Total Expenses", f"${is_data['total_expenses']:,.2f}"])
-        ws_is.append([])
-        ws_is.append([f"Net Income", f"${is_data['net_income']:,.2f}"])
-        
-        # Balance Sheet sheet
-        ws_bs = wb.create_sheet("Balance Sheet")
-        ws_bs.append(["NGI Capital LLC", "Balance Sheet"])
-        ws_bs.append([f"As of {end_date}"])
-        ws_bs.append([])
-        ws_bs.append(["ASSETS", ""])
-        for line in bs_data["asset_lines"]:
-            ws_bs.append([f"  {line['account_name']}", f"${line['amount']:,.2f}"])
-        ws_bs.append([f"Total Assets", f"${bs_data['total_assets']:,.2f}"])
-        ws_bs.append([])
-        ws_bs.append(["LIABILITIES", ""])
-        for line in bs_data["liability_lines"]:
-            ws_bs.append([f"  {line['account_name']}", f"${line['amount']:,.2f}"])
-        ws_bs.append([f"Total Liabilities", f"${bs_data['total_liabilities']:,.2f}"])
-        ws_bs.append([])
-        ws_bs.append(["EQUITY", ""])
-        for line in bs_data["equity_lines"]:
-            ws_bs.append([f"  {line['account_name']}", f"${line['amount']:,.2f}"])
-        ws_bs.append([f"Total Equity", f"${bs_data['total_equity']:,.2f}"])
-        
-        # Cash Flow sheet
-        ws_cf = wb.create_sheet("Cash Flow Statement")
-        ws_cf.append(["NGI Capital LLC", "Statement of Cash Flows"])
-        ws_cf.append([f"For the period {start_date} to {end_date}"])
-        ws_cf.append([])
-        ws_cf.append(["Operating Activities", ""])
-        ws_cf.append([f"Net Income", f"${is_data['net_income']:,.2f}"])
-        ws_cf.append([])
-        ws_cf.append(["Investing Activities", ""])
-        ws_cf.append([f"Net Cash from Investing", "$0.00"])
-        ws_cf.append([])
-        ws_cf.append(["Financing Activities", ""])
-        ws_cf.append([f"Net Cash from Financing", "$0.00"])
-        ws_cf.append([])
-        ws_cf.append([f"Net Change in Cash", f"${cf_data['net_change_in_cash']:,.2f}"])
-        
-        # Equity Statement sheet
-        ws_eq = wb.create_sheet("Equity Statement")
-        ws_eq.append(["NGI Capital LLC", "Statement of Changes in Equity"])
-        ws_eq.append([f"For the period {start_date} to {end_date}"])
-        ws_eq.append([])
-        eq_data_dict = eq_data["data"]
-        ws_eq.append(["Beginning Balance", f"${eq_data_dict['beginning_balance']['total']:,.2f}"])
-        ws_eq.append(["Net Income", f"${eq_data_dict['changes']['net_income']:,.2f}"])
-        ws_eq.append(["Distributions", f"${eq_data_dict['changes']['distributions']['total_distributions']:,.2f}"])
-        ws_eq.append([f"Ending Balance", f"${eq_data_dict['ending_balance']['total']:,.2f}"])
-        
-        # Notes sheet
-        ws_notes = wb.create_sheet("Notes to Financial Statements")
-        ws_notes.append(["NGI Capital LLC", "Notes to Financial Statements"])
-        ws_notes.append([f"For the period {start_date} to {end_date}"])
-        ws_notes.append([])
-        ws_notes.append(["Note 1: Nature of Business"])
-        ws_notes.append(["NGI Capital LLC is a Delaware limited liability company engaged in advisory services."])
-        ws_notes.append([])
-        ws_notes.append(["Note 2: Summary of Significant Accounting Policies"])
-        ws_notes.append(["The financial statements are prepared in accordance with US GAAP."])
-        ws_notes.append([])
-        ws_notes.append(["Note 3: Revenue Recognition (ASC 606)"])
-        ws_notes.append(["Revenue is recognized when services are performed and collection is probable."])
-        
-        # Save to bytes
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
-        
+        workbook_path = await render_document(render_statements_excel, {
+            "start_date": start_date, "end_date": end_date, "is_data": is_data,
+            "bs_data": bs_data, "cf_data": cf_data, "eq_data": eq_data,
+        })
+
         # Return Excel file
-        from fastapi.responses import StreamingResponse
-        return StreamingResponse(
-            io.BytesIO(output.read()),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename=Financial_Statements_{entity_id}_{period}_{fiscal_year}.xlsx"}
+        return file_response(
+            workbook_path, XLSX_MEDIA_TYPE, f"Financial_Statements_{entity_id}_{period}_{fiscal_year}.xlsx"
         )
         
+    except (RenderQueueFull, RenderTimeout) as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         logger.error(f"Error exporting to Excel: {e}")
         raise HTTPException(
@@ -1001,13 +913,6 @@ async def export_financial_statements_pdf(
     Includes all 5 GAAP statements plus notes
     """
     try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib import colors
-        from reportlab.lib.units import inch
-        from io import BytesIO
-        
         # Generate all statements
         start_date, end_date = _fiscal_period_to_dates(period, fiscal_year)
         
@@ -1020,116 +925,14 @@ async def export_financial_statements_pdf(
         # Get cash flow
         cf_data = await get_cash_flow_statement(entity_id, period, fiscal_year, db)
         
-        # Create PDF buffer
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+        pdf_path = await render_document(render_statements_pdf, {
+            "start_date": start_date, "end_date": end_date, "is_data": is_data, "bs_data": bs_data,
+        })
         
-        # Get styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            alignment=1  # Center alignment
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=12,
-            textColor=colors.darkblue
-        )
-        
-        # Build content
-        story = []
-        
-        # Title
-        story.append(Paragraph("NGI Capital LLC", title_style))
-        story.append(Paragraph("Financial Statements", title_style))
-        story.append(Paragraph(f"For the period {start_date} to {end_date}", styles['Normal']))
-        story.append(Spacer(1, 20))
-        
-        # Income Statement
-        story.append(Paragraph("Income Statement", heading_style))
-        income_data_table = [['Revenue', 'Amount']]
-        for line in is_data["revenue_lines"]:
-            income_data_table.append([f"  {line['account_name']}", f"${line['amount']:,.2f}"])
-        income_data_table.extend([
-            ['Total Revenue', f"${is_data['total_revenue']:,.2f}"],
-            ['', ''],
-            ['Expenses', 'Amount']
-        ])
-        for line in is_data["expense_lines"]:
-            income_data_table.append([f"  {line['account_name']}", f"${line['amount']:,.2f}"])
-        income_data_table.extend([
-            ['Total Expenses', f"${is_data['total_expenses']:,.2f}"],
-            ['', ''],
-            ['Net Income', f"${is_data['net_income']:,.2f}"]
-        ])
-        
-        income_table = Table(income_data_table, colWidths=[3*inch, 1.5*inch])
-        income_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, -3), (-1, -1), colors.lightblue),
-            ('FONTNAME', (0, -3), (-1, -1), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(income_table)
-        story.append(Spacer(1, 20))
-        
-        # Balance Sheet
-        story.append(Paragraph("Balance Sheet", heading_style))
-        balance_data_table = [['Assets', 'Amount']]
-        for line in bs_data["asset_lines"]:
-            balance_data_table.append([f"  {line['account_name']}", f"${line['amount']:,.2f}"])
-        balance_data_table.extend([
-            ['Total Assets', f"${bs_data['total_assets']:,.2f}"],
-            ['', ''],
-            ['Liabilities', 'Amount']
-        ])
-        for line in bs_data["liability_lines"]:
-            balance_data_table.append([f"  {line['account_name']}", f"${line['amount']:,.2f}"])
-        balance_data_table.extend([
-            ['Total Liabilities', f"${bs_data['total_liabilities']:,.2f}"],
-            ['', ''],
-            ['Equity', 'Amount']
-        ])
-        for line in bs_data["equity_lines"]:
-            balance_data_table.append([f"  {line['account_name']}", f"${line['amount']:,.2f}"])
-        balance_data_table.append(['Total Equity', f"${bs_data['total_equity']:,.2f}"])
-        
-        balance_table = Table(balance_data_table, colWidths=[3*inch, 1.5*inch])
-        balance_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(balance_table)
-        
-        # Build PDF
-        doc.build(story)
-        pdf_bytes = buffer.getvalue()
-        buffer.close()
-        
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename=financial_statements_{period}.pdf"}
-        )
+        return file_response(pdf_path, PDF_MEDIA_TYPE, f"financial_statements_{period}.pdf")
         
+    except (RenderQueueFull, RenderTimeout) as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         logger.error(f"Error exporting to PDF: {e}")
         raise HTTPException(
@@ -34,10 +34,12 @@ import uuid
 import math
 
 from services.api.database import get_db
+from services.api.schema_bootstrap import schema_ensurer
 
 router = APIRouter(prefix="/api/fixed-assets", tags=["fixed-assets"])
 
 
+@schema_ensurer("fixed_assets")
 def _ensure_fixed_asset_tables(db: Session):
     """Create fixed asset tables (idempotent)"""
     
@@ -1193,6 +1195,7 @@ from services.api.database import get_db
 router = APIRouter(prefix="/api/fixed-assets", tags=["fixed-assets"])
 
 
+@schema_ensurer("fixed_assets")
 def _ensure_fixed_asset_tables(db: Session):
     """Create fixed asset tables (idempotent)"""
     
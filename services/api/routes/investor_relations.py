@@ -11,12 +11,14 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text as sa_text
 
 from ..database import get_db
+from ..schema_bootstrap import schema_ensurer
 from ..auth_deps import require_clerk_user as _require_clerk_user
 
 
 router = APIRouter(prefix="/api/investor-relations", tags=["investor-relations"])
 
 
+@schema_ensurer("investor_relations")
 def _ensure_ir_schema(db: Session) -> None:
     db.execute(
         sa_text(
@@ -8,6 +8,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta, date
+import re
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -15,7 +16,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text as sa_text
 
 from ..database import get_db
+from ..schema_bootstrap import schema_check, schema_ensurer
 from ..auth_deps import require_clerk_user as _require_clerk_user
+from ..services.csv_export import csv_response
 
 # Router
 router = APIRouter(prefix="/api/investors", tags=["investors"])
@@ -37,6 +40,7 @@ def _uuid() -> str:
     return uuid.uuid4().hex
 
 
+@schema_ensurer("investors")
 def _ensure_schema(db: Session) -> None:
     # Investors
     db.execute(sa_text(
@@ -87,8 +91,11 @@ def _ensure_schema(db: Session) -> None:
     # Helpful indexes for performance
     try:
         db.execute(sa_text("CREATE INDEX IF NOT EXISTS idx_inv_pipelines_stage_entity ON investor_pipelines(stage, entity_id)"))
+        # Empty type-ahead queries walk the directory alphabetically
+        db.execute(sa_text("CREATE INDEX IF NOT EXISTS idx_investors_legal_name_nocase ON investors(legal_name COLLATE NOCASE)"))
     except Exception:
         pass
+    _ensure_search_index(db)
     # Interactions
     db.execute(sa_text(
         """
@@ -135,6 +142,11 @@ def _ensure_schema(db: Session) -> None:
             ('current_doc_url','TEXT'),
         ):
             _add_column_if_missing(db, 'investor_reports', col, typ)
+        # Backfill sensible defaults for nulls to satisfy strict client schemas
+        db.execute(sa_text("UPDATE investor_reports SET type = COALESCE(type,'Quarterly') WHERE type IS NULL"))
+        db.execute(sa_text("UPDATE investor_reports SET status = COALESCE(status,'Draft') WHERE status IS NULL"))
+        # Use YYYY (due year) as a basic period fallback if missing
+        db.execute(sa_text("UPDATE investor_reports SET period = CASE WHEN period IS NULL OR period = '' THEN COALESCE(strftime('%Y', due_date),'') ELSE period END"))
         db.commit()
     except Exception:
         pass
@@ -179,6 +191,123 @@ def _ensure_schema(db: Session) -> None:
     ))
 
 
+# Investor directory full-text index. investors.id is TEXT, so its implicit
+# rowid can change on VACUUM; investor_search_keys gives every investor a
+# stable INTEGER key that the external-content FTS5 table is keyed on.
+# Triggers keep keys and index in sync with investors.
+_SEARCH_INDEX_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS investor_search_keys (
+        key INTEGER PRIMARY KEY,
+        investor_id TEXT NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE VIEW IF NOT EXISTS investor_search_docs AS
+    SELECT k.key AS key, i.legal_name AS legal_name, i.firm AS firm, i.email AS email
+    FROM investor_search_keys k JOIN investors i ON i.id = k.investor_id
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS investors_fts USING fts5(
+        legal_name, firm, email, content='investor_search_docs', content_rowid='key',
+        tokenize='unicode61', prefix='1 2 3 4'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS investors_fts_ai AFTER INSERT ON investors BEGIN
+        INSERT OR IGNORE INTO investor_search_keys(investor_id) VALUES (new.id);
+        INSERT INTO investors_fts(rowid, legal_name, firm, email)
+        SELECT key, new.legal_name, new.firm, new.email FROM investor_search_keys WHERE investor_id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS investors_fts_ad AFTER DELETE ON investors BEGIN
+        INSERT INTO investors_fts(investors_fts, rowid, legal_name, firm, email)
+        SELECT 'delete', key, old.legal_name, old.firm, old.email FROM investor_search_keys WHERE investor_id = old.id;
+        DELETE FROM investor_search_keys WHERE investor_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS investors_fts_au AFTER UPDATE OF id, legal_name, firm, email ON investors BEGIN
+        INSERT INTO investors_fts(investors_fts, rowid, legal_name, firm, email)
+        SELECT 'delete', key, old.legal_name, old.firm, old.email FROM investor_search_keys WHERE investor_id = old.id;
+        UPDATE investor_search_keys SET investor_id = new.id WHERE investor_id = old.id;
+        INSERT INTO investors_fts(rowid, legal_name, firm, email)
+        SELECT key, new.legal_name, new.firm, new.email FROM investor_search_keys WHERE investor_id = new.id;
+    END
+    """,
+)
+# Earlier builds keyed investors_fts on investors.rowid directly
+_LEGACY_SEARCH_INDEX_DROP = (
+    "DROP TRIGGER IF EXISTS investors_fts_ai",
+    "DROP TRIGGER IF EXISTS investors_fts_ad",
+    "DROP TRIGGER IF EXISTS investors_fts_au",
+    "DROP TABLE IF EXISTS investors_fts",
+)
+# Default `rank` of investors_fts: bm25 weighted name > firm > email
+_SEARCH_RANK = "bm25(10.0, 5.0, 1.0)"
+
+# db url -> whether investors_fts exists (FTS5 may be missing from the SQLite build)
+_search_index_ready: Dict[str, bool] = {}
+
+
+# Called from _ensure_schema so the sync triggers exist before any write
+@schema_ensurer("investors_search")
+def _ensure_search_index(db: Session) -> None:
+    key = str(db.get_bind().url)
+    db.commit()  # keep the investors tables if FTS5 turns out to be unavailable
+    try:
+        legacy = db.execute(sa_text(
+            "SELECT 1 FROM sqlite_master WHERE name = 'investors_fts' AND sql LIKE '%content=''investors''%'"
+        )).fetchone()
+        for ddl in (_LEGACY_SEARCH_INDEX_DROP if legacy else ()) + _SEARCH_INDEX_DDL:
+            db.execute(sa_text(ddl))
+        db.execute(sa_text("INSERT INTO investors_fts(investors_fts, rank) VALUES ('rank', :r)"), {"r": _SEARCH_RANK})
+    except Exception:
+        db.rollback()
+        _search_index_ready[key] = False
+        return
+    _check_search_index(db)
+    db.commit()
+    _search_index_ready[key] = True
+
+
+@schema_check("investors_search")
+def _check_search_index(db: Session) -> None:
+    """Resync keys and index with investors (rows written before the triggers
+    existed, or a damaged index); runs on every startup"""
+    if not _has_search_index(db):
+        return
+    added = db.execute(sa_text(
+        "INSERT OR IGNORE INTO investor_search_keys(investor_id) SELECT id FROM investors WHERE id IS NOT NULL"
+    )).rowcount
+    dropped = db.execute(sa_text(
+        "DELETE FROM investor_search_keys WHERE investor_id NOT IN (SELECT id FROM investors WHERE id IS NOT NULL)"
+    )).rowcount
+    if added or dropped:
+        db.execute(sa_text("INSERT INTO investors_fts(investors_fts) VALUES ('rebuild')"))
+        return
+    try:
+        db.execute(sa_text("INSERT INTO investors_fts(investors_fts, rank) VALUES ('integrity-check', 1)"))
+    except Exception:
+        db.execute(sa_text("INSERT INTO investors_fts(investors_fts) VALUES ('rebuild')"))
+
+
+def _has_search_index(db: Session) -> bool:
+    key = str(db.get_bind().url)
+    if key not in _search_index_ready:
+        # Schema ensured by an earlier process; look once
+        _search_index_ready[key] = bool(db.execute(
+            sa_text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'investors_fts'")
+        ).fetchone())
+    return _search_index_ready[key]
+
+
+def _search_match(q: str) -> str:
+    """FTS5 query: every typed token must prefix-match a token of name, firm or email"""
+    return " AND ".join(f'"{t}"*' for t in re.findall(r"\w+", q.lower()))
+
+
 def _resolve_entity(entity: Optional[int] = None, entity_id: Optional[int] = None) -> int:
     try:
         return int(entity or 0) or int(entity_id or 0)
@@ -373,6 +502,27 @@ async def update_investor(
     return {"message": "updated"}
 
 
+def _pipeline_filters(eid: int, q: Optional[str], stage: Optional[str]) -> tuple:
+    where = [" ip.entity_id = :e "]
+    params: Dict[str, Any] = {"e": eid}
+    if q:
+        where.append(" (lower(i.legal_name) LIKE :q OR lower(coalesce(i.firm,'')) LIKE :q OR lower(coalesce(i.email,'')) LIKE :q) ")
+        params["q"] = f"%{q.lower()}%"
+    if stage:
+        if stage.lower() == 'in_progress':
+            where.append(" ip.stage IN ('Not Started','Diligence','Pitched') ")
+        else:
+            where.append(" ip.stage = :st ")
+            params["st"] = stage
+    return " AND ".join(where), params
+
+
+def _pipeline_order(sort: Optional[str]) -> str:
+    if sort and sort.lower() == 'lastactivity':
+        return "COALESCE(ip.last_activity_at, '0001-01-01') DESC, i.legal_name COLLATE NOCASE ASC"
+    return "i.legal_name COLLATE NOCASE ASC"
+
+
 @router.get("/pipeline")
 async def get_pipeline(
     entity: int | None = Query(None),
@@ -387,26 +537,13 @@ async def get_pipeline(
     eid = _resolve_entity(entity, entity_id)
     if not eid:
         raise HTTPException(status_code=422, detail="entity is required")
-    where = [" ip.entity_id = :e "]
-    params: Dict[str, Any] = {"e": eid}
-    if q:
-        where.append(" (lower(i.legal_name) LIKE :q OR lower(coalesce(i.firm,'')) LIKE :q OR lower(coalesce(i.email,'')) LIKE :q) ")
-        params["q"] = f"%{q.lower()}%"
-    if stage:
-        if stage.lower() == 'in_progress':
-            where.append(" ip.stage IN ('Not Started','Diligence','Pitched') ")
-        else:
-            where.append(" ip.stage = :st ")
-            params["st"] = stage
-    order = "i.legal_name COLLATE NOCASE ASC"
-    if sort and sort.lower() == 'lastactivity':
-        order = "COALESCE(ip.last_activity_at, '0001-01-01') DESC, i.legal_name COLLATE NOCASE ASC"
+    where_sql, params = _pipeline_filters(eid, q, stage)
     sql = f"""
         SELECT ip.id, ip.stage, ip.owner_user_id, ip.last_activity_at,
                i.id, i.legal_name, i.firm, i.email
         FROM investor_pipelines ip JOIN investors i ON i.id = ip.investor_id
-        WHERE {' AND '.join(where)}
-        ORDER BY {order}
+        WHERE {where_sql}
+        ORDER BY {_pipeline_order(sort)}
     """
     rows = db.execute(sa_text(sql), params).fetchall()
     stages = ["Not Started","Diligence","Pitched","Won","Lost"]
@@ -421,6 +558,33 @@ async def get_pipeline(
     return [{"stage": s, "items": grouped[s]} for s in stages]
 
 
+@router.get("/pipeline/export")
+async def export_pipeline(
+    entity: int | None = Query(None),
+    entity_id: int | None = Query(None),
+    q: Optional[str] = Query(None),
+    stage: Optional[str] = Query(None),
+    sort: Optional[str] = Query(None),
+    partner=Depends(_require_clerk_user),
+    db: Session = Depends(get_db),
+):
+    """Stream the entity's investor pipeline as CSV (same filters as /pipeline)"""
+    _ensure_schema(db)
+    eid = _resolve_entity(entity, entity_id)
+    if not eid:
+        raise HTTPException(status_code=422, detail="entity is required")
+    where_sql, params = _pipeline_filters(eid, q, stage)
+    sql = f"""
+        SELECT ip.id, ip.stage, i.legal_name, i.firm, i.email, i.phone, i.type, ip.owner_user_id, ip.last_activity_at
+        FROM investor_pipelines ip JOIN investors i ON i.id = ip.investor_id
+        WHERE {where_sql}
+        ORDER BY {_pipeline_order(sort)}
+    """
+    header = ["pipeline_id", "stage", "investor_name", "firm", "email", "phone", "type", "owner_user_id",
+              "last_activity_at"]
+    return csv_response(db, sql, params, header, f"investor-pipeline-{eid}.csv")
+
+
 @router.post("/pipeline")
 async def upsert_pipeline(
     payload: Dict[str, Any],
@@ -486,34 +650,45 @@ async def search_investors(
     partner=Depends(_require_clerk_user),
     db: Session = Depends(get_db),
 ):
-    """Search global investors by name/firm/email. If entity provided, exclude already linked."""
+    """
+    Search global investors by name/firm/email prefixes, best matches first.
+    If entity provided, exclude investors already in its pipeline.
+    """
     _ensure_schema(db)
-    ql = f"%{(q or '').lower()}%"
     eid = _resolve_entity(entity, entity_id)
+    params: Dict[str, Any] = {"lim": limit}
+    where: List[str] = []
     if eid:
-        rows = db.execute(sa_text(
-            """
+        # Probes the UNIQUE(entity_id, investor_id) index once per candidate
+        where.append("NOT EXISTS (SELECT 1 FROM investor_pipelines ip WHERE ip.entity_id = :e AND ip.investor_id = i.id)")
+        params["e"] = eid
+    match = _search_match(q or "")
+    if match and _has_search_index(db):
+        params["m"] = match
+        # Exclusion and ranking both happen before the LIMIT, so the best
+        # unlinked match is returned however many weaker hits precede it
+        sql = f"""
             SELECT i.id, i.legal_name, i.firm, i.email
-            FROM investors i
-            WHERE (
-                lower(i.legal_name) LIKE :q OR lower(coalesce(i.firm,'')) LIKE :q OR lower(coalesce(i.email,'')) LIKE :q
-            ) AND i.id NOT IN (
-                SELECT investor_id FROM investor_pipelines WHERE entity_id = :e
-            )
-            ORDER BY i.legal_name COLLATE NOCASE ASC
+            FROM investors_fts f
+            JOIN investor_search_keys k ON k.key = f.rowid
+            JOIN investors i ON i.id = k.investor_id
+            WHERE {" AND ".join(["investors_fts MATCH :m"] + where)}
+            ORDER BY f.rank, i.legal_name COLLATE NOCASE ASC
             LIMIT :lim
-            """
-        ), {"q": ql, "e": eid, "lim": limit}).fetchall()
+        """
     else:
-        rows = db.execute(sa_text(
-            """
+        if match:
+            # No FTS5 in this SQLite build
+            where.insert(0, "(lower(i.legal_name) LIKE :q OR lower(coalesce(i.firm,'')) LIKE :q OR lower(coalesce(i.email,'')) LIKE :q)")
+            params["q"] = f"%{q.lower()}%"
+        sql = f"""
             SELECT i.id, i.legal_name, i.firm, i.email
             FROM investors i
-            WHERE lower(i.legal_name) LIKE :q OR lower(coalesce(i.firm,'')) LIKE :q OR lower(coalesce(i.email,'')) LIKE :q
+            {"WHERE " + " AND ".join(where) if where else ""}
             ORDER BY i.legal_name COLLATE NOCASE ASC
             LIMIT :lim
-            """
-        ), {"q": ql, "lim": limit}).fetchall()
+        """
+    rows = db.execute(sa_text(sql), params).fetchall()
     return [{"id": "" if r[0] is None else str(r[0]), "legal_name": r[1], "firm": r[2], "email": r[3]} for r in rows]
 
 
@@ -7,11 +7,13 @@ from typing import Dict, Any, List
 from sqlalchemy.orm import Session
 from sqlalchemy import text as sa_text
 from services.api.database_async import get_async_db
+from services.api.schema_bootstrap import schema_ensurer
 import uuid
 
 router = APIRouter(prefix="/api/mappings", tags=["mappings"])
 
 
+@schema_ensurer("mappings")
 def _ensure_tables(db: Session):
     db.execute(sa_text("""
         CREATE TABLE IF NOT EXISTS vendors (
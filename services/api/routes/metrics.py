@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text as sa_text
 
 from ..database import get_db
+from ..schema_bootstrap import schema_ensurer
 from ..auth_deps import require_clerk_user as _require_clerk_user
 
 
@@ -19,6 +20,7 @@ router = APIRouter(prefix="/api/metrics", tags=["metrics"])
 _TEST_CLEANED = False
 
 
+@schema_ensurer("metrics")
 def _ensure_schema(db: Session) -> None:
     db.execute(sa_text(
         """
@@ -6,6 +6,7 @@ from datetime import datetime
 from pathlib import Path
 
 from services.api.database import get_db
+from services.api.schema_bootstrap import schema_ensurer
 from .advisory import require_ngiadvisory_admin, _ensure_tables
 from services.api.integrations import google_calendar as gcal
 from services.api.integrations import slack as slack
@@ -14,6 +15,7 @@ router = APIRouter()
 public_router = APIRouter()
 
 
+@schema_ensurer("plm")
 def _ensure_plm_tables(db: Session):
     db.execute(sa_text(
         """
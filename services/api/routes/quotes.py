@@ -22,12 +22,14 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text as sa_text
 
 from services.api.database import get_db
+from services.api.schema_bootstrap import schema_ensurer
 from services.api.auth_deps import require_clerk_user
 
 
 router = APIRouter(prefix="/api/quotes", tags=["quotes"])
 
 
+@schema_ensurer("quotes")
 def _ensure_table(db: Session) -> None:
     db.execute(
         sa_text(
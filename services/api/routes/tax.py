@@ -16,6 +16,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text as sa_text
 
 from ..database import get_db
+from ..schema_bootstrap import schema_ensurer
 from ..auth_deps import require_clerk_user as _require_clerk_user
 from fastapi import Depends
 
@@ -31,6 +32,7 @@ def _json(v: Any) -> str:
     return json.dumps(v, separators=(",", ":"))
 
 
+@schema_ensurer("tax")
 def _ensure_schema(db: Session) -> None:
     # Extend entities with tax-related columns if they exist
     try:
@@ -1,35 +1,120 @@
 """
 Background Scheduler for Mercury Bank Auto-Sync
 Runs Mercury transaction sync every hour for all active entities
+
+Entities are synced concurrently (bounded by MERCURY_SYNC_CONCURRENCY), each
+with its own per-page sessions so one slow or failing entity neither delays
+the others nor holds the SQLite write lock for the whole run. Starts are
+jittered, failing entities back off exponentially, and an account that is
+still syncing is skipped rather than run twice. Per-run duration and row
+counts are kept in a short history exposed through get_scheduler_status().
 """
 
+import asyncio
 import logging
+import os
+import random
+import time
+from collections import deque
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy import select
 
 from services.api.database_async import get_async_session_factory
-from services.api.models_accounting import AccountingEntity
 from services.api.models_accounting_part2 import BankAccount
-from services.api.services.mercury_sync_service import MercurySyncService
+from services.api.services.mercury_sync_service import (
+    MercurySyncService, SyncAlreadyRunning, get_in_flight_syncs, mercury_sync_guard
+)
+from services.api.diagnostics import register_stats
 
 logger = logging.getLogger(__name__)
 
+MERCURY_SYNC_CONCURRENCY = int(os.getenv("MERCURY_SYNC_CONCURRENCY", "4"))
+MERCURY_SYNC_JITTER_SECONDS = float(os.getenv("MERCURY_SYNC_JITTER_SECONDS", "5"))
+MERCURY_SYNC_DAYS_BACK = 7
+BACKOFF_BASE_SECONDS = 300
+BACKOFF_MAX_SECONDS = 6 * 3600
+
 # Global scheduler instance
 scheduler = None
 
+# entity_id -> (consecutive failures, monotonic time before which the entity is skipped)
+_backoff: Dict[int, Tuple[int, float]] = {}
+_run_history: deque = deque(maxlen=24)
+
+
+def get_sync_run_history() -> List[Dict]:
+    return list(_run_history)
+
+
+def _record_failure(entity_id: int) -> float:
+    failures = _backoff.get(entity_id, (0, 0.0))[0] + 1
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** (failures - 1), BACKOFF_MAX_SECONDS)
+    _backoff[entity_id] = (failures, time.monotonic() + delay)
+    return delay
+
+
+async def _sync_entity(entity_id: int, semaphore: asyncio.Semaphore, session_factory) -> Dict:
+    """Sync one entity with its own sessions; never raises"""
+    backoff = _backoff.get(entity_id)
+    if backoff and backoff[1] > time.monotonic():
+        return {"entity_id": entity_id, "success": False, "skipped": "backoff"}
+
+    async with semaphore:
+        if MERCURY_SYNC_JITTER_SECONDS > 0:
+            await asyncio.sleep(random.uniform(0, MERCURY_SYNC_JITTER_SECONDS))
+
+        sync_service = MercurySyncService(session_factory=session_factory)
+        started = time.perf_counter()
+        try:
+            with mercury_sync_guard(entity_id, sync_service.account_id):
+                result = await sync_service.sync_transactions(entity_id, days_back=MERCURY_SYNC_DAYS_BACK)
+        except SyncAlreadyRunning as e:
+            logger.info(f"[Mercury Auto-Sync] Entity {entity_id} skipped: {str(e)}")
+            return {"entity_id": entity_id, "success": False, "skipped": "overlap"}
+        except Exception as e:
+            result = {"success": False, "message": str(e)}
+
+        duration_ms = int((time.perf_counter() - started) * 1000)
+        if result.get("success"):
+            _backoff.pop(entity_id, None)
+            logger.info(
+                f"[Mercury Auto-Sync] Entity {entity_id}: "
+                f"Fetched {result.get('synced', 0)} transactions, "
+                f"{result.get('new_transactions', 0)} new, "
+                f"{result.get('pages', 0)} pages in {duration_ms}ms"
+            )
+        else:
+            delay = _record_failure(entity_id)
+            logger.warning(
+                f"[Mercury Auto-Sync] Entity {entity_id} sync failed: "
+                f"{result.get('message', 'Unknown error')} (retry in {int(delay)}s)"
+            )
+
+        return {
+            "entity_id": entity_id,
+            "success": bool(result.get("success")),
+            "synced": result.get("synced", 0),
+            "new_transactions": result.get("new_transactions", 0),
+            "pages": result.get("pages", 0),
+            "duration_ms": duration_ms,
+            "error": None if result.get("success") else result.get("message"),
+        }
 
-async def sync_all_mercury_accounts():
+
+async def sync_all_mercury_accounts(concurrency: Optional[int] = None) -> Dict:
     """
     Background job to sync all Mercury accounts for all active entities
     Runs every hour
     """
     logger.info(f"[Mercury Auto-Sync] Starting hourly sync at {datetime.now()}")
+    started_at = datetime.now()
+    started = time.perf_counter()
+    run: Dict = {"started_at": started_at.isoformat(), "entities": 0, "results": []}
 
     try:
-        # Get async database session
         session_factory = get_async_session_factory()
         async with session_factory() as db:
             # Get all active entities with Mercury accounts
@@ -42,60 +127,36 @@ async def sync_all_mercury_accounts():
             )
             entity_ids = [row[0] for row in result.all()]
 
-            logger.info(f"[Mercury Auto-Sync] Found {len(entity_ids)} entities with auto-sync enabled")
-
-            # Sync each entity
-            sync_results = []
-            for entity_id in entity_ids:
-                try:
-                    sync_service = MercurySyncService(db)
-                    result = await sync_service.sync_transactions(entity_id, days_back=7)
-
-                    sync_results.append({
-                        "entity_id": entity_id,
-                        "success": result.get("success", False),
-                        "synced": result.get("synced", 0),
-                        "matched": result.get("matched", 0),
-                        "created_drafts": result.get("created_drafts", 0)
-                    })
-
-                    if result.get("success"):
-                        logger.info(
-                            f"[Mercury Auto-Sync] Entity {entity_id}: "
-                            f"Synced {result.get('synced', 0)} transactions, "
-                            f"Matched {result.get('matched', 0)}, "
-                            f"Created {result.get('created_drafts', 0)} drafts"
-                        )
-                    else:
-                        logger.warning(
-                            f"[Mercury Auto-Sync] Entity {entity_id} sync failed: "
-                            f"{result.get('message', 'Unknown error')}"
-                        )
-
-                except Exception as e:
-                    logger.error(f"[Mercury Auto-Sync] Error syncing entity {entity_id}: {str(e)}")
-                    sync_results.append({
-                        "entity_id": entity_id,
-                        "success": False,
-                        "error": str(e)
-                    })
-
-            # Summary
-            successful = sum(1 for r in sync_results if r.get("success"))
-            total_synced = sum(r.get("synced", 0) for r in sync_results)
-            total_matched = sum(r.get("matched", 0) for r in sync_results)
-            total_drafts = sum(r.get("created_drafts", 0) for r in sync_results)
+        logger.info(f"[Mercury Auto-Sync] Found {len(entity_ids)} entities with auto-sync enabled")
 
-            logger.info(
-                f"[Mercury Auto-Sync] Completed: "
-                f"{successful}/{len(entity_ids)} entities successful, "
-                f"{total_synced} total transactions, "
-                f"{total_matched} matched, "
-                f"{total_drafts} drafts created"
-            )
+        semaphore = asyncio.Semaphore(concurrency or MERCURY_SYNC_CONCURRENCY)
+        sync_results = await asyncio.gather(
+            *(_sync_entity(entity_id, semaphore, session_factory) for entity_id in entity_ids)
+        )
+
+        # Summary
+        run.update(
+            entities=len(entity_ids),
+            successful=sum(1 for r in sync_results if r.get("success")),
+            skipped=sum(1 for r in sync_results if r.get("skipped")),
+            fetched=sum(r.get("synced", 0) for r in sync_results),
+            inserted=sum(r.get("new_transactions", 0) for r in sync_results),
+            results=list(sync_results),
+        )
 
     except Exception as e:
         logger.error(f"[Mercury Auto-Sync] Fatal error in sync job: {str(e)}")
+        run["error"] = str(e)
+
+    run["duration_ms"] = int((time.perf_counter() - started) * 1000)
+    _run_history.append(run)
+    logger.info(
+        f"[Mercury Auto-Sync] Completed in {run['duration_ms']}ms: "
+        f"{run.get('successful', 0)}/{run['entities']} entities successful, "
+        f"{run.get('skipped', 0)} skipped, "
+        f"{run.get('inserted', 0)} new of {run.get('fetched', 0)} fetched"
+    )
+    return run
 
 
 def start_scheduler():
@@ -148,10 +209,18 @@ def get_scheduler_status():
     """
     global scheduler
 
+    sync = {
+        "concurrency": MERCURY_SYNC_CONCURRENCY,
+        "in_flight": get_in_flight_syncs(),
+        "backing_off": [entity_id for entity_id, (_, until) in _backoff.items() if until > time.monotonic()],
+        "recent_runs": get_sync_run_history(),
+    }
+
     if scheduler is None:
         return {
             "running": False,
-            "jobs": []
+            "jobs": [],
+            "mercury_sync": sync
         }
 
     jobs = []
@@ -165,5 +234,9 @@ def get_scheduler_status():
 
     return {
         "running": True,
-        "jobs": jobs
+        "jobs": jobs,
+        "mercury_sync": sync
     }
+
+
+register_stats("mercury_sync", get_scheduler_status)
@@ -0,0 +1,238 @@
+"""
+Schema bootstrap for NGI Capital Internal System
+
+Route modules own small `_ensure_*` helpers that CREATE TABLE IF NOT EXISTS /
+ALTER TABLE the raw-SQL tables they use. Those helpers are registered here with
+`@schema_ensurer(name)` so that:
+
+- at startup `bootstrap_schema()` runs every registered helper once and records
+  a fingerprint (helper source + resulting sqlite_master) in schema_bootstrap_state;
+  a restart against an unchanged database with unchanged helpers skips the DDL
+- per-request calls become an in-memory "already ensured" set lookup keyed by
+  database URL, so handlers no longer issue DDL/pragma queries on every request
+
+Helpers registered with `@schema_check(name)` run on every bootstrap, including
+the unchanged-fingerprint path, for cheap consistency checks on derived data
+(e.g. full-text indexes) that the DDL fingerprint cannot see.
+
+Run manually with:
+    python -m services.api.schema_bootstrap [--force]
+
+Author: NGI Capital Development Team
+Date: December 2025
+"""
+
+import functools
+import hashlib
+import inspect
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Set, Tuple
+
+from sqlalchemy import text as sa_text
+from .diagnostics import register_stats
+
+logger = logging.getLogger(__name__)
+
+# name -> ensure function (undecorated)
+_registry: Dict[str, Callable] = {}
+# name -> startup consistency check
+_checks: Dict[str, Callable] = {}
+# (database url, name) pairs already ensured in this process
+_ensured: Set[Tuple[str, str]] = set()
+_lock = threading.RLock()
+_stats = {"runs": 0, "skips": 0, "checks": 0}
+
+
+def _db_key(db) -> str:
+    try:
+        url = db.get_bind().url
+        # Sync and async (aiosqlite) sessions on one database share a key
+        return str(url.set(drivername=url.get_backend_name()))
+    except Exception:
+        return "default"
+
+
+def schema_ensurer(name: str):
+    """Register an `_ensure_*(db)` helper and make repeat calls a set lookup"""
+
+    def decorator(fn: Callable) -> Callable:
+        _registry[name] = fn
+
+        @functools.wraps(fn)
+        def wrapper(db, *args, **kwargs):
+            key = (_db_key(db), name)
+            if key in _ensured:
+                _stats["skips"] += 1
+                return None
+            with _lock:
+                if key in _ensured:
+                    return None
+                result = fn(db, *args, **kwargs)
+                try:
+                    db.commit()
+                except Exception:
+                    pass
+                _ensured.add(key)
+                _stats["runs"] += 1
+                return result
+
+        wrapper.__wrapped_ensure__ = fn
+        return wrapper
+
+    return decorator
+
+
+def schema_check(name: str):
+    """Register a `check(db)` run by every bootstrap, fingerprint unchanged or not"""
+
+    def decorator(fn: Callable) -> Callable:
+        _checks[name] = fn
+        return fn
+
+    return decorator
+
+
+def _run_checks(db) -> list:
+    failed = []
+    for name, fn in sorted(_checks.items()):
+        try:
+            fn(db)
+            db.commit()
+            _stats["checks"] += 1
+        except Exception as e:
+            db.rollback()
+            failed.append(name)
+            logger.warning(f"Schema check '{name}' failed: {e}")
+    return failed
+
+
+def mark_ensured(db_url: str, names=None) -> None:
+    for name in (names or list(_registry)):
+        _ensured.add((db_url, name))
+
+
+def reset_ensured() -> None:
+    """Forget what has been ensured (e.g. after a database file is replaced)"""
+    _ensured.clear()
+
+
+def get_bootstrap_stats() -> Dict[str, int]:
+    return {**_stats, "registered": len(_registry), "checks_registered": len(_checks), "ensured": len(_ensured)}
+
+
+register_stats("schema_bootstrap", get_bootstrap_stats)
+
+
+def code_fingerprint() -> str:
+    digest = hashlib.sha256()
+    for name in sorted(_registry):
+        digest.update(name.encode())
+        try:
+            digest.update(inspect.getsource(_registry[name]).encode())
+        except (OSError, TypeError):
+            pass
+    return digest.hexdigest()
+
+
+def schema_fingerprint(db) -> str:
+    rows = db.execute(sa_text(
+        "SELECT type, name, COALESCE(sql, '') FROM sqlite_master "
+        "WHERE name != 'schema_bootstrap_state' ORDER BY type, name"
+    )).fetchall()
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update("|".join(str(v) for v in row).encode())
+    return digest.hexdigest()
+
+
+def _ensure_state_table(db) -> None:
+    db.execute(sa_text(
+        """
+        CREATE TABLE IF NOT EXISTS schema_bootstrap_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            code_fingerprint TEXT NOT NULL,
+            schema_fingerprint TEXT NOT NULL,
+            applied_at TEXT
+        )
+        """
+    ))
+
+
+def bootstrap_schema(db, force: bool = False) -> Dict[str, object]:
+    """Run all registered ensure helpers once unless fingerprints are unchanged"""
+    url = _db_key(db)
+    _ensure_state_table(db)
+    db.commit()
+    code_fp = code_fingerprint()
+    stored = db.execute(sa_text(
+        "SELECT code_fingerprint, schema_fingerprint FROM schema_bootstrap_state WHERE id = 1"
+    )).fetchone()
+    if not force and stored and stored[0] == code_fp and stored[1] == schema_fingerprint(db):
+        mark_ensured(url)
+        return {
+            "status": "unchanged", "ensured": len(_registry), "fingerprint": code_fp,
+            "failed_checks": _run_checks(db),
+        }
+
+    failed = []
+    _ensured.difference_update({k for k in _ensured if k[0] == url})
+    for name, fn in sorted(_registry.items()):
+        if (url, name) in _ensured:
+            continue  # already run by another ensurer that calls it
+        try:
+            fn(db)
+            db.commit()
+            _ensured.add((url, name))
+        except Exception as e:
+            db.rollback()
+            failed.append(name)
+            logger.warning(f"Schema ensure '{name}' failed: {e}")
+
+    if not failed:
+        db.execute(sa_text(
+            """
+            INSERT INTO schema_bootstrap_state (id, code_fingerprint, schema_fingerprint, applied_at)
+            VALUES (1, :code, :schema, :at)
+            ON CONFLICT(id) DO UPDATE SET code_fingerprint = excluded.code_fingerprint,
+                schema_fingerprint = excluded.schema_fingerprint, applied_at = excluded.applied_at
+            """
+        ), {"code": code_fp, "schema": schema_fingerprint(db), "at": datetime.utcnow().isoformat()})
+        db.commit()
+    return {
+        "status": "applied" if not failed else "partial",
+        "ensured": len(_registry) - len(failed),
+        "failed": failed,
+        "fingerprint": code_fp,
+        "failed_checks": _run_checks(db),
+    }
+
+
+def run_startup_bootstrap(force: bool = False) -> Dict[str, object]:
+    """Open a session on the sync engine and bootstrap; used by app lifespan and CLI"""
+    from services.api.database import get_session_factory
+
+    db = get_session_factory()()
+    try:
+        return bootstrap_schema(db, force=force)
+    finally:
+        db.close()
+
+
+def _run_cli() -> None:
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Run one-shot schema bootstrap")
+    parser.add_argument("--force", action="store_true", help="Ignore stored fingerprint")
+    args = parser.parse_args()
+    # Importing the app registers every route module's ensure helpers; go through
+    # the package module (not __main__) so the shared registry is used
+    import services.api.main  # noqa: F401
+    from services.api.schema_bootstrap import run_startup_bootstrap as _run
+    print(json.dumps(_run(force=args.force), indent=2))
+
+
+if __name__ == "__main__":
+    _run_cli()
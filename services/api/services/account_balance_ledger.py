@@ -0,0 +1,439 @@
+"""
+Account Balance Ledger
+Posting-time maintenance of per-account, per-period debit/credit totals
+
+Posting a journal entry adds its line totals (grouped by account) to
+account_period_balances, keyed by account and calendar month of entry_date,
+and to ChartOfAccounts.current_balance in the caller's transaction.
+Unposting subtracts the same amounts. Trial balances and balance sheets as
+of any date then read one ledger row per account per month instead of
+scanning every journal entry line.
+
+Rebuild / verify from the command line:
+    python -m services.api.services.account_balance_ledger rebuild [--entity-id N]
+    python -m services.api.services.account_balance_ledger verify [--entity-id N]
+
+Author: NGI Capital Development Team
+Date: December 2025
+"""
+
+import calendar
+import logging
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update, delete, and_, or_, func, extract
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.api.models_accounting import (
+    AccountPeriodBalance, ChartOfAccounts, EntityLedgerVersion, JournalEntry, JournalEntryLine
+)
+from services.api.services.dashboard_snapshot import mark_dashboard_stale
+from services.api.utils.datetime_utils import get_pst_now
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal("0.00")
+Totals = Tuple[Decimal, Decimal]  # (debits, credits)
+
+
+def _dec(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(ZERO)
+
+
+def signed_balance(normal_balance: Optional[str], debits: Decimal, credits: Decimal) -> Decimal:
+    """Balance expressed on the account's normal side (positive = normal)"""
+    raw = debits - credits
+    return -raw if str(normal_balance or "Debit").lower() == "credit" else raw
+
+
+def _insert_for(db: AsyncSession):
+    """Dialect insert() that supports on_conflict_do_update"""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql_insert
+    return sqlite_insert
+
+
+def _is_month_end(d: date) -> bool:
+    return d.day == calendar.monthrange(d.year, d.month)[1]
+
+
+class AccountBalanceLedger:
+    """Maintain and query the account_period_balances ledger"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    # ------------------------------------------------------------------------
+    # Posting hooks (call before the posting transaction commits)
+    # ------------------------------------------------------------------------
+
+    async def post_entry(self, je: JournalEntry) -> int:
+        """Add a posted entry to the ledger; returns number of accounts touched"""
+        return await self._apply(je, 1)
+
+    async def unpost_entry(self, je: JournalEntry) -> int:
+        """Remove a previously posted entry from the ledger"""
+        return await self._apply(je, -1)
+
+    async def _apply(self, je: JournalEntry, sign: int) -> int:
+        totals = await self._entry_totals(je.id)
+        if not totals:
+            return 0
+
+        year, month = je.entry_date.year, je.entry_date.month
+        now = get_pst_now()
+
+        # One upsert that increments in SQL, so concurrent postings to the
+        # same account/month compose instead of racing on uq_apb_account_period
+        stmt = _insert_for(self.db)(AccountPeriodBalance).values([
+            {
+                "entity_id": je.entity_id,
+                "account_id": account_id,
+                "period_year": year,
+                "period_month": month,
+                "debit_total": sign * debits,
+                "credit_total": sign * credits,
+                "updated_at": now,
+            }
+            for account_id, (debits, credits) in totals.items()
+        ])
+        await self.db.execute(stmt.on_conflict_do_update(
+            index_elements=["account_id", "period_year", "period_month"],
+            set_={
+                "debit_total": AccountPeriodBalance.debit_total + stmt.excluded.debit_total,
+                "credit_total": AccountPeriodBalance.credit_total + stmt.excluded.credit_total,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ))
+
+        accounts = await self.db.execute(
+            select(
+                ChartOfAccounts.id,
+                ChartOfAccounts.normal_balance,
+                ChartOfAccounts.last_transaction_date,
+            ).where(ChartOfAccounts.id.in_(totals.keys()))
+        )
+        for account_id, normal_balance, last_date in accounts:
+            debits, credits = totals[int(account_id)]
+            values = {
+                "current_balance": func.coalesce(ChartOfAccounts.current_balance, 0)
+                + sign * signed_balance(normal_balance, debits, credits),
+            }
+            if sign > 0 and (last_date is None or je.entry_date > last_date):
+                values["last_transaction_date"] = je.entry_date
+            await self.db.execute(
+                update(ChartOfAccounts)
+                .where(ChartOfAccounts.id == account_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+
+        await self.bump_version(je.entity_id)
+
+        # Flush so a second entry in the same session sees the new rows
+        await self.db.flush()
+        return len(totals)
+
+    async def _entry_totals(self, entry_id: int) -> Dict[int, Totals]:
+        result = await self.db.execute(
+            select(
+                JournalEntryLine.account_id,
+                func.coalesce(func.sum(JournalEntryLine.debit_amount), 0),
+                func.coalesce(func.sum(JournalEntryLine.credit_amount), 0),
+            )
+            .where(JournalEntryLine.journal_entry_id == entry_id)
+            .group_by(JournalEntryLine.account_id)
+        )
+        return {int(aid): (_dec(deb), _dec(cred)) for aid, deb, cred in result}
+
+    # ------------------------------------------------------------------------
+    # Ledger version
+    # ------------------------------------------------------------------------
+
+    async def get_version(self, entity_id: int) -> int:
+        result = await self.db.execute(
+            select(EntityLedgerVersion.version).where(EntityLedgerVersion.entity_id == entity_id)
+        )
+        return int(result.scalar_one_or_none() or 0)
+
+    async def bump_version(self, entity_id: int) -> None:
+        """Invalidate anything cached against this entity's balances"""
+        result = await self.db.execute(
+            update(EntityLedgerVersion)
+            .where(EntityLedgerVersion.entity_id == entity_id)
+            .values(version=EntityLedgerVersion.version + 1, updated_at=get_pst_now())
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            self.db.add(EntityLedgerVersion(entity_id=entity_id, version=1, updated_at=get_pst_now()))
+            await self.db.flush()
+        await mark_dashboard_stale(self.db)
+
+    # ------------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------------
+
+    async def balances_as_of(self, entity_id: int, as_of: date) -> Dict[int, Totals]:
+        """
+        Cumulative (debits, credits) per account through as_of
+
+        Whole months come from the ledger; for a mid-month date the partial
+        month is added from that month's posted lines only.
+        """
+        through_month = as_of.month if _is_month_end(as_of) else as_of.month - 1
+        result = await self.db.execute(
+            select(
+                AccountPeriodBalance.account_id,
+                func.coalesce(func.sum(AccountPeriodBalance.debit_total), 0),
+                func.coalesce(func.sum(AccountPeriodBalance.credit_total), 0),
+            )
+            .where(
+                and_(
+                    AccountPeriodBalance.entity_id == entity_id,
+                    or_(
+                        AccountPeriodBalance.period_year < as_of.year,
+                        and_(
+                            AccountPeriodBalance.period_year == as_of.year,
+                            AccountPeriodBalance.period_month <= through_month,
+                        ),
+                    ),
+                )
+            )
+            .group_by(AccountPeriodBalance.account_id)
+        )
+        totals = {int(aid): (_dec(deb), _dec(cred)) for aid, deb, cred in result}
+
+        if through_month != as_of.month:
+            partial = await self._posted_line_totals(
+                entity_id, date(as_of.year, as_of.month, 1), as_of
+            )
+            for aid, (deb, cred) in partial.items():
+                base_deb, base_cred = totals.get(aid, (ZERO, ZERO))
+                totals[aid] = (base_deb + deb, base_cred + cred)
+        return totals
+
+    async def signed_balances_as_of(self, entity_id: int, as_of: date) -> Dict[int, Decimal]:
+        """Normal-side balance per account through as_of"""
+        totals = await self.balances_as_of(entity_id, as_of)
+        if not totals:
+            return {}
+        result = await self.db.execute(
+            select(ChartOfAccounts.id, ChartOfAccounts.normal_balance).where(
+                ChartOfAccounts.id.in_(totals.keys())
+            )
+        )
+        return {
+            int(aid): signed_balance(normal, *totals[int(aid)])
+            for aid, normal in result
+        }
+
+    async def trial_balance(self, entity_id: int, as_of: date) -> Dict:
+        """Trial balance as of a date, one line per account with activity"""
+        totals = await self.balances_as_of(entity_id, as_of)
+        lines: List[Dict] = []
+        total_debits = ZERO
+        total_credits = ZERO
+        if totals:
+            result = await self.db.execute(
+                select(ChartOfAccounts)
+                .where(ChartOfAccounts.id.in_(totals.keys()))
+                .order_by(ChartOfAccounts.account_number)
+            )
+            for account in result.scalars():
+                deb, cred = totals[account.id]
+                net = deb - cred
+                debit_col = net if net > 0 else ZERO
+                credit_col = -net if net < 0 else ZERO
+                total_debits += debit_col
+                total_credits += credit_col
+                lines.append({
+                    "account_id": account.id,
+                    "account_number": account.account_number,
+                    "account_name": account.account_name,
+                    "account_type": account.account_type,
+                    "debit": float(debit_col),
+                    "credit": float(credit_col),
+                    "balance": float(signed_balance(account.normal_balance, deb, cred)),
+                })
+
+        difference = abs(total_debits - total_credits)
+        return {
+            "as_of_date": as_of.isoformat(),
+            "accounts": lines,
+            "total_debits": float(total_debits),
+            "total_credits": float(total_credits),
+            "difference": float(difference),
+            "is_balanced": difference < Decimal("0.01"),
+        }
+
+    async def _posted_line_totals(
+        self,
+        entity_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict[int, Totals]:
+        conditions = [JournalEntry.entity_id == entity_id, JournalEntry.status == "posted"]
+        if start:
+            conditions.append(JournalEntry.entry_date >= start)
+        if end:
+            conditions.append(JournalEntry.entry_date <= end)
+        result = await self.db.execute(
+            select(
+                JournalEntryLine.account_id,
+                func.coalesce(func.sum(JournalEntryLine.debit_amount), 0),
+                func.coalesce(func.sum(JournalEntryLine.credit_amount), 0),
+            )
+            .join(JournalEntry, JournalEntry.id == JournalEntryLine.journal_entry_id)
+            .where(and_(*conditions))
+            .group_by(JournalEntryLine.account_id)
+        )
+        return {int(aid): (_dec(deb), _dec(cred)) for aid, deb, cred in result}
+
+    # ------------------------------------------------------------------------
+    # Rebuild / verify
+    # ------------------------------------------------------------------------
+
+    async def _expected_periods(self, entity_id: Optional[int]) -> Dict[Tuple[int, int, int], Tuple[int, Decimal, Decimal]]:
+        """(account_id, year, month) -> (entity_id, debits, credits) from posted lines"""
+        year = extract("year", JournalEntry.entry_date)
+        month = extract("month", JournalEntry.entry_date)
+        query = (
+            select(
+                JournalEntry.entity_id,
+                JournalEntryLine.account_id,
+                year,
+                month,
+                func.coalesce(func.sum(JournalEntryLine.debit_amount), 0),
+                func.coalesce(func.sum(JournalEntryLine.credit_amount), 0),
+            )
+            .join(JournalEntry, JournalEntry.id == JournalEntryLine.journal_entry_id)
+            .where(JournalEntry.status == "posted")
+            .group_by(JournalEntry.entity_id, JournalEntryLine.account_id, year, month)
+        )
+        if entity_id is not None:
+            query = query.where(JournalEntry.entity_id == entity_id)
+        result = await self.db.execute(query)
+        return {
+            (int(aid), int(y), int(m)): (int(eid), _dec(deb), _dec(cred))
+            for eid, aid, y, m, deb, cred in result
+        }
+
+    async def rebuild(self, entity_id: Optional[int] = None) -> Dict:
+        """Recompute the ledger and ChartOfAccounts.current_balance from posted lines"""
+        expected = await self._expected_periods(entity_id)
+
+        purge = delete(AccountPeriodBalance)
+        if entity_id is not None:
+            purge = purge.where(AccountPeriodBalance.entity_id == entity_id)
+        await self.db.execute(purge.execution_options(synchronize_session=False))
+
+        now = get_pst_now()
+        cumulative: Dict[int, Totals] = {}
+        for (aid, y, m), (eid, deb, cred) in expected.items():
+            self.db.add(AccountPeriodBalance(
+                entity_id=eid, account_id=aid, period_year=y, period_month=m,
+                debit_total=deb, credit_total=cred, updated_at=now,
+            ))
+            base_deb, base_cred = cumulative.get(aid, (ZERO, ZERO))
+            cumulative[aid] = (base_deb + deb, base_cred + cred)
+
+        accounts_q = select(ChartOfAccounts)
+        if entity_id is not None:
+            accounts_q = accounts_q.where(ChartOfAccounts.entity_id == entity_id)
+        accounts = (await self.db.execute(accounts_q)).scalars().all()
+        for account in accounts:
+            deb, cred = cumulative.get(account.id, (ZERO, ZERO))
+            account.current_balance = signed_balance(account.normal_balance, deb, cred)
+
+        entity_ids = {a.entity_id for a in accounts} | {eid for eid, _, _ in expected.values()}
+        for eid in entity_ids:
+            await self.bump_version(eid)
+
+        await self.db.commit()
+        logger.info(
+            "Rebuilt balance ledger: %d period rows, %d accounts", len(expected), len(accounts)
+        )
+        return {"period_rows": len(expected), "accounts": len(accounts)}
+
+    async def rebuild_if_empty(self) -> Optional[Dict]:
+        """Backfill a ledger that was never populated (e.g. created by create_all)"""
+        if (await self.db.execute(select(AccountPeriodBalance.id).limit(1))).first() is not None:
+            return None
+        posted = await self.db.execute(select(JournalEntry.id).where(JournalEntry.status == "posted").limit(1))
+        if posted.first() is None:
+            return None
+        return await self.rebuild()
+
+    async def verify(self, entity_id: Optional[int] = None) -> Dict:
+        """Compare the ledger and current_balance against posted lines"""
+        expected = await self._expected_periods(entity_id)
+
+        ledger_q = select(AccountPeriodBalance)
+        if entity_id is not None:
+            ledger_q = ledger_q.where(AccountPeriodBalance.entity_id == entity_id)
+        actual = {
+            (r.account_id, r.period_year, r.period_month): (_dec(r.debit_total), _dec(r.credit_total))
+            for r in (await self.db.execute(ledger_q)).scalars()
+        }
+
+        discrepancies: List[Dict] = []
+        cumulative: Dict[int, Totals] = {}
+        for key in sorted(set(expected) | set(actual)):
+            _, exp_deb, exp_cred = expected.get(key, (None, ZERO, ZERO))
+            act_deb, act_cred = actual.get(key, (ZERO, ZERO))
+            if (exp_deb, exp_cred) != (act_deb, act_cred):
+                discrepancies.append({
+                    "account_id": key[0], "period": f"{key[1]:04d}-{key[2]:02d}",
+                    "expected": [float(exp_deb), float(exp_cred)],
+                    "ledger": [float(act_deb), float(act_cred)],
+                })
+            base_deb, base_cred = cumulative.get(key[0], (ZERO, ZERO))
+            cumulative[key[0]] = (base_deb + exp_deb, base_cred + exp_cred)
+
+        accounts_q = select(
+            ChartOfAccounts.id, ChartOfAccounts.normal_balance, ChartOfAccounts.current_balance
+        )
+        if entity_id is not None:
+            accounts_q = accounts_q.where(ChartOfAccounts.entity_id == entity_id)
+        checked = 0
+        for aid, normal, current in await self.db.execute(accounts_q):
+            checked += 1
+            exp = signed_balance(normal, *cumulative.get(int(aid), (ZERO, ZERO)))
+            if _dec(current) != exp:
+                discrepancies.append({
+                    "account_id": int(aid), "period": "current_balance",
+                    "expected": float(exp), "ledger": float(_dec(current)),
+                })
+
+        return {"ok": not discrepancies, "accounts_checked": checked, "discrepancies": discrepancies}
+
+
+async def _run_cli(command: str, entity_id: Optional[int]) -> Dict:
+    from services.api.database_async import get_async_session_factory
+
+    async with get_async_session_factory()() as session:
+        ledger = AccountBalanceLedger(session)
+        if command == "rebuild":
+            return await ledger.rebuild(entity_id)
+        return await ledger.verify(entity_id)
+
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+    import json
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Rebuild or verify the account balance ledger")
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    parser.add_argument("--entity-id", type=int, default=None)
+    args = parser.parse_args()
+    outcome = asyncio.run(_run_cli(args.command, args.entity_id))
+    print(json.dumps(outcome, indent=2, default=str))
+    if args.command == "verify" and not outcome["ok"]:
+        sys.exit(1)
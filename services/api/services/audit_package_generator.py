@@ -2,17 +2,26 @@
 Big 4 Audit Package Generator
 Generates comprehensive fixed asset audit packages per Big 4 requirements
 (PwC, Deloitte, EY, KPMG standards)
+
+The workbook is written with openpyxl's write-only mode: each sheet streams
+its rows from a server-side cursor straight into the sheet's temp file, so
+memory stays bounded regardless of how many assets or depreciation lines the
+year has. Summary figures come from aggregate queries and the depreciation
+schedule is one pivoted query rather than a query per asset. An optional
+progress callback is told when each sheet starts and finishes.
 """
 
 from decimal import Decimal
 from datetime import date
-from typing import Dict, List
+from typing import Any, Callable, Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func, extract
+from sqlalchemy import select, and_, func, extract, case
 from services.api.models_fixed_assets import FixedAsset, DepreciationEntry, AssetDisposal, AuditPackage
 from services.api.models_accounting import AccountingEntity
 from services.api.utils.datetime_utils import get_pst_now
+import asyncio
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 import os
@@ -20,10 +29,25 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip while streaming a sheet
+STREAM_BATCH_SIZE = 1000
+
+# (sheet, rows written so far, finished)
+ProgressCallback = Callable[[str, int, bool], None]
+
+SHEET_TITLES = [
+    "Summary",
+    "PBC-1 Asset Register",
+    "PBC-2 Depreciation",
+    "PBC-3 Roll Forward",
+    "PBC-4 Additions",
+    "PBC-5 Disposals",
+]
+
 
 class AuditPackageGenerator:
     """Generates Big 4 audit packages for fixed assets"""
-    
+
     # PwC/Deloitte/EY/KPMG standard colors
     HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
     HEADER_FONT = Font(bold=True, color="FFFFFF", size=11)
@@ -31,24 +55,25 @@ class AuditPackageGenerator:
     SUBTOTAL_FONT = Font(bold=True, size=10)
     TOTAL_FILL = PatternFill(start_color="305496", end_color="305496", fill_type="solid")
     TOTAL_FONT = Font(bold=True, color="FFFFFF", size=11)
-    
+
     THIN_BORDER = Border(
         left=Side(style='thin'),
         right=Side(style='thin'),
         top=Side(style='thin'),
         bottom=Side(style='thin')
     )
-    
+
     @staticmethod
     async def generate_fixed_asset_audit_package(
         entity_id: int,
         year: int,
         user_email: str,
-        db: AsyncSession
+        db: AsyncSession,
+        progress: Optional[ProgressCallback] = None
     ) -> str:
         """
         Generate complete Big 4 audit package for fixed assets
-        
+
         Returns:
             File path to generated Excel workbook
         """
@@ -56,41 +81,38 @@ class AuditPackageGenerator:
         entity = await db.get(AccountingEntity, entity_id)
         if not entity:
             raise ValueError(f"Entity {entity_id} not found")
-        
+
         period_start = date(year, 1, 1)
         period_end = date(year, 12, 31)
-        
-        # Create workbook
-        wb = openpyxl.Workbook()
-        wb.remove(wb.active)  # Remove default sheet
-        
-        # Generate all schedules
-        await AuditPackageGenerator._create_summary_sheet(wb, entity, year, period_end, db)
-        await AuditPackageGenerator._create_asset_register(wb, entity_id, period_end, db)
-        await AuditPackageGenerator._create_depreciation_schedule(wb, entity_id, year, db)
-        await AuditPackageGenerator._create_roll_forward(wb, entity_id, year, db)
-        await AuditPackageGenerator._create_additions_schedule(wb, entity_id, year, db)
-        await AuditPackageGenerator._create_disposals_schedule(wb, entity_id, year, db)
-        
-        # Save workbook
+        report = progress or (lambda sheet, rows, finished: None)
+        totals = await AuditPackageGenerator._asset_totals(db, entity_id)
+
+        # Write-only workbook: rows go to per-sheet temp files as they stream in
+        wb = openpyxl.Workbook(write_only=True)
+        builders = [
+            lambda ws: AuditPackageGenerator._create_summary_sheet(ws, entity, year, totals, db),
+            lambda ws: AuditPackageGenerator._create_asset_register(ws, entity_id, period_end, db, report),
+            lambda ws: AuditPackageGenerator._create_depreciation_schedule(ws, entity_id, year, db, report),
+            lambda ws: AuditPackageGenerator._create_roll_forward(ws, entity_id, year, totals, db),
+            lambda ws: AuditPackageGenerator._create_additions_schedule(ws, entity_id, year, db, report),
+            lambda ws: AuditPackageGenerator._create_disposals_schedule(ws, entity_id, year, db, report),
+        ]
+        for title, build in zip(SHEET_TITLES, builders):
+            report(title, 0, False)
+            rows = await build(wb.create_sheet(title))
+            report(title, rows, True)
+
+        # Save workbook; write to a partial file so downloads never see a half-written package
         os.makedirs("uploads/audit_packages", exist_ok=True)
         filename = f"Fixed_Asset_Audit_Package_{entity.entity_name.replace(' ', '_')}_{year}.xlsx"
         filepath = f"uploads/audit_packages/{filename}"
-        wb.save(filepath)
-        
+        partial = f"{filepath}.part"
+        await asyncio.to_thread(wb.save, partial)
+        os.replace(partial, filepath)
+
         # Get file size
         file_size = os.path.getsize(filepath)
-        
-        # Get statistics
-        result = await db.execute(
-            select(FixedAsset).where(FixedAsset.entity_id == entity_id)
-        )
-        assets = result.scalars().all()
-        
-        total_cost = sum(a.acquisition_cost for a in assets)
-        total_accum_dep = sum(a.accumulated_depreciation or Decimal("0") for a in assets)
-        total_nbv = total_cost - total_accum_dep
-        
+
         # Create audit package record
         audit_package = AuditPackage(
             entity_id=entity_id,
@@ -106,116 +128,174 @@ class AuditPackageGenerator:
             includes_roll_forward=True,
             includes_additions_schedule=True,
             includes_disposals_schedule=True,
-            total_assets_count=len(assets),
-            total_original_cost=total_cost,
-            total_accumulated_depreciation=total_accum_dep,
-            total_net_book_value=total_nbv,
+            total_assets_count=totals["count"],
+            total_original_cost=totals["cost"],
+            total_accumulated_depreciation=totals["accumulated_depreciation"],
+            total_net_book_value=totals["cost"] - totals["accumulated_depreciation"],
             generated_at=get_pst_now(),
             generated_by_email=user_email
         )
         db.add(audit_package)
         await db.commit()
-        
+
         logger.info(f"Generated audit package: {filename}")
-        
+
         return filepath
-    
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _cell(ws, value, font=None, fill=None, number_format=None, alignment=None, border=None) -> WriteOnlyCell:
+        cell = WriteOnlyCell(ws, value=value)
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        if number_format is not None:
+            cell.number_format = number_format
+        if alignment is not None:
+            cell.alignment = alignment
+        if border is not None:
+            cell.border = border
+        return cell
+
+    @staticmethod
+    def _header_row(ws, headers: List[str], alignment: Alignment, border: bool = False) -> List[WriteOnlyCell]:
+        return [
+            AuditPackageGenerator._cell(
+                ws, header,
+                font=AuditPackageGenerator.HEADER_FONT,
+                fill=AuditPackageGenerator.HEADER_FILL,
+                alignment=alignment,
+                border=AuditPackageGenerator.THIN_BORDER if border else None,
+            )
+            for header in headers
+        ]
+
+    @staticmethod
+    def _set_widths(ws, widths: Dict[str, float]) -> None:
+        # Column widths must be set before the first row is written
+        for column, width in widths.items():
+            ws.column_dimensions[column].width = width
+
+    @staticmethod
+    async def _stream(db: AsyncSession, stmt, report: ProgressCallback, sheet: str):
+        """Yield rows from a server-side cursor, reporting progress per batch"""
+        result = await db.stream(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+        count = 0
+        async for partition in result.partitions():
+            for row in partition:
+                yield row
+            count += len(partition)
+            report(sheet, count, False)
+
+    @staticmethod
+    async def _asset_totals(db: AsyncSession, entity_id: int) -> Dict[str, Any]:
+        """Entity-wide asset count and cost/depreciation/NBV totals in one query"""
+        row = (await db.execute(
+            select(
+                func.count(FixedAsset.id),
+                func.coalesce(func.sum(FixedAsset.acquisition_cost), 0),
+                func.coalesce(func.sum(func.coalesce(FixedAsset.accumulated_depreciation, 0)), 0),
+                func.coalesce(func.sum(func.coalesce(FixedAsset.net_book_value, FixedAsset.acquisition_cost)), 0),
+            ).where(FixedAsset.entity_id == entity_id)
+        )).one()
+        return {
+            "count": row[0],
+            "cost": Decimal(str(row[1])),
+            "accumulated_depreciation": Decimal(str(row[2])),
+            "net_book_value": Decimal(str(row[3])),
+        }
+
+    # ------------------------------------------------------------------
+    # Sheets (each returns the number of data rows written)
+    # ------------------------------------------------------------------
+
     @staticmethod
     async def _create_summary_sheet(
-        wb: openpyxl.Workbook,
+        ws,
         entity: AccountingEntity,
         year: int,
-        as_of_date: date,
+        totals: Dict[str, Any],
         db: AsyncSession
-    ):
+    ) -> int:
         """Create summary/cover sheet"""
-        ws = wb.create_sheet("Summary", 0)
-        
+        cell = lambda value, **style: AuditPackageGenerator._cell(ws, value, **style)
+        money = '$#,##0.00'
+        AuditPackageGenerator._set_widths(ws, {'A': 30, 'B': 15, 'C': 15, 'D': 15})
+
         # Title
-        ws['A1'] = f"{entity.entity_name}"
-        ws['A1'].font = Font(bold=True, size=16)
-        ws['A2'] = f"Fixed Asset Audit Package"
-        ws['A2'].font = Font(bold=True, size=14)
-        ws['A3'] = f"Year Ended December 31, {year}"
-        ws['A3'].font = Font(size=12)
-        ws['A4'] = f"Generated: {get_pst_now().strftime('%B %d, %Y')}"
-        
+        ws.append([cell(f"{entity.entity_name}", font=Font(bold=True, size=16))])
+        ws.append([cell("Fixed Asset Audit Package", font=Font(bold=True, size=14))])
+        ws.append([cell(f"Year Ended December 31, {year}", font=Font(size=12))])
+        ws.append([f"Generated: {get_pst_now().strftime('%B %d, %Y')}"])
+        ws.append([])
+
         # Entity information
-        ws['A6'] = "Entity Information"
-        ws['A6'].font = Font(bold=True, size=12)
-        ws['A7'] = f"Entity Type: {entity.entity_type}"
-        ws['A8'] = f"EIN: {entity.ein or 'N/A'}"
-        ws['A9'] = f"Formation Date: {entity.formation_date or 'N/A'}"
-        
-        # Get asset statistics
-        result = await db.execute(
-            select(FixedAsset).where(FixedAsset.entity_id == entity.id)
-        )
-        assets = result.scalars().all()
-        
+        ws.append([cell("Entity Information", font=Font(bold=True, size=12))])
+        ws.append([f"Entity Type: {entity.entity_type}"])
+        ws.append([f"EIN: {entity.ein or 'N/A'}"])
+        ws.append([f"Formation Date: {entity.formation_date or 'N/A'}"])
+        ws.append([])
+
         # Summary statistics
-        ws['A11'] = "Fixed Assets Summary"
-        ws['A11'].font = Font(bold=True, size=12)
-        ws['A12'] = "Total Assets:"
-        ws['B12'] = len(assets)
-        ws['A13'] = "Original Cost:"
-        ws['B13'] = float(sum(a.acquisition_cost for a in assets))
-        ws['B13'].number_format = '$#,##0.00'
-        ws['A14'] = "Accumulated Depreciation:"
-        ws['B14'] = float(sum(a.accumulated_depreciation or Decimal("0") for a in assets))
-        ws['B14'].number_format = '$#,##0.00'
-        ws['A15'] = "Net Book Value:"
-        ws['B15'] = float(sum(a.net_book_value or a.acquisition_cost for a in assets))
-        ws['B15'].number_format = '$#,##0.00'
-        
+        ws.append([cell("Fixed Assets Summary", font=Font(bold=True, size=12))])
+        ws.append(["Total Assets:", totals["count"]])
+        ws.append(["Original Cost:", cell(float(totals["cost"]), number_format=money)])
+        ws.append(["Accumulated Depreciation:",
+                   cell(float(totals["accumulated_depreciation"]), number_format=money)])
+        ws.append(["Net Book Value:", cell(float(totals["net_book_value"]), number_format=money)])
+        ws.append([])
+
         # Category breakdown
-        ws['A17'] = "Assets by Category"
-        ws['A17'].font = Font(bold=True, size=12)
-        
-        categories = {}
-        for asset in assets:
-            cat = asset.asset_category
-            if cat not in categories:
-                categories[cat] = {"count": 0, "cost": Decimal("0"), "nbv": Decimal("0")}
-            categories[cat]["count"] += 1
-            categories[cat]["cost"] += asset.acquisition_cost
-            categories[cat]["nbv"] += asset.net_book_value or asset.acquisition_cost
-        
-        row = 18
-        for cat, data in sorted(categories.items()):
-            ws[f'A{row}'] = cat
-            ws[f'B{row}'] = data["count"]
-            ws[f'C{row}'] = float(data["cost"])
-            ws[f'C{row}'].number_format = '$#,##0.00'
-            ws[f'D{row}'] = float(data["nbv"])
-            ws[f'D{row}'].number_format = '$#,##0.00'
-            row += 1
-        
+        ws.append([cell("Assets by Category", font=Font(bold=True, size=12))])
+        categories = await db.execute(
+            select(
+                FixedAsset.asset_category,
+                func.count(FixedAsset.id),
+                func.sum(FixedAsset.acquisition_cost),
+                func.sum(func.coalesce(FixedAsset.net_book_value, FixedAsset.acquisition_cost)),
+            )
+            .where(FixedAsset.entity_id == entity.id)
+            .group_by(FixedAsset.asset_category)
+            .order_by(FixedAsset.asset_category)
+        )
+        rows = 0
+        for category, count, cost, nbv in categories.all():
+            ws.append([category, count, cell(float(cost or 0), number_format=money),
+                       cell(float(nbv or 0), number_format=money)])
+            rows += 1
+
         # Workbook contents
-        ws[f'A{row + 2}'] = "Workbook Contents"
-        ws[f'A{row + 2}'].font = Font(bold=True, size=12)
-        ws[f'A{row + 3}'] = "PBC-1: Fixed Asset Register"
-        ws[f'A{row + 4}'] = "PBC-2: Depreciation Schedule"
-        ws[f'A{row + 5}'] = "PBC-3: Roll Forward Report"
-        ws[f'A{row + 6}'] = "PBC-4: Additions Schedule"
-        ws[f'A{row + 7}'] = "PBC-5: Disposals Schedule"
-        
-        # Format columns
-        ws.column_dimensions['A'].width = 30
-        ws.column_dimensions['B'].width = 15
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 15
-    
+        ws.append([])
+        ws.append([])
+        ws.append([cell("Workbook Contents", font=Font(bold=True, size=12))])
+        ws.append(["PBC-1: Fixed Asset Register"])
+        ws.append(["PBC-2: Depreciation Schedule"])
+        ws.append(["PBC-3: Roll Forward Report"])
+        ws.append(["PBC-4: Additions Schedule"])
+        ws.append(["PBC-5: Disposals Schedule"])
+        return rows
+
     @staticmethod
     async def _create_asset_register(
-        wb: openpyxl.Workbook,
+        ws,
         entity_id: int,
         as_of_date: date,
-        db: AsyncSession
-    ):
+        db: AsyncSession,
+        report: ProgressCallback
+    ) -> int:
         """Create PBC-1: Fixed Asset Register"""
-        ws = wb.create_sheet("PBC-1 Asset Register")
-        
+        cell = lambda value, **style: AuditPackageGenerator._cell(ws, value, **style)
+        money = '$#,##0.00'
+        AuditPackageGenerator._set_widths(ws, {
+            'A': 15, 'B': 30, 'C': 20, 'D': 35, 'E': 15, 'F': 15, 'G': 15,
+            'H': 15, 'I': 20, 'J': 20, 'K': 15, 'L': 15, 'M': 20,
+        })
+        ws.freeze_panes = 'A2'
+
         # Headers
         headers = [
             "Asset Number", "Asset Name", "Category", "Description",
@@ -223,96 +303,75 @@ class AuditPackageGenerator:
             "Depreciation Method", "Accumulated Depreciation", "Net Book Value",
             "Status", "Location"
         ]
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col)
-            cell.value = header
-            cell.font = AuditPackageGenerator.HEADER_FONT
-            cell.fill = AuditPackageGenerator.HEADER_FILL
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = AuditPackageGenerator.THIN_BORDER
-        
-        # Get all assets
-        result = await db.execute(
-            select(FixedAsset)
+        ws.append(AuditPackageGenerator._header_row(
+            ws, headers, Alignment(horizontal='center', vertical='center'), border=True
+        ))
+
+        # Stream all assets
+        stmt = (
+            select(
+                FixedAsset.asset_number, FixedAsset.asset_name, FixedAsset.asset_category,
+                FixedAsset.asset_description, FixedAsset.acquisition_date, FixedAsset.acquisition_cost,
+                FixedAsset.salvage_value, FixedAsset.useful_life_years, FixedAsset.depreciation_method,
+                FixedAsset.accumulated_depreciation, FixedAsset.net_book_value, FixedAsset.status,
+                FixedAsset.location,
+            )
             .where(FixedAsset.entity_id == entity_id)
             .order_by(FixedAsset.asset_number)
         )
-        assets = result.scalars().all()
-        
+
         # Data rows
-        row = 2
+        rows = 0
         total_cost = Decimal("0")
         total_accum_dep = Decimal("0")
         total_nbv = Decimal("0")
-        
-        for asset in assets:
-            ws.cell(row=row, column=1).value = asset.asset_number
-            ws.cell(row=row, column=2).value = asset.asset_name
-            ws.cell(row=row, column=3).value = asset.asset_category
-            ws.cell(row=row, column=4).value = asset.asset_description or ""
-            ws.cell(row=row, column=5).value = asset.acquisition_date
-            ws.cell(row=row, column=5).number_format = 'MM/DD/YYYY'
-            ws.cell(row=row, column=6).value = float(asset.acquisition_cost)
-            ws.cell(row=row, column=6).number_format = '$#,##0.00'
-            ws.cell(row=row, column=7).value = float(asset.salvage_value or 0)
-            ws.cell(row=row, column=7).number_format = '$#,##0.00'
-            ws.cell(row=row, column=8).value = asset.useful_life_years
-            ws.cell(row=row, column=9).value = asset.depreciation_method
-            ws.cell(row=row, column=10).value = float(asset.accumulated_depreciation or 0)
-            ws.cell(row=row, column=10).number_format = '$#,##0.00'
-            ws.cell(row=row, column=11).value = float(asset.net_book_value or asset.acquisition_cost)
-            ws.cell(row=row, column=11).number_format = '$#,##0.00'
-            ws.cell(row=row, column=12).value = asset.status
-            ws.cell(row=row, column=13).value = asset.location or ""
-            
+
+        async for asset in AuditPackageGenerator._stream(db, stmt, report, "PBC-1 Asset Register"):
+            nbv = asset.net_book_value or asset.acquisition_cost
+            ws.append([
+                asset.asset_number,
+                asset.asset_name,
+                asset.asset_category,
+                asset.asset_description or "",
+                cell(asset.acquisition_date, number_format='MM/DD/YYYY'),
+                cell(float(asset.acquisition_cost), number_format=money),
+                cell(float(asset.salvage_value or 0), number_format=money),
+                asset.useful_life_years,
+                asset.depreciation_method,
+                cell(float(asset.accumulated_depreciation or 0), number_format=money),
+                cell(float(nbv), number_format=money),
+                asset.status,
+                asset.location or "",
+            ])
             total_cost += asset.acquisition_cost
             total_accum_dep += asset.accumulated_depreciation or Decimal("0")
-            total_nbv += asset.net_book_value or asset.acquisition_cost
-            
-            row += 1
-        
+            total_nbv += nbv
+            rows += 1
+
         # Totals row
-        ws.cell(row=row, column=1).value = "TOTAL"
-        ws.cell(row=row, column=1).font = AuditPackageGenerator.TOTAL_FONT
-        ws.cell(row=row, column=6).value = float(total_cost)
-        ws.cell(row=row, column=6).number_format = '$#,##0.00'
-        ws.cell(row=row, column=6).font = AuditPackageGenerator.TOTAL_FONT
-        ws.cell(row=row, column=10).value = float(total_accum_dep)
-        ws.cell(row=row, column=10).number_format = '$#,##0.00'
-        ws.cell(row=row, column=10).font = AuditPackageGenerator.TOTAL_FONT
-        ws.cell(row=row, column=11).value = float(total_nbv)
-        ws.cell(row=row, column=11).number_format = '$#,##0.00'
-        ws.cell(row=row, column=11).font = AuditPackageGenerator.TOTAL_FONT
-        
-        # Format columns
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 30
-        ws.column_dimensions['C'].width = 20
-        ws.column_dimensions['D'].width = 35
-        ws.column_dimensions['E'].width = 15
-        ws.column_dimensions['F'].width = 15
-        ws.column_dimensions['G'].width = 15
-        ws.column_dimensions['H'].width = 15
-        ws.column_dimensions['I'].width = 20
-        ws.column_dimensions['J'].width = 20
-        ws.column_dimensions['K'].width = 15
-        ws.column_dimensions['L'].width = 15
-        ws.column_dimensions['M'].width = 20
-        
-        # Freeze panes
-        ws.freeze_panes = 'A2'
-    
+        total = lambda value: cell(float(value), number_format=money, font=AuditPackageGenerator.TOTAL_FONT)
+        ws.append([
+            cell("TOTAL", font=AuditPackageGenerator.TOTAL_FONT), None, None, None, None,
+            total(total_cost), None, None, None, total(total_accum_dep), total(total_nbv),
+        ])
+        return rows
+
     @staticmethod
     async def _create_depreciation_schedule(
-        wb: openpyxl.Workbook,
+        ws,
         entity_id: int,
         year: int,
-        db: AsyncSession
-    ):
+        db: AsyncSession,
+        report: ProgressCallback
+    ) -> int:
         """Create PBC-2: Depreciation Schedule"""
-        ws = wb.create_sheet("PBC-2 Depreciation")
-        
+        cell = lambda value, **style: AuditPackageGenerator._cell(ws, value, **style)
+        money = '$#,##0.00'
+        widths = {'A': 15, 'B': 30, 'C': 15, 'D': 12, 'Q': 15, 'R': 18, 'S': 15}
+        widths.update({get_column_letter(col): 10 for col in range(5, 17)})
+        AuditPackageGenerator._set_widths(ws, widths)
+        ws.freeze_panes = 'A2'
+
         # Headers
         headers = [
             "Asset Number", "Asset Name", "Acquisition Date", "Cost",
@@ -320,147 +379,98 @@ class AuditPackageGenerator:
             "Jul", "Aug", "Sep", "Oct", "Nov", "Dec",
             "Total Depreciation", "Accumulated Dep", "Net Book Value"
         ]
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col)
-            cell.value = header
-            cell.font = AuditPackageGenerator.HEADER_FONT
-            cell.fill = AuditPackageGenerator.HEADER_FILL
-            cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-            cell.border = AuditPackageGenerator.THIN_BORDER
-        
-        # Get all assets
-        result = await db.execute(
-            select(FixedAsset)
+        ws.append(AuditPackageGenerator._header_row(
+            ws, headers, Alignment(horizontal='center', vertical='center', wrap_text=True), border=True
+        ))
+
+        # One pivoted query: a column per month of the year's depreciation
+        months = [
+            func.coalesce(func.sum(case(
+                (DepreciationEntry.period_month == month, DepreciationEntry.depreciation_amount), else_=0
+            )), 0)
+            for month in range(1, 13)
+        ]
+        stmt = (
+            select(
+                FixedAsset.asset_number, FixedAsset.asset_name, FixedAsset.acquisition_date,
+                FixedAsset.acquisition_cost, FixedAsset.accumulated_depreciation, FixedAsset.net_book_value,
+                *months,
+            )
+            .outerjoin(DepreciationEntry, and_(
+                DepreciationEntry.asset_id == FixedAsset.id,
+                DepreciationEntry.period_year == year
+            ))
             .where(FixedAsset.entity_id == entity_id)
+            .group_by(FixedAsset.id)
             .order_by(FixedAsset.asset_number)
         )
-        assets = result.scalars().all()
-        
-        row = 2
-        for asset in assets:
-            ws.cell(row=row, column=1).value = asset.asset_number
-            ws.cell(row=row, column=2).value = asset.asset_name
-            ws.cell(row=row, column=3).value = asset.acquisition_date
-            ws.cell(row=row, column=3).number_format = 'MM/DD/YYYY'
-            ws.cell(row=row, column=4).value = float(asset.acquisition_cost)
-            ws.cell(row=row, column=4).number_format = '$#,##0.00'
-            
-            # Get monthly depreciation entries for this asset for the year
-            dep_result = await db.execute(
-                select(DepreciationEntry)
-                .where(
-                    and_(
-                        DepreciationEntry.asset_id == asset.id,
-                        DepreciationEntry.period_year == year
-                    )
-                )
-                .order_by(DepreciationEntry.period_month)
-            )
-            dep_entries = dep_result.scalars().all()
-            
-            # Map depreciation to months
-            monthly_dep = {entry.period_month: entry.depreciation_amount for entry in dep_entries}
-            
-            # Fill in monthly columns
-            total_year_dep = Decimal("0")
-            for month in range(1, 13):
-                col = 4 + month
-                dep_amount = monthly_dep.get(month, Decimal("0"))
-                ws.cell(row=row, column=col).value = float(dep_amount)
-                ws.cell(row=row, column=col).number_format = '$#,##0'
-                total_year_dep += dep_amount
-            
-            # Total depreciation
-            ws.cell(row=row, column=17).value = float(total_year_dep)
-            ws.cell(row=row, column=17).number_format = '$#,##0.00'
-            
-            # Accumulated depreciation
-            ws.cell(row=row, column=18).value = float(asset.accumulated_depreciation or 0)
-            ws.cell(row=row, column=18).number_format = '$#,##0.00'
-            
-            # Net book value
-            ws.cell(row=row, column=19).value = float(asset.net_book_value or asset.acquisition_cost)
-            ws.cell(row=row, column=19).number_format = '$#,##0.00'
-            
-            row += 1
-        
-        # Format columns
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 30
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 12
-        for col in range(5, 17):
-            ws.column_dimensions[get_column_letter(col)].width = 10
-        ws.column_dimensions['Q'].width = 15
-        ws.column_dimensions['R'].width = 18
-        ws.column_dimensions['S'].width = 15
-        
-        ws.freeze_panes = 'A2'
-    
+
+        rows = 0
+        async for row in AuditPackageGenerator._stream(db, stmt, report, "PBC-2 Depreciation"):
+            monthly_dep = [Decimal(str(amount or 0)) for amount in row[6:]]
+            ws.append([
+                row.asset_number,
+                row.asset_name,
+                cell(row.acquisition_date, number_format='MM/DD/YYYY'),
+                cell(float(row.acquisition_cost), number_format=money),
+                *(cell(float(amount), number_format='$#,##0') for amount in monthly_dep),
+                cell(float(sum(monthly_dep)), number_format=money),
+                cell(float(row.accumulated_depreciation or 0), number_format=money),
+                cell(float(row.net_book_value or row.acquisition_cost), number_format=money),
+            ])
+            rows += 1
+        return rows
+
     @staticmethod
     async def _create_roll_forward(
-        wb: openpyxl.Workbook,
+        ws,
         entity_id: int,
         year: int,
+        totals: Dict[str, Any],
         db: AsyncSession
-    ):
+    ) -> int:
         """Create PBC-3: Roll Forward Report"""
-        ws = wb.create_sheet("PBC-3 Roll Forward")
-        
+        cell = lambda value, **style: AuditPackageGenerator._cell(ws, value, **style)
+        money = '$#,##0.00'
+        negative = '$(#,##0.00)'
+        AuditPackageGenerator._set_widths(ws, {'A': 25, 'B': 18, 'C': 18, 'D': 18, 'E': 18, 'F': 18})
+
         # Title
-        ws['A1'] = f"Fixed Assets Roll Forward - Year {year}"
-        ws['A1'].font = Font(bold=True, size=14)
-        ws.merge_cells('A1:F1')
-        
+        ws.append([cell(f"Fixed Assets Roll Forward - Year {year}", font=Font(bold=True, size=14))])
+        ws.merged_cells.add('A1:F1')
+        ws.append([])
+
         # Headers
         headers = ["", "Beginning Balance", "Additions", "Disposals", "Depreciation", "Ending Balance"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col)
-            cell.value = header
-            cell.font = AuditPackageGenerator.HEADER_FONT
-            cell.fill = AuditPackageGenerator.HEADER_FILL
-            cell.alignment = Alignment(horizontal='center')
-        
-        # Get assets as of beginning of year
-        beg_date = date(year - 1, 12, 31)
-        end_date = date(year, 12, 31)
-        
+        ws.append(AuditPackageGenerator._header_row(ws, headers, Alignment(horizontal='center')))
+
         # Calculate beginning balances (would need historical data)
         # For now, use current less this year's activity
-        
-        result = await db.execute(
-            select(FixedAsset).where(FixedAsset.entity_id == entity_id)
-        )
-        assets = result.scalars().all()
-        
-        # Get additions in year
-        additions_result = await db.execute(
-            select(FixedAsset).where(
+        additions_cost = Decimal(str(await db.scalar(
+            select(func.coalesce(func.sum(FixedAsset.acquisition_cost), 0)).where(
                 and_(
                     FixedAsset.entity_id == entity_id,
                     extract('year', FixedAsset.acquisition_date) == year
                 )
             )
-        )
-        additions = additions_result.scalars().all()
-        additions_cost = sum(a.acquisition_cost for a in additions)
-        
-        # Get disposals in year
-        disposals_result = await db.execute(
-            select(AssetDisposal).where(
+        ) or 0))
+
+        disposals_row = (await db.execute(
+            select(
+                func.coalesce(func.sum(AssetDisposal.original_cost), 0),
+                func.coalesce(func.sum(AssetDisposal.accumulated_depreciation), 0),
+            ).where(
                 and_(
                     AssetDisposal.entity_id == entity_id,
                     extract('year', AssetDisposal.disposal_date) == year
                 )
             )
-        )
-        disposals = disposals_result.scalars().all()
-        disposals_cost = sum(d.original_cost for d in disposals)
-        disposals_accum_dep = sum(d.accumulated_depreciation for d in disposals)
-        
+        )).one()
+        disposals_cost = Decimal(str(disposals_row[0]))
+        disposals_accum_dep = Decimal(str(disposals_row[1]))
+
         # Get depreciation for year
-        dep_result = await db.execute(
+        year_depreciation = Decimal(str(await db.scalar(
             select(func.sum(DepreciationEntry.depreciation_amount))
             .where(
                 and_(
@@ -468,99 +478,79 @@ class AuditPackageGenerator:
                     DepreciationEntry.period_year == year
                 )
             )
-        )
-        year_depreciation = dep_result.scalar() or Decimal("0")
-        
+        ) or 0))
+
         # Calculate balances
-        ending_cost = sum(a.acquisition_cost for a in assets)
-        ending_accum_dep = sum(a.accumulated_depreciation or Decimal("0") for a in assets)
+        ending_cost = totals["cost"]
+        ending_accum_dep = totals["accumulated_depreciation"]
         ending_nbv = ending_cost - ending_accum_dep
-        
+
         beginning_cost = ending_cost - additions_cost + disposals_cost
         beginning_accum_dep = ending_accum_dep - year_depreciation + disposals_accum_dep
         beginning_nbv = beginning_cost - beginning_accum_dep
-        
-        # Data rows
-        row = 4
-        
+
         # Cost
-        ws.cell(row=row, column=1).value = "Cost"
-        ws.cell(row=row, column=1).font = Font(bold=True)
-        ws.cell(row=row, column=2).value = float(beginning_cost)
-        ws.cell(row=row, column=2).number_format = '$#,##0.00'
-        ws.cell(row=row, column=3).value = float(additions_cost)
-        ws.cell(row=row, column=3).number_format = '$#,##0.00'
-        ws.cell(row=row, column=4).value = float(disposals_cost)
-        ws.cell(row=row, column=4).number_format = '$(#,##0.00)'
-        ws.cell(row=row, column=5).value = 0
-        ws.cell(row=row, column=6).value = float(ending_cost)
-        ws.cell(row=row, column=6).number_format = '$#,##0.00'
-        row += 1
-        
+        ws.append([
+            cell("Cost", font=Font(bold=True)),
+            cell(float(beginning_cost), number_format=money),
+            cell(float(additions_cost), number_format=money),
+            cell(float(disposals_cost), number_format=negative),
+            0,
+            cell(float(ending_cost), number_format=money),
+        ])
+
         # Accumulated Depreciation
-        ws.cell(row=row, column=1).value = "Accumulated Depreciation"
-        ws.cell(row=row, column=1).font = Font(bold=True)
-        ws.cell(row=row, column=2).value = float(beginning_accum_dep)
-        ws.cell(row=row, column=2).number_format = '$(#,##0.00)'
-        ws.cell(row=row, column=3).value = 0
-        ws.cell(row=row, column=4).value = float(disposals_accum_dep)
-        ws.cell(row=row, column=4).number_format = '$#,##0.00'
-        ws.cell(row=row, column=5).value = float(year_depreciation)
-        ws.cell(row=row, column=5).number_format = '$(#,##0.00)'
-        ws.cell(row=row, column=6).value = float(ending_accum_dep)
-        ws.cell(row=row, column=6).number_format = '$(#,##0.00)'
-        row += 1
-        
+        ws.append([
+            cell("Accumulated Depreciation", font=Font(bold=True)),
+            cell(float(beginning_accum_dep), number_format=negative),
+            0,
+            cell(float(disposals_accum_dep), number_format=money),
+            cell(float(year_depreciation), number_format=negative),
+            cell(float(ending_accum_dep), number_format=negative),
+        ])
+
         # Net Book Value
-        ws.cell(row=row, column=1).value = "Net Book Value"
-        ws.cell(row=row, column=1).font = AuditPackageGenerator.TOTAL_FONT
-        ws.cell(row=row, column=2).value = float(beginning_nbv)
-        ws.cell(row=row, column=2).number_format = '$#,##0.00'
-        ws.cell(row=row, column=2).font = AuditPackageGenerator.TOTAL_FONT
-        ws.cell(row=row, column=3).value = float(additions_cost)
-        ws.cell(row=row, column=3).number_format = '$#,##0.00'
-        ws.cell(row=row, column=3).font = AuditPackageGenerator.TOTAL_FONT
-        ws.cell(row=row, column=4).value = float(disposals_cost - disposals_accum_dep)
-        ws.cell(row=row, column=4).number_format = '$(#,##0.00)'
-        ws.cell(row=row, column=4).font = AuditPackageGenerator.TOTAL_FONT
-        ws.cell(row=row, column=5).value = float(year_depreciation)
-        ws.cell(row=row, column=5).number_format = '$(#,##0.00)'
-        ws.cell(row=row, column=5).font = AuditPackageGenerator.TOTAL_FONT
-        ws.cell(row=row, column=6).value = float(ending_nbv)
-        ws.cell(row=row, column=6).number_format = '$#,##0.00'
-        ws.cell(row=row, column=6).font = AuditPackageGenerator.TOTAL_FONT
-        
-        # Format columns
-        ws.column_dimensions['A'].width = 25
-        for col in ['B', 'C', 'D', 'E', 'F']:
-            ws.column_dimensions[col].width = 18
-    
+        total = lambda value, fmt: cell(float(value), number_format=fmt, font=AuditPackageGenerator.TOTAL_FONT)
+        ws.append([
+            cell("Net Book Value", font=AuditPackageGenerator.TOTAL_FONT),
+            total(beginning_nbv, money),
+            total(additions_cost, money),
+            total(disposals_cost - disposals_accum_dep, negative),
+            total(year_depreciation, negative),
+            total(ending_nbv, money),
+        ])
+        return 3
+
     @staticmethod
     async def _create_additions_schedule(
-        wb: openpyxl.Workbook,
+        ws,
         entity_id: int,
         year: int,
-        db: AsyncSession
-    ):
+        db: AsyncSession,
+        report: ProgressCallback
+    ) -> int:
         """Create PBC-4: Additions Schedule"""
-        ws = wb.create_sheet("PBC-4 Additions")
-        
+        cell = lambda value, **style: AuditPackageGenerator._cell(ws, value, **style)
+        money = '$#,##0.00'
+        AuditPackageGenerator._set_widths(ws, {
+            'A': 15, 'B': 30, 'C': 20, 'D': 15, 'E': 15, 'F': 25, 'G': 15, 'H': 12, 'I': 15,
+        })
+        ws.freeze_panes = 'A2'
+
         # Headers
         headers = [
             "Asset Number", "Asset Name", "Category", "Acquisition Date",
             "Cost", "Vendor", "Auto-Detected", "Confidence %", "JE Number"
         ]
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col)
-            cell.value = header
-            cell.font = AuditPackageGenerator.HEADER_FONT
-            cell.fill = AuditPackageGenerator.HEADER_FILL
-            cell.alignment = Alignment(horizontal='center')
-        
-        # Get additions for year
-        result = await db.execute(
-            select(FixedAsset)
+        ws.append(AuditPackageGenerator._header_row(ws, headers, Alignment(horizontal='center')))
+
+        # Stream additions for year
+        stmt = (
+            select(
+                FixedAsset.asset_number, FixedAsset.asset_name, FixedAsset.asset_category,
+                FixedAsset.acquisition_date, FixedAsset.acquisition_cost, FixedAsset.detection_metadata,
+                FixedAsset.auto_detected, FixedAsset.detection_confidence,
+            )
             .where(
                 and_(
                     FixedAsset.entity_id == entity_id,
@@ -569,75 +559,66 @@ class AuditPackageGenerator:
             )
             .order_by(FixedAsset.acquisition_date)
         )
-        additions = result.scalars().all()
-        
-        row = 2
+
+        rows = 0
         total_cost = Decimal("0")
-        
-        for asset in additions:
-            ws.cell(row=row, column=1).value = asset.asset_number
-            ws.cell(row=row, column=2).value = asset.asset_name
-            ws.cell(row=row, column=3).value = asset.asset_category
-            ws.cell(row=row, column=4).value = asset.acquisition_date
-            ws.cell(row=row, column=4).number_format = 'MM/DD/YYYY'
-            ws.cell(row=row, column=5).value = float(asset.acquisition_cost)
-            ws.cell(row=row, column=5).number_format = '$#,##0.00'
-            ws.cell(row=row, column=6).value = asset.detection_metadata.get("vendor_name", "") if asset.detection_metadata else ""
-            ws.cell(row=row, column=7).value = "Yes" if asset.auto_detected else "No"
-            ws.cell(row=row, column=8).value = float(asset.detection_confidence or 0)
-            ws.cell(row=row, column=8).number_format = '0.0"%"'
-            ws.cell(row=row, column=9).value = ""  # Would link to JE if available
-            
+
+        async for asset in AuditPackageGenerator._stream(db, stmt, report, "PBC-4 Additions"):
+            ws.append([
+                asset.asset_number,
+                asset.asset_name,
+                asset.asset_category,
+                cell(asset.acquisition_date, number_format='MM/DD/YYYY'),
+                cell(float(asset.acquisition_cost), number_format=money),
+                asset.detection_metadata.get("vendor_name", "") if asset.detection_metadata else "",
+                "Yes" if asset.auto_detected else "No",
+                cell(float(asset.detection_confidence or 0), number_format='0.0"%"'),
+                "",  # Would link to JE if available
+            ])
             total_cost += asset.acquisition_cost
-            row += 1
-        
+            rows += 1
+
         # Total
-        ws.cell(row=row, column=1).value = "TOTAL"
-        ws.cell(row=row, column=1).font = AuditPackageGenerator.TOTAL_FONT
-        ws.cell(row=row, column=5).value = float(total_cost)
-        ws.cell(row=row, column=5).number_format = '$#,##0.00'
-        ws.cell(row=row, column=5).font = AuditPackageGenerator.TOTAL_FONT
-        
-        # Format columns
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 30
-        ws.column_dimensions['C'].width = 20
-        ws.column_dimensions['D'].width = 15
-        ws.column_dimensions['E'].width = 15
-        ws.column_dimensions['F'].width = 25
-        ws.column_dimensions['G'].width = 15
-        ws.column_dimensions['H'].width = 12
-        ws.column_dimensions['I'].width = 15
-        
-        ws.freeze_panes = 'A2'
-    
+        ws.append([
+            cell("TOTAL", font=AuditPackageGenerator.TOTAL_FONT), None, None, None,
+            cell(float(total_cost), number_format=money, font=AuditPackageGenerator.TOTAL_FONT),
+        ])
+        return rows
+
     @staticmethod
     async def _create_disposals_schedule(
-        wb: openpyxl.Workbook,
+        ws,
         entity_id: int,
         year: int,
-        db: AsyncSession
-    ):
+        db: AsyncSession,
+        report: ProgressCallback
+    ) -> int:
         """Create PBC-5: Disposals Schedule"""
-        ws = wb.create_sheet("PBC-5 Disposals")
-        
+        cell = lambda value, **style: AuditPackageGenerator._cell(ws, value, **style)
+        money = '$#,##0.00'
+        negative = '$(#,##0.00)'
+        gain_loss = '$#,##0.00;[Red]$(#,##0.00)'
+        AuditPackageGenerator._set_widths(ws, {
+            'A': 15, 'B': 30, 'C': 15, 'D': 15, 'E': 15, 'F': 18, 'G': 15, 'H': 15, 'I': 15, 'J': 35,
+        })
+        ws.freeze_panes = 'A2'
+
         # Headers
         headers = [
             "Asset Number", "Asset Name", "Disposal Date", "Disposal Type",
             "Original Cost", "Accumulated Dep", "Net Book Value",
             "Disposal Amount", "Gain/(Loss)", "Notes"
         ]
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col)
-            cell.value = header
-            cell.font = AuditPackageGenerator.HEADER_FONT
-            cell.fill = AuditPackageGenerator.HEADER_FILL
-            cell.alignment = Alignment(horizontal='center')
-        
-        # Get disposals for year
-        result = await db.execute(
-            select(AssetDisposal, FixedAsset)
+        ws.append(AuditPackageGenerator._header_row(ws, headers, Alignment(horizontal='center')))
+
+        # Stream disposals for year
+        stmt = (
+            select(
+                FixedAsset.asset_number, FixedAsset.asset_name, AssetDisposal.disposal_date,
+                AssetDisposal.disposal_type, AssetDisposal.original_cost, AssetDisposal.accumulated_depreciation,
+                AssetDisposal.net_book_value, AssetDisposal.disposal_amount, AssetDisposal.gain_loss,
+                AssetDisposal.disposal_notes,
+            )
             .join(FixedAsset, AssetDisposal.asset_id == FixedAsset.id)
             .where(
                 and_(
@@ -647,74 +628,45 @@ class AuditPackageGenerator:
             )
             .order_by(AssetDisposal.disposal_date)
         )
-        disposals = result.all()
-        
-        row = 2
+
+        rows = 0
         total_cost = Decimal("0")
         total_accum_dep = Decimal("0")
         total_nbv = Decimal("0")
         total_proceeds = Decimal("0")
         total_gain_loss = Decimal("0")
-        
-        for disposal, asset in disposals:
-            ws.cell(row=row, column=1).value = asset.asset_number
-            ws.cell(row=row, column=2).value = asset.asset_name
-            ws.cell(row=row, column=3).value = disposal.disposal_date
-            ws.cell(row=row, column=3).number_format = 'MM/DD/YYYY'
-            ws.cell(row=row, column=4).value = disposal.disposal_type
-            ws.cell(row=row, column=5).value = float(disposal.original_cost)
-            ws.cell(row=row, column=5).number_format = '$#,##0.00'
-            ws.cell(row=row, column=6).value = float(disposal.accumulated_depreciation)
-            ws.cell(row=row, column=6).number_format = '$(#,##0.00)'
-            ws.cell(row=row, column=7).value = float(disposal.net_book_value)
-            ws.cell(row=row, column=7).number_format = '$#,##0.00'
-            ws.cell(row=row, column=8).value = float(disposal.disposal_amount)
-            ws.cell(row=row, column=8).number_format = '$#,##0.00'
-            ws.cell(row=row, column=9).value = float(disposal.gain_loss)
-            ws.cell(row=row, column=9).number_format = '$#,##0.00;[Red]$(#,##0.00)'
-            ws.cell(row=row, column=10).value = disposal.disposal_notes or ""
-            
+
+        async for disposal in AuditPackageGenerator._stream(db, stmt, report, "PBC-5 Disposals"):
+            ws.append([
+                disposal.asset_number,
+                disposal.asset_name,
+                cell(disposal.disposal_date, number_format='MM/DD/YYYY'),
+                disposal.disposal_type,
+                cell(float(disposal.original_cost), number_format=money),
+                cell(float(disposal.accumulated_depreciation), number_format=negative),
+                cell(float(disposal.net_book_value), number_format=money),
+                cell(float(disposal.disposal_amount), number_format=money),
+                cell(float(disposal.gain_loss), number_format=gain_loss),
+                disposal.disposal_notes or "",
+            ])
             total_cost += disposal.original_cost
             total_accum_dep += disposal.accumulated_depreciation
             total_nbv += disposal.net_book_value
             total_proceeds += disposal.disposal_amount
             total_gain_loss += disposal.gain_loss
-            
-            row += 1
-        
+            rows += 1
+
         # Totals
-        if row > 2:
-            ws.cell(row=row, column=1).value = "TOTAL"
-            ws.cell(row=row, column=1).font = AuditPackageGenerator.TOTAL_FONT
-            ws.cell(row=row, column=5).value = float(total_cost)
-            ws.cell(row=row, column=5).number_format = '$#,##0.00'
-            ws.cell(row=row, column=5).font = AuditPackageGenerator.TOTAL_FONT
-            ws.cell(row=row, column=6).value = float(total_accum_dep)
-            ws.cell(row=row, column=6).number_format = '$(#,##0.00)'
-            ws.cell(row=row, column=6).font = AuditPackageGenerator.TOTAL_FONT
-            ws.cell(row=row, column=7).value = float(total_nbv)
-            ws.cell(row=row, column=7).number_format = '$#,##0.00'
-            ws.cell(row=row, column=7).font = AuditPackageGenerator.TOTAL_FONT
-            ws.cell(row=row, column=8).value = float(total_proceeds)
-            ws.cell(row=row, column=8).number_format = '$#,##0.00'
-            ws.cell(row=row, column=8).font = AuditPackageGenerator.TOTAL_FONT
-            ws.cell(row=row, column=9).value = float(total_gain_loss)
-            ws.cell(row=row, column=9).number_format = '$#,##0.00;[Red]$(#,##0.00)'
-            ws.cell(row=row, column=9).font = AuditPackageGenerator.TOTAL_FONT
+        if rows:
+            total = lambda value, fmt: cell(float(value), number_format=fmt, font=AuditPackageGenerator.TOTAL_FONT)
+            ws.append([
+                cell("TOTAL", font=AuditPackageGenerator.TOTAL_FONT), None, None, None,
+                total(total_cost, money),
+                total(total_accum_dep, negative),
+                total(total_nbv, money),
+                total(total_proceeds, money),
+                total(total_gain_loss, gain_loss),
+            ])
         else:
-            ws.cell(row=row, column=1).value = "No disposals in this period"
-        
-        # Format columns
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 30
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 15
-        ws.column_dimensions['E'].width = 15
-        ws.column_dimensions['F'].width = 18
-        ws.column_dimensions['G'].width = 15
-        ws.column_dimensions['H'].width = 15
-        ws.column_dimensions['I'].width = 15
-        ws.column_dimensions['J'].width = 35
-        
-        ws.freeze_panes = 'A2'
-
+            ws.append(["No disposals in this period"])
+        return rows
@@ -0,0 +1,103 @@
+"""
+Audit Package Job
+Background generation of fixed asset audit packages with per-sheet progress
+
+The generate endpoint registers a job and returns its id immediately; the
+worker builds the workbook on its own session through AuditPackageGenerator
+(write-only, streamed sheets) and publishes the current sheet, rows written
+and completed sheets on an in-process job record that the job-status
+endpoint reads. Finished packages are downloaded from the job's file with
+HTTP Range support.
+
+Author: NGI Capital Development Team
+Date: December 2025
+"""
+
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .audit_package_generator import SHEET_TITLES, AuditPackageGenerator
+from .job_registry import JobRegistry
+from ..diagnostics import register_stats
+
+logger = logging.getLogger(__name__)
+
+_registry = JobRegistry("Audit package", counters=("rows_written",))
+
+
+def get_audit_package_stats() -> Dict[str, int]:
+    return _registry.get_stats()
+
+
+register_stats("audit_package", get_audit_package_stats)
+
+
+def get_audit_package_job(job_id: str) -> Optional[Dict[str, Any]]:
+    return _registry.snapshot(job_id)
+
+
+def create_audit_package_job(entity_id: int, year: int, user_email: str) -> Dict[str, Any]:
+    """Register a queued job; run it with run_audit_package_job(job_id)"""
+    job = _registry.create(
+        entity_id=entity_id,
+        year=year,
+        user_email=user_email,
+        current_sheet=None,
+        sheets_total=len(SHEET_TITLES),
+        sheets_completed=0,
+        sheets=[{"title": title, "status": "pending", "rows": 0} for title in SHEET_TITLES],
+        rows_written=0,
+        percent_complete=0,
+        file_path=None,
+        file_size_bytes=None,
+        elapsed_ms=0,
+    )
+    return get_audit_package_job(job["job_id"])
+
+
+async def _build_package(db: AsyncSession, job: Dict[str, Any]) -> None:
+    started = time.perf_counter()
+    sheets = {sheet["title"]: sheet for sheet in job["sheets"]}
+
+    def elapsed_ms() -> int:
+        return int((time.perf_counter() - started) * 1000)
+
+    def progress(title: str, rows: int, finished: bool) -> None:
+        sheet = sheets[title]
+        job["rows_written"] += rows - sheet["rows"]
+        sheet["rows"] = rows
+        if finished:
+            sheet["status"] = "completed"
+            job["sheets_completed"] += 1
+            job["percent_complete"] = int(100 * job["sheets_completed"] / job["sheets_total"])
+        else:
+            sheet["status"] = "running"
+            job["current_sheet"] = title
+        job["elapsed_ms"] = elapsed_ms()
+
+    job["status"] = "running"
+    try:
+        filepath = await AuditPackageGenerator.generate_fixed_asset_audit_package(
+            job["entity_id"], job["year"], job["user_email"], db, progress=progress
+        )
+    finally:
+        job["elapsed_ms"] = elapsed_ms()
+
+    _registry.complete(
+        job,
+        current_sheet=None,
+        file_path=filepath,
+        file_size_bytes=os.path.getsize(filepath),
+        percent_complete=100,
+    )
+    _registry.stats["rows_written"] += job["rows_written"]
+    logger.info(f"Audit package job {job['job_id']}: {job['rows_written']} rows in {job['elapsed_ms']}ms")
+
+
+async def run_audit_package_job(job_id: str) -> None:
+    """Background entry point for a job created by create_audit_package_job"""
+    await _registry.run(job_id, _build_package)
@@ -0,0 +1,317 @@
+"""
+Bank Auto-Match Job
+Batch matching of a bank account's unmatched transactions to posted journal entries
+
+Loads every unmatched BankTransaction, every unmatched cash-account
+JournalEntryLine and the active BankMatchingRules for the account in three
+queries, indexes the lines by signed integer cents (each bucket sorted by date)
+and assigns matches greedily one-to-one. BankTransactionMatch rows and the
+transaction status updates are written in chunks, one commit per chunk, and
+progress/throughput is published on an in-process job record that the
+job-status endpoint reads.
+
+Author: NGI Capital Development Team
+Date: December 2025
+"""
+
+import logging
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, and_, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models_accounting import JournalEntry, JournalEntryLine
+from ..models_accounting_part2 import (
+    BankAccount, BankTransaction, BankTransactionMatch, BankMatchingRule
+)
+from ..utils.datetime_utils import get_pst_now
+from .job_registry import JobRegistry
+from .transaction_matcher_engine import AmountDateIndex, MatchCandidate, from_cents, to_cents
+from ..diagnostics import register_stats
+
+logger = logging.getLogger(__name__)
+
+
+AUTO_MATCH_CHUNK_SIZE = int(os.getenv("AUTO_MATCH_CHUNK_SIZE", "500"))
+AUTO_MATCH_WINDOW_DAYS = 5
+AUTO_MATCH_MIN_CONFIDENCE = Decimal("0.80")
+_registry = JobRegistry("Auto-match", counters=("matches_written",))
+
+
+def get_auto_match_stats() -> Dict[str, int]:
+    return _registry.get_stats()
+
+
+register_stats("bank_auto_match", get_auto_match_stats)
+
+
+def get_auto_match_job(job_id: str) -> Optional[Dict[str, Any]]:
+    return _registry.snapshot(job_id)
+
+
+def create_auto_match_job(bank_account_id: int, matched_by_id: int = 1) -> Dict[str, Any]:
+    """Register a queued job; run it with run_auto_match_job(job_id)"""
+    job = _registry.create(
+        bank_account_id=bank_account_id,
+        matched_by_id=matched_by_id,
+        phase="queued",
+        total_transactions=0,
+        candidate_lines=0,
+        processed=0,
+        matched=0,
+        chunks_committed=0,
+        rules_applied=0,
+        transactions_per_sec=0.0,
+        elapsed_ms=0,
+    )
+    return dict(job)
+
+
+@dataclass
+class _Rule:
+    id: int
+    bank_account_id: Optional[int]
+    description_contains: str
+    merchant_name: str
+    amount_min: Optional[Decimal]
+    amount_max: Optional[Decimal]
+    priority: int
+
+    def applies_to(self, txn: BankTransaction) -> bool:
+        description = (txn.description or "").lower()
+        if self.description_contains and self.description_contains not in description:
+            return False
+        if self.merchant_name and self.merchant_name not in (txn.merchant_name or "").lower():
+            return False
+        amount = abs(Decimal(str(txn.amount)))
+        if self.amount_min is not None and amount < self.amount_min:
+            return False
+        if self.amount_max is not None and amount > self.amount_max:
+            return False
+        return True
+
+
+def _signed_cents(amount) -> int:
+    cents = to_cents(amount)
+    return -cents if Decimal(str(amount)) < 0 else cents
+
+
+def _score(txn: BankTransaction, cents: int, key: int, candidate: MatchCandidate, rule_hit: bool) -> Decimal:
+    days = abs((candidate.on_date - txn.transaction_date).days)
+    confidence = Decimal("0.95") - Decimal("0.02") * days
+    if key != cents:
+        confidence -= Decimal("0.05")
+    words = {w for w in (txn.description or "").lower().split() if len(w) > 3}
+    if words and any(w in candidate.text for w in words):
+        confidence += Decimal("0.03")
+    if rule_hit:
+        confidence += Decimal("0.02")
+    return min(confidence, Decimal("0.99"))
+
+
+async def _load_unmatched_transactions(db: AsyncSession, bank_account_id: int) -> List[BankTransaction]:
+    result = await db.execute(
+        select(BankTransaction)
+        .where(
+            and_(
+                BankTransaction.bank_account_id == bank_account_id,
+                BankTransaction.status == "unmatched",
+                or_(BankTransaction.is_matched.is_(False), BankTransaction.is_matched.is_(None))
+            )
+        )
+        .order_by(BankTransaction.transaction_date, BankTransaction.id)
+    )
+    return list(result.scalars().all())
+
+
+async def _load_candidates(db: AsyncSession, account: BankAccount) -> AmountDateIndex:
+    """Net cash-account movement per posted/approved JE not already matched"""
+    matched_jes = select(BankTransactionMatch.journal_entry_id)
+    linked_jes = select(BankTransaction.matched_journal_entry_id).where(
+        BankTransaction.matched_journal_entry_id.is_not(None)
+    )
+    rows = (await db.execute(
+        select(
+            JournalEntryLine.journal_entry_id,
+            JournalEntry.entry_date,
+            JournalEntry.memo,
+            JournalEntryLine.description,
+            JournalEntryLine.debit_amount,
+            JournalEntryLine.credit_amount,
+        )
+        .join(JournalEntry, JournalEntry.id == JournalEntryLine.journal_entry_id)
+        .where(
+            and_(
+                JournalEntry.entity_id == account.entity_id,
+                JournalEntry.status.in_(["approved", "posted"]),
+                JournalEntryLine.account_id == account.gl_account_id,
+                JournalEntry.id.not_in(matched_jes),
+                JournalEntry.id.not_in(linked_jes),
+            )
+        )
+    )).all()
+
+    # A JE may touch the cash account on several lines; match on its net movement
+    per_entry: Dict[int, List[Any]] = {}
+    for je_id, entry_date, memo, description, debit, credit in rows:
+        entry = per_entry.setdefault(je_id, [entry_date, 0, (memo or "").lower()])
+        entry[1] += _signed_cents(Decimal(str(debit or 0)) - Decimal(str(credit or 0)))
+        if description:
+            entry[2] += " " + description.lower()
+    return AmountDateIndex([
+        (cents, MatchCandidate(je_id, from_cents(abs(cents)), entry_date, text_))
+        for je_id, (entry_date, cents, text_) in per_entry.items()
+        if cents and entry_date
+    ])
+
+
+async def _load_rules(db: AsyncSession, account: BankAccount) -> List[_Rule]:
+    result = await db.execute(
+        select(BankMatchingRule)
+        .where(
+            and_(
+                BankMatchingRule.entity_id == account.entity_id,
+                BankMatchingRule.is_active.is_(True),
+                BankMatchingRule.auto_match.is_(True),
+                or_(BankMatchingRule.bank_account_id.is_(None), BankMatchingRule.bank_account_id == account.id)
+            )
+        )
+        .order_by(BankMatchingRule.priority.desc())
+    )
+    return [
+        _Rule(
+            id=r.id,
+            bank_account_id=r.bank_account_id,
+            description_contains=(r.description_contains or "").lower(),
+            merchant_name=(r.merchant_name or "").lower(),
+            amount_min=r.amount_min,
+            amount_max=r.amount_max,
+            priority=r.priority or 0,
+        )
+        for r in result.scalars().all()
+    ]
+
+
+async def _write_chunk(db: AsyncSession, chunk: List[Dict[str, Any]], matched_by_id: int) -> None:
+    now = get_pst_now()
+    db.add_all([
+        BankTransactionMatch(
+            bank_transaction_id=m["bank_transaction_id"],
+            journal_entry_id=m["journal_entry_id"],
+            match_type="exact" if m["confidence"] >= Decimal("0.95") else "likely",
+            confidence=m["confidence"],
+            matched_by_id=matched_by_id,
+            matched_at=now,
+        )
+        for m in chunk
+    ])
+    # ORM bulk UPDATE by primary key (executemany)
+    await db.execute(
+        update(BankTransaction),
+        [
+            {
+                "id": m["bank_transaction_id"],
+                "is_matched": True,
+                "matched_at": now,
+                "matched_by_id": matched_by_id,
+                "matched_journal_entry_id": m["journal_entry_id"],
+                "confidence_score": m["confidence"],
+                "status": "matched",
+                "match_type": "single",
+            }
+            for m in chunk
+        ],
+    )
+    await db.commit()
+
+
+async def auto_match_account(
+    db: AsyncSession,
+    bank_account_id: int,
+    job_id: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    window_days: int = AUTO_MATCH_WINDOW_DAYS,
+    min_confidence: Decimal = AUTO_MATCH_MIN_CONFIDENCE,
+) -> Dict[str, Any]:
+    """Match every unmatched transaction on the account in one pass"""
+    job = _registry.get(job_id or create_auto_match_job(bank_account_id)["job_id"])
+    chunk_size = chunk_size or AUTO_MATCH_CHUNK_SIZE
+    started = time.perf_counter()
+
+    def _progress(**fields):
+        job.update(fields)
+        elapsed = time.perf_counter() - started
+        job["elapsed_ms"] = int(elapsed * 1000)
+        job["transactions_per_sec"] = round(job["processed"] / elapsed, 1) if elapsed > 0 else 0.0
+
+    account = await db.get(BankAccount, bank_account_id)
+    if not account:
+        raise ValueError("Bank account not found")
+
+    _progress(status="running", phase="loading")
+    transactions = await _load_unmatched_transactions(db, bank_account_id)
+    index = await _load_candidates(db, account)
+    rules = await _load_rules(db, account)
+    _progress(phase="matching", total_transactions=len(transactions), candidate_lines=len(index))
+
+    rule_hits: Dict[int, int] = defaultdict(int)
+    pending: List[Dict[str, Any]] = []
+    processed = 0
+    for txn in transactions:
+        processed += 1
+        cents = _signed_cents(txn.amount)
+        rule = next((r for r in rules if r.applies_to(txn)), None)
+        best = None
+        for key, candidate in index.nearby(cents, txn.transaction_date, window_days):
+            confidence = _score(txn, cents, key, candidate, rule is not None)
+            if best is None or confidence > best[0]:
+                best = (confidence, candidate)
+        if best and best[0] >= min_confidence:
+            index.claim(best[1])
+            if rule is not None:
+                rule_hits[rule.id] += 1
+            pending.append({
+                "bank_transaction_id": txn.id,
+                "journal_entry_id": best[1].ref,
+                "confidence": best[0],
+            })
+
+        if len(pending) >= chunk_size:
+            await _write_chunk(db, pending, job["matched_by_id"])
+            _registry.stats["matches_written"] += len(pending)
+            _progress(processed=processed, matched=job["matched"] + len(pending),
+                      chunks_committed=job["chunks_committed"] + 1)
+            pending = []
+        elif processed % chunk_size == 0:
+            _progress(processed=processed)
+
+    if pending:
+        await _write_chunk(db, pending, job["matched_by_id"])
+        _registry.stats["matches_written"] += len(pending)
+        _progress(matched=job["matched"] + len(pending), chunks_committed=job["chunks_committed"] + 1)
+
+    for rule_id, hits in rule_hits.items():
+        await db.execute(
+            update(BankMatchingRule)
+            .where(BankMatchingRule.id == rule_id)
+            .values(times_applied=BankMatchingRule.times_applied + hits)
+        )
+    if rule_hits:
+        await db.commit()
+
+    _progress(phase="done", processed=processed, rules_applied=sum(rule_hits.values()))
+    _registry.complete(job)
+    return dict(job)
+
+
+async def run_auto_match_job(job_id: str) -> None:
+    """Background entry point for a job created by create_auto_match_job"""
+    async def work(db: AsyncSession, job: Dict[str, Any]) -> None:
+        await auto_match_account(db, job["bank_account_id"], job_id=job_id)
+
+    await _registry.run(job_id, work, on_error=lambda job: {"phase": "failed"})
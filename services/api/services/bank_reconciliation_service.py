@@ -1,6 +1,10 @@
 """
 Bank Reconciliation Service
 Complete bank reconciliation workflow per GAAP standards with smart period detection
+
+Account status is built from grouped queries (counts/sums per account, one
+transaction listing with JE numbers joined in) and cached per account; the
+cached lists are reused until the account's transaction/match aggregate changes.
 """
 
 from decimal import Decimal
@@ -15,9 +19,35 @@ from services.api.models_accounting import JournalEntry, JournalEntryLine, Chart
 from services.api.models_accounting_part2 import BankAccount, BankTransaction, BankReconciliation
 from services.api.models_accounting_part3 import AccountingPeriod, PeriodCloseValidation
 from services.api.utils.datetime_utils import get_pst_now
+from services.api.services.account_balance_ledger import AccountBalanceLedger
+from services.api.diagnostics import register_stats
 
 logger = logging.getLogger(__name__)
 
+STATUS_CACHE_MAX_ENTRIES = 256
+
+# (database url, bank_account_id, as_of_date) -> (change token, {"matched": [...], "unmatched": [...]})
+_status_cache: Dict[Tuple[str, int, date], Tuple[tuple, Dict[str, List[Dict]]]] = {}
+_stats = {"hits": 0, "misses": 0}
+
+
+def get_reconciliation_cache_stats() -> Dict[str, int]:
+    return {**_stats, "cached_accounts": len(_status_cache)}
+
+
+register_stats("reconciliation_cache", get_reconciliation_cache_stats)
+
+
+def clear_reconciliation_cache() -> None:
+    _status_cache.clear()
+
+
+def _db_key(db: AsyncSession) -> str:
+    try:
+        return str(db.get_bind().url)
+    except Exception:
+        return "default"
+
 
 class BankReconciliationService:
     """
@@ -77,15 +107,12 @@ class BankReconciliationService:
             )
             bank_accounts = bank_accounts_result.scalars().all()
 
-            # Get reconciliation status for each bank account
-            bank_account_statuses = []
-            for bank_account in bank_accounts:
-                account_status = await self.get_reconciliation_status(
-                    bank_account.id,
-                    period_status["target_period_end"]
-                )
-                if account_status.get("success"):
-                    bank_account_statuses.append(account_status)
+            # Status for every bank account from one set of grouped queries
+            account_statuses = await self._get_reconciliation_statuses(
+                bank_accounts,
+                period_status["target_period_end"]
+            )
+            bank_account_statuses = [account_statuses[a.id] for a in bank_accounts]
 
             return {
                 "success": True,
@@ -345,36 +372,15 @@ class BankReconciliationService:
         Check if trial balance is balanced (total debits = total credits)
         """
         try:
-            # Sum all debits and credits for posted entries
-            result = await self.db.execute(
-                select(
-                    func.sum(JournalEntryLine.debit_amount).label("total_debits"),
-                    func.sum(JournalEntryLine.credit_amount).label("total_credits")
-                ).select_from(JournalEntryLine).join(
-                    JournalEntry,
-                    JournalEntry.id == JournalEntryLine.journal_entry_id
-                ).where(
-                    and_(
-                        JournalEntry.entity_id == entity_id,
-                        JournalEntry.entry_date <= as_of_date,
-                        JournalEntry.workflow_stage == 3,  # Posted only
-                        JournalEntry.status == "posted"
-                    )
-                )
-            )
-            row = result.first()
-
-            total_debits = row.total_debits or Decimal("0")
-            total_credits = row.total_credits or Decimal("0")
-            difference = abs(total_debits - total_credits)
-
-            is_balanced = difference < Decimal("0.01")
+            tb = await AccountBalanceLedger(self.db).trial_balance(entity_id, as_of_date)
+            is_balanced = tb["is_balanced"]
+            difference = tb["difference"]
 
             return {
                 "is_balanced": is_balanced,
-                "total_debits": float(total_debits),
-                "total_credits": float(total_credits),
-                "difference": float(difference),
+                "total_debits": tb["total_debits"],
+                "total_credits": tb["total_credits"],
+                "difference": difference,
                 "message": "Trial balance is balanced" if is_balanced else f"Out of balance by ${difference:,.2f}"
             }
 
@@ -433,72 +439,141 @@ class BankReconciliationService:
             bank_account = await self.db.get(BankAccount, bank_account_id)
             if not bank_account:
                 return {"success": False, "message": "Bank account not found"}
-            
-            # Get all transactions up to date
-            transactions_result = await self.db.execute(
-                select(BankTransaction).where(
+
+            statuses = await self._get_reconciliation_statuses([bank_account], as_of_date)
+            return statuses[bank_account.id]
+
+        except Exception as e:
+            logger.error(f"Error getting reconciliation status: {str(e)}")
+            return {"success": False, "message": str(e)}
+
+    async def _get_reconciliation_statuses(
+        self,
+        bank_accounts: List[BankAccount],
+        as_of_date: date
+    ) -> Dict[int, Dict]:
+        """
+        Reconciliation status for several bank accounts in a constant number of queries
+
+        One grouped aggregate per call doubles as the change token for the
+        per-account cache; transaction lists (with JE numbers joined in) are
+        only loaded for accounts whose token moved since the last call.
+        """
+        if not bank_accounts:
+            return {}
+        account_ids = [a.id for a in bank_accounts]
+        entity_ids = {a.entity_id for a in bank_accounts}
+
+        # Counts and sums per account, plus what changes when rows are imported or (un)matched
+        summary_rows = (await self.db.execute(
+            select(
+                BankTransaction.bank_account_id,
+                func.count(BankTransaction.id),
+                func.count(BankTransaction.matched_journal_entry_id),
+                func.coalesce(func.sum(BankTransaction.amount), 0),
+                func.max(BankTransaction.id),
+                func.coalesce(func.sum(BankTransaction.matched_journal_entry_id), 0),
+                func.max(BankTransaction.matched_at),
+            ).where(
+                and_(
+                    BankTransaction.bank_account_id.in_(account_ids),
+                    BankTransaction.transaction_date <= as_of_date
+                )
+            ).group_by(BankTransaction.bank_account_id)
+        )).all()
+        summaries = {row[0]: row[1:] for row in summary_rows}
+
+        # GL cash balance per entity
+        gl_rows = (await self.db.execute(
+            select(ChartOfAccounts.entity_id, ChartOfAccounts.current_balance).where(
+                and_(
+                    ChartOfAccounts.entity_id.in_(entity_ids),
+                    ChartOfAccounts.account_number == "10110"
+                )
+            )
+        )).all()
+        gl_balances = {row[0]: Decimal(str(row[1] or 0)) for row in gl_rows}
+
+        db_key = _db_key(self.db)
+        tokens = {}
+        stale_ids = []
+        for account in bank_accounts:
+            summary = summaries.get(account.id, (0, 0, 0, None, 0, None))
+            tokens[account.id] = summary
+            cached = _status_cache.get((db_key, account.id, as_of_date))
+            if cached and cached[0] == summary:
+                _stats["hits"] += 1
+            else:
+                _stats["misses"] += 1
+                stale_ids.append(account.id)
+
+        if stale_ids:
+            lists: Dict[int, Dict[str, List[Dict]]] = {
+                account_id: {"matched": [], "unmatched": []} for account_id in stale_ids
+            }
+            txn_rows = await self.db.execute(
+                select(
+                    BankTransaction.bank_account_id,
+                    BankTransaction.id,
+                    BankTransaction.transaction_date,
+                    BankTransaction.description,
+                    BankTransaction.amount,
+                    BankTransaction.mercury_transaction_id,
+                    BankTransaction.matched_journal_entry_id,
+                    JournalEntry.entry_number,
+                ).outerjoin(
+                    JournalEntry, JournalEntry.id == BankTransaction.matched_journal_entry_id
+                ).where(
                     and_(
-                        BankTransaction.bank_account_id == bank_account_id,
+                        BankTransaction.bank_account_id.in_(stale_ids),
                         BankTransaction.transaction_date <= as_of_date
                     )
-                ).order_by(BankTransaction.transaction_date)
+                ).order_by(BankTransaction.transaction_date, BankTransaction.id)
             )
-            transactions = transactions_result.scalars().all()
-            
-            # Separate matched and unmatched
-            matched_txns = [t for t in transactions if t.matched_journal_entry_id]
-            unmatched_txns = [t for t in transactions if not t.matched_journal_entry_id]
-            
-            # Calculate bank balance
-            bank_balance = sum(t.amount for t in transactions)
-            
-            # Get GL cash account balance
-            cash_account = await self._get_cash_account(bank_account.entity_id)
-            gl_balance = cash_account.current_balance if cash_account else Decimal("0")
-            
-            # Calculate difference
+            for account_id, txn_id, txn_date, description, amount, mercury_id, je_id, je_number in txn_rows:
+                item = {
+                    "id": txn_id,
+                    "date": txn_date.isoformat(),
+                    "description": description,
+                    "amount": float(amount),
+                }
+                if je_id:
+                    item["je_number"] = je_number
+                    lists[account_id]["matched"].append(item)
+                else:
+                    item["mercury_id"] = mercury_id
+                    lists[account_id]["unmatched"].append(item)
+            for account_id in stale_ids:
+                _status_cache[(db_key, account_id, as_of_date)] = (tokens[account_id], lists[account_id])
+            while len(_status_cache) > STATUS_CACHE_MAX_ENTRIES:
+                _status_cache.pop(next(iter(_status_cache)))
+
+        statuses = {}
+        for account in bank_accounts:
+            total_count, matched_count, bank_balance, _, _, _ = tokens[account.id]
+            bank_balance = Decimal(str(bank_balance))
+            gl_balance = gl_balances.get(account.entity_id, Decimal("0"))
             difference = gl_balance - bank_balance
-            
-            return {
+            txn_lists = _status_cache[(db_key, account.id, as_of_date)][1]
+            statuses[account.id] = {
                 "success": True,
                 "bank_account": {
-                    "id": bank_account.id,
-                    "bank_name": bank_account.bank_name,
-                    "account_name": bank_account.account_name,
-                    "account_number_last_four": bank_account.account_number_last_four
+                    "id": account.id,
+                    "bank_name": account.bank_name,
+                    "account_name": account.account_name,
+                    "account_number_last_four": (account.account_number_masked or "")[-4:] or None
                 },
                 "as_of_date": as_of_date.isoformat(),
                 "bank_balance": float(bank_balance),
                 "gl_balance": float(gl_balance),
                 "difference": float(difference),
                 "is_reconciled": abs(difference) < Decimal("0.01"),
-                "matched_transactions": len(matched_txns),
-                "unmatched_transactions": len(unmatched_txns),
-                "matched_txn_list": [
-                    {
-                        "id": t.id,
-                        "date": t.transaction_date.isoformat(),
-                        "description": t.description,
-                        "amount": float(t.amount),
-                        "je_number": await self._get_je_number(t.matched_journal_entry_id)
-                    }
-                    for t in matched_txns
-                ],
-                "unmatched_txn_list": [
-                    {
-                        "id": t.id,
-                        "date": t.transaction_date.isoformat(),
-                        "description": t.description,
-                        "amount": float(t.amount),
-                        "mercury_id": t.mercury_transaction_id
-                    }
-                    for t in unmatched_txns
-                ]
+                "matched_transactions": matched_count,
+                "unmatched_transactions": total_count - matched_count,
+                "matched_txn_list": [dict(t) for t in txn_lists["matched"]],
+                "unmatched_txn_list": [dict(t) for t in txn_lists["unmatched"]]
             }
-            
-        except Exception as e:
-            logger.error(f"Error getting reconciliation status: {str(e)}")
-            return {"success": False, "message": str(e)}
+        return statuses
     
     async def match_transaction_to_je(
         self,
@@ -607,14 +682,9 @@ class BankReconciliationService:
             cash_account = await self._get_cash_account(bank_account.entity_id)
             gl_ending_balance = cash_account.current_balance if cash_account else Decimal("0")
             
-            # Get outstanding deposits (in GL but not in bank yet)
-            outstanding_deposits = await self._get_outstanding_deposits(
-                bank_account_id, period_end
-            )
-            
-            # Get outstanding checks (in GL but not cleared yet)
-            outstanding_checks = await self._get_outstanding_checks(
-                bank_account_id, period_end
+            # Outstanding deposits (in GL but not in bank yet) and checks (not cleared yet)
+            outstanding_deposits, outstanding_checks = await self._get_outstanding_items(
+                bank_account, cash_account, period_end
             )
             
             # Calculate reconciliation
@@ -622,7 +692,7 @@ class BankReconciliationService:
                 "bank_account": {
                     "bank_name": bank_account.bank_name,
                     "account_name": bank_account.account_name,
-                    "account_number_last_four": bank_account.account_number_last_four
+                    "account_number_last_four": (bank_account.account_number_masked or "")[-4:] or None
                 },
                 "period_start": period_start.isoformat(),
                 "period_end": period_end.isoformat(),
@@ -701,131 +771,49 @@ class BankReconciliationService:
         )
         return result.scalar_one_or_none()
     
-    async def _get_outstanding_deposits(
+    async def _get_outstanding_items(
         self,
-        bank_account_id: int,
+        bank_account: BankAccount,
+        cash_account: Optional[ChartOfAccounts],
         as_of_date: date
-    ) -> List[Dict]:
+    ) -> Tuple[List[Dict], List[Dict]]:
         """
-        Get deposits in transit - recorded in GL but not yet cleared at bank
+        Deposits in transit and outstanding checks in one query
 
         US GAAP Requirement: ASC 305-10-50-1
         "Deposits in transit are deposits that have been recorded in the entity's
         accounting records but have not yet been recorded by the bank."
-
-        Logic:
-        1. Find all JEs with DEBIT to Cash (account 10110)
-        2. Check if there's a matching bank transaction
-        3. If no match and date <= as_of_date, it's outstanding
-        """
-        try:
-            bank_account = await self.db.get(BankAccount, bank_account_id)
-            if not bank_account:
-                return []
-
-            # Get cash account for this entity
-            cash_account_result = await self.db.execute(
-                select(ChartOfAccounts).where(
-                    and_(
-                        ChartOfAccounts.entity_id == bank_account.entity_id,
-                        ChartOfAccounts.account_number == "10110"
-                    )
-                )
-            )
-            cash_account = cash_account_result.scalar_one_or_none()
-
-            if not cash_account:
-                return []
-
-            # Find all posted JE lines with DEBIT to cash (deposits)
-            # that don't have matching bank transactions
-            je_lines_result = await self.db.execute(
-                select(JournalEntryLine, JournalEntry).join(
-                    JournalEntry,
-                    JournalEntry.id == JournalEntryLine.journal_entry_id
-                ).outerjoin(
-                    BankTransaction,
-                    and_(
-                        BankTransaction.matched_journal_entry_id == JournalEntry.id,
-                        BankTransaction.bank_account_id == bank_account_id
-                    )
-                ).where(
-                    and_(
-                        JournalEntry.entity_id == bank_account.entity_id,
-                        JournalEntry.entry_date <= as_of_date,
-                        JournalEntry.workflow_stage == 3,  # Posted
-                        JournalEntry.status == "posted",
-                        JournalEntryLine.account_id == cash_account.id,
-                        JournalEntryLine.debit_amount > 0,  # Deposits are debits to cash
-                        BankTransaction.id.is_(None)  # No matching bank transaction
-                    )
-                ).order_by(JournalEntry.entry_date)
-            )
-
-            outstanding = []
-            for line, je in je_lines_result:
-                outstanding.append({
-                    "date": je.entry_date,
-                    "description": f"JE {je.entry_number}: {je.memo or 'Deposit'}",
-                    "amount": line.debit_amount,
-                    "je_id": je.id,
-                    "je_number": je.entry_number
-                })
-
-            return outstanding
-
-        except Exception as e:
-            logger.error(f"Error getting outstanding deposits: {str(e)}")
-            return []
-
-    async def _get_outstanding_checks(
-        self,
-        bank_account_id: int,
-        as_of_date: date
-    ) -> List[Dict]:
-        """
-        Get outstanding checks - checks issued (recorded in GL) but not yet cleared at bank
-
-        US GAAP Requirement: ASC 305-10-50-1
         "Outstanding checks are checks that have been issued and recorded in the entity's
         accounting records but have not yet cleared the bank."
 
         Logic:
-        1. Find all JEs with CREDIT to Cash (account 10110)
-        2. Check if there's a matching bank transaction
-        3. If no match and date <= as_of_date, check is outstanding
+        1. Posted JE lines on Cash (account 10110) dated <= as_of_date
+        2. With no bank transaction on this account matched to the JE
+        3. Debits are deposits in transit, credits are outstanding checks
         """
-        try:
-            bank_account = await self.db.get(BankAccount, bank_account_id)
-            if not bank_account:
-                return []
+        deposits: List[Dict] = []
+        checks: List[Dict] = []
+        if not cash_account:
+            return deposits, checks
 
-            # Get cash account for this entity
-            cash_account_result = await self.db.execute(
-                select(ChartOfAccounts).where(
-                    and_(
-                        ChartOfAccounts.entity_id == bank_account.entity_id,
-                        ChartOfAccounts.account_number == "10110"
-                    )
+        try:
+            has_bank_match = select(BankTransaction.id).where(
+                and_(
+                    BankTransaction.matched_journal_entry_id == JournalEntry.id,
+                    BankTransaction.bank_account_id == bank_account.id
                 )
-            )
-            cash_account = cash_account_result.scalar_one_or_none()
-
-            if not cash_account:
-                return []
-
-            # Find all posted JE lines with CREDIT to cash (checks/payments)
-            # that don't have matching bank transactions
-            je_lines_result = await self.db.execute(
-                select(JournalEntryLine, JournalEntry).join(
+            ).exists()
+            rows = await self.db.execute(
+                select(
+                    JournalEntry.id,
+                    JournalEntry.entry_number,
+                    JournalEntry.entry_date,
+                    JournalEntry.memo,
+                    JournalEntryLine.debit_amount,
+                    JournalEntryLine.credit_amount,
+                ).join(
                     JournalEntry,
                     JournalEntry.id == JournalEntryLine.journal_entry_id
-                ).outerjoin(
-                    BankTransaction,
-                    and_(
-                        BankTransaction.matched_journal_entry_id == JournalEntry.id,
-                        BankTransaction.bank_account_id == bank_account_id
-                    )
                 ).where(
                     and_(
                         JournalEntry.entity_id == bank_account.entity_id,
@@ -833,33 +821,31 @@ class BankReconciliationService:
                         JournalEntry.workflow_stage == 3,  # Posted
                         JournalEntry.status == "posted",
                         JournalEntryLine.account_id == cash_account.id,
-                        JournalEntryLine.credit_amount > 0,  # Checks are credits to cash
-                        BankTransaction.id.is_(None)  # No matching bank transaction
+                        or_(JournalEntryLine.debit_amount > 0, JournalEntryLine.credit_amount > 0),
+                        ~has_bank_match
                     )
-                ).order_by(JournalEntry.entry_date)
+                ).order_by(JournalEntry.entry_date, JournalEntry.id)
             )
 
-            outstanding = []
-            for line, je in je_lines_result:
-                outstanding.append({
-                    "date": je.entry_date,
-                    "description": f"JE {je.entry_number}: {je.memo or 'Payment'}",
-                    "amount": line.credit_amount,
-                    "je_id": je.id,
-                    "je_number": je.entry_number
-                })
-
-            return outstanding
+            for je_id, entry_number, entry_date, memo, debit, credit in rows:
+                if debit and debit > 0:
+                    deposits.append({
+                        "date": entry_date,
+                        "description": f"JE {entry_number}: {memo or 'Deposit'}",
+                        "amount": debit,
+                        "je_id": je_id,
+                        "je_number": entry_number
+                    })
+                if credit and credit > 0:
+                    checks.append({
+                        "date": entry_date,
+                        "description": f"JE {entry_number}: {memo or 'Payment'}",
+                        "amount": credit,
+                        "je_id": je_id,
+                        "je_number": entry_number
+                    })
+            return deposits, checks
 
         except Exception as e:
-            logger.error(f"Error getting outstanding checks: {str(e)}")
-            return []
-    
-    async def _get_je_number(self, je_id: Optional[int]) -> Optional[str]:
-        """Get JE number from ID"""
-        if not je_id:
-            return None
-        
-        je = await self.db.get(JournalEntry, je_id)
-        return je.entry_number if je else None
-
+            logger.error(f"Error getting outstanding items: {str(e)}")
+            return [], []
@@ -0,0 +1,466 @@
+"""
+Transaction Categorization Engine
+Compiled keyword matching for Mercury imports
+
+All categorization patterns for an entity - BankMatchingRule
+(description_contains / merchant_name), AccountMappingRule patterns and the
+built-in keyword rules - are compiled once into a single trie-shaped regex.
+Scanning with a zero-width lookahead yields the longest keyword starting at
+every position; every shorter keyword matching there is a prefix of it, so
+the full (overlapping) set of hits is recovered from a precomputed prefix
+table, exactly like `keyword in text` against each rule. Rules are kept in
+precedence order and the first rule whose keyword hit and side conditions
+pass wins:
+
+    1. BankMatchingRule with an auto_categorize account (priority desc)
+    2. AccountMappingRule (confidence_weight desc)
+    3. built-in keyword rules for the transaction's direction
+
+A page of transactions is categorized in one categorize_many call: each
+distinct text is scanned once by the compiled pattern and its candidate rules
+are cached, so repeated descriptions cost a dict lookup. Compiled engines are
+cached per entity and rebuilt when the rule tables (or the entity's chart of
+accounts) change.
+
+Author: NGI Capital Development Team
+Date: December 2025
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.api.models_accounting import AccountMappingRule, ChartOfAccounts
+from services.api.models_accounting_part2 import BankMatchingRule
+from services.api.diagnostics import register_stats
+
+logger = logging.getLogger(__name__)
+
+
+# Format: (keywords, account_number, category_name, description_template)
+EXPENSE_KEYWORD_RULES = [
+    # Software & SaaS (62100 - Software & Subscriptions)
+    (
+        ["openai", "anthropic", "claude", "gpt", "api", "github", "gitlab", "vercel", "netlify",
+         "aws", "azure", "gcp", "google cloud", "digitalocean", "heroku", "software", "saas",
+         "subscription", "slack", "notion", "figma", "linear", "zoom", "microsoft 365"],
+        "62100",
+        "Software & Subscriptions",
+        "Software/SaaS"
+    ),
+    # Legal & Professional (62700 - Legal & Professional Fees)
+    (
+        ["attorney", "lawyer", "legal", "law firm", "stripe atlas", "clerky", "incorporation",
+         "filing fee", "state filing", "delaware", "secretary of state", "registered agent",
+         "northwest registered", "incfile", "legalzoom", "rocket lawyer"],
+        "62700",
+        "Legal & Professional Fees",
+        "Legal/Professional services"
+    ),
+    # Marketing & Advertising (62200 - Marketing & Advertising)
+    (
+        ["google ads", "facebook ads", "linkedin ads", "twitter ads", "meta", "ad spend",
+         "advertising", "marketing", "mailchimp", "sendgrid", "hubspot", "campaign"],
+        "62200",
+        "Marketing & Advertising",
+        "Marketing/Advertising"
+    ),
+    # Travel & Entertainment (62600 - Travel & Entertainment)
+    (
+        ["airline", "hotel", "airbnb", "uber", "lyft", "rental car", "flight", "travel",
+         "restaurant", "meal", "doordash", "ubereats", "grubhub", "entertainment"],
+        "62600",
+        "Travel & Entertainment",
+        "Travel/Entertainment"
+    ),
+    # Office Supplies (62400 - Office Supplies & Equipment)
+    (
+        ["amazon", "staples", "office depot", "supplies", "equipment", "furniture",
+         "desk", "chair", "monitor", "keyboard", "mouse"],
+        "62400",
+        "Office Supplies & Equipment",
+        "Office supplies/equipment"
+    ),
+    # Insurance (62800 - Insurance)
+    (
+        ["insurance", "liability", "workers comp", "health insurance", "dental",
+         "vision", "embroker", "next insurance", "hiscox"],
+        "62800",
+        "Insurance",
+        "Insurance premium"
+    ),
+    # Utilities (62500 - Utilities)
+    (
+        ["internet", "phone", "mobile", "verizon", "at&t", "t-mobile", "comcast",
+         "spectrum", "utility", "electric", "power"],
+        "62500",
+        "Utilities",
+        "Utilities"
+    ),
+    # Bank Fees (62900 - Bank Fees)
+    (
+        ["bank fee", "service charge", "wire fee", "ach fee", "monthly fee",
+         "transaction fee", "overdraft", "mercury fee"],
+        "62900",
+        "Bank Fees",
+        "Bank fees"
+    ),
+    # Rent (62300 - Rent)
+    (
+        ["rent", "lease", "office space", "coworking", "wework", "regus"],
+        "62300",
+        "Rent",
+        "Rent expense"
+    ),
+    # Payroll (63000 - Payroll Expenses)
+    (
+        ["payroll", "salary", "wages", "gusto", "rippling", "adp", "paychex",
+         "employee", "contractor payment"],
+        "63000",
+        "Payroll Expenses",
+        "Payroll/Compensation"
+    ),
+]
+
+REVENUE_KEYWORD_RULES = [
+    # Service Revenue (40100 - Service Revenue)
+    (
+        ["client payment", "invoice payment", "service fee", "consulting", "advisory",
+         "professional services", "revenue", "stripe", "payment received"],
+        "40100",
+        "Service Revenue",
+        "Service revenue"
+    ),
+    # Interest Income (40500 - Interest Income)
+    (
+        ["interest", "interest earned", "mercury interest", "bank interest"],
+        "40500",
+        "Interest Income",
+        "Interest income"
+    ),
+    # Refunds/Returns
+    (
+        ["refund", "return", "reimbursement", "credit memo"],
+        "40400",
+        "Other Income",
+        "Refund/Return"
+    ),
+]
+
+SCAN_CACHE_SIZE = 65536
+MAX_CACHED_ENGINES = 64
+
+_engines: Dict[int, Tuple[tuple, "CategorizationEngine"]] = {}
+_stats = {"compiles": 0, "engine_hits": 0}
+
+
+def get_categorization_stats() -> Dict[str, int]:
+    return {**_stats, "cached_engines": len(_engines)}
+
+
+register_stats("categorization", get_categorization_stats)
+
+
+def clear_categorization_engines() -> None:
+    _engines.clear()
+
+
+@lru_cache(maxsize=SCAN_CACHE_SIZE)
+def tokenize(text: str) -> FrozenSet[str]:
+    """Lower-cased word set of a description (cached)"""
+    return frozenset(text.lower().split()) if text else frozenset()
+
+
+def description_similarity(desc1: str, desc2: str) -> float:
+    """Jaccard similarity of cached token sets (0-1)"""
+    words1 = tokenize(desc1)
+    words2 = tokenize(desc2)
+    if not words1 or not words2:
+        return 0.0
+    return len(words1 & words2) / len(words1 | words2)
+
+
+def _trie_regex(keywords: Iterable[str]) -> str:
+    """Alternation factored as a trie; greedy optionals give the longest match"""
+    trie: Dict = {}
+    for word in keywords:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: Dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != ""]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            # Single-char bodies need no group for "?"
+            return ("(?:" + body + ")?") if len(branches) > 1 or len(body) > 1 else body + "?"
+        return body
+
+    return build(trie)
+
+
+@dataclass
+class CompiledRule:
+    keyword: str
+    account_id: int
+    account_number: Optional[str]
+    category_name: str
+    description_template: str
+    confidence: float
+    source: str
+    # Side conditions
+    direction: Optional[str] = None  # "credit" / "debit" / None
+    counterparty_contains: Optional[str] = None
+    amount_min: Optional[Decimal] = None
+    amount_max: Optional[Decimal] = None
+    bank_account_id: Optional[int] = None
+    rule_id: Optional[int] = None
+
+    def accepts(self, counterparty: str, amount: Decimal, bank_account_id: Optional[int]) -> bool:
+        if self.direction == "credit" and not amount > 0:
+            return False
+        if self.direction == "debit" and amount > 0:
+            return False
+        if self.counterparty_contains and self.counterparty_contains not in counterparty:
+            return False
+        magnitude = abs(amount)
+        if self.amount_min is not None and magnitude < self.amount_min:
+            return False
+        if self.amount_max is not None and magnitude > self.amount_max:
+            return False
+        if self.bank_account_id is not None and bank_account_id is not None \
+                and self.bank_account_id != bank_account_id:
+            return False
+        return True
+
+
+class CategorizationEngine:
+    """Rules in precedence order compiled into one scanning regex"""
+
+    def __init__(self, rules: Sequence[CompiledRule]):
+        self.rules = list(rules)
+        keywords = sorted({r.keyword for r in self.rules if r.keyword})
+        self._keyword_ids = {kw: i for i, kw in enumerate(keywords)}
+        # keyword id -> rule indexes (ascending = precedence)
+        self._rules_by_keyword: List[List[int]] = [[] for _ in keywords]
+        for index, rule in enumerate(self.rules):
+            if rule.keyword:
+                self._rules_by_keyword[self._keyword_ids[rule.keyword]].append(index)
+        # keyword -> ids of every keyword that is a prefix of it (itself included)
+        self._prefix_ids: Dict[str, Tuple[int, ...]] = {
+            kw: tuple(self._keyword_ids[kw[:n]] for n in range(1, len(kw) + 1) if kw[:n] in self._keyword_ids)
+            for kw in keywords
+        }
+        self._pattern = re.compile("(?=(" + _trie_regex(keywords) + "))") if keywords else None
+        # lower-cased text -> candidate rule indexes
+        self._scan_cache: Dict[str, Tuple[int, ...]] = {}
+
+    def scan_many(self, texts: Sequence[str]) -> List[Tuple[int, ...]]:
+        """Candidate rule indexes (ascending = precedence) for each lower-cased text"""
+        cache = self._scan_cache
+        findall = self._pattern.findall if self._pattern is not None else None
+        prefix_ids = self._prefix_ids
+        rules_by_keyword = self._rules_by_keyword
+        out = []
+        for text in texts:
+            candidates = cache.get(text)
+            if candidates is None:
+                candidates = ()
+                hits = findall(text) if findall else None
+                if hits:
+                    candidates = tuple(sorted({
+                        index
+                        for keyword in hits
+                        for keyword_id in prefix_ids[keyword]
+                        for index in rules_by_keyword[keyword_id]
+                    }))
+                cache[text] = candidates
+                if len(cache) > SCAN_CACHE_SIZE:
+                    cache.pop(next(iter(cache)))
+            out.append(candidates)
+        return out
+
+    def categorize_many(
+        self,
+        transactions: Sequence[Dict],
+        bank_account_id: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Categorize a page of Mercury transaction dicts
+        Returns one result per input: account_id, account_number, category_name,
+        description, confidence and rule (source/id) or all-None when unmatched
+        """
+        texts = [
+            f"{txn.get('description') or ''} {txn.get('counterpartyName') or ''} {txn.get('note') or ''}".lower()
+            for txn in transactions
+        ]
+        rules = self.rules
+        results = []
+        for txn, candidates in zip(transactions, self.scan_many(texts)):
+            counterparty = txn.get("counterpartyName") or ""
+            best = None
+            if candidates:
+                amount = txn.get("amount") or 0
+                amount = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+                lowered = counterparty.lower()
+                for index in candidates:
+                    if rules[index].accepts(lowered, amount, bank_account_id):
+                        best = index
+                        break
+            results.append(self._result(best, counterparty))
+        return results
+
+    def categorize(self, description: str, counterparty: str, note: str, amount: Decimal) -> Dict:
+        return self.categorize_many(
+            [{"description": description, "counterpartyName": counterparty, "note": note, "amount": amount}]
+        )[0]
+
+    def _result(self, index: Optional[int], counterparty: str) -> Dict:
+        if index is None:
+            return {
+                "account_id": None,
+                "account_number": None,
+                "category_name": None,
+                "description": None,
+                "confidence": 0.0,
+                "rule": None,
+            }
+        rule = self.rules[index]
+        return {
+            "account_id": rule.account_id,
+            "account_number": rule.account_number,
+            "category_name": rule.category_name,
+            "description": f"{rule.description_template} - {counterparty}" if counterparty else rule.description_template,
+            "confidence": rule.confidence,
+            "rule": {"source": rule.source, "id": rule.rule_id},
+        }
+
+
+def build_rules(
+    accounts: Dict[str, Tuple[int, str]],
+    matching_rules: Sequence[BankMatchingRule] = (),
+    mapping_rules: Sequence[AccountMappingRule] = (),
+) -> List[CompiledRule]:
+    """
+    Flatten rule rows and built-in keywords into precedence order
+    `accounts` maps account_number -> (account_id, account_name)
+    """
+    names_by_id = {account_id: (number, name) for number, (account_id, name) in accounts.items()}
+    rules: List[CompiledRule] = []
+
+    for r in sorted(matching_rules, key=lambda r: (-(r.priority or 0), r.id)):
+        keyword = (r.description_contains or r.merchant_name or "").strip().lower()
+        if not keyword or not r.auto_categorize_account_id:
+            continue
+        number, name = names_by_id.get(r.auto_categorize_account_id, (None, r.rule_name))
+        merchant = (r.merchant_name or "").strip().lower()
+        rules.append(CompiledRule(
+            keyword=keyword,
+            account_id=r.auto_categorize_account_id,
+            account_number=number,
+            category_name=name,
+            description_template=r.rule_name,
+            confidence=0.95,
+            source="bank_matching_rule",
+            counterparty_contains=merchant if r.description_contains and merchant else None,
+            amount_min=r.amount_min,
+            amount_max=r.amount_max,
+            bank_account_id=r.bank_account_id,
+            rule_id=r.id,
+        ))
+
+    for r in sorted(mapping_rules, key=lambda r: (-(r.confidence_weight or Decimal("1")), r.id)):
+        keyword = (r.pattern or "").strip().lower()
+        if not keyword or r.rule_type == "amount" or not r.account_id:
+            continue
+        number, name = names_by_id.get(r.account_id, (None, keyword))
+        rules.append(CompiledRule(
+            keyword=keyword,
+            account_id=r.account_id,
+            account_number=number,
+            category_name=name,
+            description_template=name,
+            confidence=round(min(0.95, 0.9 * float(r.confidence_weight or 1)), 2),
+            source="account_mapping_rule",
+            counterparty_contains=keyword if r.rule_type == "vendor" else None,
+            rule_id=r.id,
+        ))
+
+    for direction, keyword_rules in (("debit", EXPENSE_KEYWORD_RULES), ("credit", REVENUE_KEYWORD_RULES)):
+        for keywords, account_number, category_name, template in keyword_rules:
+            if account_number not in accounts:
+                # Same as before: a rule whose account is missing never applies
+                continue
+            for keyword in keywords:
+                rules.append(CompiledRule(
+                    keyword=keyword,
+                    account_id=accounts[account_number][0],
+                    account_number=account_number,
+                    category_name=category_name,
+                    description_template=template,
+                    confidence=0.85,
+                    source="keyword",
+                    direction=direction,
+                ))
+    return rules
+
+
+async def _rules_token(db: AsyncSession, entity_id: int) -> tuple:
+    """Changes whenever a rule or chart-of-accounts row for the entity changes"""
+    def scalar(column, model, *criteria):
+        return select(column).where(model.entity_id == entity_id, *criteria).scalar_subquery()
+
+    row = (await db.execute(
+        select(
+            scalar(func.count(BankMatchingRule.id), BankMatchingRule, BankMatchingRule.is_active.is_(True)),
+            scalar(func.max(BankMatchingRule.updated_at), BankMatchingRule),
+            scalar(func.count(AccountMappingRule.id), AccountMappingRule, AccountMappingRule.is_active.is_(True)),
+            scalar(func.max(AccountMappingRule.updated_at), AccountMappingRule),
+            scalar(func.count(ChartOfAccounts.id), ChartOfAccounts),
+            scalar(func.max(ChartOfAccounts.id), ChartOfAccounts),
+        )
+    )).one()
+    return tuple(row)
+
+
+async def get_categorization_engine(db: AsyncSession, entity_id: int) -> CategorizationEngine:
+    """Compiled engine for the entity, rebuilt only when its rules changed"""
+    token = await _rules_token(db, entity_id)
+    cached = _engines.get(entity_id)
+    if cached and cached[0] == token:
+        _stats["engine_hits"] += 1
+        return cached[1]
+
+    account_rows = (await db.execute(
+        select(ChartOfAccounts.account_number, ChartOfAccounts.id, ChartOfAccounts.account_name)
+        .where(ChartOfAccounts.entity_id == entity_id)
+    )).all()
+    accounts = {number: (account_id, name) for number, account_id, name in account_rows}
+    matching_rules = (await db.execute(
+        select(BankMatchingRule).where(
+            BankMatchingRule.entity_id == entity_id, BankMatchingRule.is_active.is_(True)
+        )
+    )).scalars().all()
+    mapping_rules = (await db.execute(
+        select(AccountMappingRule).where(
+            AccountMappingRule.entity_id == entity_id, AccountMappingRule.is_active.is_(True)
+        )
+    )).scalars().all()
+
+    engine = CategorizationEngine(build_rules(accounts, matching_rules, mapping_rules))
+    _engines[entity_id] = (token, engine)
+    while len(_engines) > MAX_CACHED_ENGINES:
+        _engines.pop(next(iter(_engines)))
+    _stats["compiles"] += 1
+    logger.info(f"Compiled categorization engine for entity {entity_id}: {len(engine.rules)} rules")
+    return engine
@@ -0,0 +1,399 @@
+"""
+Consolidation Engine
+Set-based multi-entity consolidation with intercompany eliminations (ASC 810)
+
+1. Resolve the group from entity_relationships (full-consolidation, active,
+   controlled subsidiaries), walking the tree from the parent
+2. Aggregate every entity's trial balance in one grouped query over posted
+   lines, mapped across entities by account_number
+3. Eliminate intercompany activity by backing out the posted journal entries
+   referenced by IntercompanyTransaction rows whose both sides are in the
+   group, again as one grouped query
+4. Persist the result to consolidated_financial_statements
+
+Author: NGI Capital Development Team
+Date: December 2025
+"""
+
+import logging
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select, and_, or_, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.api.models_accounting import (
+    AccountingEntity, ChartOfAccounts, EntityRelationship, JournalEntry, JournalEntryLine
+)
+from services.api.models_accounting_part3 import IntercompanyTransaction, ConsolidatedFinancialStatement
+from services.api.services.account_balance_ledger import signed_balance
+from services.api.utils.datetime_utils import get_pst_now
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal("0.00")
+
+ASSET_TYPES = ("Asset", "Assets", "Current Assets", "Non-Current Assets")
+LIABILITY_TYPES = ("Liability", "Liabilities", "Current Liabilities", "Long-term Liabilities")
+EQUITY_TYPES = ("Equity", "Shareholders' Equity")
+REVENUE_TYPES = ("Revenue", "Other Income")
+EXPENSE_TYPES = ("Expense", "Operating Expenses", "Cost of Revenue", "Other Expenses")
+
+
+def _dec(value) -> Decimal:
+    return Decimal(str(value or 0))
+
+
+def _period_type(period_start: date, period_end: date) -> str:
+    months = (period_end.year - period_start.year) * 12 + period_end.month - period_start.month + 1
+    if months <= 1:
+        return "monthly"
+    if months <= 3:
+        return "quarterly"
+    return "annual"
+
+
+class ConsolidationEngine:
+    """Consolidate a parent and its subsidiaries for a period"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def resolve_group(self, parent_entity_id: int, as_of: date) -> List[int]:
+        """Parent plus every fully consolidated descendant as of a date"""
+        result = await self.db.execute(
+            select(EntityRelationship.parent_entity_id, EntityRelationship.subsidiary_entity_id).where(
+                and_(
+                    EntityRelationship.is_active == True,
+                    EntityRelationship.has_control == True,
+                    EntityRelationship.consolidation_method == "full",
+                    EntityRelationship.ownership_effective_date <= as_of,
+                    or_(
+                        EntityRelationship.ownership_end_date.is_(None),
+                        EntityRelationship.ownership_end_date >= as_of,
+                    ),
+                )
+            )
+        )
+        children: Dict[int, List[int]] = {}
+        for parent_id, sub_id in result:
+            children.setdefault(int(parent_id), []).append(int(sub_id))
+
+        # Fall back to AccountingEntity.parent_entity_id links
+        legacy = await self.db.execute(
+            select(AccountingEntity.parent_entity_id, AccountingEntity.id).where(
+                AccountingEntity.parent_entity_id.is_not(None)
+            )
+        )
+        for parent_id, sub_id in legacy:
+            kids = children.setdefault(int(parent_id), [])
+            if int(sub_id) not in kids:
+                kids.append(int(sub_id))
+
+        group, frontier = [parent_entity_id], [parent_entity_id]
+        while frontier:
+            nxt = []
+            for eid in frontier:
+                for sub_id in children.get(eid, []):
+                    if sub_id not in group:
+                        group.append(sub_id)
+                        nxt.append(sub_id)
+            frontier = nxt
+        return group
+
+    async def consolidate(
+        self,
+        parent_entity_id: int,
+        period_start: date,
+        period_end: date,
+        entity_ids: Optional[Iterable[int]] = None,
+        *,
+        generated_by_id: int,
+    ) -> Dict:
+        """Build, eliminate and persist a consolidated trial balance"""
+        if entity_ids:
+            group = [parent_entity_id] + [e for e in entity_ids if e != parent_entity_id]
+        else:
+            group = await self.resolve_group(parent_entity_id, period_end)
+
+        accounts = await self._grouped_trial_balance(group, period_start, period_end)
+        ic_entry_ids, unmatched = await self._intercompany_entries(group, period_start, period_end)
+        eliminations = await self._eliminate(accounts, ic_entry_ids, period_start, period_end)
+        ic_summary = await self._intercompany_summary(group, period_start, period_end)
+        total_eliminations = sum(ic_summary.values(), ZERO)
+
+        balance_sheet = build_balance_sheet(accounts)
+        income_statement = build_income_statement(accounts)
+        statement = await self._persist(
+            parent_entity_id, group, period_start, period_end,
+            accounts, balance_sheet, income_statement, eliminations, ic_summary,
+            total_eliminations, generated_by_id,
+        )
+
+        return {
+            "consolidated_statement_id": statement.id,
+            "entities_included": group,
+            "intercompany_eliminations": float(total_eliminations),
+            "eliminated_entries": len(ic_entry_ids),
+            "unmatched_intercompany": unmatched,
+            "accounts": _accounts_json(accounts),
+            "balance_sheet": balance_sheet,
+            "income_statement": income_statement,
+        }
+
+    # ------------------------------------------------------------------------
+    # Aggregation
+    # ------------------------------------------------------------------------
+
+    async def _grouped_trial_balance(
+        self, entity_ids: List[int], period_start: date, period_end: date
+    ) -> Dict[str, Dict]:
+        """account_number -> cumulative and period debits/credits across the group"""
+        in_period = JournalEntry.entry_date >= period_start
+        result = await self.db.execute(
+            select(
+                JournalEntry.entity_id,
+                ChartOfAccounts.account_number,
+                ChartOfAccounts.account_name,
+                ChartOfAccounts.account_type,
+                ChartOfAccounts.normal_balance,
+                func.sum(JournalEntryLine.debit_amount).label("debit"),
+                func.sum(JournalEntryLine.credit_amount).label("credit"),
+                func.sum(case((in_period, JournalEntryLine.debit_amount), else_=0)).label("period_debit"),
+                func.sum(case((in_period, JournalEntryLine.credit_amount), else_=0)).label("period_credit"),
+            )
+            .join(JournalEntry, JournalEntry.id == JournalEntryLine.journal_entry_id)
+            .join(ChartOfAccounts, ChartOfAccounts.id == JournalEntryLine.account_id)
+            .where(
+                and_(
+                    JournalEntry.entity_id.in_(entity_ids),
+                    JournalEntry.status == "posted",
+                    JournalEntry.entry_date <= period_end,
+                )
+            )
+            .group_by(
+                JournalEntry.entity_id,
+                ChartOfAccounts.account_number,
+                ChartOfAccounts.account_name,
+                ChartOfAccounts.account_type,
+                ChartOfAccounts.normal_balance,
+            )
+        )
+
+        parent_id = entity_ids[0]
+        accounts: Dict[str, Dict] = {}
+        for row in result.mappings():
+            acct = accounts.get(row["account_number"])
+            if acct is None:
+                acct = accounts[row["account_number"]] = {
+                    "account_number": row["account_number"],
+                    "account_name": row["account_name"],
+                    "account_type": row["account_type"],
+                    "normal_balance": row["normal_balance"],
+                    "debit": ZERO, "credit": ZERO,
+                    "period_debit": ZERO, "period_credit": ZERO,
+                    "by_entity": {},
+                }
+            elif row["entity_id"] == parent_id:
+                # Parent's naming wins when subsidiaries label an account differently
+                acct["account_name"] = row["account_name"]
+            for key in ("debit", "credit", "period_debit", "period_credit"):
+                acct[key] += _dec(row[key])
+            acct["by_entity"][int(row["entity_id"])] = float(_dec(row["debit"]) - _dec(row["credit"]))
+        return accounts
+
+    async def _intercompany_entries(
+        self, entity_ids: List[int], period_start: date, period_end: date
+    ):
+        """
+        Journal entry ids to eliminate, and ids of intercompany rows that cannot
+        be eliminated because one side has no journal entry.
+
+        Includes earlier periods so intercompany balances carried on the
+        balance sheet are eliminated as well as this period's activity.
+        """
+        result = await self.db.execute(
+            select(
+                IntercompanyTransaction.id,
+                IntercompanyTransaction.from_journal_entry_id,
+                IntercompanyTransaction.to_journal_entry_id,
+            ).where(
+                and_(
+                    IntercompanyTransaction.transaction_date <= period_end,
+                    IntercompanyTransaction.from_entity_id.in_(entity_ids),
+                    IntercompanyTransaction.to_entity_id.in_(entity_ids),
+                )
+            )
+        )
+        entry_ids, unmatched = set(), []
+        for ic_id, from_je, to_je in result:
+            # Eliminating one side alone would unbalance the group
+            if from_je and to_je:
+                entry_ids.update((int(from_je), int(to_je)))
+            else:
+                unmatched.append(int(ic_id))
+        return entry_ids, unmatched
+
+    async def _eliminate(
+        self, accounts: Dict[str, Dict], entry_ids: set, period_start: date, period_end: date
+    ) -> Dict[str, Dict]:
+        """Back intercompany entries out of the consolidated balances in one pass"""
+        if not entry_ids:
+            return {}
+        in_period = JournalEntry.entry_date >= period_start
+        result = await self.db.execute(
+            select(
+                ChartOfAccounts.account_number,
+                func.sum(JournalEntryLine.debit_amount).label("debit"),
+                func.sum(JournalEntryLine.credit_amount).label("credit"),
+                func.sum(case((in_period, JournalEntryLine.debit_amount), else_=0)).label("period_debit"),
+                func.sum(case((in_period, JournalEntryLine.credit_amount), else_=0)).label("period_credit"),
+            )
+            .join(JournalEntry, JournalEntry.id == JournalEntryLine.journal_entry_id)
+            .join(ChartOfAccounts, ChartOfAccounts.id == JournalEntryLine.account_id)
+            .where(
+                and_(
+                    JournalEntryLine.journal_entry_id.in_(entry_ids),
+                    JournalEntry.status == "posted",
+                    JournalEntry.entry_date <= period_end,
+                )
+            )
+            .group_by(ChartOfAccounts.account_number)
+        )
+        eliminations = {}
+        for row in result.mappings():
+            acct = accounts.get(row["account_number"])
+            if acct is None:
+                continue
+            for key in ("debit", "credit", "period_debit", "period_credit"):
+                acct[key] -= _dec(row[key])
+            eliminations[row["account_number"]] = {
+                "debit": float(_dec(row["debit"])), "credit": float(_dec(row["credit"])),
+                "period_debit": float(_dec(row["period_debit"])), "period_credit": float(_dec(row["period_credit"])),
+            }
+        return eliminations
+
+    async def _intercompany_summary(
+        self, entity_ids: List[int], period_start: date, period_end: date
+    ) -> Dict[str, Decimal]:
+        result = await self.db.execute(
+            select(
+                IntercompanyTransaction.transaction_type,
+                func.coalesce(func.sum(IntercompanyTransaction.amount), 0),
+            )
+            .where(
+                and_(
+                    IntercompanyTransaction.transaction_date >= period_start,
+                    IntercompanyTransaction.transaction_date <= period_end,
+                    IntercompanyTransaction.from_entity_id.in_(entity_ids),
+                    IntercompanyTransaction.to_entity_id.in_(entity_ids),
+                )
+            )
+            .group_by(IntercompanyTransaction.transaction_type)
+        )
+        return {(t or "Other"): _dec(total) for t, total in result}
+
+    # ------------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------------
+
+    async def _persist(
+        self, parent_entity_id, group, period_start, period_end, accounts,
+        balance_sheet, income_statement, eliminations, ic_summary,
+        total_eliminations, generated_by_id,
+    ) -> ConsolidatedFinancialStatement:
+        period_type = _period_type(period_start, period_end)
+        # One row per group and period (uq_consol_group_period)
+        result = await self.db.execute(
+            select(ConsolidatedFinancialStatement).where(
+                and_(
+                    ConsolidatedFinancialStatement.parent_entity_id == parent_entity_id,
+                    ConsolidatedFinancialStatement.period_type == period_type,
+                    ConsolidatedFinancialStatement.as_of_date == period_end,
+                )
+            )
+        )
+        statement = result.scalar_one_or_none()
+        if statement is not None and statement.status == "final":
+            raise ValueError("Consolidated statements for this period are final")
+        if statement is None:
+            statement = ConsolidatedFinancialStatement(
+                parent_entity_id=parent_entity_id,
+                period_type=period_type,
+                as_of_date=period_end,
+            )
+            self.db.add(statement)
+
+        statement.fiscal_year = period_end.year
+        statement.fiscal_period = period_end.month
+        statement.subsidiary_entity_ids = ",".join(str(e) for e in group[1:])
+        statement.balance_sheet_data = {**balance_sheet, "accounts": _accounts_json(accounts)}
+        statement.income_statement_data = income_statement
+        statement.elimination_entries_json = {
+            "accounts": eliminations,
+            "by_type": {k: float(v) for k, v in ic_summary.items()},
+            "period_start": period_start.isoformat(),
+        }
+        statement.total_eliminations = total_eliminations
+        statement.status = "draft"
+        statement.generated_by_id = generated_by_id
+        statement.generated_at = get_pst_now()
+        await self.db.commit()
+        await self.db.refresh(statement)
+        return statement
+
+
+def _accounts_json(accounts: Dict[str, Dict]) -> Dict[str, Dict]:
+    return {
+        number: {
+            "account_number": a["account_number"],
+            "account_name": a["account_name"],
+            "account_type": a["account_type"],
+            "debit": float(a["debit"]),
+            "credit": float(a["credit"]),
+            "balance": float(signed_balance(a["normal_balance"], a["debit"], a["credit"])),
+            "by_entity": a["by_entity"],
+        }
+        for number, a in sorted(accounts.items())
+    }
+
+
+def build_balance_sheet(accounts: Dict[str, Dict]) -> Dict:
+    """Totals by section from consolidated balances (normal-side signs)"""
+    assets = liabilities = equity = ZERO
+    for a in accounts.values():
+        balance = signed_balance(a["normal_balance"], a["debit"], a["credit"])
+        if a["account_type"] in ASSET_TYPES:
+            assets += balance
+        elif a["account_type"] in LIABILITY_TYPES:
+            liabilities += balance
+        elif a["account_type"] in EQUITY_TYPES:
+            equity += balance
+        elif a["account_type"] in REVENUE_TYPES + EXPENSE_TYPES:
+            # Earnings not yet closed to equity
+            equity += a["credit"] - a["debit"]
+    return {
+        "total_assets": float(assets),
+        "total_liabilities": float(liabilities),
+        "total_equity": float(equity),
+        "balance_check": float(assets - liabilities - equity),
+    }
+
+
+def build_income_statement(accounts: Dict[str, Dict]) -> Dict:
+    """Period revenue, expenses and net income from consolidated activity"""
+    revenue = expenses = ZERO
+    for a in accounts.values():
+        net_credit = a["period_credit"] - a["period_debit"]
+        if a["account_type"] in REVENUE_TYPES:
+            revenue += net_credit
+        elif a["account_type"] in EXPENSE_TYPES:
+            expenses -= net_credit
+    net_income = revenue - expenses
+    return {
+        "total_revenue": float(revenue),
+        "total_expenses": float(expenses),
+        "net_income": float(net_income),
+        "profit_margin": float((net_income / revenue * 100) if revenue > 0 else 0),
+    }
@@ -0,0 +1,169 @@
+"""
+Dashboard Snapshot
+Versioned, precomputed payload for /api/dashboard/metrics
+
+The snapshot is flagged stale (one UPDATE in the writer's own transaction)
+when journal entries post or move through approval, Mercury sync imports
+rows or refreshes balances, legacy transactions are created/approved, and
+entity conversion creates or closes an entity.
+Reads serve the stored payload and only recompute when stale or when the
+calendar month rolled over; the version only moves when the payload changed,
+so it can be used directly as an ETag.
+
+Author: NGI Capital Development Team
+Date: December 2025
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, select, update, text as sa_text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from services.api.models_accounting import DashboardSnapshot
+from services.api.utils.datetime_utils import get_pst_now
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_SCOPE = "global"
+
+# Writers bump the generation so a recompute that started before the write
+# cannot clear the flag it raised
+_STALE = (
+    update(DashboardSnapshot)
+    .values(is_stale=True, generation=DashboardSnapshot.generation + 1)
+    .execution_options(synchronize_session=False)
+)
+
+
+async def mark_dashboard_stale(db: AsyncSession) -> None:
+    """Flag the snapshot stale inside the caller's (async) transaction"""
+    try:
+        await db.execute(_STALE)
+    except Exception as e:
+        logger.debug(f"Could not flag dashboard snapshot stale: {e}")
+
+
+def mark_dashboard_stale_sync(db: Session) -> None:
+    """Sync-session variant for legacy raw-SQL writers"""
+    try:
+        db.execute(_STALE)
+    except Exception as e:
+        logger.debug(f"Could not flag dashboard snapshot stale: {e}")
+
+
+def _scalar(db: Session, sql: str, params: Optional[Dict[str, Any]] = None, default: Any = 0) -> Any:
+    # Legacy tables may be missing in fresh/dev databases
+    try:
+        value = db.execute(sa_text(sql), params or {}).scalar()
+        return default if value is None else value
+    except Exception:
+        db.rollback()
+        return default
+
+
+def compute_dashboard_metrics(db: Session) -> Dict[str, Any]:
+    """Aggregate the dashboard figures (used on a stale snapshot only)"""
+    month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    payload: Dict[str, Any] = {
+        "total_assets": 0.0,
+        "monthly_revenue": 0.0,
+        "monthly_expenses": 0.0,
+        "cash_position": 0.0,
+        "entity_count": 0,
+        "pending_approvals": 0,
+        "recent_activity": [],
+    }
+
+    payload["entity_count"] = int(_scalar(db, "SELECT COUNT(*) FROM entities WHERE is_active = 1"))
+
+    # Total assets: prefer bank_accounts sum, fallback to partners capital balance
+    cash = float(_scalar(
+        db, "SELECT COALESCE(SUM(current_balance),0) FROM bank_accounts WHERE COALESCE(is_active,1) = 1", default=0.0
+    ))
+    payload["cash_position"] = cash
+    total_assets = cash
+    if abs(total_assets) < 1e-6:
+        total_assets = float(_scalar(
+            db, "SELECT COALESCE(SUM(capital_account_balance),0) FROM partners WHERE COALESCE(is_active,1) = 1",
+            default=0.0,
+        ))
+    payload["total_assets"] = total_assets
+
+    monthly = (
+        "SELECT COALESCE(SUM(amount),0) FROM transactions WHERE transaction_type = :tt "
+        "AND transaction_date >= :ms AND approval_status = 'approved'"
+    )
+    payload["monthly_revenue"] = float(_scalar(db, monthly, {"tt": "revenue", "ms": month_start}, 0.0))
+    payload["monthly_expenses"] = float(_scalar(db, monthly, {"tt": "expense", "ms": month_start}, 0.0))
+
+    payload["pending_approvals"] = int(_scalar(
+        db, "SELECT COUNT(*) FROM transactions WHERE approval_status = 'pending'"
+    )) + int(_scalar(
+        db, "SELECT COUNT(*) FROM journal_entries WHERE status IN ('pending_first_approval','pending_final_approval')"
+    ))
+
+    # Recent activity (optional)
+    try:
+        rows = db.execute(sa_text(
+            """
+            SELECT t.id, t.transaction_date, t.amount, t.transaction_type, t.description, e.legal_name, t.approval_status
+            FROM transactions t
+            LEFT JOIN entities e ON t.entity_id = e.id
+            ORDER BY t.created_at DESC
+            LIMIT 10
+            """
+        )).fetchall()
+        for tx in rows:
+            payload["recent_activity"].append({
+                "id": tx[0],
+                "date": str(tx[1]) if tx[1] else datetime.now().isoformat(),
+                "amount": float(tx[2]) if tx[2] else 0.0,
+                "type": tx[3] or "unknown",
+                "description": tx[4] or "",
+                "entity": tx[5] or "Unknown",
+                "status": tx[6] or "pending",
+            })
+    except Exception:
+        db.rollback()
+    return payload
+
+
+def get_dashboard_snapshot(db: Session) -> DashboardSnapshot:
+    """Current snapshot, recomputed first if stale or from a previous month"""
+    current_month = datetime.now().strftime("%Y-%m")
+    snapshot = db.execute(
+        select(DashboardSnapshot).where(DashboardSnapshot.scope == SNAPSHOT_SCOPE)
+    ).scalar_one_or_none()
+    if snapshot is not None and not snapshot.is_stale and snapshot.period_month == current_month:
+        return snapshot
+
+    if snapshot is None:
+        snapshot = DashboardSnapshot(
+            scope=SNAPSHOT_SCOPE, version=1, payload=compute_dashboard_metrics(db),
+            is_stale=False, generation=0, period_month=current_month, computed_at=get_pst_now(),
+        )
+        db.add(snapshot)
+        db.commit()
+        return snapshot
+
+    seen = snapshot.generation or 0
+    previous = snapshot.payload
+    payload = compute_dashboard_metrics(db)
+    scope = DashboardSnapshot.scope == SNAPSHOT_SCOPE
+    values = {"period_month": current_month, "computed_at": get_pst_now()}
+    if previous != payload:
+        values.update(payload=payload, version=DashboardSnapshot.version + 1)
+    db.execute(update(DashboardSnapshot).where(scope).values(**values).execution_options(synchronize_session=False))
+    # Compare-and-set: a write that landed during the recompute keeps it stale
+    db.execute(
+        update(DashboardSnapshot)
+        .where(and_(scope, DashboardSnapshot.generation == seen))
+        .values(is_stale=False)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    db.refresh(snapshot)
+    return snapshot
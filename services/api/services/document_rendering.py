@@ -0,0 +1,287 @@
+"""
+Document Rendering Executor
+Runs CPU-bound Excel/PDF builders off the event loop in a bounded process pool
+
+Handlers gather their data (DB work stays on the async side), then await
+`render_document(renderer, payload)`. The renderer is a module-level function
+taking a picklable payload (dicts, lists, dates, Decimals) and returning the
+document bytes. Results are written to a disk cache keyed by a hash of the
+renderer and payload, so repeated exports of unchanged data skip rendering
+entirely, and `file_response` streams the cached file back in chunks.
+
+At most RENDER_WORKERS documents render at once; up to RENDER_MAX_QUEUED more
+wait their turn and anything beyond that is rejected with RenderQueueFull so
+callers can answer 503 instead of piling up. A render that exceeds its timeout
+has its worker processes terminated and the pool is rebuilt. With
+RENDER_WORKERS=0 (or if the pool breaks) rendering falls back to a thread,
+which still keeps the event loop free.
+
+Author: NGI Capital Development Team
+Date: December 2025
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from fastapi.responses import StreamingResponse
+
+from services.api.diagnostics import register_stats
+
+logger = logging.getLogger(__name__)
+
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+RENDER_MAX_QUEUED = int(os.getenv("RENDER_MAX_QUEUED", "32"))
+RENDER_TIMEOUT_SECONDS = float(os.getenv("RENDER_TIMEOUT_SECONDS", "60"))
+
+
+def _default_cache_dir() -> str:
+    """App-owned cache location: the Docker data volume, else the user's cache dir.
+    Not the shared temp dir, where another local user could read or plant documents"""
+    if os.path.isdir("/app/data"):
+        return "/app/data/render_cache"
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "ngi_capital", "render_cache")
+
+
+# Outside the working tree: uploads/ is served statically and is not a cache
+RENDER_CACHE_DIR = Path(os.getenv("RENDER_CACHE_DIR") or _default_cache_dir())
+RENDER_CACHE_MAX_FILES = int(os.getenv("RENDER_CACHE_MAX_FILES", "500"))
+# Bump when renderer output changes so stale cached documents are not served
+RENDER_CACHE_VERSION = "1"
+STREAM_CHUNK_SIZE = 64 * 1024
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+PDF_MEDIA_TYPE = "application/pdf"
+
+_pool: Optional[ProcessPoolExecutor] = None
+_cache_dir_ready: Optional[Path] = None
+_pool_lock = threading.Lock()
+_gate: Optional[asyncio.Semaphore] = None
+_gate_loop: Optional[asyncio.AbstractEventLoop] = None
+_waiting = 0
+_running = 0
+
+_stats = {
+    "rendered": 0,
+    "cache_hits": 0,
+    "timeouts": 0,
+    "rejected": 0,
+    "failures": 0,
+    "thread_fallbacks": 0,
+    "pool_restarts": 0,
+    "render_ms_total": 0.0,
+}
+
+
+class RenderQueueFull(RuntimeError):
+    """Raised when more renders are waiting than RENDER_MAX_QUEUED allows"""
+    status_code = 503
+
+
+class RenderTimeout(RuntimeError):
+    """Raised when a render exceeds its timeout"""
+    status_code = 504
+
+
+def get_render_stats() -> Dict[str, Any]:
+    rendered = _stats["rendered"]
+    return {
+        **_stats,
+        "avg_render_ms": round(_stats["render_ms_total"] / rendered, 2) if rendered else 0.0,
+        "workers": RENDER_WORKERS,
+        "running": _running,
+        "waiting": _waiting,
+        "pool_active": _pool is not None,
+    }
+
+
+register_stats("rendering", get_render_stats)
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    if RENDER_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that runs an event loop and DB pools is unsafe
+            _pool = ProcessPoolExecutor(
+                max_workers=RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _reset_pool(terminate: bool = False) -> None:
+    """Drop the pool; terminate its workers when a render is stuck"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is None:
+        return
+    if terminate:
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            try:
+                process.terminate()
+            except Exception:
+                pass
+        _stats["pool_restarts"] += 1
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_render_pool() -> None:
+    _reset_pool()
+
+
+def _get_gate() -> asyncio.Semaphore:
+    """Per-event-loop semaphore limiting concurrent renders to the worker count"""
+    global _gate, _gate_loop
+    loop = asyncio.get_running_loop()
+    if _gate is None or _gate_loop is not loop:
+        _gate = asyncio.Semaphore(max(RENDER_WORKERS, 1))
+        _gate_loop = loop
+    return _gate
+
+
+def _cache_key(renderer: Callable, payload: Any) -> str:
+    canonical = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    name = f"{renderer.__module__}.{renderer.__qualname__}:{RENDER_CACHE_VERSION}"
+    return hashlib.sha256(f"{name}\n{canonical}".encode()).hexdigest()
+
+
+def _prepare_cache_dir() -> None:
+    """Create RENDER_CACHE_DIR (once per path) readable only by this user"""
+    global _cache_dir_ready
+    if _cache_dir_ready == RENDER_CACHE_DIR:
+        return
+    RENDER_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    os.chmod(RENDER_CACHE_DIR, 0o700)  # mkdir's mode is masked and skips existing dirs
+    _cache_dir_ready = RENDER_CACHE_DIR
+
+
+def _write_cache_file(path: Path, data: bytes, tag: int) -> None:
+    """Atomically write `data` to `path` with owner-only (0600) permissions"""
+    partial = path.with_suffix(f".{os.getpid()}.{tag}.tmp")
+    fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(partial, path)
+
+
+def _prune_cache() -> None:
+    try:
+        files = sorted(RENDER_CACHE_DIR.glob("*.bin"), key=lambda p: p.stat().st_mtime)
+    except OSError:
+        return
+    for stale in files[:max(len(files) - RENDER_CACHE_MAX_FILES, 0)]:
+        try:
+            stale.unlink()
+        except OSError:
+            pass
+
+
+async def _run(renderer: Callable[[Any], bytes], payload: Any, timeout: float) -> bytes:
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    if pool is not None:
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(pool, renderer, payload), timeout)
+        except asyncio.TimeoutError:
+            _reset_pool(terminate=True)
+            raise
+        except BrokenProcessPool:
+            logger.warning("Render pool broke; rendering %s in a thread", renderer.__qualname__)
+            _reset_pool()
+    _stats["thread_fallbacks"] += 1
+    return await asyncio.wait_for(asyncio.to_thread(renderer, payload), timeout)
+
+
+async def render_document(
+    renderer: Callable[[Any], bytes],
+    payload: Any,
+    timeout: Optional[float] = None,
+    use_cache: bool = True,
+) -> Path:
+    """
+    Render `payload` with `renderer` in the pool and return the cached file path
+
+    Raises RenderQueueFull when too many renders are waiting and RenderTimeout
+    when the render runs longer than `timeout` seconds.
+    """
+    global _waiting, _running
+    _prepare_cache_dir()
+    key = _cache_key(renderer, payload)
+    path = RENDER_CACHE_DIR / f"{key}.bin"
+    if use_cache and path.exists():
+        _stats["cache_hits"] += 1
+        os.utime(path)
+        return path
+
+    if _waiting >= RENDER_MAX_QUEUED:
+        _stats["rejected"] += 1
+        raise RenderQueueFull(f"{_waiting} documents already waiting to render")
+
+    _waiting += 1
+    try:
+        gate = _get_gate()
+        await gate.acquire()
+    finally:
+        _waiting -= 1
+    _running += 1
+    started = time.perf_counter()
+    try:
+        # Another request may have rendered the same document while we waited
+        if use_cache and path.exists():
+            _stats["cache_hits"] += 1
+            return path
+        try:
+            data = await _run(renderer, payload, timeout or RENDER_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            _stats["timeouts"] += 1
+            raise RenderTimeout(f"{renderer.__qualname__} exceeded {timeout or RENDER_TIMEOUT_SECONDS}s")
+        except Exception:
+            _stats["failures"] += 1
+            raise
+        _write_cache_file(path, data, id(payload))
+        _stats["rendered"] += 1
+        _stats["render_ms_total"] += (time.perf_counter() - started) * 1000
+        if _stats["rendered"] % 50 == 0:
+            _prune_cache()
+        return path
+    finally:
+        _running -= 1
+        gate.release()
+
+
+async def _iter_file(path: Path, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    with open(path, "rb") as handle:
+        while True:
+            chunk = await asyncio.to_thread(handle.read, chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def file_response(
+    path: Path, media_type: str, filename: str, headers: Optional[Dict[str, str]] = None
+) -> StreamingResponse:
+    """Stream a rendered document back in chunks"""
+    return StreamingResponse(
+        _iter_file(path),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "Content-Length": str(path.stat().st_size),
+            **(headers or {}),
+        },
+    )
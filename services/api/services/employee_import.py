@@ -0,0 +1,187 @@
+"""
+Employee CSV Import
+Set-based bulk import behind POST /api/employees/import
+
+Rows are read incrementally from a text stream (the spooled multipart upload
+or a legacy JSON string) and handled in batches of IMPORT_BATCH_SIZE: each
+batch is validated in Python, checked against existing employees with one
+`lower(email) IN (...)` query (served by the idx_employees_email_lower
+expression index) and inserted with a single executemany. Team names are
+resolved from a per-entity map loaded once per entity. Everything runs in
+the caller's transaction, which is committed once at the end by the route.
+
+Author: NGI Capital Development Team
+Date: December 2025
+"""
+
+import csv
+import logging
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional, TextIO
+
+from sqlalchemy import bindparam, text as sa_text
+from sqlalchemy.orm import Session
+
+from services.api.diagnostics import register_stats
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 1000
+# Per-row report is capped; counts always cover every row
+MAX_REPORTED_ISSUES = 500
+
+_INSERT_EMPLOYEE = sa_text(
+    "INSERT INTO employees (entity_id, name, legal_name, email, employment_type, start_date, team_id, status, "
+    "created_at, updated_at) VALUES (:e, :n, :n, :em, :tp, :sd, :tid, 'active', datetime('now'), datetime('now'))"
+)
+_EXISTING_EMAILS = sa_text(
+    "SELECT lower(email) FROM employees WHERE lower(email) IN :emails AND (is_deleted = 0 OR is_deleted IS NULL)"
+).bindparams(bindparam("emails", expanding=True))
+_ENTITY_TEAMS = sa_text(
+    "SELECT entity_id, lower(name), id FROM teams WHERE entity_id IN :ids"
+).bindparams(bindparam("ids", expanding=True))
+
+_stats = {"imports": 0, "rows_read": 0, "rows_created": 0, "rows_rejected": 0, "import_ms_total": 0.0}
+
+
+def get_employee_import_stats() -> Dict[str, Any]:
+    return dict(_stats)
+
+
+register_stats("employee_import", get_employee_import_stats)
+
+
+class _ImportReport:
+    def __init__(self) -> None:
+        self.rows = 0
+        self.created = 0
+        self.skipped = 0
+        self.failed = 0
+        self.issues: List[Dict[str, Any]] = []
+        self.issues_truncated = False
+
+    def note(self, row: int, email: Optional[str], message: str, level: str = "error") -> None:
+        if level == "error":
+            self.failed += 1
+        elif level == "skipped":
+            self.skipped += 1
+        if len(self.issues) < MAX_REPORTED_ISSUES:
+            self.issues.append({"row": row, "email": email or None, "level": level, "message": message})
+        else:
+            self.issues_truncated = True
+
+
+def _entity_id(value: Any) -> int:
+    try:
+        return int(str(value).strip() or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _load_teams(db: Session, teams: Dict[int, Dict[str, int]], entity_ids: set) -> None:
+    missing = [eid for eid in entity_ids if eid not in teams]
+    if not missing:
+        return
+    for eid in missing:
+        teams[eid] = {}
+    for eid, name, team_id in db.execute(_ENTITY_TEAMS, {"ids": missing}):
+        teams[eid].setdefault(name, int(team_id))
+
+
+def _flush(db: Session, batch: List[Dict[str, Any]], teams: Dict[int, Dict[str, int]],
+           report: _ImportReport) -> None:
+    """Dedupe a validated batch against existing employees and insert the rest"""
+    if not batch:
+        return
+    existing = {row[0] for row in db.execute(_EXISTING_EMAILS, {"emails": [r["em"] for r in batch]})}
+    _load_teams(db, teams, {r["e"] for r in batch if r["team"]})
+    params = []
+    for r in batch:
+        if r["em"] in existing:
+            report.note(r["row"], r["em"], "employee with this email already exists", level="skipped")
+            continue
+        tid = None
+        if r["team"]:
+            tid = teams.get(r["e"], {}).get(r["team"].lower())
+            if tid is None:
+                report.note(r["row"], r["em"], f"team '{r['team']}' not found; imported without a team",
+                            level="warning")
+        params.append({"e": r["e"], "n": r["n"], "em": r["em"], "tp": r["tp"], "sd": r["sd"], "tid": tid})
+    if params:
+        db.execute(_INSERT_EMPLOYEE, params)
+        report.created += len(params)
+
+
+def import_employee_csv(db: Session, stream: TextIO, default_entity_id: int = 0) -> Dict[str, Any]:
+    """
+    Import employees from a CSV stream. Columns: name, email, type, start, entity, team
+
+    Emails are deduplicated case-insensitively against existing employees
+    and earlier rows of the same file. Does not commit.
+    """
+    started = time.perf_counter()
+    report = _ImportReport()
+    reader = csv.DictReader(stream)
+    if not reader.fieldnames:
+        raise ValueError("csv is empty")
+    reader.fieldnames = [(h or "").strip().lower() for h in reader.fieldnames]
+    missing = {"name", "email"} - set(reader.fieldnames)
+    if missing:
+        raise ValueError(f"csv is missing required columns: {', '.join(sorted(missing))}")
+
+    teams: Dict[int, Dict[str, int]] = {}
+    seen: set = set()
+    batch: List[Dict[str, Any]] = []
+    for row in reader:
+        if not any(v.strip() for v in row.values() if isinstance(v, str)):
+            continue  # trailing ",,,," lines from spreadsheet exports
+        report.rows += 1
+        line = reader.line_num
+        name = (row.get("name") or "").strip()
+        email = (row.get("email") or "").strip().lower()
+        if not name or not email:
+            report.note(line, email, "name and email are required")
+            continue
+        if "@" not in email:
+            report.note(line, email, "invalid email address")
+            continue
+        if email in seen:
+            report.note(line, email, "duplicate email earlier in this file", level="skipped")
+            continue
+        ent_id = _entity_id(row.get("entity")) or default_entity_id
+        if not ent_id:
+            report.note(line, email, "entity is required")
+            continue
+        start = (row.get("start") or "").strip() or None
+        if start:
+            try:
+                date.fromisoformat(start)
+            except ValueError:
+                report.note(line, email, f"invalid start date '{start}' (expected YYYY-MM-DD)")
+                continue
+        seen.add(email)
+        batch.append({"row": line, "e": ent_id, "n": name, "em": email, "tp": (row.get("type") or "").strip() or None,
+                      "sd": start, "team": (row.get("team") or "").strip()})
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            _flush(db, batch, teams, report)
+            batch = []
+    _flush(db, batch, teams, report)
+
+    elapsed = time.perf_counter() - started
+    _stats["imports"] += 1
+    _stats["rows_read"] += report.rows
+    _stats["rows_created"] += report.created
+    _stats["rows_rejected"] += report.failed
+    _stats["import_ms_total"] += elapsed * 1000
+    logger.info(f"Employee import: {report.created}/{report.rows} rows created in {elapsed * 1000:.0f}ms")
+    return {
+        "rows": report.rows,
+        "created": report.created,
+        "skipped": report.skipped,
+        "failed": report.failed,
+        "issues": report.issues,
+        "issues_truncated": report.issues_truncated,
+        "elapsed_ms": int(elapsed * 1000),
+        "rows_per_sec": round(report.rows / elapsed, 1) if elapsed > 0 else float(report.rows),
+    }
@@ -22,6 +22,11 @@ except ImportError:
     Workbook = None
 
 
+def render_financial_statements_workbook(financial_data: Dict[str, Any]) -> bytes:
+    """Renderer for the document rendering pool: workbook bytes for a statements payload"""
+    return ExcelFinancialStatementExporter(financial_data).generate_workbook().getvalue()
+
+
 class ExcelFinancialStatementExporter:
     """
     Exports financial statements to Excel using Deloitte EGC format
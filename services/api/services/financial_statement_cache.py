@@ -0,0 +1,138 @@
+"""
+Financial Statement Cache
+Read-through cache of rendered statement JSON in financial_statement_cache
+
+A cached row is stamped with the entity's ledger version at build time and
+served only while that version is still current. Posting, unposting and
+period reopen bump the version (see AccountBalanceLedger), so stale rows are
+simply rebuilt on the next read.
+
+Author: NGI Capital Development Team
+Date: December 2025
+"""
+
+import logging
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.api.models_accounting_part3 import FinancialStatementCache
+from services.api.services.account_balance_ledger import AccountBalanceLedger
+from services.api.utils.datetime_utils import get_pst_now
+from services.api.diagnostics import register_stats
+
+logger = logging.getLogger(__name__)
+
+# Statement types warmed after a period close
+WARM_STATEMENT_TYPES = ("all_statements", "balance_sheet", "income_statement")
+
+_stats = {"hits": 0, "misses": 0, "errors": 0}
+
+
+def get_cache_stats() -> Dict[str, int]:
+    return dict(_stats)
+
+
+register_stats("financial_statement_cache", get_cache_stats)
+
+
+class FinancialStatementCacheService:
+    """Serve statements from cache while the entity's ledger version is unchanged"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_or_build(
+        self,
+        entity_id: int,
+        period_end_date: date,
+        statement_type: str,
+        builder: Callable[[], Awaitable[Dict[str, Any]]],
+        is_consolidated: bool = False,
+    ) -> Dict[str, Any]:
+        """Return cached statement JSON, building and storing it on a miss"""
+        try:
+            version = await AccountBalanceLedger(self.db).get_version(entity_id)
+            row = await self._get_row(entity_id, period_end_date, statement_type, is_consolidated)
+        except Exception as e:
+            # Cache is an optimization; never fail the report because of it
+            _stats["errors"] += 1
+            logger.warning(f"Statement cache lookup failed: {e}")
+            await self.db.rollback()
+            return jsonable_encoder(await builder())
+
+        if row is not None and row.ledger_version == version:
+            _stats["hits"] += 1
+            return row.statement_data
+
+        _stats["misses"] += 1
+        data = jsonable_encoder(await builder())
+        try:
+            if row is None:
+                self.db.add(FinancialStatementCache(
+                    entity_id=entity_id,
+                    period_end_date=period_end_date,
+                    statement_type=statement_type,
+                    statement_data=data,
+                    ledger_version=version,
+                    is_consolidated=is_consolidated,
+                    created_at=get_pst_now(),
+                ))
+            else:
+                row.statement_data = data
+                row.ledger_version = version
+                row.created_at = get_pst_now()
+            await self.db.commit()
+        except Exception as e:
+            _stats["errors"] += 1
+            logger.warning(f"Statement cache write failed: {e}")
+            await self.db.rollback()
+        return data
+
+    async def _get_row(
+        self, entity_id: int, period_end_date: date, statement_type: str, is_consolidated: bool
+    ):
+        result = await self.db.execute(
+            select(FinancialStatementCache).where(
+                and_(
+                    FinancialStatementCache.entity_id == entity_id,
+                    FinancialStatementCache.period_end_date == period_end_date,
+                    FinancialStatementCache.statement_type == statement_type,
+                    FinancialStatementCache.is_consolidated == is_consolidated,
+                )
+            )
+        )
+        return result.scalar_one_or_none()
+
+
+async def cached_statement(
+    db: AsyncSession, entity_id: int, period_end_date: date, statement_type: str
+) -> Dict[str, Any]:
+    """Build (or fetch) one of the standard statements through the cache"""
+    from services.api.services.financial_statement_generator import FinancialStatementGenerator
+
+    generator = FinancialStatementGenerator(db, entity_id, period_end_date)
+    builders = {
+        "all_statements": generator.generate_all_statements,
+        "balance_sheet": generator.generate_balance_sheet,
+        "income_statement": generator.generate_income_statement,
+    }
+    return await FinancialStatementCacheService(db).get_or_build(
+        entity_id, period_end_date, statement_type, builders[statement_type]
+    )
+
+
+async def warm_statement_cache(entity_id: int, period_end_date: date) -> None:
+    """Background task: pre-build the standard statements after a period close"""
+    from services.api.database_async import get_async_session_factory
+
+    try:
+        async with get_async_session_factory()() as session:
+            for statement_type in WARM_STATEMENT_TYPES:
+                await cached_statement(session, entity_id, period_end_date, statement_type)
+        logger.info(f"Warmed statement cache for entity {entity_id} as of {period_end_date}")
+    except Exception as e:
+        logger.warning(f"Statement cache warm-up failed for entity {entity_id}: {e}")
@@ -4,20 +4,65 @@ Generates 5 US GAAP-compliant financial statements with notes
 
 Implements Deloitte EGC format for startup financial statements
 
+Account totals are loaded once per generator: closing balances come from the
+account balance ledger and period activity from a single grouped scan of
+posted journal entry lines (with the prior-year comparative period bucketed
+in the same scan). Every statement is built from that shared snapshot.
+
 Author: NGI Capital Development Team
 Date: October 3, 2025
 """
 
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func, desc
+from sqlalchemy import select, and_, or_, func, desc, case
 
 from ..models_accounting import (
-    AccountingEntity, ChartOfAccounts, JournalEntry, JournalEntryLine,
-    AccountingPeriod, TrialBalance
+    AccountingEntity, ChartOfAccounts, JournalEntry, JournalEntryLine
 )
+from .account_balance_ledger import AccountBalanceLedger, signed_balance
+
+ZERO = Decimal("0.00")
+
+
+def _dec(value) -> Decimal:
+    return Decimal(str(value or 0))
+
+
+def _prior_year(d: date) -> date:
+    try:
+        return d.replace(year=d.year - 1)
+    except ValueError:  # Feb 29
+        return d.replace(year=d.year - 1, day=28)
+
+
+class PeriodSnapshot:
+    """Per-account totals for one reporting period"""
+
+    def __init__(self, period_start: date, period_end: date):
+        self.period_start = period_start
+        self.period_end = period_end
+        # account_id -> (debits, credits)
+        self.closing: Dict[int, Tuple[Decimal, Decimal]] = {}  # cumulative through period_end
+        self.activity: Dict[int, Tuple[Decimal, Decimal]] = {}  # within [period_start, period_end]
+
+    def balance(self, account: ChartOfAccounts) -> Decimal:
+        """Closing balance on the account's normal side"""
+        debits, credits = self.closing.get(account.id, (ZERO, ZERO))
+        return signed_balance(account.normal_balance, debits, credits)
+
+    def opening_balance(self, account: ChartOfAccounts) -> Decimal:
+        """Balance on the account's normal side just before period_start"""
+        debits, credits = self.closing.get(account.id, (ZERO, ZERO))
+        act_debits, act_credits = self.activity.get(account.id, (ZERO, ZERO))
+        return signed_balance(account.normal_balance, debits - act_debits, credits - act_credits)
+
+    def net_activity(self, account_id: int) -> Decimal:
+        """Period activity as credits - debits"""
+        debits, credits = self.activity.get(account_id, (ZERO, ZERO))
+        return credits - debits
 
 
 class FinancialStatementGenerator:
@@ -27,11 +72,20 @@ class FinancialStatementGenerator:
     ASC 220 (Income Statement), ASC 230 (Cash Flows)
     """
     
-    def __init__(self, db: AsyncSession, entity_id: int, period_end_date: date):
+    def __init__(
+        self,
+        db: AsyncSession,
+        entity_id: int,
+        period_end_date: date,
+        include_comparatives: bool = False
+    ):
         self.db = db
         self.entity_id = entity_id
         self.period_end_date = period_end_date
         self.period_start_date = date(period_end_date.year, 1, 1)  # YTD
+        self.include_comparatives = include_comparatives
+        self._accounts: Optional[List[ChartOfAccounts]] = None
+        self._snapshots: Optional[Dict[str, PeriodSnapshot]] = None
         
     async def generate_all_statements(self) -> Dict[str, Any]:
         """
@@ -53,7 +107,7 @@ class FinancialStatementGenerator:
         comprehensive_income = await self.generate_comprehensive_income()
         notes = await self.generate_notes()
         
-        return {
+        package = {
             "entity_name": entity.entity_name,
             "period_end_date": self.period_end_date.isoformat(),
             "period_start_date": self.period_start_date.isoformat(),
@@ -67,14 +121,96 @@ class FinancialStatementGenerator:
             "notes": notes,
             "generated_at": datetime.utcnow().isoformat()
         }
+        if self.include_comparatives:
+            prior = self._snapshots["prior"]
+            package["prior_period_start_date"] = prior.period_start.isoformat()
+            package["prior_period_end_date"] = prior.period_end.isoformat()
+        return package
     
     async def generate_balance_sheet(self) -> Dict[str, Any]:
         """
         Generate Classified Balance Sheet
         ASC 210 - Balance Sheet
         """
+        return await self._with_comparative(self._build_balance_sheet)
         
-        # Get account balances
+    async def generate_income_statement(self) -> Dict[str, Any]:
+        """
+        Generate Multi-Step Income Statement
+        ASC 220 - Income Statement
+        Includes expense disaggregation per 2025 GAAP
+        """
+        return await self._with_comparative(self._build_income_statement)
+
+    async def generate_cash_flows(self) -> Dict[str, Any]:
+        """
+        Generate Statement of Cash Flows (Indirect Method)
+        ASC 230 - Cash Flows
+        """
+        return await self._with_comparative(self._build_cash_flows)
+
+    async def generate_stockholders_equity(self) -> Dict[str, Any]:
+        """
+        Generate Statement of Stockholders' Equity
+        ASC 505 - Equity
+        """
+        return await self._with_comparative(self._build_stockholders_equity)
+
+    async def generate_comprehensive_income(self) -> Dict[str, Any]:
+        """
+        Generate Statement of Comprehensive Income
+        ASC 220 - Comprehensive Income (2025 requirement)
+        """
+        return await self._with_comparative(self._build_comprehensive_income)
+
+    async def generate_notes(self) -> List[Dict[str, Any]]:
+        """
+        Generate Notes to Financial Statements
+        Per ASC 235 - Notes disclosure requirements
+        """
+
+        notes = [
+            {
+                "note_number": 1,
+                "title": "Summary of Significant Accounting Policies",
+                "content": "The Company prepares its financial statements in accordance with US GAAP."
+            },
+            {
+                "note_number": 2,
+                "title": "Revenue Recognition",
+                "content": "Revenue is recognized in accordance with ASC 606."
+            },
+            {
+                "note_number": 3,
+                "title": "Property and Equipment",
+                "content": "Property and equipment are stated at cost, net of accumulated depreciation."
+            },
+            {
+                "note_number": 4,
+                "title": "Income Taxes",
+                "content": "The Company accounts for income taxes under ASC 740."
+            }
+        ]
+
+        return notes
+
+    # ============================================================================
+    # SHARED ACCOUNT TOTALS
+    # ============================================================================
+
+    async def _with_comparative(self, builder) -> Dict[str, Any]:
+        """Build a statement for the current period (and prior period if requested)"""
+        await self._load()
+        statement = builder(self._snapshots["current"])
+        if self.include_comparatives:
+            statement["prior_period"] = builder(self._snapshots["prior"])
+        return statement
+
+    async def _load(self):
+        """Load accounts, closing balances and period activity once per generator"""
+        if self._snapshots is not None:
+            return
+
         accounts_result = await self.db.execute(
             select(ChartOfAccounts).where(
                 and_(
@@ -83,8 +219,53 @@ class FinancialStatementGenerator:
                 )
             ).order_by(ChartOfAccounts.account_number)
         )
-        accounts = accounts_result.scalars().all()
+        self._accounts = accounts_result.scalars().all()
         
+        snapshots = {"current": PeriodSnapshot(self.period_start_date, self.period_end_date)}
+        if self.include_comparatives:
+            prior_end = _prior_year(self.period_end_date)
+            snapshots["prior"] = PeriodSnapshot(date(prior_end.year, 1, 1), prior_end)
+
+        ledger = AccountBalanceLedger(self.db)
+        for snap in snapshots.values():
+            snap.closing = await ledger.balances_as_of(self.entity_id, snap.period_end)
+
+        # One grouped pass over posted lines; each period is a pair of CASE buckets
+        columns = []
+        for key, snap in snapshots.items():
+            in_period = and_(
+                JournalEntry.entry_date >= snap.period_start,
+                JournalEntry.entry_date <= snap.period_end
+            )
+            columns.append(func.sum(case((in_period, JournalEntryLine.debit_amount), else_=0)).label(f"{key}_debits"))
+            columns.append(func.sum(case((in_period, JournalEntryLine.credit_amount), else_=0)).label(f"{key}_credits"))
+
+        result = await self.db.execute(
+            select(JournalEntryLine.account_id, *columns)
+            .join(JournalEntry, JournalEntryLine.journal_entry_id == JournalEntry.id)
+            .where(
+                and_(
+                    JournalEntry.entity_id == self.entity_id,
+                    JournalEntry.status == "posted",
+                    JournalEntry.entry_date >= min(s.period_start for s in snapshots.values()),
+                    JournalEntry.entry_date <= self.period_end_date
+                )
+            )
+            .group_by(JournalEntryLine.account_id)
+        )
+        for row in result.mappings():
+            for key, snap in snapshots.items():
+                snap.activity[int(row["account_id"])] = (
+                    _dec(row[f"{key}_debits"]), _dec(row[f"{key}_credits"])
+                )
+
+        self._snapshots = snapshots
+
+    # ============================================================================
+    # STATEMENT BUILDERS
+    # ============================================================================
+
+    def _build_balance_sheet(self, snap: PeriodSnapshot) -> Dict[str, Any]:
         # Initialize categories
         balance_sheet = {
             "assets": {
@@ -103,8 +284,8 @@ class FinancialStatementGenerator:
             }
         }
         
-        for account in accounts:
-            balance = account.current_balance
+        for account in self._accounts:
+            balance = snap.balance(account)
             
             # Assets (10000-19999)
             if 10000 <= int(account.account_number) < 20000:
@@ -149,31 +330,15 @@ class FinancialStatementGenerator:
         
         return balance_sheet
     
-    async def generate_income_statement(self) -> Dict[str, Any]:
-        """
-        Generate Multi-Step Income Statement
-        ASC 220 - Income Statement
-        Includes expense disaggregation per 2025 GAAP
-        """
-        
-        # Get revenue and expense accounts with activity in period
-        accounts_result = await self.db.execute(
-            select(ChartOfAccounts).where(
-                and_(
-                    ChartOfAccounts.entity_id == self.entity_id,
-                    ChartOfAccounts.is_active == True,
-                    or_(
-                        ChartOfAccounts.account_type.in_(["Revenue", "Operating Expenses", "Other Income", "Other Expenses"]),
-                        and_(
-                            ChartOfAccounts.account_number >= "40000",
-                            ChartOfAccounts.account_number < "70000"
-                        )
-                    )
-                )
-            ).order_by(ChartOfAccounts.account_number)
-        )
-        accounts = accounts_result.scalars().all()
+    def _income_accounts(self) -> List[ChartOfAccounts]:
+        """Revenue and expense accounts"""
+        return [
+            a for a in self._accounts
+            if a.account_type in ("Revenue", "Operating Expenses", "Other Income", "Other Expenses")
+            or "40000" <= a.account_number < "70000"
+        ]
         
+    def _build_income_statement(self, snap: PeriodSnapshot) -> Dict[str, Any]:
         income_statement = {
             "revenue": {},
             "cost_of_revenue": {},
@@ -195,9 +360,8 @@ class FinancialStatementGenerator:
         total_cogs = Decimal("0.00")
         total_other = Decimal("0.00")
         
-        for account in accounts:
-            # Get period activity
-            period_activity = await self._get_period_activity(account.id)
+        for account in self._income_accounts():
+            period_activity = snap.net_activity(account.id)
             
             if abs(period_activity) < Decimal("0.01"):
                 continue
@@ -273,12 +437,10 @@ class FinancialStatementGenerator:
         
         return income_statement
     
-    async def generate_cash_flows(self) -> Dict[str, Any]:
-        """
-        Generate Statement of Cash Flows (Indirect Method)
-        ASC 230 - Cash Flows
-        """
+    def _net_income(self, snap: PeriodSnapshot) -> Decimal:
+        return _dec(self._build_income_statement(snap)["net_income"])
         
+    def _build_cash_flows(self, snap: PeriodSnapshot) -> Dict[str, Any]:
         cash_flows = {
             "operating_activities": {
                 "net_income": Decimal("0.00"),
@@ -293,24 +455,14 @@ class FinancialStatementGenerator:
             "cash_ending": Decimal("0.00")
         }
         
-        # Get cash accounts
-        cash_result = await self.db.execute(
-            select(ChartOfAccounts).where(
-                and_(
-                    ChartOfAccounts.entity_id == self.entity_id,
-                    ChartOfAccounts.account_type == "Cash",
-                    ChartOfAccounts.is_active == True
-                )
-            )
-        )
-        cash_accounts = cash_result.scalars().all()
-        
-        # Calculate cash beginning and ending
-        for account in cash_accounts:
-            cash_flows["cash_ending"] += account.current_balance
+        # Cash accounts (10100-10199)
+        for account in self._accounts:
+            if account.account_type == "Cash" or account.account_number.startswith("101"):
+                cash_flows["cash_beginning"] += snap.opening_balance(account)
+                cash_flows["cash_ending"] += snap.balance(account)
         
         # Placeholder for now - full implementation needs transaction analysis
-        cash_flows["operating_activities"]["net_income"] = Decimal("0.00")
+        cash_flows["operating_activities"]["net_income"] = self._net_income(snap)
         cash_flows["net_change_in_cash"] = cash_flows["cash_ending"] - cash_flows["cash_beginning"]
         
         # Convert to float
@@ -322,94 +474,30 @@ class FinancialStatementGenerator:
         
         return cash_flows
     
-    async def generate_stockholders_equity(self) -> Dict[str, Any]:
-        """
-        Generate Statement of Stockholders' Equity
-        ASC 505 - Equity
-        """
+    def _build_stockholders_equity(self, snap: PeriodSnapshot) -> Dict[str, Any]:
+        beginning = {}
+        ending = {}
+        for account in self._accounts:
+            if 30000 <= int(account.account_number) < 40000:
+                beginning[account.account_name] = float(snap.opening_balance(account))
+                ending[account.account_name] = float(snap.balance(account))
         
         return {
             "columns": ["Common Stock", "Additional Paid-in Capital", "Retained Earnings", "Total Equity"],
-            "beginning_balance": {},
-            "net_income": {},
+            "beginning_balance": beginning,
+            "net_income": {"Retained Earnings": float(self._net_income(snap))},
             "stock_issuance": {},
-            "ending_balance": {}
+            "ending_balance": ending
         }
     
-    async def generate_comprehensive_income(self) -> Dict[str, Any]:
-        """
-        Generate Statement of Comprehensive Income
-        ASC 220 - Comprehensive Income (2025 requirement)
-        """
-        
+    def _build_comprehensive_income(self, snap: PeriodSnapshot) -> Dict[str, Any]:
+        net_income = self._net_income(snap)
         return {
-            "net_income": Decimal("0.00"),
+            "net_income": net_income,
             "other_comprehensive_income": {
                 "unrealized_gains_losses": Decimal("0.00"),
                 "foreign_currency_translation": Decimal("0.00"),
                 "total_oci": Decimal("0.00")
             },
-            "comprehensive_income": Decimal("0.00")
+            "comprehensive_income": net_income
         }
-    
-    async def generate_notes(self) -> List[Dict[str, Any]]:
-        """
-        Generate Notes to Financial Statements
-        Per ASC 235 - Notes disclosure requirements
-        """
-        
-        notes = [
-            {
-                "note_number": 1,
-                "title": "Summary of Significant Accounting Policies",
-                "content": "The Company prepares its financial statements in accordance with US GAAP."
-            },
-            {
-                "note_number": 2,
-                "title": "Revenue Recognition",
-                "content": "Revenue is recognized in accordance with ASC 606."
-            },
-            {
-                "note_number": 3,
-                "title": "Property and Equipment",
-                "content": "Property and equipment are stated at cost, net of accumulated depreciation."
-            },
-            {
-                "note_number": 4,
-                "title": "Income Taxes",
-                "content": "The Company accounts for income taxes under ASC 740."
-            }
-        ]
-        
-        return notes
-    
-    async def _get_period_activity(self, account_id: int) -> Decimal:
-        """Get activity (debits - credits) for an account in the period"""
-        
-        result = await self.db.execute(
-            select(
-                func.sum(JournalEntryLine.debit_amount).label("total_debits"),
-                func.sum(JournalEntryLine.credit_amount).label("total_credits")
-            ).join(
-                JournalEntry,
-                JournalEntryLine.journal_entry_id == JournalEntry.id
-            ).where(
-                and_(
-                    JournalEntryLine.account_id == account_id,
-                    JournalEntry.entry_date >= self.period_start_date,
-                    JournalEntry.entry_date <= self.period_end_date,
-                    JournalEntry.status == "posted"
-                )
-            )
-        )
-        
-        row = result.first()
-        if not row:
-            return Decimal("0.00")
-        
-        total_debits = row.total_debits or Decimal("0.00")
-        total_credits = row.total_credits or Decimal("0.00")
-        
-        # Net activity (debits increase revenue credits, credits increase expense debits)
-        return total_credits - total_debits
-
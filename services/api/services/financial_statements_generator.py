@@ -15,6 +15,7 @@ from services.api.models_accounting import (
 )
 from services.api.models_fixed_assets import FixedAsset, DepreciationEntry
 from services.api.utils.datetime_utils import get_pst_now
+from services.api.services.account_balance_ledger import AccountBalanceLedger
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +48,7 @@ class FinancialStatementsGenerator:
             ).order_by(ChartOfAccounts.account_number)
         )
         accounts = accounts_query.scalars().all()
+        balances = await AccountBalanceLedger(self.db).signed_balances_as_of(entity_id, as_of_date)
         
         balance_sheet = {
             "entity_name": entity.entity_name,
@@ -75,7 +77,7 @@ class FinancialStatementsGenerator:
         
         # Process each account
         for account in accounts:
-            balance = Decimal(str(account.current_balance or 0))
+            balance = balances.get(account.id, Decimal("0.00"))
             if balance == 0:
                 continue
             
@@ -486,7 +488,7 @@ class FinancialStatementsGenerator:
         """Get cash balance as of date"""
         # Query cash accounts (10110-10150)
         result = await self.db.execute(
-            select(func.sum(ChartOfAccounts.current_balance)).where(
+            select(ChartOfAccounts.id).where(
                 and_(
                     ChartOfAccounts.entity_id == entity_id,
                     ChartOfAccounts.account_number.startswith("101"),
@@ -494,8 +496,9 @@ class FinancialStatementsGenerator:
                 )
             )
         )
-        total = result.scalar()
-        return Decimal(str(total or 0))
+        cash_ids = set(result.scalars().all())
+        balances = await AccountBalanceLedger(self.db).signed_balances_as_of(entity_id, as_of_date)
+        return sum((bal for aid, bal in balances.items() if aid in cash_ids), Decimal("0.00"))
     
     async def _get_member_equity_balances(self, entity_id: int, as_of_date: date) -> Dict:
         """Get member equity balances for LLC"""
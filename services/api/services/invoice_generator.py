@@ -6,10 +6,14 @@ Author: NGI Capital Development Team
 Date: October 10, 2025
 """
 
+import asyncio
 import os
+import shutil
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional
+from io import BytesIO
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
 from pathlib import Path
 
 from reportlab.lib.pagesizes import letter
@@ -26,6 +30,42 @@ from sqlalchemy import select
 from ..models_ar import Invoice, InvoiceLine, Customer
 from ..models_accounting import AccountingEntity
 from ..utils.datetime_utils import format_date_us, convert_to_pst
+from .document_rendering import render_document
+
+# Fields the PDF layouts read; snapshotted so rendering can run in the process pool
+_INVOICE_FIELDS = (
+    "invoice_number", "invoice_date", "due_date", "memo",
+    "subtotal", "tax_rate", "tax_amount", "total_amount",
+)
+_CUSTOMER_FIELDS = (
+    "customer_name", "email", "billing_address_line1", "billing_address_line2",
+    "billing_city", "billing_state", "billing_zip",
+)
+_ENTITY_FIELDS = (
+    "entity_name", "ein", "default_payment_terms", "invoice_payment_instructions",
+    "late_payment_fee", "late_payment_interest_rate",
+)
+_LINE_FIELDS = ("description", "quantity", "unit_price", "total_amount")
+
+
+def _invoice_payload(invoice, customer, entity, lines) -> Dict[str, Any]:
+    snapshot = lambda obj, fields: {f: getattr(obj, f, None) for f in fields}
+    return {
+        "invoice": snapshot(invoice, _INVOICE_FIELDS),
+        "customer": snapshot(customer, _CUSTOMER_FIELDS),
+        "entity": snapshot(entity, _ENTITY_FIELDS),
+        "lines": [snapshot(line, _LINE_FIELDS) for line in lines],
+        "generated_on": date.today(),
+    }
+
+
+def _unpack_payload(payload: Dict[str, Any]):
+    return (
+        SimpleNamespace(**payload["invoice"]),
+        SimpleNamespace(**payload["customer"]),
+        SimpleNamespace(**payload["entity"]),
+        [SimpleNamespace(**line) for line in payload["lines"]],
+    )
 
 
 async def generate_invoice_preview_pdf(invoice, customer, entity, lines) -> bytes:
@@ -41,8 +81,14 @@ async def generate_invoice_preview_pdf(invoice, customer, entity, lines) -> byte
     Returns:
         bytes: PDF content as bytes
     """
-    from io import BytesIO
-    
+    path = await render_document(render_invoice_preview_pdf, _invoice_payload(invoice, customer, entity, lines))
+    return await asyncio.to_thread(path.read_bytes)
+
+
+def render_invoice_preview_pdf(payload: Dict[str, Any]) -> bytes:
+    """Preview layout for a snapshotted invoice payload (runs in the render pool)"""
+    invoice, customer, entity, lines = _unpack_payload(payload)
+
     # Create PDF in memory
     buffer = BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
@@ -359,8 +405,25 @@ async def generate_invoice_pdf(invoice_id: int, db: AsyncSession) -> str:
     pdf_filename = f"{invoice.invoice_number.replace('/', '_')}.pdf"
     pdf_path = pdf_dir / pdf_filename
     
+    # Render in the document pool, then copy the cached file into place
+    rendered = await render_document(render_invoice_pdf, _invoice_payload(invoice, customer, entity, lines))
+    await asyncio.to_thread(shutil.copyfile, rendered, pdf_path)
+    
+    # Update invoice record with PDF path
+    invoice.pdf_file_path = str(pdf_path)
+    invoice.pdf_generated_at = convert_to_pst(datetime.utcnow())
+    await db.commit()
+    
+    return str(pdf_path)
+
+
+def render_invoice_pdf(payload: Dict[str, Any]) -> bytes:
+    """Branded invoice layout for a snapshotted invoice payload (runs in the render pool)"""
+    invoice, customer, entity, lines = _unpack_payload(payload)
+
     # Create PDF
-    c = canvas.Canvas(str(pdf_path), pagesize=letter)
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
     width, height = letter
     
     # Set fonts
@@ -646,17 +709,11 @@ async def generate_invoice_pdf(invoice_id: int, db: AsyncSession) -> str:
     c.setFont("Helvetica", 8)
     c.setFillColorRGB(0.5, 0.5, 0.5)
     c.drawCentredString(width / 2, 50, "Thank you for your business!")
-    c.drawCentredString(width / 2, 35, f"Generated on {format_date_us(date.today())} | {entity.entity_name}")
+    c.drawCentredString(width / 2, 35, f"Generated on {format_date_us(payload['generated_on'])} | {entity.entity_name}")
     
     # Save PDF
     c.save()
-    
-    # Update invoice record with PDF path
-    invoice.pdf_file_path = str(pdf_path)
-    invoice.pdf_generated_at = convert_to_pst(datetime.utcnow())
-    await db.commit()
-    
-    return str(pdf_path)
+    return buffer.getvalue()
 
 
 def format_currency(amount: Decimal) -> str:
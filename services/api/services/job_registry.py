@@ -0,0 +1,95 @@
+"""
+Job Registry
+In-process records for background jobs that a status endpoint polls
+
+A route creates a job record (queued) and schedules `registry.run(job_id,
+work)` as a background task; `work(db, job)` runs on its own pooled async
+session and updates the record as it goes. Finished records are kept for
+the status endpoint up to `max_finished` per registry, oldest dropped first.
+Records live in this process only, which matches how the jobs themselves run.
+
+Author: NGI Capital Development Team
+Date: December 2025
+"""
+
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..utils.datetime_utils import get_pst_now
+
+logger = logging.getLogger(__name__)
+
+MAX_FINISHED_JOBS = 50
+FINISHED_STATUSES = ("completed", "failed")
+
+
+class JobRegistry:
+    def __init__(self, name: str, counters: tuple = (), max_finished: int = MAX_FINISHED_JOBS):
+        self.name = name
+        self.max_finished = max_finished
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self.stats: Dict[str, int] = {"jobs_started": 0, "jobs_completed": 0, "jobs_failed": 0,
+                                      **{c: 0 for c in counters}}
+
+    def _prune(self) -> None:
+        finished = [j for j in self._jobs.values() if j["status"] in FINISHED_STATUSES]
+        excess = len(finished) - self.max_finished
+        if excess > 0:
+            for old in sorted(finished, key=lambda j: j["created_at"])[:excess]:
+                self._jobs.pop(old["job_id"], None)
+
+    def create(self, **fields: Any) -> Dict[str, Any]:
+        """Register a queued job and return its live record"""
+        self._prune()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "queued",
+            **fields,
+            "error": None,
+            "created_at": get_pst_now().isoformat(),
+            "finished_at": None,
+        }
+        self._jobs[job["job_id"]] = job
+        self.stats["jobs_started"] += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Live record (for the worker); status endpoints use snapshot()"""
+        return self._jobs.get(job_id)
+
+    def snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        return {
+            k: [dict(i) if isinstance(i, dict) else i for i in v] if isinstance(v, list) else v
+            for k, v in job.items()
+        }
+
+    def complete(self, job: Dict[str, Any], **fields: Any) -> None:
+        job.update(status="completed", finished_at=get_pst_now().isoformat(), **fields)
+        self.stats["jobs_completed"] += 1
+
+    def fail(self, job: Dict[str, Any], error: str, **fields: Any) -> None:
+        job.update(status="failed", error=error, finished_at=get_pst_now().isoformat(), **fields)
+        self.stats["jobs_failed"] += 1
+        logger.error(f"{self.name} job {job['job_id']} failed: {error}")
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "tracked_jobs": len(self._jobs)}
+
+    async def run(self, job_id: str, work: Callable[[Any, Dict[str, Any]], Awaitable[None]],
+                  on_error: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None) -> None:
+        """Background entry point: run `work(db, job)` on its own session, failing the job on error"""
+        from ..database_async import get_async_session_factory
+
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        async with get_async_session_factory()() as db:
+            try:
+                await work(db, job)
+            except Exception as e:
+                await db.rollback()
+                self.fail(job, str(e), **(on_error(job) if on_error else {}))
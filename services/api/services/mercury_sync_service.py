@@ -1,11 +1,23 @@
 """
 Mercury API Sync Service
 Auto-sync bank transactions every hour with intelligent JE matching
+
+Sync is incremental: each run pages through Mercury (ascending by postedAt)
+from the account's high-water mark in mercury_sync_state, dedupes each page
+against bank_transactions with one IN query and bulk-inserts the new rows.
+The page cursor is committed with each page so an interrupted run resumes.
+New rows are matched to existing journal entries through an amount/date
+index built once per page from a single grouped query, so description
+similarity only runs on the few entries within a cent and three days.
+Given a session_factory instead of a session, every page (and the run's
+setup/finish bookkeeping) uses its own short-lived session, so no transaction
+is held open across Mercury HTTP calls.
 """
 
+from contextlib import asynccontextmanager, contextmanager
 from decimal import Decimal
-from typing import Dict, List, Optional
-from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+from datetime import date, datetime, timedelta, timezone
 import os
 import logging
 import httpx
@@ -15,11 +27,74 @@ from sqlalchemy import select, and_, or_, func
 from services.api.models_accounting import (
     JournalEntry, JournalEntryLine, ChartOfAccounts
 )
-from services.api.models_accounting_part2 import BankAccount, BankTransaction
+from services.api.models_accounting_part2 import BankAccount, BankTransaction, MercurySyncState
+from services.api.services.categorization_engine import description_similarity, get_categorization_engine
+from services.api.services.dashboard_snapshot import mark_dashboard_stale
+from services.api.services.transaction_matcher_engine import AmountDateIndex, MatchCandidate, to_cents
 from services.api.utils.datetime_utils import get_pst_now, convert_to_pst
 
 logger = logging.getLogger(__name__)
 
+MERCURY_PAGE_SIZE = int(os.getenv("MERCURY_PAGE_SIZE", "500"))
+# Re-read this far behind the high-water mark; pending transactions post late
+SYNC_OVERLAP = timedelta(days=2)
+# Existing-JE matching: date window either side and minimum memo similarity
+JE_MATCH_WINDOW_DAYS = 3
+JE_MATCH_MIN_SIMILARITY = 0.5
+
+# Shared keep-alive client for all Mercury calls in this process
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_mercury_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=60.0),
+        )
+    return _http_client
+
+
+async def close_mercury_http_client() -> None:
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
+
+# (entity_id, mercury account id) pairs with a sync running in this process
+_in_flight_syncs: Set[Tuple[int, str]] = set()
+
+
+def get_in_flight_syncs() -> int:
+    return len(_in_flight_syncs)
+
+
+class SyncAlreadyRunning(RuntimeError):
+    pass
+
+
+@contextmanager
+def mercury_sync_guard(entity_id: int, mercury_account_id: Optional[str]):
+    """Overlap protection: at most one sync per account at a time"""
+    key = (entity_id, mercury_account_id or "default")
+    if key in _in_flight_syncs:
+        raise SyncAlreadyRunning(f"Mercury sync already running for entity {entity_id}")
+    _in_flight_syncs.add(key)
+    try:
+        yield
+    finally:
+        _in_flight_syncs.discard(key)
+
+
+def _posted_at(transaction: Dict) -> datetime:
+    """postedAt as naive UTC (Mercury sends ISO-8601 with Z)"""
+    posted = datetime.fromisoformat(transaction["postedAt"].replace("Z", "+00:00"))
+    if posted.tzinfo is not None:
+        posted = posted.astimezone(timezone.utc).replace(tzinfo=None)
+    return posted
+
 
 class MercurySyncService:
     """
@@ -27,8 +102,9 @@ class MercurySyncService:
     Auto-matches to existing JEs or creates draft JEs for unmatched transactions
     """
     
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: Optional[AsyncSession] = None, session_factory: Optional[Callable] = None):
         self.db = db
+        self.session_factory = session_factory
         self.api_key = os.getenv("NGI_CAPITAL_LLC_MERCURY_API_KEY")
         self.base_url = "https://api.mercury.com/api/v1"
         self.account_id = os.getenv("MERCURY_ACCOUNT_ID")
@@ -37,71 +113,115 @@ class MercurySyncService:
     
     async def sync_transactions(self, entity_id: int, days_back: int = 30) -> Dict:
         """
-        Sync Mercury transactions for the past N days
+        Sync Mercury transactions since the account's high-water mark
+        (or the past N days on first sync)
         REVISED: Only imports transactions into staging, does NOT create JEs
         US GAAP Compliance: Transactions need supporting docs before JE creation
         """
         try:
-            # Get last sync timestamp or use days_back
-            last_sync = await self._get_last_sync_timestamp(entity_id)
-            if not last_sync:
-                last_sync = datetime.now() - timedelta(days=days_back)
-
-            # Fetch transactions from Mercury
-            transactions = await self._fetch_mercury_transactions(last_sync)
-
-            if not transactions:
+            async with self._session_scope():
+                state = await self._get_sync_state(entity_id)
+                if state.cursor_start is not None and state.cursor_offset is not None:
+                    # Resume an interrupted run from its last committed page
+                    start, offset = state.cursor_start, state.cursor_offset
+                else:
+                    last_sync = await self._get_last_sync_timestamp(entity_id)
+                    if last_sync:
+                        start = (last_sync - SYNC_OVERLAP).date()
+                    else:
+                        start = (datetime.now() - timedelta(days=days_back)).date()
+                    offset = 0
+
+                state.last_sync_status = "in_progress"
+                high_water = state.high_water_mark
+                last_transaction_id = state.last_transaction_id
+                await self.db.commit()
+
+            bank_account_id = None
+            fetched = new_count = skipped_count = pages = 0
+
+            async for page, next_offset in self._iter_transaction_pages(start, offset):
+                pages += 1
+                fetched += len(page)
+                async with self._session_scope():
+                    if bank_account_id is None:
+                        bank_account_id = await self._get_bank_account_id(entity_id)
+
+                    inserted, skipped = await self._ingest_page(page, entity_id, bank_account_id)
+                    new_count += inserted
+                    skipped_count += skipped
+
+                    for txn in page:
+                        posted = _posted_at(txn)
+                        if high_water is None or posted > high_water:
+                            high_water = posted
+                            last_transaction_id = txn["id"]
+
+                    # Page rows and cursor commit together
+                    state = await self._get_sync_state(entity_id)
+                    state.cursor_start = start
+                    state.cursor_offset = next_offset
+                    await self.db.commit()
+
+            async with self._session_scope():
+                state = await self._get_sync_state(entity_id)
+                state.cursor_start = None
+                state.cursor_offset = None
+                state.high_water_mark = high_water
+                state.last_transaction_id = last_transaction_id
+                state.last_run_fetched = fetched
+                state.last_run_inserted = new_count
+                state.last_run_pages = pages
+                await self._update_sync_timestamp(entity_id, get_pst_now())
+                if new_count:
+                    await mark_dashboard_stale(self.db)
+
+                await self.db.commit()
+
+            if not fetched:
                 logger.info(f"No new transactions found for entity {entity_id}")
                 return {
                     "success": True,
                     "synced": 0,
                     "new_transactions": 0,
+                    "pages": pages,
                     "message": "No new transactions to sync"
                 }
 
-            # Group related transactions (main transaction + cashback rewards)
-            grouped_txns = await self._group_related_transactions(transactions)
-
-            new_count = 0
-            skipped_count = 0
-
-            for txn_group in grouped_txns:
-                main_txn = txn_group["main"]
-                cashback_txn = txn_group.get("cashback")
-
-                # Check if main transaction already exists
-                existing = await self._get_existing_transaction(main_txn["id"])
-                if existing:
-                    skipped_count += 1
-                    continue
-
-                # REVISED: Save to staging, run smart suggestions, NO JE CREATION
-                await self._save_transaction_to_staging(
-                    main_txn, entity_id, cashback_txn=cashback_txn
-                )
-                new_count += 1
-
-            # Update last sync timestamp
-            await self._update_sync_timestamp(entity_id, get_pst_now())
-
-            await self.db.commit()
-
             return {
                 "success": True,
-                "synced": len(transactions),
+                "synced": fetched,
                 "new_transactions": new_count,
                 "skipped": skipped_count,
+                "pages": pages,
                 "message": f"Synced {new_count} new transactions (skipped {skipped_count} duplicates). Ready for review and matching."
             }
 
         except Exception as e:
             logger.error(f"Error syncing Mercury transactions: {str(e)}")
-            await self.db.rollback()
+            if self.db is not None:
+                await self.db.rollback()
+            async with self._session_scope():
+                await self._mark_sync_failed(entity_id)
             return {
                 "success": False,
                 "message": f"Sync failed: {str(e)}"
             }
-    
+
+    @asynccontextmanager
+    async def _session_scope(self):
+        """Own short-lived session when built with a session_factory, else the caller's"""
+        if self.session_factory is None:
+            yield self.db
+            return
+        outer = self.db
+        async with self.session_factory() as db:
+            self.db = db
+            try:
+                yield db
+            finally:
+                self.db = outer
+
     async def _fetch_mercury_account_details(self) -> Dict:
         """Fetch full account details from Mercury API"""
         try:
@@ -110,12 +230,10 @@ class MercurySyncService:
                 "Content-Type": "application/json"
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/account/{self.account_id}",
-                    headers=headers,
-                    timeout=30.0
-                )
+            response = await get_mercury_http_client().get(
+                f"{self.base_url}/account/{self.account_id}",
+                headers=headers,
+            )
 
             if response.status_code == 200:
                 return response.json()
@@ -127,39 +245,104 @@ class MercurySyncService:
             logger.error(f"Error fetching Mercury account details: {str(e)}")
             return {}
 
-    async def _fetch_mercury_transactions(self, since: datetime) -> List[Dict]:
-        """Fetch transactions from Mercury API"""
-        try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
+    async def _fetch_transactions_page(self, start: date, offset: int) -> List[Dict]:
+        """Fetch one page of transactions; raises so the run keeps its cursor"""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
 
-            params = {
-                "accountId": self.account_id,
-                "start": since.strftime("%Y-%m-%d"),
-                "limit": 100
-            }
+        params = {
+            "accountId": self.account_id,
+            "start": start.strftime("%Y-%m-%d"),
+            "limit": MERCURY_PAGE_SIZE,
+            "offset": offset,
+            "order": "asc",
+        }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/transactions",
-                    params=params,
-                    headers=headers,
-                    timeout=30.0
-                )
+        response = await get_mercury_http_client().get(
+            f"{self.base_url}/transactions",
+            params=params,
+            headers=headers,
+        )
 
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("transactions", [])
-            else:
-                logger.error(f"Mercury API error: {response.status_code} - {response.text}")
-                return []
+        if response.status_code != 200:
+            logger.error(f"Mercury API error: {response.status_code} - {response.text}")
+            raise RuntimeError(f"Mercury API returned {response.status_code}")
+        return response.json().get("transactions", [])
+
+    async def _iter_transaction_pages(
+        self, start: date, offset: int = 0
+    ) -> AsyncIterator[Tuple[List[Dict], int]]:
+        """Yield (page, next_offset) until Mercury returns a short page"""
+        while True:
+            page = await self._fetch_transactions_page(start, offset)
+            if not page:
+                return
+            offset += len(page)
+            yield page, offset
+            if len(page) < MERCURY_PAGE_SIZE:
+                return
+
+    async def _ingest_page(
+        self, page: List[Dict], entity_id: int, bank_account_id: int
+    ) -> Tuple[int, int]:
+        """Dedupe a page with one IN query and bulk-insert the new rows"""
+        grouped_txns = await self._group_related_transactions(page)
+        seen = await self._existing_mercury_ids([txn["id"] for txn in page])
+
+        new_groups: List[Dict] = []
+        skipped = 0
+        for txn_group in grouped_txns:
+            main_txn = txn_group["main"]
+            if main_txn["id"] in seen:
+                skipped += 1
+                continue
+            seen.add(main_txn["id"])
+            new_groups.append(txn_group)
+
+        # Categorize the whole page in one engine call
+        engine = await get_categorization_engine(self.db, entity_id) if new_groups else None
+        categories = engine.categorize_many([g["main"] for g in new_groups], bank_account_id) if engine else []
+
+        # Match against existing JEs with one index per page
+        je_matches = await self._match_page_to_jes([g["main"] for g in new_groups], entity_id)
+
+        new_rows: List[BankTransaction] = []
+        cashback_pairs: List[Tuple[BankTransaction, Dict]] = []
+        for txn_group, category in zip(new_groups, categories):
+            # REVISED: Save to staging, run smart suggestions, NO JE CREATION
+            bank_txn = await self._build_staging_transaction(
+                txn_group["main"], entity_id, bank_account_id, category
+            )
+            je = je_matches.get(txn_group["main"]["id"])
+            if je is not None:
+                self._mark_je_matched(txn_group["main"], je)
+                bank_txn.status = "pending"
+                bank_txn.matched_journal_entry_id = je.id
+            new_rows.append(bank_txn)
+
+            cashback_txn = txn_group.get("cashback")
+            if cashback_txn and cashback_txn["id"] not in seen:
+                seen.add(cashback_txn["id"])
+                cashback_pairs.append((bank_txn, cashback_txn))
+
+        if not new_rows:
+            return 0, skipped
+
+        self.db.add_all(new_rows)
+        await self.db.flush()
+
+        # Cashback rows link to their (now flushed) main transaction
+        if cashback_pairs:
+            self.db.add_all([
+                self._build_cashback_transaction(cashback_txn, entity_id, bank_account_id, main_row.id)
+                for main_row, cashback_txn in cashback_pairs
+            ])
+            await self.db.flush()
+
+        return len(new_rows), skipped
 
-        except Exception as e:
-            logger.error(f"Error fetching Mercury transactions: {str(e)}")
-            return []
-    
     async def _group_related_transactions(self, transactions: List[Dict]) -> List[Dict]:
         """
         Group related transactions (main transaction + cashback rewards)
@@ -228,19 +411,99 @@ class MercurySyncService:
 
         return grouped
 
-    async def _get_existing_transaction(self, mercury_transaction_id: str):
-        """Check if transaction already synced"""
+    async def _existing_mercury_ids(self, mercury_transaction_ids: List[str]) -> Set[str]:
+        """Mercury ids from the list that are already synced (single IN query)"""
+        if not mercury_transaction_ids:
+            return set()
         result = await self.db.execute(
-            select(BankTransaction).where(
-                BankTransaction.mercury_transaction_id == mercury_transaction_id
+            select(BankTransaction.mercury_transaction_id).where(
+                BankTransaction.mercury_transaction_id.in_(mercury_transaction_ids)
             )
         )
-        return result.scalar_one_or_none()
-    
+        return {row[0] for row in result.all()}
+
+    async def _build_je_match_index(self, transactions: List[Dict], entity_id: int) -> AmountDateIndex:
+        """
+        Index unlinked approved/posted JEs around the transactions' dates
+
+        One grouped query sums each entry's debits and credits; entries are
+        bucketed by max(debits, credits) in cents and sorted by date.
+        """
+        if not transactions:
+            return AmountDateIndex([])
+        dates = [_posted_at(txn).date() for txn in transactions]
+        window = timedelta(days=JE_MATCH_WINDOW_DAYS)
+        rows = (await self.db.execute(
+            select(
+                JournalEntry.id,
+                JournalEntry.entry_date,
+                JournalEntry.memo,
+                func.sum(JournalEntryLine.debit_amount),
+                func.sum(JournalEntryLine.credit_amount),
+            )
+            .join(JournalEntryLine, JournalEntryLine.journal_entry_id == JournalEntry.id)
+            .where(
+                and_(
+                    JournalEntry.entity_id == entity_id,
+                    JournalEntry.entry_date >= min(dates) - window,
+                    JournalEntry.entry_date <= max(dates) + window,
+                    JournalEntry.status.in_(["approved", "posted"]),
+                    or_(
+                        JournalEntry.mercury_transaction_id.is_(None),
+                        JournalEntry.mercury_transaction_id == ""
+                    )
+                )
+            )
+            .group_by(JournalEntry.id, JournalEntry.entry_date, JournalEntry.memo)
+        )).all()
+
+        candidates = []
+        for je_id, entry_date, memo, total_debit, total_credit in rows:
+            je_amount = max(Decimal(str(total_debit or 0)), Decimal(str(total_credit or 0)))
+            candidate = MatchCandidate(je_id, je_amount, entry_date, memo or "")
+            candidates.append((candidate.cents, candidate))
+        return AmountDateIndex(candidates)
+
+    def _pick_je_candidate(self, transaction: Dict, index: AmountDateIndex) -> Optional[MatchCandidate]:
+        """Best-described unclaimed JE within $0.01 and the date window; claims it"""
+        txn_date = _posted_at(transaction).date()
+        txn_description = transaction.get("description", "").lower()
+        best: Optional[Tuple[float, int, MatchCandidate]] = None
+        for _, candidate in index.nearby(to_cents(transaction["amount"]), txn_date, JE_MATCH_WINDOW_DAYS):
+            similarity = self._description_similarity(txn_description, candidate.text)
+            if similarity <= JE_MATCH_MIN_SIMILARITY:
+                continue
+            rank = (similarity, -abs((candidate.on_date - txn_date).days), candidate)
+            if best is None or rank[:2] > best[:2]:
+                best = rank
+        if best is None:
+            return None
+        index.claim(best[2])
+        return best[2]
+
+    async def _match_page_to_jes(self, transactions: List[Dict], entity_id: int) -> Dict[str, JournalEntry]:
+        """Match a page of Mercury transactions to existing JEs one-to-one (two queries)"""
+        if not transactions:
+            return {}
+        index = await self._build_je_match_index(transactions, entity_id)
+        if not len(index):
+            return {}
+        picks = {}
+        for transaction in transactions:
+            candidate = self._pick_je_candidate(transaction, index)
+            if candidate is not None:
+                picks[transaction["id"]] = candidate.ref
+        if not picks:
+            return {}
+        result = await self.db.execute(select(JournalEntry).where(JournalEntry.id.in_(set(picks.values()))))
+        entries = {je.id: je for je in result.scalars().all()}
+        return {mercury_id: entries[je_id] for mercury_id, je_id in picks.items() if je_id in entries}
+
     async def _match_transaction_to_je(
         self,
         transaction: Dict,
-        entity_id: int
+        entity_id: int,
+        index: Optional[AmountDateIndex] = None
     ) -> Optional[JournalEntry]:
         """
         Intelligently match Mercury transaction to existing JE
@@ -249,71 +512,28 @@ class MercurySyncService:
         2. Date within 3 days
         3. Description similarity
         4. Not already matched
+
+        Pass an index from _build_je_match_index to match a batch without
+        re-querying per transaction.
         """
-        txn_amount = abs(Decimal(str(transaction["amount"])))
-        txn_date = datetime.fromisoformat(transaction["postedAt"].replace("Z", "+00:00")).date()
-        txn_description = transaction.get("description", "").lower()
-        
-        # Search for potential matches
-        date_range_start = txn_date - timedelta(days=3)
-        date_range_end = txn_date + timedelta(days=3)
-        
-        result = await self.db.execute(
-            select(JournalEntry).where(
-                and_(
-                    JournalEntry.entity_id == entity_id,
-                    JournalEntry.entry_date >= date_range_start,
-                    JournalEntry.entry_date <= date_range_end,
-                    JournalEntry.status.in_(["approved", "posted"]),
-                    or_(
-                        JournalEntry.mercury_transaction_id.is_(None),
-                        JournalEntry.mercury_transaction_id == ""
-                    )
-                )
-            )
-        )
-        potential_matches = result.scalars().all()
-        
-        # Check each potential match
-        for je in potential_matches:
-            # Get JE lines
-            lines_result = await self.db.execute(
-                select(JournalEntryLine).where(
-                    JournalEntryLine.journal_entry_id == je.id
-                )
-            )
-            lines = lines_result.scalars().all()
-            
-            # Calculate total amount (sum of debits or credits)
-            total_debit = sum(line.debit_amount for line in lines)
-            total_credit = sum(line.credit_amount for line in lines)
-            je_amount = max(total_debit, total_credit)
-            
-            # Check amount match (within $0.01)
-            if abs(je_amount - txn_amount) <= Decimal("0.01"):
-                # Check description similarity
-                je_memo = (je.memo or "").lower()
-                if self._description_similarity(txn_description, je_memo) > 0.5:
-                    return je
-        
-        return None
-    
+        if index is None:
+            index = await self._build_je_match_index([transaction], entity_id)
+        candidate = self._pick_je_candidate(transaction, index)
+        if candidate is None:
+            return None
+        return await self.db.get(JournalEntry, candidate.ref)
+
+    @staticmethod
+    def _mark_je_matched(transaction: Dict, je: JournalEntry) -> None:
+        je.mercury_transaction_id = transaction["id"]
+        je.reconciliation_status = "pending_review"  # US GAAP: Requires review before marked as matched
+        je.needs_review = True  # Flag for manual review and document upload
+        logger.info(f"Matched Mercury transaction {transaction['id']} to JE {je.entry_number} (pending review)")
+
     @staticmethod
     def _description_similarity(desc1: str, desc2: str) -> float:
         """Calculate simple description similarity (0-1)"""
-        if not desc1 or not desc2:
-            return 0.0
-        
-        words1 = set(desc1.split())
-        words2 = set(desc2.split())
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-        
-        return len(intersection) / len(union)
+        return description_similarity(desc1, desc2)
     
     async def _link_transaction_to_je(
         self,
@@ -322,10 +542,7 @@ class MercurySyncService:
         entity_id: int
     ):
         """Link Mercury transaction to existing JE"""
-        # Update JE with Mercury transaction ID
-        je.mercury_transaction_id = transaction["id"]
-        je.reconciliation_status = "pending_review"  # US GAAP: Requires review before marked as matched
-        je.needs_review = True  # Flag for manual review and document upload
+        self._mark_je_matched(transaction, je)
 
         # Create BankTransaction record
         bank_txn = BankTransaction(
@@ -343,26 +560,23 @@ class MercurySyncService:
             created_at=get_pst_now()
         )
         self.db.add(bank_txn)
-
-        logger.info(f"Matched Mercury transaction {transaction['id']} to JE {je.entry_number} (pending review)")
     
-    async def _save_transaction_to_staging(
+    async def _build_staging_transaction(
         self,
         transaction: Dict,
         entity_id: int,
-        cashback_txn: Optional[Dict] = None
-    ):
+        bank_account_id: int,
+        category_result: Optional[Dict] = None
+    ) -> BankTransaction:
         """
-        REVISED: Save transaction to staging for user review
+        REVISED: Build staging row for user review
         NO JOURNAL ENTRY CREATION - transactions wait for supporting documents
         US GAAP Compliant: Transactions need docs before posting to GL
         """
         amount = Decimal(str(transaction["amount"]))
         is_credit = amount > 0
 
-        txn_date = datetime.fromisoformat(
-            transaction["postedAt"].replace("Z", "+00:00")
-        ).date()
+        txn_date = _posted_at(transaction).date()
 
         # Parse transaction metadata for intelligent categorization
         description = transaction.get("description", "")
@@ -370,22 +584,32 @@ class MercurySyncService:
         note = transaction.get("note", "")
 
         # Intelligent categorization for suggestions (NOT for JE creation)
-        category_result = await self._categorize_transaction(
-            description, counterparty_name, note, amount, entity_id
-        )
+        if category_result is None:
+            category_result = await self._categorize_transaction(
+                description, counterparty_name, note, amount, entity_id
+            )
 
-        # Store suggested account as JSON string for new fields
-        suggested_account_id = None
-        if category_result.get("account"):
-            suggested_account_id = category_result["account"].id
+        suggested_account_id = category_result.get("account_id")
 
         # Detect recurring vendor
         is_recurring = bool(counterparty_name and len(counterparty_name) > 3)
 
+        # Log result
+        suggestion_note = (
+            f"[Suggested: {category_result.get('category_name')}]"
+            if suggested_account_id
+            else "[No auto-categorization]"
+        )
+        logger.info(
+            f"Imported Mercury transaction '{description}' "
+            f"(${amount}) to staging - {suggestion_note}. "
+            f"Awaiting document upload for JE creation."
+        )
+
         # Create BankTransaction record (STAGING - NO JE!)
-        bank_txn = BankTransaction(
+        return BankTransaction(
             entity_id=entity_id,
-            bank_account_id=await self._get_bank_account_id(entity_id),
+            bank_account_id=bank_account_id,
             mercury_transaction_id=transaction["id"],
             transaction_date=txn_date,
             description=description,
@@ -402,49 +626,33 @@ class MercurySyncService:
             imported_at=get_pst_now(),
             created_at=get_pst_now()
         )
-        self.db.add(bank_txn)
-
-        # Handle cashback if present - save as related transaction
-        if cashback_txn:
-            cashback_amount = Decimal(str(cashback_txn["amount"]))
-            cashback_date = datetime.fromisoformat(
-                cashback_txn["postedAt"].replace("Z", "+00:00")
-            ).date()
-
-            cashback_bank_txn = BankTransaction(
-                entity_id=entity_id,
-                bank_account_id=await self._get_bank_account_id(entity_id),
-                mercury_transaction_id=cashback_txn["id"],
-                transaction_date=cashback_date,
-                description=cashback_txn.get("description", "Cashback reward"),
-                amount=cashback_amount,
-                transaction_type="credit",
-                merchant_name="Mercury Cashback",
-                status="unmatched",
-                needs_review=True,
-                grouped_transaction_ids=str([bank_txn.id]),  # Link to main transaction
-                imported_at=get_pst_now(),
-                created_at=get_pst_now()
-            )
-            self.db.add(cashback_bank_txn)
 
-            logger.info(
-                f"Saved cashback transaction ${cashback_amount} linked to main transaction"
-            )
-
-        # Log result
-        suggestion_note = (
-            f"[Suggested: {category_result.get('category_name')}]"
-            if category_result.get("account")
-            else "[No auto-categorization]"
+    def _build_cashback_transaction(
+        self,
+        cashback_txn: Dict,
+        entity_id: int,
+        bank_account_id: int,
+        main_transaction_id: int
+    ) -> BankTransaction:
+        """Cashback saved as a related staging row linked to its main transaction"""
+        cashback_amount = Decimal(str(cashback_txn["amount"]))
+        logger.info(f"Saved cashback transaction ${cashback_amount} linked to main transaction")
+        return BankTransaction(
+            entity_id=entity_id,
+            bank_account_id=bank_account_id,
+            mercury_transaction_id=cashback_txn["id"],
+            transaction_date=_posted_at(cashback_txn).date(),
+            description=cashback_txn.get("description", "Cashback reward"),
+            amount=cashback_amount,
+            transaction_type="credit",
+            merchant_name="Mercury Cashback",
+            status="unmatched",
+            needs_review=True,
+            grouped_transaction_ids=str([main_transaction_id]),  # Link to main transaction
+            imported_at=get_pst_now(),
+            created_at=get_pst_now()
         )
 
-        logger.info(
-            f"Imported Mercury transaction '{description}' "
-            f"(${amount}) to staging - {suggestion_note}. "
-            f"Awaiting document upload for JE creation."
-        )
-    
     async def _categorize_transaction(
         self,
         description: str,
@@ -454,171 +662,18 @@ class MercurySyncService:
         entity_id: int
     ) -> Dict:
         """
-        Intelligently categorize Mercury transaction based on description, counterparty, and patterns
+        Categorize one Mercury transaction with the entity's compiled rules
+        (see categorization_engine; pages use categorize_many directly)
         Returns: {
-            "account": ChartOfAccounts | None,
-            "category_name": str,
-            "description": str,
+            "account_id": int | None,
+            "account_number": str | None,
+            "category_name": str | None,
+            "description": str | None,
             "confidence": float  # 0-1
         }
         """
-        # Combine all text fields for analysis
-        full_text = f"{description} {counterparty} {note}".lower()
-        is_credit = amount > 0  # Positive = money in (revenue), Negative = money out (expense)
-
-        # Define categorization rules (keyword matching)
-        # Format: (keywords, account_number, category_name, description_template)
-
-        expense_rules = [
-            # Software & SaaS (62100 - Software & Subscriptions)
-            (
-                ["openai", "anthropic", "claude", "gpt", "api", "github", "gitlab", "vercel", "netlify",
-                 "aws", "azure", "gcp", "google cloud", "digitalocean", "heroku", "software", "saas",
-                 "subscription", "slack", "notion", "figma", "linear", "zoom", "microsoft 365"],
-                "62100",
-                "Software & Subscriptions",
-                "Software/SaaS"
-            ),
-            # Legal & Professional (62700 - Legal & Professional Fees)
-            (
-                ["attorney", "lawyer", "legal", "law firm", "stripe atlas", "clerky", "incorporation",
-                 "filing fee", "state filing", "delaware", "secretary of state", "registered agent",
-                 "northwest registered", "incfile", "legalzoom", "rocket lawyer"],
-                "62700",
-                "Legal & Professional Fees",
-                "Legal/Professional services"
-            ),
-            # Marketing & Advertising (62200 - Marketing & Advertising)
-            (
-                ["google ads", "facebook ads", "linkedin ads", "twitter ads", "meta", "ad spend",
-                 "advertising", "marketing", "mailchimp", "sendgrid", "hubspot", "campaign"],
-                "62200",
-                "Marketing & Advertising",
-                "Marketing/Advertising"
-            ),
-            # Travel & Entertainment (62600 - Travel & Entertainment)
-            (
-                ["airline", "hotel", "airbnb", "uber", "lyft", "rental car", "flight", "travel",
-                 "restaurant", "meal", "doordash", "ubereats", "grubhub", "entertainment"],
-                "62600",
-                "Travel & Entertainment",
-                "Travel/Entertainment"
-            ),
-            # Office Supplies (62400 - Office Supplies & Equipment)
-            (
-                ["amazon", "staples", "office depot", "supplies", "equipment", "furniture",
-                 "desk", "chair", "monitor", "keyboard", "mouse"],
-                "62400",
-                "Office Supplies & Equipment",
-                "Office supplies/equipment"
-            ),
-            # Insurance (62800 - Insurance)
-            (
-                ["insurance", "liability", "workers comp", "health insurance", "dental",
-                 "vision", "embroker", "next insurance", "hiscox"],
-                "62800",
-                "Insurance",
-                "Insurance premium"
-            ),
-            # Utilities (62500 - Utilities)
-            (
-                ["internet", "phone", "mobile", "verizon", "at&t", "t-mobile", "comcast",
-                 "spectrum", "utility", "electric", "power"],
-                "62500",
-                "Utilities",
-                "Utilities"
-            ),
-            # Bank Fees (62900 - Bank Fees)
-            (
-                ["bank fee", "service charge", "wire fee", "ach fee", "monthly fee",
-                 "transaction fee", "overdraft", "mercury fee"],
-                "62900",
-                "Bank Fees",
-                "Bank fees"
-            ),
-            # Rent (62300 - Rent)
-            (
-                ["rent", "lease", "office space", "coworking", "wework", "regus"],
-                "62300",
-                "Rent",
-                "Rent expense"
-            ),
-            # Payroll (63000 - Payroll Expenses)
-            (
-                ["payroll", "salary", "wages", "gusto", "rippling", "adp", "paychex",
-                 "employee", "contractor payment"],
-                "63000",
-                "Payroll Expenses",
-                "Payroll/Compensation"
-            ),
-        ]
-
-        revenue_rules = [
-            # Service Revenue (40100 - Service Revenue)
-            (
-                ["client payment", "invoice payment", "service fee", "consulting", "advisory",
-                 "professional services", "revenue", "stripe", "payment received"],
-                "40100",
-                "Service Revenue",
-                "Service revenue"
-            ),
-            # Interest Income (40500 - Interest Income)
-            (
-                ["interest", "interest earned", "mercury interest", "bank interest"],
-                "40500",
-                "Interest Income",
-                "Interest income"
-            ),
-            # Refunds/Returns
-            (
-                ["refund", "return", "reimbursement", "credit memo"],
-                "40400",
-                "Other Income",
-                "Refund/Return"
-            ),
-        ]
-
-        # Apply rules based on transaction direction
-        rules_to_check = revenue_rules if is_credit else expense_rules
-
-        for keywords, account_number, category_name, desc_template in rules_to_check:
-            # Check if any keyword matches
-            if any(keyword in full_text for keyword in keywords):
-                # Get the account
-                result = await self.db.execute(
-                    select(ChartOfAccounts).where(
-                        and_(
-                            ChartOfAccounts.entity_id == entity_id,
-                            ChartOfAccounts.account_number == account_number
-                        )
-                    )
-                )
-                account = result.scalar_one_or_none()
-
-                if account:
-                    # Build description with counterparty if available
-                    final_desc = f"{desc_template} - {counterparty}" if counterparty else desc_template
-
-                    logger.info(
-                        f"Auto-categorized transaction: '{description}' → "
-                        f"{account_number} ({category_name})"
-                    )
-
-                    return {
-                        "account": account,
-                        "category_name": category_name,
-                        "description": final_desc,
-                        "confidence": 0.85  # High confidence for keyword match
-                    }
-
-        # No match found - will use suspense account
-        logger.info(f"Could not auto-categorize: '{description}' - using Suspense account")
-        return {
-            "account": None,
-            "category_name": None,
-            "description": None,
-            "confidence": 0.0
-        }
+        engine = await get_categorization_engine(self.db, entity_id)
+        return engine.categorize(description, counterparty, note, amount)
 
     async def _get_cash_account(self, entity_id: int) -> ChartOfAccounts:
         """Get primary cash account (10110)"""
@@ -749,14 +804,48 @@ class MercurySyncService:
 
         return f"{prefix}-{next_num:06d}"
     
+    async def _get_sync_state(self, entity_id: int) -> MercurySyncState:
+        """Get (or create) the durable sync cursor for this entity's Mercury account"""
+        mercury_account_id = self.account_id or "default"
+        result = await self.db.execute(
+            select(MercurySyncState).where(
+                and_(
+                    MercurySyncState.entity_id == entity_id,
+                    MercurySyncState.mercury_account_id == mercury_account_id
+                )
+            )
+        )
+        state = result.scalar_one_or_none()
+        if not state:
+            state = MercurySyncState(
+                entity_id=entity_id,
+                mercury_account_id=mercury_account_id,
+                last_run_fetched=0,
+                last_run_inserted=0,
+                last_run_pages=0,
+            )
+            self.db.add(state)
+            await self.db.flush()
+        return state
+
     async def _get_last_sync_timestamp(self, entity_id: int) -> Optional[datetime]:
-        """Get last sync timestamp from database"""
-        # This would query a sync_log table in production
-        # For now, return None to sync last 30 days
-        return None
-    
+        """High-water mark (latest postedAt) from the last completed sync"""
+        state = await self._get_sync_state(entity_id)
+        return state.high_water_mark
+
     async def _update_sync_timestamp(self, entity_id: int, timestamp: datetime):
         """Update last sync timestamp"""
-        # This would update a sync_log table in production
+        state = await self._get_sync_state(entity_id)
+        state.last_sync_at = timestamp
+        state.last_sync_status = "success"
         logger.info(f"Sync completed for entity {entity_id} at {timestamp}")
 
+    async def _mark_sync_failed(self, entity_id: int):
+        """Best-effort: record failure while keeping the committed page cursor"""
+        try:
+            state = await self._get_sync_state(entity_id)
+            state.last_sync_status = "failed"
+            state.last_sync_at = get_pst_now()
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
@@ -15,6 +15,7 @@ from services.api.models_accounting_part2 import BankAccount, BankReconciliation
 from services.api.models_fixed_assets import FixedAsset, DepreciationEntry
 from services.api.utils.datetime_utils import get_pst_now
 from services.api.services.financial_statements_generator import FinancialStatementsGenerator
+from services.api.services.account_balance_ledger import AccountBalanceLedger
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +26,7 @@ class PeriodCloseService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.statements_generator = FinancialStatementsGenerator(db)
+        self.ledger = AccountBalanceLedger(db)
     
     async def initiate_period_close(
         self,
@@ -311,6 +313,11 @@ class PeriodCloseService:
         # Unlock period
         await self._unlock_period(close.entity_id, close.period_start, close.period_end)
         
+        # Back posted closing entries out of the balance ledger; they are
+        # regenerated on the next close
+        await self._unpost_closing_entries(close.id)
+        await self.ledger.bump_version(close.entity_id)
+        
         # Update close record
         close.status = "reopened"
         close.reopened_by_email = reopened_by_email
@@ -400,43 +407,17 @@ class PeriodCloseService:
         return {"complete": True, "details": "All journal entries posted"}
     
     async def _check_trial_balance(self, entity_id: int, period_end: date) -> Dict:
-        """Check trial balance"""
-        
-        # Get all accounts with balances
-        result = await self.db.execute(
-            select(ChartOfAccounts).where(
-                and_(
-                    ChartOfAccounts.entity_id == entity_id,
-                    ChartOfAccounts.is_active == True
-                )
-            )
-        )
-        accounts = result.scalars().all()
-        
-        total_debits = 0
-        total_credits = 0
+        """Check trial balance as of period end from the balance ledger"""
         
-        for account in accounts:
-            if account.normal_balance == "Debit":
-                if account.current_balance >= 0:
-                    total_debits += account.current_balance
-                else:
-                    total_credits += abs(account.current_balance)
-            else:  # Credit
-                if account.current_balance >= 0:
-                    total_credits += account.current_balance
-                else:
-                    total_debits += abs(account.current_balance)
-        
-        difference = abs(total_debits - total_credits)
-        is_balanced = difference < 0.01  # Allow for rounding
+        tb = await self.ledger.trial_balance(entity_id, period_end)
+        is_balanced = tb["is_balanced"]
         
         return {
             "complete": is_balanced,
             "balanced": is_balanced,
-            "total_debits": float(total_debits),
-            "total_credits": float(total_credits),
-            "details": f"Trial balance is balanced" if is_balanced else f"Out of balance by ${difference:.2f}"
+            "total_debits": tb["total_debits"],
+            "total_credits": tb["total_credits"],
+            "details": f"Trial balance is balanced" if is_balanced else f"Out of balance by ${tb['difference']:.2f}"
         }
     
     async def _check_depreciation(self, entity_id: int, period_end: date) -> Dict:
@@ -558,6 +539,28 @@ class PeriodCloseService:
             await self.db.flush()
             logger.info(f"Period unlocked: {period_start} to {period_end}")
     
+    async def _unpost_closing_entries(self, close_id: int):
+        """Return posted closing entries for a period close to draft"""
+        
+        result = await self.db.execute(
+            select(ClosingEntry, JournalEntry)
+            .join(JournalEntry, JournalEntry.id == ClosingEntry.journal_entry_id)
+            .where(
+                and_(
+                    ClosingEntry.period_close_id == close_id,
+                    JournalEntry.status == "posted"
+                )
+            )
+        )
+        for closing, je in result.all():
+            await self.ledger.unpost_entry(je)
+            je.status = "draft"
+            je.workflow_stage = 0
+            je.posted_at = None
+            je.is_locked = False
+            closing.status = "draft"
+            closing.posted_at = None
+    
     # ============================================================================
     # UTILITIES
     # ============================================================================
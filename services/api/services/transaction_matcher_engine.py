@@ -0,0 +1,291 @@
+"""
+Transaction Matcher Engine
+Bounded subset-sum search used to group bank transactions (or documents)
+that together settle a single target amount
+
+Works in integer cents and runs a capped dynamic program over reachable
+sums, so the cost is bounded by the state cap and the per-call latency
+budget instead of growing with C(n, k).
+
+Author: NGI Capital Development Team
+Date: December 2025
+"""
+
+import bisect
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from datetime import date, datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TOLERANCE_CENTS = 1
+DEFAULT_MAX_GROUP_SIZE = 9
+DEFAULT_TOP_K = 5
+DEFAULT_TIME_BUDGET_MS = 250
+DEFAULT_MAX_STATES = 50000
+
+
+def to_cents(value) -> int:
+    """Convert a Decimal/float/int/str amount to absolute integer cents"""
+    if value is None:
+        return 0
+    amount = value if isinstance(value, Decimal) else Decimal(str(value))
+    return abs(int((amount * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP)))
+
+
+def from_cents(cents: int) -> Decimal:
+    return (Decimal(cents) / Decimal(100)).quantize(Decimal("0.01"))
+
+
+class MatchCandidate:
+    """A single matchable item (bank transaction, document, JE line)"""
+
+    __slots__ = ("ref", "cents", "on_date", "text")
+
+    def __init__(self, ref: Any, amount, on_date: Optional[date] = None, text: str = ""):
+        self.ref = ref
+        self.cents = to_cents(amount)
+        if isinstance(on_date, datetime):
+            on_date = on_date.date()
+        self.on_date = on_date
+        self.text = (text or "").lower()
+
+    @classmethod
+    def from_bank_transaction(cls, txn) -> "MatchCandidate":
+        text = f"{txn.description or ''} {txn.merchant_name or ''}"
+        return cls(txn, txn.amount, txn.transaction_date, text)
+
+
+class AmountDateIndex:
+    """
+    Match candidates bucketed by integer cents, each bucket sorted by date
+
+    Built once per batch; `nearby` probes the buckets inside the amount
+    tolerance and bisects each one to the date window, so a lookup costs
+    O(tolerance * log n) plus the hits. Callers pass the bucket key
+    explicitly, which lets them index on signed or absolute cents.
+    `claim` keeps assignment one-to-one across the batch.
+    """
+
+    def __init__(self, candidates: Iterable[Tuple[int, MatchCandidate]]):
+        buckets: Dict[int, List[MatchCandidate]] = defaultdict(list)
+        for cents, candidate in candidates:
+            buckets[cents].append(candidate)
+        self._buckets: Dict[int, Tuple[List[MatchCandidate], List[date]]] = {}
+        for cents, items in buckets.items():
+            items.sort(key=lambda c: c.on_date)
+            self._buckets[cents] = (items, [c.on_date for c in items])
+        self._used: set = set()
+
+    def __len__(self) -> int:
+        return sum(len(items) for items, _ in self._buckets.values())
+
+    def nearby(self, cents: int, on_date: date, window_days: int,
+               tolerance_cents: int = DEFAULT_TOLERANCE_CENTS) -> Iterator[Tuple[int, MatchCandidate]]:
+        """Unclaimed candidates within the amount tolerance and date window"""
+        if isinstance(on_date, datetime):
+            on_date = on_date.date()
+        lo_date = on_date - timedelta(days=window_days)
+        hi_date = on_date + timedelta(days=window_days)
+        for key in range(cents - tolerance_cents, cents + tolerance_cents + 1):
+            bucket = self._buckets.get(key)
+            if not bucket:
+                continue
+            items, dates = bucket
+            start = bisect.bisect_left(dates, lo_date)
+            end = bisect.bisect_right(dates, hi_date)
+            for candidate in items[start:end]:
+                if candidate.ref not in self._used:
+                    yield key, candidate
+
+    def claim(self, candidate: MatchCandidate) -> None:
+        self._used.add(candidate.ref)
+
+
+class SubsetSumMatcher:
+    """
+    Capped subset-sum matcher
+
+    Candidates are pruned by vendor text, date window and amount before the
+    search. The dynamic program keeps, for every reachable sum <= target,
+    at most `top_k` index groups (smallest groups first). The search stops
+    early when the state cap or the latency budget is hit and reports the
+    result as truncated.
+    """
+
+    def __init__(
+        self,
+        tolerance_cents: int = DEFAULT_TOLERANCE_CENTS,
+        max_group_size: int = DEFAULT_MAX_GROUP_SIZE,
+        top_k: int = DEFAULT_TOP_K,
+        time_budget_ms: int = DEFAULT_TIME_BUDGET_MS,
+        max_states: int = DEFAULT_MAX_STATES,
+    ):
+        self.tolerance_cents = tolerance_cents
+        self.max_group_size = max_group_size
+        self.top_k = top_k
+        self.time_budget_ms = time_budget_ms
+        self.max_states = max_states
+
+    def prune(
+        self,
+        candidates: Sequence[MatchCandidate],
+        target_cents: int,
+        anchor_date: Optional[date] = None,
+        window_days: Optional[int] = None,
+        vendor_name: Optional[str] = None,
+    ) -> List[MatchCandidate]:
+        """Drop candidates that can never be part of a matching group"""
+        vendor = (vendor_name or "").lower().strip()
+        upper = target_cents + self.tolerance_cents
+        kept = []
+        for cand in candidates:
+            if cand.cents <= 0 or cand.cents > upper:
+                continue
+            if vendor and vendor not in cand.text:
+                continue
+            if anchor_date and window_days is not None and cand.on_date:
+                if abs((cand.on_date - anchor_date).days) > window_days:
+                    continue
+            kept.append(cand)
+        kept.sort(key=lambda c: (c.on_date or date.min, c.cents))
+        return kept
+
+    def find_groups(
+        self,
+        candidates: Sequence[MatchCandidate],
+        target,
+        anchor_date: Optional[date] = None,
+        window_days: Optional[int] = None,
+        vendor_name: Optional[str] = None,
+        min_group_size: int = 2,
+        time_budget_ms: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> Dict:
+        """
+        Find the top-K groups of candidates whose amounts sum to target
+
+        Returns {"groups": [...], "truncated": bool, "elapsed_ms": float,
+        "candidates_considered": int}. Each group has "items" (candidate refs),
+        "total" (Decimal), "total_cents", "date_span_days" and "confidence".
+        `deadline` (a time.perf_counter() value) lets callers share one budget
+        across several searches.
+        """
+        started = time.perf_counter()
+        budget = self.time_budget_ms if time_budget_ms is None else time_budget_ms
+        own_deadline = started + budget / 1000.0
+        deadline = min(deadline, own_deadline) if deadline else own_deadline
+
+        target_cents = to_cents(target)
+        pool = self.prune(candidates, target_cents, anchor_date, window_days, vendor_name)
+        result = {
+            "groups": [],
+            "truncated": False,
+            "elapsed_ms": 0.0,
+            "candidates_considered": len(pool),
+        }
+        if not pool or target_cents <= 0:
+            return self._finish(result, started)
+        if sum(c.cents for c in pool) < target_cents - self.tolerance_cents:
+            return self._finish(result, started)
+
+        groups, truncated = self._search(pool, target_cents, min_group_size, deadline)
+        result["truncated"] = truncated
+        result["groups"] = self._rank(pool, groups, target_cents, bool(vendor_name))
+        return self._finish(result, started)
+
+    # ------------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------------
+
+    def _search(
+        self,
+        pool: List[MatchCandidate],
+        target_cents: int,
+        min_group_size: int,
+        deadline: float,
+    ) -> Tuple[List[Tuple[int, ...]], bool]:
+        lower = target_cents - self.tolerance_cents
+        upper = target_cents + self.tolerance_cents
+        states: Dict[int, List[Tuple[int, ...]]] = {0: [()]}
+        truncated = False
+
+        for idx, cand in enumerate(pool):
+            if time.perf_counter() > deadline:
+                truncated = True
+                break
+            # Snapshot (including the group lists) so each candidate is used
+            # at most once per group
+            snapshot = [(subtotal, tuple(members)) for subtotal, members in states.items()]
+            for subtotal, members in snapshot:
+                new_total = subtotal + cand.cents
+                if new_total > upper:
+                    continue
+                bucket = states.get(new_total)
+                for group in members:
+                    if len(group) >= self.max_group_size:
+                        continue
+                    extended = group + (idx,)
+                    if bucket is None:
+                        bucket = states[new_total] = []
+                    if len(bucket) < self.top_k:
+                        bucket.append(extended)
+                    elif len(extended) < len(bucket[-1]):
+                        bucket[-1] = extended
+                    else:
+                        continue
+                    bucket.sort(key=len)
+            if len(states) > self.max_states:
+                truncated = True
+                break
+
+        hits: List[Tuple[int, ...]] = []
+        for total in range(lower, upper + 1):
+            for group in states.get(total, []):
+                if len(group) >= min_group_size:
+                    hits.append(group)
+        return hits, truncated
+
+    def _rank(
+        self,
+        pool: List[MatchCandidate],
+        groups: List[Tuple[int, ...]],
+        target_cents: int,
+        vendor_filtered: bool,
+    ) -> List[Dict]:
+        ranked = []
+        for group in groups:
+            members = [pool[i] for i in group]
+            total_cents = sum(m.cents for m in members)
+            dates = [m.on_date for m in members if m.on_date]
+            span = (max(dates) - min(dates)).days if dates else 0
+
+            confidence = 0.85 if vendor_filtered else 0.70
+            if total_cents != target_cents:
+                confidence -= 0.02
+            confidence -= 0.01 * max(0, len(members) - 2)
+            if span > 31:
+                confidence -= 0.05
+            ranked.append({
+                "items": [m.ref for m in members],
+                "total_cents": total_cents,
+                "total": from_cents(total_cents),
+                "date_span_days": span,
+                "confidence": round(max(0.50, confidence), 2),
+            })
+
+        ranked.sort(key=lambda g: (-g["confidence"], len(g["items"]), g["date_span_days"]))
+        return ranked[: self.top_k]
+
+    def _finish(self, result: Dict, started: float) -> Dict:
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        if result["truncated"]:
+            logger.info(
+                "Subset-sum search truncated after %.1fms over %d candidates",
+                result["elapsed_ms"], result["candidates_considered"]
+            )
+        return result
@@ -8,7 +8,8 @@ Date: December 2025
 """
 
 import logging
-from typing import Dict, List, Optional, Tuple
+import time
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -22,6 +23,9 @@ from services.api.models_ar import Invoice, InvoicePayment
 from services.api.models_accounting_part2 import (
     BankAccount, BankTransaction, AccountingDocument
 )
+from services.api.services.transaction_matcher_engine import (
+    MatchCandidate, SubsetSumMatcher
+)
 from services.api.utils.datetime_utils import get_pst_now
 
 logger = logging.getLogger(__name__)
@@ -33,8 +37,13 @@ class TransactionMatchingService:
     Implements US GAAP standards for supporting documentation
     """
 
-    def __init__(self, db: AsyncSession):
+    # Per-call latency budget for the subset-sum search
+    MATCH_TIME_BUDGET_MS = 250
+    MATCH_WINDOW_DAYS = 30
+
+    def __init__(self, db: AsyncSession, matcher: Optional[SubsetSumMatcher] = None):
         self.db = db
+        self.matcher = matcher or SubsetSumMatcher(time_budget_ms=self.MATCH_TIME_BUDGET_MS)
 
     async def suggest_matches_for_document(
         self,
@@ -102,10 +111,13 @@ class TransactionMatchingService:
                     "match_type": "single"
                 })
 
-            # Scenario 2: Monthly aggregation (multiple small transactions = one invoice)
-            monthly_match = self._find_monthly_aggregation(
-                unmatched_transactions, invoice_amount, vendor_name
+            # Scenarios 2 and 3 share a single bounded subset-sum search
+            groups = self._find_aggregate_groups(
+                unmatched_transactions, invoice_amount, vendor_name, invoice_date
             )
+
+            # Scenario 2: Monthly aggregation (multiple small transactions = one invoice)
+            monthly_match = self._find_monthly_aggregation(groups)
             if monthly_match:
                 suggestions.append({
                     "scenario": "monthly_aggregate",
@@ -126,9 +138,7 @@ class TransactionMatchingService:
                 })
 
             # Scenario 3: Partial payment
-            partial_match = self._find_partial_payments(
-                unmatched_transactions, invoice_amount, vendor_name
-            )
+            partial_match = self._find_partial_payments(groups)
             if partial_match:
                 suggestions.append({
                     "scenario": "partial_payment",
@@ -148,7 +158,8 @@ class TransactionMatchingService:
                 "invoice_amount": float(invoice_amount),
                 "vendor_name": vendor_name,
                 "suggestions": suggestions,
-                "total_suggestions": len(suggestions)
+                "total_suggestions": len(suggestions),
+                "search_truncated": groups["truncated"]
             }
 
         except Exception as e:
@@ -191,6 +202,7 @@ class TransactionMatchingService:
             documents = result.scalars().all()
 
             suggestions = []
+            doc_candidates = []
 
             for doc in documents:
                 extracted_data = doc.extracted_data or {}
@@ -200,6 +212,8 @@ class TransactionMatchingService:
                 if not doc_amount:
                     continue
 
+                doc_candidates.append(MatchCandidate(doc, doc_amount, doc.effective_date, vendor_name))
+
                 # Check amount match
                 amount_diff = abs(doc_amount - amount)
                 if amount_diff <= Decimal("0.01"):
@@ -217,9 +231,30 @@ class TransactionMatchingService:
                         "amount": float(doc_amount),
                         "date": doc.effective_date.isoformat() if doc.effective_date else None,
                         "confidence": confidence,
-                        "match_reason": "Exact amount match"
+                        "match_reason": "Exact amount match",
+                        "match_type": "single"
                     })
 
+            # Split payment: one bank transaction settling several documents
+            groups = self.matcher.find_groups(
+                doc_candidates,
+                amount,
+                anchor_date=date,
+                window_days=self.MATCH_WINDOW_DAYS
+            )
+            for group in groups["groups"]:
+                docs = group["items"]
+                suggestions.append({
+                    "document_id": docs[0].id,
+                    "document_ids": [d.id for d in docs],
+                    "filename": ", ".join(d.filename for d in docs),
+                    "amount": float(group["total"]),
+                    "date": date.isoformat(),
+                    "confidence": round(group["confidence"] - 0.10, 2),
+                    "match_reason": f"Split payment across {len(docs)} documents",
+                    "match_type": "split"
+                })
+
             # Sort by confidence
             suggestions.sort(key=lambda x: x["confidence"], reverse=True)
 
@@ -227,13 +262,120 @@ class TransactionMatchingService:
                 "success": True,
                 "transaction_id": transaction.id,
                 "suggestions": suggestions,
-                "total_suggestions": len(suggestions)
+                "total_suggestions": len(suggestions),
+                "search_truncated": groups["truncated"]
             }
 
         except Exception as e:
             logger.error(f"Error suggesting matches for transaction {transaction.id}: {str(e)}")
             return {"success": False, "message": str(e)}
 
+    async def suggest_matches_for_account(
+        self,
+        bank_account_id: int,
+        time_budget_ms: int = 2000
+    ) -> Dict:
+        """
+        Suggest document -> transaction groups for every extracted document
+        against the account's unmatched transactions
+
+        Runs single and aggregate matching for each document under one shared
+        latency budget. Does not write anything; matches still require
+        confirmation through create_je_from_match.
+        """
+        started = time.perf_counter()
+        deadline = started + time_budget_ms / 1000.0
+
+        bank_account = await self.db.get(BankAccount, bank_account_id)
+        if not bank_account:
+            return {"success": False, "message": "Bank account not found"}
+
+        txn_result = await self.db.execute(
+            select(BankTransaction).where(
+                and_(
+                    BankTransaction.bank_account_id == bank_account_id,
+                    BankTransaction.status == "unmatched"
+                )
+            )
+        )
+        unmatched_transactions = txn_result.scalars().all()
+
+        doc_result = await self.db.execute(
+            select(AccountingDocument).where(
+                and_(
+                    AccountingDocument.entity_id == bank_account.entity_id,
+                    AccountingDocument.category.in_(["invoices", "receipts", "bills"]),
+                    AccountingDocument.processing_status == "extracted"
+                )
+            )
+        )
+        documents = doc_result.scalars().all()
+
+        candidates = [MatchCandidate.from_bank_transaction(t) for t in unmatched_transactions]
+        suggestions = []
+        truncated = False
+        # Each transaction is suggested for at most one document
+        claimed: Set[int] = set()
+
+        for doc in documents:
+            if time.perf_counter() > deadline:
+                truncated = True
+                break
+
+            extracted_data = doc.extracted_data or {}
+            invoice_amount = self._parse_amount(extracted_data.get("total_amount"))
+            if not invoice_amount:
+                continue
+            invoice_date = self._parse_date(extracted_data.get("invoice_date") or doc.effective_date)
+            vendor_name = (extracted_data.get("vendor_name") or "").lower()
+
+            single_match = self._find_single_match(
+                unmatched_transactions, invoice_amount, vendor_name,
+                anchor_date=invoice_date, exclude=claimed
+            )
+            if single_match:
+                claimed.add(single_match["transaction"].id)
+                suggestions.append({
+                    "document_id": doc.id,
+                    "match_type": "single",
+                    "confidence": single_match["confidence"],
+                    "transaction_ids": [single_match["transaction"].id],
+                    "total_amount": float(abs(single_match["transaction"].amount))
+                })
+                continue
+
+            groups = self.matcher.find_groups(
+                [c for c in candidates if c.ref.id not in claimed] if claimed else candidates,
+                invoice_amount,
+                anchor_date=invoice_date,
+                window_days=self.MATCH_WINDOW_DAYS if invoice_date else None,
+                vendor_name=vendor_name,
+                deadline=deadline
+            )
+            truncated = truncated or groups["truncated"]
+            if groups["groups"]:
+                best = groups["groups"][0]
+                claimed.update(t.id for t in best["items"])
+                suggestions.append({
+                    "document_id": doc.id,
+                    "match_type": "monthly_aggregate",
+                    "confidence": best["confidence"],
+                    "transaction_ids": [t.id for t in best["items"]],
+                    "total_amount": float(best["total"])
+                })
+
+        suggestions.sort(key=lambda x: x["confidence"], reverse=True)
+
+        return {
+            "success": True,
+            "bank_account_id": bank_account_id,
+            "unmatched": len(unmatched_transactions),
+            "documents_considered": len(documents),
+            "suggestions": suggestions,
+            "truncated": truncated,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
     async def create_je_from_match(
         self,
         transaction_ids: List[int],
@@ -469,10 +611,18 @@ class TransactionMatchingService:
         self,
         transactions: List[BankTransaction],
         target_amount: Decimal,
-        vendor_name: str
+        vendor_name: str,
+        anchor_date: Optional[date] = None,
+        exclude: Optional[Set[int]] = None
     ) -> Optional[Dict]:
-        """Find single transaction that matches amount"""
+        """Find single transaction that matches amount, within MATCH_WINDOW_DAYS
+        of anchor_date when given and skipping transaction ids in `exclude`"""
         for txn in transactions:
+            if exclude and txn.id in exclude:
+                continue
+            if anchor_date and txn.transaction_date:
+                if abs((txn.transaction_date - anchor_date).days) > self.MATCH_WINDOW_DAYS:
+                    continue
             amount_diff = abs(abs(txn.amount) - target_amount)
 
             if amount_diff <= Decimal("0.01"):
@@ -490,60 +640,51 @@ class TransactionMatchingService:
 
         return None
 
-    def _find_monthly_aggregation(
+    def _find_aggregate_groups(
         self,
         transactions: List[BankTransaction],
         target_amount: Decimal,
-        vendor_name: str
-    ) -> Optional[Dict]:
+        vendor_name: str,
+        anchor_date: Optional[date] = None
+    ) -> Dict:
         """
-        Find multiple transactions that sum to target amount
+        Run the bounded subset-sum search once for a target amount
         Common for API bills, subscriptions (e.g., Claude API charges)
         """
-        # Filter transactions by vendor name if available
-        if vendor_name:
-            relevant_txns = [
-                t for t in transactions
-                if vendor_name in t.description.lower()
-                or (t.merchant_name and vendor_name in t.merchant_name.lower())
-            ]
-        else:
-            relevant_txns = transactions
-
-        # Try to find combination that sums to target
-        for i in range(2, min(len(relevant_txns) + 1, 10)):  # Max 10 transactions
-            from itertools import combinations
-
-            for combo in combinations(relevant_txns, i):
-                combo_total = sum(abs(t.amount) for t in combo)
-                diff = abs(combo_total - target_amount)
-
-                if diff <= Decimal("0.01"):
-                    # Found match!
-                    confidence = 0.85 if vendor_name else 0.70
-
-                    return {
-                        "transactions": list(combo),
-                        "total": combo_total,
-                        "confidence": confidence
-                    }
+        return self.matcher.find_groups(
+            [MatchCandidate.from_bank_transaction(t) for t in transactions],
+            target_amount,
+            anchor_date=anchor_date,
+            window_days=self.MATCH_WINDOW_DAYS if anchor_date else None,
+            vendor_name=vendor_name
+        )
 
-        return None
+    def _find_monthly_aggregation(self, groups: Dict) -> Optional[Dict]:
+        """Best group of transactions that sum to the target amount"""
+        if not groups["groups"]:
+            return None
 
-    def _find_partial_payments(
-        self,
-        transactions: List[BankTransaction],
-        target_amount: Decimal,
-        vendor_name: str
-    ) -> Optional[Dict]:
-        """Find partial payments for a larger invoice"""
-        # Similar to monthly aggregation but lower confidence
-        result = self._find_monthly_aggregation(transactions, target_amount, vendor_name)
+        best = groups["groups"][0]
+        return {
+            "transactions": best["items"],
+            "total": best["total"],
+            "confidence": best["confidence"]
+        }
 
-        if result:
-            result["confidence"] = max(0.60, result["confidence"] - 0.15)
+    def _find_partial_payments(self, groups: Dict) -> Optional[Dict]:
+        """Find partial payments for a larger invoice"""
+        # Prefer installments spread over more than one month; otherwise fall
+        # back to the best aggregate at a lower confidence
+        ranked = groups["groups"]
+        if not ranked:
+            return None
 
-        return result
+        best = next((g for g in ranked if g["date_span_days"] > 31), ranked[0])
+        return {
+            "transactions": best["items"],
+            "total": best["total"],
+            "confidence": max(0.60, best["confidence"] - 0.15)
+        }
 
     def _parse_amount(self, value) -> Optional[Decimal]:
         """Parse amount from various formats"""
@@ -0,0 +1,437 @@
+"""
+XBRL Taxonomy Index
+One-time compiler for the 2025 US GAAP taxonomy into a compact SQLite index
+
+The schema, label, documentation, reference and presentation linkbases are
+streamed once (ET.iterparse) and written to a single SQLite file keyed by
+element name, with precomputed presentation parent/child adjacency and an
+FTS5 inverted index over element names and standard labels. Readers open the
+file read-only and memory-mapped, so lookups never touch the XML.
+
+Build (or rebuild) from the repo root:
+    python -m services.api.services.xbrl_taxonomy_index [--force]
+
+Author: NGI Capital Development Team
+Date: December 2025
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = "1"
+
+XLINK = "{http://www.w3.org/1999/xlink}"
+XBRLI = "{http://www.xbrl.org/2003/instance}"
+XS_ELEMENT = "{http://www.w3.org/2001/XMLSchema}element"
+LINK = "{http://www.xbrl.org/2003/linkbase}"
+
+STANDARD_LABEL_ROLE = "http://www.xbrl.org/2003/role/label"
+
+_SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE elements (
+    name TEXT PRIMARY KEY,
+    ordinal INTEGER NOT NULL,
+    data_type TEXT,
+    period_type TEXT,
+    balance_type TEXT,
+    is_abstract INTEGER NOT NULL DEFAULT 0,
+    standard_label TEXT,
+    documentation TEXT,
+    asc_references TEXT
+);
+CREATE INDEX idx_elements_ordinal ON elements (ordinal);
+CREATE TABLE presentation (
+    parent TEXT NOT NULL,
+    child TEXT NOT NULL,
+    ordinal INTEGER NOT NULL,
+    PRIMARY KEY (parent, child)
+) WITHOUT ROWID;
+CREATE INDEX idx_presentation_child ON presentation (child, ordinal);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE element_search USING fts5(
+    name, label, content='', tokenize='unicode61', prefix='2 3 4'
+);
+"""
+
+
+# ============================================================================
+# COMPILER
+# ============================================================================
+
+def source_fingerprint(paths: List[Path]) -> str:
+    """Staleness key from file contents (no parsing), so a fresh checkout or
+    deploy of the same taxonomy keeps matching an existing index"""
+    parts = []
+    for path in paths:
+        try:
+            digest = hashlib.sha256()
+            with open(path, "rb") as fh:
+                for chunk in iter(lambda: fh.read(1 << 20), b""):
+                    digest.update(chunk)
+            parts.append(f"{path.name}:{digest.hexdigest()}")
+        except OSError:
+            parts.append(f"{path.name}:missing")
+    return "|".join(parts)
+
+
+def _element_name_from_href(href: str) -> Optional[str]:
+    if '#us-gaap_' in href:
+        return href.split('#us-gaap_')[-1].split('#')[0].split('/')[-1]
+    return None
+
+
+def _iter_links(path: Path, link_tag: str) -> Iterator[ET.Element]:
+    """Yield each extended link element once fully parsed, then free it"""
+    for _, elem in ET.iterparse(str(path), events=("end",)):
+        if elem.tag == link_tag:
+            yield elem
+            elem.clear()
+
+
+def _normalize_data_type(type_attr: str) -> str:
+    lowered = type_attr.lower()
+    if 'monetary' in lowered:
+        return 'monetary'
+    if 'shares' in lowered:
+        return 'shares'
+    if 'percent' in lowered:
+        return 'percent'
+    if 'string' in lowered or 'text' in lowered:
+        return 'string'
+    if 'date' in lowered:
+        return 'date'
+    if 'boolean' in lowered:
+        return 'boolean'
+    return type_attr.split(':')[-1] if ':' in type_attr else type_attr
+
+
+def _asc_from_reference(ref_elem: ET.Element) -> Optional[str]:
+    topic = subtopic = section = paragraph = None
+    for child in ref_elem:
+        tag = child.tag.split('}')[-1].lower()
+        text = child.text.strip() if child.text else None
+        if not text:
+            continue
+        if 'subtopic' in tag:
+            subtopic = text
+        elif 'topic' in tag:
+            topic = text
+        elif 'section' in tag:
+            section = text
+        elif 'paragraph' in tag:
+            paragraph = text
+    if not topic:
+        return None
+    ref = f"ASC {topic}"
+    for part in (subtopic, section, paragraph):
+        if part:
+            ref += f"-{part}"
+    return ref
+
+
+def _read_schema(path: Path) -> Dict[str, Dict]:
+    elements: Dict[str, Dict] = {}
+    for _, elem in ET.iterparse(str(path), events=("end",)):
+        if elem.tag != XS_ELEMENT:
+            continue
+        name = elem.get('name')
+        if name and name not in elements:
+            elements[name] = {
+                'ordinal': len(elements),
+                'data_type': _normalize_data_type(elem.get('type', '')),
+                'period_type': elem.get(f'{XBRLI}periodType'),
+                'balance_type': elem.get(f'{XBRLI}balance'),
+                'is_abstract': elem.get('abstract') == 'true',
+                'standard_label': None,
+                'documentation': [],
+                'asc_references': [],
+            }
+        elem.clear()
+    return elements
+
+
+def _read_label_linkbase(path: Path, elements: Dict[str, Dict], want_labels: bool) -> None:
+    """Attach standard labels and documentation text to elements"""
+    for link in _iter_links(path, f'{LINK}labelLink'):
+        locs: Dict[str, str] = {}
+        resources: Dict[str, List[Tuple[str, str]]] = {}
+        arcs: List[Tuple[str, str]] = []
+        for child in link:
+            if child.tag == f'{LINK}loc':
+                name = _element_name_from_href(child.get(f'{XLINK}href', ''))
+                if name:
+                    locs[child.get(f'{XLINK}label', '')] = name
+            elif child.tag == f'{LINK}label':
+                text = (child.text or '').strip()
+                if text:
+                    resources.setdefault(child.get(f'{XLINK}label', ''), []).append(
+                        (child.get(f'{XLINK}role', ''), text)
+                    )
+            elif child.tag == f'{LINK}labelArc':
+                arcs.append((child.get(f'{XLINK}from', ''), child.get(f'{XLINK}to', '')))
+
+        for frm, to in arcs:
+            el = elements.get(locs.get(frm, ''))
+            if el is None:
+                continue
+            for role, text in resources.get(to, []):
+                role_lower = role.lower()
+                if 'documentation' in role_lower:
+                    if text not in el['documentation']:
+                        el['documentation'].append(text)
+                elif want_labels:
+                    # Prefer the standard label role; otherwise keep the first one seen
+                    if role == STANDARD_LABEL_ROLE:
+                        el['standard_label'] = text
+                    elif el['standard_label'] is None:
+                        el['standard_label'] = text
+
+
+def _read_reference_linkbase(path: Path, elements: Dict[str, Dict]) -> None:
+    for link in _iter_links(path, f'{LINK}referenceLink'):
+        locs: Dict[str, str] = {}
+        refs: Dict[str, List[str]] = {}
+        arcs: List[Tuple[str, str]] = []
+        for child in link:
+            if child.tag == f'{LINK}loc':
+                name = _element_name_from_href(child.get(f'{XLINK}href', ''))
+                if name:
+                    locs[child.get(f'{XLINK}label', '')] = name
+            elif child.tag == f'{LINK}reference':
+                asc = _asc_from_reference(child)
+                if asc:
+                    refs.setdefault(child.get(f'{XLINK}label', ''), []).append(asc)
+            elif child.tag == f'{LINK}referenceArc':
+                arcs.append((child.get(f'{XLINK}from', ''), child.get(f'{XLINK}to', '')))
+
+        for frm, to in arcs:
+            el = elements.get(locs.get(frm, ''))
+            if el is None:
+                continue
+            for asc in refs.get(to, []):
+                if asc not in el['asc_references']:
+                    el['asc_references'].append(asc)
+
+
+def _read_presentation_linkbase(path: Path) -> List[Tuple[str, str]]:
+    edges: Dict[Tuple[str, str], int] = {}
+    for link in _iter_links(path, f'{LINK}presentationLink'):
+        locs: Dict[str, str] = {}
+        arcs: List[Tuple[str, str]] = []
+        for child in link:
+            if child.tag == f'{LINK}loc':
+                name = _element_name_from_href(child.get(f'{XLINK}href', ''))
+                if name:
+                    locs[child.get(f'{XLINK}label', '')] = name
+            elif child.tag == f'{LINK}presentationArc':
+                arcs.append((child.get(f'{XLINK}from', ''), child.get(f'{XLINK}to', '')))
+        for frm, to in arcs:
+            parent, child_name = locs.get(frm), locs.get(to)
+            if parent and child_name and (parent, child_name) not in edges:
+                edges[(parent, child_name)] = len(edges)
+    return sorted(edges, key=edges.get)
+
+
+def compile_taxonomy_index(
+    output_path: Path,
+    schema_file: Path,
+    label_file: Path,
+    doc_file: Optional[Path] = None,
+    reference_file: Optional[Path] = None,
+    presentation_file: Optional[Path] = None,
+) -> Dict:
+    """
+    Parse the taxonomy XML once and write the SQLite index atomically.
+    Optional linkbases that are missing on disk are skipped.
+    """
+    started = time.perf_counter()
+    elements = _read_schema(schema_file)
+
+    if label_file.exists():
+        _read_label_linkbase(label_file, elements, want_labels=True)
+    if doc_file and doc_file.exists():
+        _read_label_linkbase(doc_file, elements, want_labels=False)
+    if reference_file and reference_file.exists():
+        _read_reference_linkbase(reference_file, elements)
+    edges: List[Tuple[str, str]] = []
+    if presentation_file and presentation_file.exists():
+        edges = _read_presentation_linkbase(presentation_file)
+
+    sources = [p for p in (schema_file, label_file, doc_file, reference_file, presentation_file) if p]
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(str(tmp_path))
+    try:
+        conn.executescript(_SCHEMA)
+        has_fts = True
+        try:
+            conn.executescript(_FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            has_fts = False
+            logger.warning("SQLite FTS5 unavailable; XBRL label search falls back to LIKE")
+
+        conn.executemany(
+            "INSERT INTO elements VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    name,
+                    el['ordinal'],
+                    el['data_type'],
+                    el['period_type'],
+                    el['balance_type'],
+                    1 if el['is_abstract'] else 0,
+                    el['standard_label'],
+                    '\n\n'.join(el['documentation']) or None,
+                    json.dumps(el['asc_references']),
+                )
+                for name, el in elements.items()
+            ),
+        )
+        if has_fts:
+            conn.executemany(
+                "INSERT INTO element_search (rowid, name, label) VALUES (?, ?, ?)",
+                (
+                    (el['ordinal'] + 1, _split_camel(name), el['standard_label'] or '')
+                    for name, el in elements.items()
+                ),
+            )
+        conn.executemany(
+            "INSERT INTO presentation VALUES (?, ?, ?)",
+            ((parent, child, i) for i, (parent, child) in enumerate(edges)),
+        )
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("version", INDEX_VERSION),
+                ("fingerprint", source_fingerprint(sources)),
+                ("has_fts", "1" if has_fts else "0"),
+                ("element_count", str(len(elements))),
+                ("built_at", str(int(time.time()))),
+            ],
+        )
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    os.replace(tmp_path, output_path)
+
+    stats = {
+        "elements": len(elements),
+        "presentation_edges": len(edges),
+        "has_fts": has_fts,
+        "seconds": round(time.perf_counter() - started, 2),
+        "path": str(output_path),
+    }
+    logger.info("Compiled XBRL taxonomy index: %s", stats)
+    return stats
+
+
+def _split_camel(name: str) -> str:
+    """'AccountsPayableCurrent' -> 'AccountsPayableCurrent Accounts Payable Current'"""
+    return f"{name} {' '.join(re.findall(r'[A-Z]+(?=[A-Z][a-z]|$)|[A-Z]?[a-z0-9]+', name))}"
+
+
+# ============================================================================
+# READER
+# ============================================================================
+
+class XBRLTaxonomyIndex:
+    """Read-only, memory-mapped view over a compiled taxonomy index"""
+
+    MMAP_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn = sqlite3.connect(
+            f"file:{path}?mode=ro&immutable=1", uri=True, check_same_thread=False
+        )
+        self._conn.execute(f"PRAGMA mmap_size={self.MMAP_BYTES}")
+        self._conn.row_factory = sqlite3.Row
+        meta = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+        self.version = meta.get("version")
+        self.fingerprint = meta.get("fingerprint")
+        self.has_fts = meta.get("has_fts") == "1"
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def get_element_row(self, name: str) -> Optional[Dict]:
+        row = self._conn.execute("SELECT * FROM elements WHERE name = ?", (name,)).fetchone()
+        if not row:
+            return None
+        return {
+            'data_type': row['data_type'],
+            'period_type': row['period_type'],
+            'balance_type': row['balance_type'],
+            'is_abstract': bool(row['is_abstract']),
+            'standard_label': row['standard_label'],
+            'documentation': row['documentation'],
+            'asc_references': json.loads(row['asc_references'] or '[]'),
+        }
+
+    def related(self, name: str, direction: str = 'children', limit: int = 20) -> List[str]:
+        if direction == 'children':
+            sql = "SELECT child FROM presentation WHERE parent = ? ORDER BY ordinal LIMIT ?"
+        else:
+            sql = "SELECT parent FROM presentation WHERE child = ? ORDER BY ordinal LIMIT ?"
+        return [r[0] for r in self._conn.execute(sql, (name, limit))]
+
+    def search_names(self, keyword: str, limit: int) -> List[str]:
+        """Non-abstract elements whose name contains keyword, in schema order"""
+        rows = self._conn.execute(
+            "SELECT name FROM elements WHERE is_abstract = 0 AND instr(lower(name), ?) > 0 "
+            "ORDER BY ordinal LIMIT ?",
+            (keyword.lower(), limit),
+        )
+        return [r[0] for r in rows]
+
+    def search_labels(self, keyword: str, limit: int) -> List[str]:
+        """Non-abstract elements whose label (or split name) matches every keyword token as a prefix"""
+        tokens = re.findall(r"\w+", keyword.lower())
+        if not tokens:
+            return []
+        if self.has_fts:
+            match = " AND ".join(f'"{t}"*' for t in tokens)
+            rows = self._conn.execute(
+                "SELECT e.name FROM element_search s JOIN elements e ON e.ordinal = s.rowid - 1 "
+                "WHERE element_search MATCH ? AND e.is_abstract = 0 ORDER BY s.rank LIMIT ?",
+                (match, limit),
+            )
+        else:
+            rows = self._conn.execute(
+                "SELECT name FROM elements WHERE is_abstract = 0 "
+                "AND instr(lower(coalesce(standard_label, '')), ?) > 0 "
+                "ORDER BY ordinal LIMIT ?",
+                (keyword.lower(), limit),
+            )
+        return [r[0] for r in rows]
+
+
+if __name__ == "__main__":
+    import argparse
+    from services.api.services.xbrl_taxonomy_service import build_index
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Compile the XBRL taxonomy index")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the index is fresh")
+    args = parser.parse_args()
+    print(build_index(force=args.force))
@@ -2,20 +2,25 @@
 XBRL Taxonomy Service
 Direct access to 2025 US GAAP XBRL Taxonomy files
 
-This service reads the FASB taxonomy XML files directly without parsing
-the entire 18,000+ element set into the database. It provides on-demand
-lookups with in-memory caching for performance.
+The FASB taxonomy XML is compiled into a memory-mapped SQLite index (see
+xbrl_taxonomy_index) at deploy time with `make xbrl-index`, or by the API
+lifespan in a worker thread when the index is missing or stale. The service
+only opens that index, so no XML is parsed on the request path.
 
 Author: NGI Capital Development Team
 Date: October 11, 2025
 """
 
-import xml.etree.ElementTree as ET
+import os
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from functools import lru_cache
 import logging
 
+from services.api.services.xbrl_taxonomy_index import (
+    INDEX_VERSION, XBRLTaxonomyIndex, compile_taxonomy_index, source_fingerprint
+)
+
 logger = logging.getLogger(__name__)
 
 # XBRL Taxonomy paths
@@ -25,34 +30,76 @@ LABEL_FILE = TAXONOMY_BASE / "elts" / "us-gaap-lab-2025.xml"
 REFERENCE_FILE = TAXONOMY_BASE / "elts" / "us-gaap-ref-2025.xml"
 DOC_FILE = TAXONOMY_BASE / "elts" / "us-gaap-doc-2025.xml"
 PRESENTATION_FILE = TAXONOMY_BASE / "elts" / "us-gaap-depcon-pre-2025.xml"
+SOURCE_FILES = [SCHEMA_FILE, LABEL_FILE, DOC_FILE, REFERENCE_FILE, PRESENTATION_FILE]
+
+# Compiled index (override with XBRL_INDEX_PATH, e.g. a read-only volume)
+INDEX_FILE = Path(os.getenv("XBRL_INDEX_PATH") or TAXONOMY_BASE.parent / "us-gaap-2025.index.sqlite")
+
 
-# XBRL Namespaces
-NAMESPACES = {
-    'xs': 'http://www.w3.org/2001/XMLSchema',
-    'us-gaap': 'http://fasb.org/us-gaap/2025',
-    'xbrli': 'http://www.xbrl.org/2003/instance',
-    'link': 'http://www.xbrl.org/2003/linkbase',
-    'xlink': 'http://www.w3.org/1999/xlink',
-    'ref': 'http://www.xbrl.org/2006/ref',
-}
+def _index_is_fresh(index: XBRLTaxonomyIndex) -> bool:
+    """An index is fresh if it matches this version and the XML hasn't changed"""
+    if index.version != INDEX_VERSION:
+        return False
+    if not SCHEMA_FILE.exists():
+        # Deployed without the raw taxonomy; trust the shipped index
+        return True
+    return index.fingerprint == source_fingerprint(SOURCE_FILES)
+
+
+def build_index(force: bool = False) -> Dict:
+    """Compile the taxonomy index if it is missing or stale"""
+    if not force and INDEX_FILE.exists():
+        index = XBRLTaxonomyIndex(INDEX_FILE)
+        try:
+            if _index_is_fresh(index):
+                return {"path": str(INDEX_FILE), "rebuilt": False}
+        finally:
+            index.close()
+    if not SCHEMA_FILE.exists():
+        raise FileNotFoundError(
+            f"XBRL taxonomy not found at {TAXONOMY_BASE}. "
+            f"Please download 2025 US GAAP taxonomy."
+        )
+    stats = compile_taxonomy_index(
+        INDEX_FILE,
+        schema_file=SCHEMA_FILE,
+        label_file=LABEL_FILE,
+        doc_file=DOC_FILE,
+        reference_file=REFERENCE_FILE,
+        presentation_file=PRESENTATION_FILE,
+    )
+    return {**stats, "rebuilt": True}
+
+
+def open_index() -> XBRLTaxonomyIndex:
+    """Open the prebuilt index; never compiles (see build_index)"""
+    if not INDEX_FILE.exists():
+        raise FileNotFoundError(
+            f"XBRL taxonomy index not found at {INDEX_FILE}. "
+            f"Build it with `make xbrl-index`."
+        )
+    index = XBRLTaxonomyIndex(INDEX_FILE)
+    if index.version != INDEX_VERSION:
+        index.close()
+        raise RuntimeError(
+            f"XBRL taxonomy index at {INDEX_FILE} is version {index.version}, "
+            f"expected {INDEX_VERSION}. Rebuild it with `make xbrl-index`."
+        )
+    return index
 
 
 class XBRLTaxonomyService:
     """
     Service for querying XBRL US GAAP Taxonomy
-    Reads XML files directly with caching for performance
+    Serves lookups from the compiled taxonomy index
     """
 
-    def __init__(self):
-        """Initialize service and verify taxonomy files exist"""
-        if not SCHEMA_FILE.exists():
-            raise FileNotFoundError(
-                f"XBRL taxonomy not found at {TAXONOMY_BASE}. "
-                f"Please download 2025 US GAAP taxonomy."
-            )
+    def __init__(self, index: Optional[XBRLTaxonomyIndex] = None):
+        """Open the compiled index; fails fast if it has not been built"""
+        self.index = index if index is not None else open_index()
 
         logger.info("XBRL Taxonomy Service initialized")
-        logger.info(f"Taxonomy location: {TAXONOMY_BASE}")
+        logger.info(f"Taxonomy index: {self.index.path}")
 
     @lru_cache(maxsize=1000)
     def get_element(self, element_name: str) -> Optional[Dict]:
@@ -76,26 +123,12 @@ class XBRLTaxonomyService:
             'primary_asc_topic': None,
         }
 
-        # Get definition from schema
-        schema_data = self._get_from_schema(element_name)
-        if schema_data:
-            element_data.update(schema_data)
-        else:
+        row = self.index.get_element_row(element_name)
+        if not row:
             return None  # Element not found
-
-        # Get label and documentation
-        label = self._get_label(element_name)
-        if label:
-            element_data['standard_label'] = label
-        doc = self._get_documentation(element_name)
-        if doc:
-            element_data['documentation'] = doc
-
-        # Get ASC references
-        asc_refs = self._get_asc_references(element_name)
-        if asc_refs:
-            element_data['asc_references'] = asc_refs
-            element_data['primary_asc_topic'] = asc_refs[0] if asc_refs else None
+        element_data.update(row)
+        if row['asc_references']:
+            element_data['primary_asc_topic'] = row['asc_references'][0]
 
         # Add presentation neighbors for context
         try:
@@ -181,156 +214,14 @@ class XBRLTaxonomyService:
         else:
             return "ASC 000-00"  # Unknown
 
-    @lru_cache(maxsize=500)
-    def _get_from_schema(self, element_name: str) -> Optional[Dict]:
-        """Extract element definition from schema file"""
-        try:
-            tree = ET.parse(SCHEMA_FILE)
-            root = tree.getroot()
-
-            # Find element by name (using xs: namespace)
-            for elem in root.findall('.//xs:element', NAMESPACES):
-                if elem.get('name') == element_name:
-                    return {
-                        'data_type': self._extract_data_type(elem),
-                        'period_type': elem.get('{http://www.xbrl.org/2003/instance}periodType'),
-                        'balance_type': elem.get('{http://www.xbrl.org/2003/instance}balance'),
-                        'is_abstract': elem.get('abstract') == 'true',
-                    }
-
-            return None
-        except Exception as e:
-            logger.error(f"Error reading schema for {element_name}: {e}")
-            return None
-
-    @lru_cache(maxsize=500)
-    def _get_label(self, element_name: str) -> Optional[str]:
-        """Get human-readable label from label linkbase"""
-        try:
-            tree = ET.parse(LABEL_FILE)
-            root = tree.getroot()
-
-            # Find label for element
-            target_href = f"#us-gaap_{element_name}"
-
-            for loc in root.findall('.//link:loc', NAMESPACES):
-                href = loc.get('{http://www.w3.org/1999/xlink}href', '')
-                if target_href in href:
-                    loc_label = loc.get('{http://www.w3.org/1999/xlink}label', '')
-
-                    # Find corresponding label text
-                    for arc in root.findall('.//link:labelArc', NAMESPACES):
-                        if arc.get('{http://www.w3.org/1999/xlink}from') == loc_label:
-                            to_label = arc.get('{http://www.w3.org/1999/xlink}to')
-
-                            for label in root.findall('.//link:label', NAMESPACES):
-                                if label.get('{http://www.w3.org/1999/xlink}label') == to_label:
-                                    return label.text.strip() if label.text else None
-
-            return None
-        except Exception as e:
-            logger.error(f"Error reading label for {element_name}: {e}")
-            return None
-
-    @lru_cache(maxsize=500)
-    def _get_documentation(self, element_name: str) -> Optional[str]:
-        """Get documentation from documentation linkbase (preferred), fallback to label linkbase.
-
-        Traverses loc -> labelArc/reference to capture documentation role labels.
-        """
-        try:
-            # Prefer dedicated documentation linkbase when available
-            file_path = DOC_FILE if DOC_FILE.exists() else LABEL_FILE
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-
-            target_suffix = f"#us-gaap_{element_name}"
-            # Map of resource labels we want to collect
-            doc_labels = set()
-
-            for loc in root.findall('.//link:loc', NAMESPACES):
-                href = loc.get('{http://www.w3.org/1999/xlink}href', '')
-                if href.endswith(target_suffix) or target_suffix in href:
-                    loc_label = loc.get('{http://www.w3.org/1999/xlink}label', '')
-                    # Traverse label arcs from this loc
-                    for arc in root.findall('.//link:labelArc', NAMESPACES):
-                        if arc.get('{http://www.w3.org/1999/xlink}from') == loc_label:
-                            to_label = arc.get('{http://www.w3.org/1999/xlink}to')
-                            if to_label:
-                                doc_labels.add(to_label)
-
-            docs: list[str] = []
-            # Extract text for documentation role labels
-            for label in root.findall('.//link:label', NAMESPACES):
-                if label.get('{http://www.w3.org/1999/xlink}label') in doc_labels:
-                    role = label.get('{http://www.w3.org/1999/xlink}role', '')
-                    text = (label.text or '').strip()
-                    if text and ('documentation' in role.lower() or 'doc' in role.lower()):
-                        docs.append(text)
-
-            if docs:
-                # Deduplicate and join
-                uniq = []
-                for t in docs:
-                    if t and t not in uniq:
-                        uniq.append(t)
-                return '\n\n'.join(uniq)
-            return None
-        except Exception as e:
-            logger.error(f"Error reading documentation for {element_name}: {e}")
-            return None
-
     @lru_cache(maxsize=1000)
     def get_presentation_related(self, element_name: str, direction: str = 'children', limit: int = 20) -> List[str]:
         """Return neighboring elements from the presentation linkbase.
 
         direction: 'children' looks at arcs from element -> children; 'parents' looks at arcs parent -> element
         """
-        results: List[str] = []
         try:
-            if not PRESENTATION_FILE.exists():
-                return results
-            tree = ET.parse(PRESENTATION_FILE)
-            root = tree.getroot()
-
-            target_suffix = f"#us-gaap_{element_name}"
-
-            # Iterate each presentationLink independently
-            for link in root.findall('.//link:presentationLink', NAMESPACES):
-                # Build map of loc labels -> href for this link
-                locs = {}
-                for loc in link.findall('.//link:loc', NAMESPACES):
-                    href = loc.get('{http://www.w3.org/1999/xlink}href', '')
-                    label = loc.get('{http://www.w3.org/1999/xlink}label', '')
-                    if label:
-                        locs[label] = href
-
-                # Find the loc label for our target element in this link
-                target_labels = [lbl for (lbl, href) in locs.items() if href.endswith(target_suffix) or target_suffix in href]
-                if not target_labels:
-                    continue
-                target_label = target_labels[0]
-
-                # Collect neighbor labels via arcs
-                neighbor_labels: List[str] = []
-                for arc in link.findall('.//link:presentationArc', NAMESPACES):
-                    frm = arc.get('{http://www.w3.org/1999/xlink}from', '')
-                    to = arc.get('{http://www.w3.org/1999/xlink}to', '')
-                    if direction == 'children' and frm == target_label:
-                        neighbor_labels.append(to)
-                    elif direction == 'parents' and to == target_label:
-                        neighbor_labels.append(frm)
-
-                # Map neighbor labels -> element names
-                for lbl in neighbor_labels:
-                    href = locs.get(lbl, '')
-                    name = self._extract_element_name_from_href(href)
-                    if name and name not in results:
-                        results.append(name)
-                        if len(results) >= limit:
-                            return results
-
-            return results
+            return self.index.related(element_name, direction=direction, limit=limit)
         except Exception as e:
             logger.error(f"Error reading presentation neighbors for {element_name}: {e}")
             return []
@@ -372,133 +263,14 @@ class XBRLTaxonomyService:
                 break
         return out
 
-    @lru_cache(maxsize=500)
-    def _get_asc_references(self, element_name: str) -> List[str]:
-        """Get ASC topic references from reference linkbase"""
-        try:
-            tree = ET.parse(REFERENCE_FILE)
-            root = tree.getroot()
-
-            asc_refs = []
-            target_href = f"#us-gaap_{element_name}"
-
-            for loc in root.findall('.//link:loc', NAMESPACES):
-                href = loc.get('{http://www.w3.org/1999/xlink}href', '')
-                if target_href in href:
-                    loc_label = loc.get('{http://www.w3.org/1999/xlink}label', '')
-
-                    # Find reference arcs
-                    for arc in root.findall('.//link:referenceArc', NAMESPACES):
-                        if arc.get('{http://www.w3.org/1999/xlink}from') == loc_label:
-                            to_ref = arc.get('{http://www.w3.org/1999/xlink}to')
-
-                            # Find reference element
-                            for ref in root.findall('.//link:reference', NAMESPACES):
-                                if ref.get('{http://www.w3.org/1999/xlink}label') == to_ref:
-                                    asc_ref = self._extract_asc_from_reference(ref)
-                                    if asc_ref and asc_ref not in asc_refs:
-                                        asc_refs.append(asc_ref)
-
-            return asc_refs
-        except Exception as e:
-            logger.error(f"Error reading ASC references for {element_name}: {e}")
-            return []
-
-    def _extract_data_type(self, elem) -> str:
-        """Extract and normalize data type"""
-        type_attr = elem.get('type', '')
-
-        if 'monetary' in type_attr.lower():
-            return 'monetary'
-        elif 'shares' in type_attr.lower():
-            return 'shares'
-        elif 'percent' in type_attr.lower():
-            return 'percent'
-        elif 'string' in type_attr.lower() or 'text' in type_attr.lower():
-            return 'string'
-        elif 'date' in type_attr.lower():
-            return 'date'
-        elif 'boolean' in type_attr.lower():
-            return 'boolean'
-        else:
-            return type_attr.split(':')[-1] if ':' in type_attr else type_attr
-
-    def _extract_asc_from_reference(self, ref_elem) -> Optional[str]:
-        """Extract ASC reference string from reference element"""
-        topic = None
-        subtopic = None
-        section = None
-        paragraph = None
-
-        for child in ref_elem:
-            tag = child.tag.split('}')[-1].lower()
-            text = child.text.strip() if child.text else None
-
-            if not text:
-                continue
-
-            if 'topic' in tag and not subtopic:
-                topic = text
-            elif 'subtopic' in tag:
-                subtopic = text
-            elif 'section' in tag:
-                section = text
-            elif 'paragraph' in tag:
-                paragraph = text
-
-        if topic:
-            ref = f"ASC {topic}"
-            if subtopic:
-                ref += f"-{subtopic}"
-            if section:
-                ref += f"-{section}"
-            if paragraph:
-                ref += f"-{paragraph}"
-            return ref
-
-        return None
-
     @lru_cache(maxsize=500)
     def _search_by_label(self, keyword: str, max_hits: int = 50) -> List[str]:
-        """Return element names whose standard labels contain keyword (case-insensitive)."""
+        """Return element names whose labels match keyword tokens (prefix, case-insensitive)."""
         kw = (keyword or '').strip().lower()
         if not kw:
             return []
         try:
-            tree = ET.parse(LABEL_FILE)
-            root = tree.getroot()
-
-            # Build maps for quick joins
-            locs: Dict[str, str] = {}
-            labels: Dict[str, str] = {}
-            for loc in root.findall('.//link:loc', NAMESPACES):
-                lbl = loc.get('{http://www.w3.org/1999/xlink}label') or ''
-                href = loc.get('{http://www.w3.org/1999/xlink}href') or ''
-                if lbl and href:
-                    locs[lbl] = href
-            for lab in root.findall('.//link:label', NAMESPACES):
-                lbl = lab.get('{http://www.w3.org/1999/xlink}label') or ''
-                txt = (lab.text or '').strip()
-                if lbl and txt:
-                    labels[lbl] = txt
-
-            results: List[str] = []
-            for arc in root.findall('.//link:labelArc', NAMESPACES):
-                frm = arc.get('{http://www.w3.org/1999/xlink}from') or ''
-                to = arc.get('{http://www.w3.org/1999/xlink}to') or ''
-                if not frm or not to:
-                    continue
-                txt = labels.get(to, '')
-                if not txt:
-                    continue
-                if kw in txt.lower():
-                    href = locs.get(frm, '')
-                    name = self._extract_element_name_from_href(href)
-                    if name and name not in results:
-                        results.append(name)
-                        if len(results) >= max_hits:
-                            break
-            return results
+            return self.index.search_labels(kw, max_hits)
         except Exception as e:
             logger.error(f"Error label-search '{keyword}': {e}")
             return []
@@ -514,29 +286,13 @@ class XBRLTaxonomyService:
         Returns:
             List of matching element dicts
         """
-        keyword_lower = keyword.lower()
         results = []
 
         try:
-            tree = ET.parse(SCHEMA_FILE)
-            root = tree.getroot()
-
-            for elem in root.findall('.//xs:element', NAMESPACES):
-                name = elem.get('name', '')
-                if not name:
-                    continue
-
-                # Skip abstract elements
-                if elem.get('abstract') == 'true':
-                    continue
-
-                if keyword_lower in name.lower():
-                    element_data = self.get_element(name)
-                    if element_data:
-                        results.append(element_data)
-
-                        if len(results) >= limit:
-                            break
+            for name in self.index.search_names(keyword, limit):
+                element_data = self.get_element(name)
+                if element_data:
+                    results.append(element_data)
 
             # If we still have room, supplement with label matches
             if len(results) < limit:
@@ -0,0 +1,97 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from services.api.models_accounting import ChartOfAccounts, JournalEntry, JournalEntryLine
+from services.api.services.account_balance_ledger import AccountBalanceLedger
+
+
+async def _seed_entry(db, entity_id, number, entry_date, debit_account, credit_account, amount):
+    je = JournalEntry(
+        entity_id=entity_id,
+        entry_number=number,
+        entry_date=entry_date,
+        fiscal_year=entry_date.year,
+        fiscal_period=entry_date.month,
+        status="posted",
+        created_by_id=1,
+    )
+    db.add(je)
+    await db.flush()
+    db.add(JournalEntryLine(journal_entry_id=je.id, line_number=1, account_id=debit_account.id,
+                            debit_amount=Decimal(amount), credit_amount=Decimal("0")))
+    db.add(JournalEntryLine(journal_entry_id=je.id, line_number=2, account_id=credit_account.id,
+                            debit_amount=Decimal("0"), credit_amount=Decimal(amount)))
+    await db.flush()
+    return je
+
+
+@pytest.mark.asyncio
+async def test_ledger_post_unpost_and_as_of(test_db, test_entity, test_chart_of_accounts):
+    cash, _, expense, _, revenue = test_chart_of_accounts
+    ledger = AccountBalanceLedger(test_db)
+
+    sale = await _seed_entry(test_db, test_entity.id, "JE-L-1", date(2025, 1, 10), cash, revenue, "500.00")
+    await ledger.post_entry(sale)
+    spend = await _seed_entry(test_db, test_entity.id, "JE-L-2", date(2025, 2, 14), expense, cash, "120.00")
+    await ledger.post_entry(spend)
+    await test_db.commit()
+
+    jan = await ledger.signed_balances_as_of(test_entity.id, date(2025, 1, 31))
+    assert jan[cash.id] == Decimal("500.00")
+    assert jan[revenue.id] == Decimal("500.00")
+    assert expense.id not in jan
+
+    # Mid-month date folds in only the partial month's lines
+    assert (await ledger.signed_balances_as_of(test_entity.id, date(2025, 2, 13)))[cash.id] == Decimal("500.00")
+    tb = await ledger.trial_balance(test_entity.id, date(2025, 2, 28))
+    assert tb["is_balanced"] and tb["total_debits"] == 500.0
+
+    await test_db.refresh(cash)
+    assert cash.current_balance == Decimal("380.00")
+    assert cash.last_transaction_date == date(2025, 2, 14)
+    assert (await ledger.verify(test_entity.id))["ok"]
+
+    await ledger.unpost_entry(spend)
+    spend.status = "draft"
+    await test_db.commit()
+    await test_db.refresh(cash)
+    assert cash.current_balance == Decimal("500.00")
+    assert (await ledger.verify(test_entity.id))["ok"]
+
+
+@pytest.mark.asyncio
+async def test_ledger_rebuild_repairs_drift(test_db, test_entity, test_chart_of_accounts):
+    cash, _, _, _, revenue = test_chart_of_accounts
+    ledger = AccountBalanceLedger(test_db)
+    await _seed_entry(test_db, test_entity.id, "JE-L-3", date(2025, 3, 1), cash, revenue, "75.00")
+    await test_db.commit()
+
+    report = await ledger.verify(test_entity.id)
+    assert not report["ok"]
+
+    await ledger.rebuild(test_entity.id)
+    assert (await ledger.verify(test_entity.id))["ok"]
+    account = await test_db.get(ChartOfAccounts, revenue.id)
+    await test_db.refresh(account)
+    assert account.current_balance == Decimal("75.00")
+
+
+@pytest.mark.asyncio
+async def test_empty_ledger_is_backfilled_then_upserted(test_db, test_entity, test_chart_of_accounts):
+    cash, _, _, _, revenue = test_chart_of_accounts
+    ledger = AccountBalanceLedger(test_db)
+    # Posted before the ledger existed (e.g. a database upgraded in place)
+    await _seed_entry(test_db, test_entity.id, "JE-L-4", date(2025, 4, 2), cash, revenue, "60.00")
+    await test_db.commit()
+
+    assert (await ledger.rebuild_if_empty())["period_rows"] == 2
+    assert await ledger.rebuild_if_empty() is None
+
+    # Same account and month as the backfilled row: incremented in place
+    later = await _seed_entry(test_db, test_entity.id, "JE-L-5", date(2025, 4, 20), cash, revenue, "15.00")
+    await ledger.post_entry(later)
+    await test_db.commit()
+    assert (await ledger.signed_balances_as_of(test_entity.id, date(2025, 4, 30)))[cash.id] == Decimal("75.00")
+    assert (await ledger.verify(test_entity.id))["ok"]
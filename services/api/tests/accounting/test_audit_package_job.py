@@ -0,0 +1,72 @@
+import os
+from datetime import date
+from decimal import Decimal
+
+import openpyxl
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from services.api import database_async
+from services.api.auth_deps import require_clerk_user
+from services.api.main import app
+from services.api.models_fixed_assets import AssetDisposal, DepreciationEntry, FixedAsset
+
+
+@pytest.mark.asyncio
+async def test_audit_package_job_streams_sheets_and_serves_ranges(client, test_db, test_entity, monkeypatch):
+    for n in range(1, 26):
+        asset = FixedAsset(entity_id=test_entity.id, asset_number=f"FA-{n:04d}", asset_name=f"Laptop {n}",
+                           asset_category="Computer Equipment", acquisition_date=date(2025, 1, 15),
+                           acquisition_cost=Decimal("1200.00"), useful_life_years=3,
+                           accumulated_depreciation=Decimal("300.00"), net_book_value=Decimal("900.00"))
+        test_db.add(asset)
+        await test_db.flush()
+        test_db.add_all([
+            DepreciationEntry(asset_id=asset.id, entity_id=test_entity.id, period_date=date(2025, month, 28),
+                              period_month=month, period_year=2025, depreciation_amount=Decimal("100.00"))
+            for month in (1, 2, 3)
+        ])
+        if n == 1:
+            test_db.add(AssetDisposal(asset_id=asset.id, entity_id=test_entity.id, disposal_date=date(2025, 6, 1),
+                                      disposal_type="Sale", disposal_amount=Decimal("1000.00"),
+                                      original_cost=Decimal("1200.00"), accumulated_depreciation=Decimal("300.00"),
+                                      net_book_value=Decimal("900.00"), gain_loss=Decimal("100.00")))
+    await test_db.commit()
+
+    monkeypatch.setattr(database_async, "get_async_session_factory",
+                        lambda: async_sessionmaker(test_db.bind, expire_on_commit=False))
+    app.dependency_overrides[require_clerk_user] = lambda: {"email": "lwhitworth@ngicapitaladvisory.com"}
+
+    started = await client.post("/accounting/fixed-assets/audit-package/generate",
+                                 params={"entity_id": test_entity.id, "year": 2025})
+    assert started.status_code == 200
+    job_id = started.json()["job_id"]
+
+    job = (await client.get(f"/accounting/fixed-assets/audit-package/jobs/{job_id}")).json()
+    assert job["status"] == "completed", job["error"]
+    assert job["percent_complete"] == 100
+    rows = {sheet["title"]: sheet["rows"] for sheet in job["sheets"]}
+    assert rows["PBC-1 Asset Register"] == 25
+    assert rows["PBC-2 Depreciation"] == 25
+    assert rows["PBC-5 Disposals"] == 1
+    assert all(sheet["status"] == "completed" for sheet in job["sheets"])
+
+    try:
+        wb = openpyxl.load_workbook(job["file_path"], read_only=True)
+        assert wb.sheetnames[0] == "Summary"
+        schedule = list(wb["PBC-2 Depreciation"].iter_rows(min_row=2, max_row=2, values_only=True))[0]
+        assert schedule[0] == "FA-0001"
+        assert schedule[4:8] == (100.0, 100.0, 100.0, 0.0)
+        assert schedule[16] == 300.0
+        wb.close()
+
+        url = f"/accounting/fixed-assets/audit-package/jobs/{job_id}/download"
+        full = await client.get(url)
+        assert full.status_code == 200
+        assert full.headers["accept-ranges"] == "bytes"
+        tail = await client.get(url, headers={"Range": "bytes=100-"})
+        assert tail.status_code == 206
+        assert tail.headers["content-range"] == f"bytes 100-{len(full.content) - 1}/{len(full.content)}"
+        assert full.content[:100] + tail.content == full.content
+    finally:
+        os.remove(job["file_path"])
@@ -375,3 +375,49 @@ async def test_invoice_workflow_complete(client, test_db, test_entity, test_char
     final_resp = await client.get(f"/api/accounting/ar/invoices/{invoice_id}")
     assert final_resp.json()["invoice"]["status"] == "paid"
 
+
+
+# ============================================================================
+# JOURNAL ENTRY LISTING
+# ============================================================================
+
+@pytest.mark.asyncio
+async def test_list_journal_entries_keyset_pagination(client, test_db, test_entity, test_chart_of_accounts):
+    """Journal entries page on (entry_date, id) via X-Next-Cursor"""
+    from datetime import date
+    from decimal import Decimal
+    from services.api.models_accounting import JournalEntry, JournalEntryLine
+
+    cash, expense = test_chart_of_accounts[0], test_chart_of_accounts[2]
+    for day in (1, 2, 3):
+        je = JournalEntry(
+            entity_id=test_entity.id,
+            entry_number=f"JE-2025-00000{day}",
+            entry_date=date(2025, 1, day),
+            fiscal_year=2025,
+            fiscal_period=1,
+            memo=f"Entry {day}",
+            status="draft",
+            created_by_id=1,
+        )
+        test_db.add(je)
+        await test_db.flush()
+        test_db.add(JournalEntryLine(journal_entry_id=je.id, line_number=1, account_id=expense.id,
+                                     debit_amount=Decimal("10.00"), credit_amount=Decimal("0")))
+        test_db.add(JournalEntryLine(journal_entry_id=je.id, line_number=2, account_id=cash.id,
+                                     debit_amount=Decimal("0"), credit_amount=Decimal("10.00")))
+    await test_db.commit()
+
+    resp = await client.get(f"/api/accounting/journal-entries/?entity_id={test_entity.id}&limit=2")
+    assert resp.status_code == 200
+    first_page = resp.json()
+    assert [e["memo"] for e in first_page] == ["Entry 3", "Entry 2"]
+    assert first_page[0]["lines"][0]["account_number"] == expense.account_number
+    assert first_page[0]["total_debits"] == 10.0
+    cursor = resp.headers["x-next-cursor"]
+
+    resp = await client.get(
+        f"/api/accounting/journal-entries/?entity_id={test_entity.id}&limit=2&cursor={cursor}"
+    )
+    assert [e["memo"] for e in resp.json()] == ["Entry 1"]
+    assert "x-next-cursor" not in resp.headers
@@ -0,0 +1,81 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from services.api.models_accounting import JournalEntry, JournalEntryLine
+from services.api.models_accounting_part2 import BankMatchingRule, BankTransaction, BankTransactionMatch
+from services.api.services.bank_auto_match_job import (
+    auto_match_account, create_auto_match_job, get_auto_match_job
+)
+
+
+async def _je(db, entity_id, number, on, cash, other, amount, memo):
+    # Positive amount = deposit (debit cash), negative = payment (credit cash)
+    je = JournalEntry(entity_id=entity_id, entry_number=number, entry_date=on, fiscal_year=on.year,
+                      fiscal_period=on.month, status="posted", memo=memo, created_by_id=1)
+    db.add(je)
+    await db.flush()
+    value = abs(Decimal(amount))
+    cash_dr, cash_cr = (value, Decimal("0")) if Decimal(amount) > 0 else (Decimal("0"), value)
+    db.add_all([
+        JournalEntryLine(journal_entry_id=je.id, line_number=1, account_id=cash.id,
+                         debit_amount=cash_dr, credit_amount=cash_cr),
+        JournalEntryLine(journal_entry_id=je.id, line_number=2, account_id=other.id,
+                         debit_amount=cash_cr, credit_amount=cash_dr),
+    ])
+    return je
+
+
+@pytest.mark.asyncio
+async def test_auto_match_job_matches_backlog_in_chunks(
+    test_db, test_entity, test_chart_of_accounts, test_bank_account
+):
+    cash, _, software, _, revenue = test_chart_of_accounts
+    start = date(2025, 6, 1)
+    expected = {}
+    for i in range(7):
+        on = start + timedelta(days=i * 3)
+        amount = f"-{100 + i}.00"
+        je = await _je(test_db, test_entity.id, f"JE-{i}", on, cash, software, amount, f"Vendor{i} subscription")
+        txn = BankTransaction(bank_account_id=test_bank_account.id, entity_id=test_entity.id,
+                              transaction_date=on + timedelta(days=1), description=f"VENDOR{i} subscription",
+                              amount=Decimal(amount), status="unmatched")
+        test_db.add(txn)
+        await test_db.flush()
+        expected[txn.id] = je.id
+    # Same amount as a payment but outside the date window: stays unmatched
+    await _je(test_db, test_entity.id, "JE-far", start + timedelta(days=90), cash, revenue, "500.00", "Deposit")
+    lonely = BankTransaction(bank_account_id=test_bank_account.id, entity_id=test_entity.id,
+                             transaction_date=start, description="Client deposit",
+                             amount=Decimal("500.00"), status="unmatched")
+    test_db.add(lonely)
+    test_db.add(BankMatchingRule(entity_id=test_entity.id, rule_name="Vendor", description_contains="vendor",
+                                 auto_match=True, is_active=True, created_by_id=1))
+    await test_db.commit()
+
+    job = create_auto_match_job(test_bank_account.id)
+    result = await auto_match_account(test_db, test_bank_account.id, job_id=job["job_id"], chunk_size=3)
+
+    assert result["status"] == "completed"
+    assert result["total_transactions"] == 8
+    assert result["processed"] == 8
+    assert result["matched"] == 7
+    assert result["chunks_committed"] == 3
+    assert result["rules_applied"] == 7
+    assert get_auto_match_job(job["job_id"])["matched"] == 7
+
+    matches = (await test_db.execute(select(BankTransactionMatch))).scalars().all()
+    assert {m.bank_transaction_id: m.journal_entry_id for m in matches} == expected
+    rows = (await test_db.execute(
+        select(BankTransaction.id, BankTransaction.status, BankTransaction.matched_journal_entry_id)
+    )).all()
+    assert {r.id: r.status for r in rows}[lonely.id] == "unmatched"
+    assert all(r.matched_journal_entry_id == expected[r.id] for r in rows if r.id in expected)
+
+    # A second run finds nothing left to match
+    again = await auto_match_account(test_db, test_bank_account.id)
+    assert again["total_transactions"] == 1
+    assert again["matched"] == 0
+
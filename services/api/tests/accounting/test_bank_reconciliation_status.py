@@ -0,0 +1,87 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from services.api.models_accounting import ChartOfAccounts, JournalEntry
+from services.api.models_accounting_part2 import BankAccount, BankTransaction
+from services.api.services import bank_reconciliation_service
+from services.api.services.bank_reconciliation_service import BankReconciliationService
+
+
+class _QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+async def _account(db, entity_id, gl_account_id, name, transactions):
+    account = BankAccount(entity_id=entity_id, bank_name="Mercury", account_name=name,
+                          account_number_masked="****" + name[-4:], gl_account_id=gl_account_id)
+    db.add(account)
+    await db.flush()
+    for day, amount, je_id in transactions:
+        db.add(BankTransaction(bank_account_id=account.id, entity_id=entity_id, transaction_date=date(2025, 5, day),
+                               description=f"{name} {day}", amount=Decimal(amount),
+                               matched_journal_entry_id=je_id))
+    return account
+
+
+@pytest.mark.asyncio
+async def test_status_uses_grouped_queries_and_caches_per_account(test_db, test_entity):
+    bank_reconciliation_service.clear_reconciliation_cache()
+    cash = ChartOfAccounts(entity_id=test_entity.id, account_number="10110", account_name="Cash",
+                           account_type="Asset", normal_balance="Debit", current_balance=Decimal("150.00"))
+    test_db.add(cash)
+    await test_db.flush()
+    je = JournalEntry(entity_id=test_entity.id, entry_number="JE-2025-000001", entry_date=date(2025, 5, 2),
+                      fiscal_year=2025, fiscal_period=5, status="posted", created_by_id=1)
+    test_db.add(je)
+    await test_db.flush()
+    accounts = [
+        await _account(test_db, test_entity.id, cash.id, "Ops 0001", [(2, "200.00", je.id), (3, "-50.00", None)]),
+        await _account(test_db, test_entity.id, cash.id, "Reserve 0002", [(4, "75.00", None)]),
+        await _account(test_db, test_entity.id, cash.id, "Payroll 0003", []),
+    ]
+    await test_db.commit()
+    service = BankReconciliationService(test_db)
+    engine = test_db.bind.sync_engine
+
+    with _QueryCounter(engine) as cold:
+        statuses = await service._get_reconciliation_statuses(accounts, date(2025, 5, 31))
+    ops = statuses[accounts[0].id]
+    assert ops["bank_balance"] == 150.0
+    assert ops["is_reconciled"] is True
+    assert ops["matched_transactions"] == 1
+    assert ops["matched_txn_list"][0]["je_number"] == "JE-2025-000001"
+    assert [t["amount"] for t in ops["unmatched_txn_list"]] == [-50.0]
+    assert ops["bank_account"]["account_number_last_four"] == "0001"
+    assert statuses[accounts[2].id]["unmatched_transactions"] == 0
+    assert cold.count == 3
+
+    # Unchanged accounts are served from cache without listing queries
+    with _QueryCounter(engine) as warm:
+        await service._get_reconciliation_statuses(accounts, date(2025, 5, 31))
+    assert warm.count == 2
+
+    # A match on one account invalidates only that account
+    txn = await test_db.get(BankTransaction, ops["unmatched_txn_list"][0]["id"])
+    txn.matched_journal_entry_id = je.id
+    await test_db.commit()
+    before = bank_reconciliation_service.get_reconciliation_cache_stats()
+    refreshed = await service.get_reconciliation_status(accounts[0].id, date(2025, 5, 31))
+    after = bank_reconciliation_service.get_reconciliation_cache_stats()
+    assert refreshed["matched_transactions"] == 2
+    assert refreshed["unmatched_txn_list"] == []
+    assert after["misses"] == before["misses"] + 1
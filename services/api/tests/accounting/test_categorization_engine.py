@@ -0,0 +1,60 @@
+from decimal import Decimal
+
+import pytest
+
+from services.api.models_accounting import AccountMappingRule, ChartOfAccounts
+from services.api.models_accounting_part2 import BankMatchingRule
+from services.api.services import categorization_engine
+from services.api.services.categorization_engine import CategorizationEngine, build_rules, get_categorization_engine
+
+
+def _txn(description, amount, counterparty=""):
+    return {"description": description, "counterpartyName": counterparty, "amount": amount}
+
+
+def test_compiled_scan_matches_substring_semantics_including_overlaps():
+    accounts = {"62100": (1, "Software"), "62500": (2, "Utilities"), "40500": (3, "Interest")}
+    engine = CategorizationEngine(build_rules(accounts))
+    results = engine.categorize_many([
+        _txn("MERCURY INTEREST EARNED", "4.10"),
+        _txn("Verizon wireless", "-80.00"),
+        _txn("rapid transit", "-3.00"),  # "api" inside "rapid", as with `in`
+        _txn("Coffee", "-5.00"),
+        _txn("Verizon wireless", "-80.00"),
+    ])
+    assert [r["account_number"] for r in results] == ["40500", "62500", "62100", None, "62500"]
+    # Interest keywords are revenue-only
+    assert engine.categorize("bank interest", "", "", Decimal("-1.00"))["account_id"] is None
+
+
+@pytest.mark.asyncio
+async def test_engine_applies_rule_precedence_and_hot_reloads(test_db, test_entity, test_chart_of_accounts):
+    categorization_engine.clear_categorization_engines()
+    software = next(a for a in test_chart_of_accounts if a.account_number == "62100")
+    consulting = ChartOfAccounts(entity_id=test_entity.id, account_number="62710", account_name="Consulting Fees",
+                                 account_type="Expense", normal_balance="Debit")
+    test_db.add(consulting)
+    await test_db.flush()
+    test_db.add(AccountMappingRule(entity_id=test_entity.id, rule_type="vendor", pattern="acme",
+                                   account_id=consulting.id, is_active=True))
+    await test_db.commit()
+
+    engine = await get_categorization_engine(test_db, test_entity.id)
+    page = [_txn("ACME software license", "-99.00", "Acme Corp"), _txn("acme mention", "-10.00", "Other")]
+    by_vendor, not_vendor = engine.categorize_many(page)
+    assert by_vendor["account_id"] == consulting.id
+    assert by_vendor["rule"]["source"] == "account_mapping_rule"
+    # Vendor rules only fire on the counterparty; falls through to built-ins
+    assert not_vendor["account_id"] is None
+    assert await get_categorization_engine(test_db, test_entity.id) is engine
+
+    # A new bank matching rule outranks mapping rules once it exists
+    test_db.add(BankMatchingRule(entity_id=test_entity.id, rule_name="Acme licences", description_contains="license",
+                                 auto_categorize_account_id=software.id, priority=10, is_active=True,
+                                 created_by_id=1))
+    await test_db.commit()
+    reloaded = await get_categorization_engine(test_db, test_entity.id)
+    assert reloaded is not engine
+    result = reloaded.categorize_many(page)[0]
+    assert result["account_id"] == software.id
+    assert result["confidence"] == 0.95
@@ -0,0 +1,89 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from services.api.models import Partners
+from services.api.models_accounting import (
+    AccountingEntity, ChartOfAccounts, EntityRelationship, JournalEntry, JournalEntryLine
+)
+from services.api.models_accounting_part3 import ConsolidatedFinancialStatement, IntercompanyTransaction
+from services.api.services.consolidation_engine import ConsolidationEngine
+
+
+async def _post(db, entity_id, number, on, debit_account, credit_account, amount):
+    je = JournalEntry(entity_id=entity_id, entry_number=number, entry_date=on,
+                      fiscal_year=on.year, fiscal_period=on.month, status="posted", created_by_id=1)
+    db.add(je)
+    await db.flush()
+    db.add(JournalEntryLine(journal_entry_id=je.id, line_number=1, account_id=debit_account.id,
+                            debit_amount=Decimal(amount), credit_amount=Decimal("0")))
+    db.add(JournalEntryLine(journal_entry_id=je.id, line_number=2, account_id=credit_account.id,
+                            debit_amount=Decimal("0"), credit_amount=Decimal(amount)))
+    await db.flush()
+    return je
+
+
+@pytest.mark.asyncio
+async def test_consolidation_maps_by_number_and_eliminates_intercompany(test_db, test_entity, test_chart_of_accounts):
+    p_cash, p_ar, p_expense, _, p_revenue = test_chart_of_accounts
+    sub = AccountingEntity(entity_name="Sub LLC", entity_type="LLC", ein="98-7654321", entity_status="active")
+    test_db.add(sub)
+    await test_db.flush()
+    test_db.add(EntityRelationship(parent_entity_id=test_entity.id, subsidiary_entity_id=sub.id,
+                                   ownership_percent=Decimal("100.00"), ownership_effective_date=date(2024, 1, 1)))
+    sub_accounts = {}
+    for number, name, kind, normal in [
+        ("10100", "Cash", "Asset", "Debit"),
+        ("20100", "Due to Parent", "Liability", "Credit"),
+        ("62100", "Management Fees", "Expense", "Debit"),
+        ("40100", "Revenue", "Revenue", "Credit"),
+    ]:
+        acct = ChartOfAccounts(entity_id=sub.id, account_number=number, account_name=name,
+                               account_type=kind, normal_balance=normal, is_active=True)
+        test_db.add(acct)
+        sub_accounts[number] = acct
+    await test_db.flush()
+
+    on = date(2025, 3, 15)
+    await _post(test_db, test_entity.id, "JE-P-1", on, p_cash, p_revenue, "1000.00")
+    await _post(test_db, sub.id, "JE-S-1", on, sub_accounts["10100"], sub_accounts["40100"], "400.00")
+    # Parent bills the sub a management fee
+    fee_p = await _post(test_db, test_entity.id, "JE-P-2", on, p_ar, p_revenue, "150.00")
+    fee_s = await _post(test_db, sub.id, "JE-S-2", on, sub_accounts["62100"], sub_accounts["20100"], "150.00")
+    test_db.add(IntercompanyTransaction(from_entity_id=test_entity.id, to_entity_id=sub.id,
+                                        from_journal_entry_id=fee_p.id, to_journal_entry_id=fee_s.id,
+                                        transaction_date=on, transaction_type="Management Fee",
+                                        amount=Decimal("150.00")))
+    partner = Partners(email="cfo@ngicapitaladvisory.com", name="CFO", password_hash="x",
+                       ownership_percentage=Decimal("50.00"))
+    test_db.add(partner)
+    await test_db.commit()
+
+    result = await ConsolidationEngine(test_db).consolidate(test_entity.id, date(2025, 1, 1), date(2025, 3, 31),
+                                                           generated_by_id=partner.id)
+
+    assert result["entities_included"] == [test_entity.id, sub.id]
+    assert result["accounts"]["10100"]["balance"] == 1400.0
+    assert result["accounts"]["10100"]["account_name"] == p_cash.account_name
+    assert result["accounts"]["40100"]["balance"] == 1400.0
+    assert result["accounts"]["62100"]["balance"] == 0.0
+    assert result["income_statement"]["net_income"] == 1400.0
+    assert result["balance_sheet"]["balance_check"] == 0.0
+    assert result["intercompany_eliminations"] == 150.0
+
+    stored = await test_db.get(ConsolidatedFinancialStatement, result["consolidated_statement_id"])
+    assert stored.period_type == "quarterly"
+    assert stored.subsidiary_entity_ids == str(sub.id)
+    assert stored.generated_by_id == partner.id
+
+    # Each parent group keeps its own row; a final statement only locks its own group
+    stored.status = "final"
+    await test_db.commit()
+    other = await ConsolidationEngine(test_db).consolidate(sub.id, date(2025, 1, 1), date(2025, 3, 31),
+                                                          generated_by_id=partner.id)
+    assert other["consolidated_statement_id"] != stored.id
+    assert other["entities_included"] == [sub.id]
+    with pytest.raises(ValueError):
+        await ConsolidationEngine(test_db).consolidate(test_entity.id, date(2025, 1, 1), date(2025, 3, 31),
+                                                       generated_by_id=partner.id)
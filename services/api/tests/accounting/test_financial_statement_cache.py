@@ -0,0 +1,39 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from services.api.models_accounting import JournalEntry, JournalEntryLine
+from services.api.services.account_balance_ledger import AccountBalanceLedger
+from services.api.services.financial_statement_cache import FinancialStatementCacheService
+
+
+@pytest.mark.asyncio
+async def test_statement_cache_invalidated_by_ledger_version(test_db, test_entity, test_chart_of_accounts):
+    cash, _, _, _, revenue = test_chart_of_accounts
+    cache = FinancialStatementCacheService(test_db)
+    builds = []
+
+    async def builder():
+        builds.append(1)
+        return {"net_income": Decimal("12.50"), "build": len(builds)}
+
+    period_end = date(2025, 6, 30)
+    first = await cache.get_or_build(test_entity.id, period_end, "income_statement", builder)
+    second = await cache.get_or_build(test_entity.id, period_end, "income_statement", builder)
+    assert first == second == {"net_income": 12.5, "build": 1}
+
+    je = JournalEntry(entity_id=test_entity.id, entry_number="JE-C-1", entry_date=date(2025, 6, 1),
+                      fiscal_year=2025, fiscal_period=6, status="posted", created_by_id=1)
+    test_db.add(je)
+    await test_db.flush()
+    test_db.add(JournalEntryLine(journal_entry_id=je.id, line_number=1, account_id=cash.id,
+                                 debit_amount=Decimal("5.00"), credit_amount=Decimal("0")))
+    test_db.add(JournalEntryLine(journal_entry_id=je.id, line_number=2, account_id=revenue.id,
+                                 debit_amount=Decimal("0"), credit_amount=Decimal("5.00")))
+    await AccountBalanceLedger(test_db).post_entry(je)
+    await test_db.commit()
+
+    third = await cache.get_or_build(test_entity.id, period_end, "income_statement", builder)
+    assert third["build"] == 2
+    assert len(builds) == 2
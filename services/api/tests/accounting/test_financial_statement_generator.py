@@ -0,0 +1,41 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from services.api.models_accounting import JournalEntry, JournalEntryLine
+from services.api.services.account_balance_ledger import AccountBalanceLedger
+from services.api.services.financial_statement_generator import FinancialStatementGenerator
+
+
+@pytest.mark.asyncio
+async def test_generator_shares_one_snapshot_with_comparatives(test_db, test_entity, test_chart_of_accounts):
+    cash, _, expense, _, revenue = test_chart_of_accounts
+    postings = [
+        ("JE-FS-1", date(2024, 5, 1), cash, revenue, "300.00"),
+        ("JE-FS-2", date(2025, 2, 1), cash, revenue, "1000.00"),
+        ("JE-FS-3", date(2025, 3, 1), expense, cash, "250.00"),
+    ]
+    for number, on, debit, credit, amount in postings:
+        je = JournalEntry(entity_id=test_entity.id, entry_number=number, entry_date=on,
+                          fiscal_year=on.year, fiscal_period=on.month, status="posted", created_by_id=1)
+        test_db.add(je)
+        await test_db.flush()
+        test_db.add(JournalEntryLine(journal_entry_id=je.id, line_number=1, account_id=debit.id,
+                                     debit_amount=Decimal(amount), credit_amount=Decimal("0")))
+        test_db.add(JournalEntryLine(journal_entry_id=je.id, line_number=2, account_id=credit.id,
+                                     debit_amount=Decimal("0"), credit_amount=Decimal(amount)))
+    await test_db.commit()
+    await AccountBalanceLedger(test_db).rebuild(test_entity.id)
+
+    generator = FinancialStatementGenerator(test_db, test_entity.id, date(2025, 6, 30), include_comparatives=True)
+    package = await generator.generate_all_statements()
+    income = package["statements"]["income_statement"]
+    cash_flows = package["statements"]["cash_flows"]
+
+    assert income["net_income"] == 750.0
+    assert income["prior_period"]["net_income"] == 300.0
+    assert cash_flows["cash_beginning"] == 300.0
+    assert cash_flows["cash_ending"] == 1050.0
+    assert package["statements"]["balance_sheet"]["prior_period"]["assets"]["total_assets"] == 300.0
+    assert package["prior_period_end_date"] == "2024-06-30"
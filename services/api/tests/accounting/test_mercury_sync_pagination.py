@@ -0,0 +1,136 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.api.models_accounting import JournalEntry, JournalEntryLine
+from services.api.models_accounting_part2 import BankTransaction, MercurySyncState
+from services.api.services import mercury_sync_service
+from services.api.services.mercury_sync_service import MercurySyncService
+
+
+def _txn(n, day, amount="-25.00"):
+    return {"id": f"mt-{n}", "postedAt": f"2025-11-{day:02d}T12:00:00Z", "amount": amount,
+            "description": f"Vendor {n}", "counterpartyName": f"Vendor {n}"}
+
+
+@pytest.mark.asyncio
+async def test_sync_pages_through_results_and_resumes_from_high_water_mark(
+    test_db, test_entity, test_bank_account, monkeypatch
+):
+    test_bank_account.mercury_account_id = "acct-1"
+    await test_db.commit()
+    monkeypatch.setattr(mercury_sync_service, "MERCURY_PAGE_SIZE", 2)
+
+    feed = [_txn(1, 3), _txn(2, 4), _txn(3, 5), _txn(4, 6, "100.00"), _txn(5, 7)]
+    requests = []
+
+    async def fake_page(self, start, offset):
+        requests.append((start, offset))
+        rows = [t for t in feed if t["postedAt"][:10] >= start.isoformat()]
+        return rows[offset:offset + 2]
+
+    monkeypatch.setattr(MercurySyncService, "_fetch_transactions_page", fake_page)
+    service = MercurySyncService(test_db)
+    service.account_id = "acct-1"
+
+    first = await service.sync_transactions(test_entity.id, days_back=5000)
+    assert first["success"] is True
+    assert first["new_transactions"] == 5
+    assert first["pages"] == 3
+    assert [offset for _, offset in requests] == [0, 2, 4]
+
+    state = (await test_db.execute(select(MercurySyncState))).scalar_one()
+    assert state.high_water_mark == datetime(2025, 11, 7, 12, 0)
+    assert state.last_transaction_id == "mt-5"
+    assert state.cursor_offset is None
+
+    # Next run starts near the high-water mark and only inserts new activity
+    requests.clear()
+    feed.append(_txn(6, 8))
+    second = await service.sync_transactions(test_entity.id, days_back=5000)
+    assert requests[0][0].isoformat() == "2025-11-05"
+    assert second["new_transactions"] == 1
+    assert second["skipped"] == 3
+    count = await test_db.scalar(select(func.count(BankTransaction.id)))
+    assert count == 6
+
+
+@pytest.mark.asyncio
+async def test_sync_with_session_factory_commits_each_page_in_its_own_session(
+    test_db, test_entity, test_bank_account, monkeypatch
+):
+    test_bank_account.mercury_account_id = "acct-1"
+    await test_db.commit()
+    monkeypatch.setattr(mercury_sync_service, "MERCURY_PAGE_SIZE", 2)
+    feed = [_txn(1, 3), _txn(2, 4), _txn(3, 5)]
+    opened = []
+
+    async def fake_page(self, start, offset):
+        # No session is held while Mercury is being called
+        assert self.db is None
+        return feed[offset:offset + 2]
+
+    def factory():
+        session = AsyncSession(test_db.bind, expire_on_commit=False)
+        opened.append(session)
+        return session
+
+    monkeypatch.setattr(MercurySyncService, "_fetch_transactions_page", fake_page)
+    service = MercurySyncService(session_factory=factory)
+    service.account_id = "acct-1"
+
+    result = await service.sync_transactions(test_entity.id, days_back=5000)
+    assert result["new_transactions"] == 3
+    # setup + one per page + finish
+    assert len(opened) == 4
+    assert await test_db.scalar(select(func.count(BankTransaction.id))) == 3
+
+
+@pytest.mark.asyncio
+async def test_page_matches_existing_jes_from_one_index_query(
+    test_db, test_entity, test_bank_account, test_chart_of_accounts
+):
+    cash, other = test_chart_of_accounts[:2]
+    for number, day, amount, memo in [(1, 4, "25.00", "Vendor 1"), (2, 20, "25.00", "Vendor 2"),
+                                      (3, 5, "25.01", "Vendor 3"), (4, 6, "25.00", "Unrelated memo")]:
+        je = JournalEntry(entity_id=test_entity.id, entry_number=f"JE-2025-00000{number}",
+                          entry_date=date(2025, 11, day), fiscal_year=2025, fiscal_period=11,
+                          status="posted", memo=memo, created_by_id=1)
+        test_db.add(je)
+        await test_db.flush()
+        test_db.add_all([
+            JournalEntryLine(journal_entry_id=je.id, line_number=1, account_id=other.id,
+                             debit_amount=Decimal(amount), credit_amount=Decimal("0")),
+            JournalEntryLine(journal_entry_id=je.id, line_number=2, account_id=cash.id,
+                             debit_amount=Decimal("0"), credit_amount=Decimal(amount)),
+        ])
+    await test_db.commit()
+    service = MercurySyncService(test_db)
+
+    # Candidate lookup is two queries no matter how large the page is
+    page = [_txn(n, 3 + n % 5) for n in range(1, 51)]
+    queries = []
+    listener = lambda *args: queries.append(args[2])
+    event.listen(test_db.bind.sync_engine, "before_cursor_execute", listener)
+    try:
+        matches = await service._match_page_to_jes(page, test_entity.id)
+    finally:
+        event.remove(test_db.bind.sync_engine, "before_cursor_execute", listener)
+    assert len(queries) == 2
+    # Out-of-window, dissimilar memo and already-claimed entries are skipped
+    assert {k: je.entry_number for k, je in matches.items()} == {
+        "mt-1": "JE-2025-000001", "mt-3": "JE-2025-000003"
+    }
+
+    inserted, _ = await service._ingest_page([_txn(1, 3), _txn(2, 4)], test_entity.id, test_bank_account.id)
+    await test_db.commit()
+    assert inserted == 2
+    rows = {t.mercury_transaction_id: t for t in (await test_db.execute(select(BankTransaction))).scalars()}
+    je = await test_db.get(JournalEntry, rows["mt-1"].matched_journal_entry_id)
+    assert (rows["mt-1"].status, je.mercury_transaction_id, je.reconciliation_status) == (
+        "pending", "mt-1", "pending_review"
+    )
+    assert rows["mt-2"].matched_journal_entry_id is None
@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from services.api.models_accounting_part2 import AccountingDocument, BankTransaction
+from services.api.services.transaction_matcher_engine import (
+    MatchCandidate, SubsetSumMatcher, to_cents
+)
+from services.api.services.transaction_matching_service import TransactionMatchingService
+
+
+def test_to_cents_rounds_and_drops_sign():
+    assert to_cents(Decimal("-12.345")) == 1235
+    assert to_cents("19.99") == 1999
+    assert to_cents(None) == 0
+
+
+def test_subset_sum_finds_aggregate_group():
+    start = date(2025, 1, 1)
+    candidates = [
+        MatchCandidate(i, amt, start + timedelta(days=i), "Anthropic API")
+        for i, amt in enumerate(["12.50", "7.25", "30.00", "5.25", "99.99"])
+    ]
+    matcher = SubsetSumMatcher()
+    result = matcher.find_groups(candidates, Decimal("25.00"), vendor_name="anthropic")
+
+    assert not result["truncated"]
+    best = result["groups"][0]
+    assert sorted(best["items"]) == [0, 1, 3]
+    assert best["total"] == Decimal("25.00")
+    assert best["confidence"] == pytest.approx(0.84)
+
+
+def test_subset_sum_prunes_vendor_and_window():
+    anchor = date(2025, 3, 15)
+    candidates = [
+        MatchCandidate("a", "10.00", anchor, "openai"),
+        MatchCandidate("b", "10.00", anchor, "anthropic"),
+        MatchCandidate("c", "10.00", anchor + timedelta(days=90), "anthropic"),
+        MatchCandidate("d", "10.00", anchor - timedelta(days=5), "anthropic"),
+    ]
+    matcher = SubsetSumMatcher()
+    result = matcher.find_groups(
+        candidates, Decimal("20.00"), anchor_date=anchor, window_days=30, vendor_name="anthropic"
+    )
+
+    assert result["candidates_considered"] == 2
+    assert [sorted(g["items"]) for g in result["groups"]] == [["b", "d"]]
+
+
+def test_subset_sum_respects_state_cap():
+    candidates = [MatchCandidate(i, Decimal(i + 1) / 7, None, "") for i in range(200)]
+    matcher = SubsetSumMatcher(max_states=500)
+    result = matcher.find_groups(candidates, Decimal("500.00"))
+
+    assert result["truncated"] is True
+
+
+@pytest.mark.asyncio
+async def test_account_suggestions_claim_each_transaction_once_within_window(
+    test_db, test_entity, test_bank_account
+):
+    invoice_date = date(2025, 5, 1)
+
+    def txn(on, description):
+        return BankTransaction(bank_account_id=test_bank_account.id, entity_id=test_entity.id,
+                               transaction_date=on, description=description,
+                               amount=Decimal("-250.00"), status="unmatched")
+
+    near = txn(invoice_date + timedelta(days=3), "Acme hosting")
+    far = txn(invoice_date + timedelta(days=120), "Acme hosting")
+    test_db.add_all([near, far])
+    for n in range(2):
+        test_db.add(AccountingDocument(
+            entity_id=test_entity.id, document_type="invoice", category="invoices",
+            filename=f"acme-{n}.pdf", file_path=f"/tmp/acme-{n}.pdf", uploaded_by_id=1,
+            processing_status="extracted",
+            extracted_data={"total_amount": "250.00", "invoice_date": invoice_date.isoformat(),
+                            "vendor_name": "Acme"},
+        ))
+    await test_db.commit()
+
+    result = await TransactionMatchingService(test_db).suggest_matches_for_account(test_bank_account.id)
+
+    # One invoice gets the in-window payment; the other is not offered the same
+    # transaction again, nor the one four months away
+    assert [s["transaction_ids"] for s in result["suggestions"]] == [[near.id]]
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from services.api.services import xbrl_taxonomy_service
+from services.api.services.xbrl_taxonomy_index import XBRLTaxonomyIndex, compile_taxonomy_index, source_fingerprint
+from services.api.services.xbrl_taxonomy_service import XBRLTaxonomyService
+
+
+SCHEMA = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance">
+<xs:element name="LiabilitiesCurrent" type="xbrli:monetaryItemType" xbrli:periodType="instant" xbrli:balance="credit"/>
+<xs:element name="AccountsPayableCurrent" type="xbrli:monetaryItemType" xbrli:periodType="instant" xbrli:balance="credit"/>
+<xs:element name="LiabilitiesAbstract" type="xbrli:stringItemType" abstract="true"/>
+</xs:schema>"""
+
+LABELS = """<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink">
+<link:labelLink>
+<link:loc xlink:href="us-gaap-2025.xsd#us-gaap_AccountsPayableCurrent" xlink:label="loc_ap"/>
+<link:labelArc xlink:from="loc_ap" xlink:to="lab_ap"/>
+<link:label xlink:label="lab_ap" xlink:role="http://www.xbrl.org/2003/role/terseLabel">AP</link:label>
+<link:label xlink:label="lab_ap" xlink:role="http://www.xbrl.org/2003/role/label">Accounts Payable, Current</link:label>
+<link:label xlink:label="lab_ap" xlink:role="http://www.xbrl.org/2003/role/documentation">Amounts owed to vendors.</link:label>
+</link:labelLink></link:linkbase>"""
+
+REFERENCES = """<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:ref="http://www.xbrl.org/2006/ref">
+<link:referenceLink>
+<link:loc xlink:href="us-gaap-2025.xsd#us-gaap_AccountsPayableCurrent" xlink:label="loc_ap"/>
+<link:referenceArc xlink:from="loc_ap" xlink:to="ref_ap"/>
+<link:reference xlink:label="ref_ap"><ref:Topic>210</ref:Topic><ref:SubTopic>10</ref:SubTopic><ref:Section>45</ref:Section></link:reference>
+</link:referenceLink></link:linkbase>"""
+
+PRESENTATION = """<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink">
+<link:presentationLink>
+<link:loc xlink:href="us-gaap-2025.xsd#us-gaap_LiabilitiesCurrent" xlink:label="loc_lc"/>
+<link:loc xlink:href="us-gaap-2025.xsd#us-gaap_AccountsPayableCurrent" xlink:label="loc_ap"/>
+<link:presentationArc xlink:from="loc_lc" xlink:to="loc_ap"/>
+</link:presentationLink></link:linkbase>"""
+
+
+def _service(tmp_path):
+    files = {}
+    for name, body in (("s.xsd", SCHEMA), ("lab.xml", LABELS), ("ref.xml", REFERENCES), ("pre.xml", PRESENTATION)):
+        files[name] = tmp_path / name
+        files[name].write_text(body)
+    index_path = tmp_path / "index.sqlite"
+    stats = compile_taxonomy_index(
+        index_path,
+        schema_file=files["s.xsd"],
+        label_file=files["lab.xml"],
+        reference_file=files["ref.xml"],
+        presentation_file=files["pre.xml"],
+    )
+    assert stats["elements"] == 3
+    return XBRLTaxonomyService(index=XBRLTaxonomyIndex(index_path))
+
+
+def test_element_lookup_from_compiled_index(tmp_path):
+    svc = _service(tmp_path)
+    el = svc.get_element("AccountsPayableCurrent")
+
+    assert el["standard_label"] == "Accounts Payable, Current"
+    assert el["documentation"] == "Amounts owed to vendors."
+    assert el["balance_type"] == "credit"
+    assert el["data_type"] == "monetary"
+    assert el["primary_asc_topic"] == "ASC 210-10-45"
+    assert el["presentation_parents"] == ["LiabilitiesCurrent"]
+    assert svc.get_element("DoesNotExist") is None
+
+
+def test_search_uses_names_then_label_prefixes(tmp_path):
+    svc = _service(tmp_path)
+
+    assert [e["element_name"] for e in svc.search_elements("liabilities")] == ["LiabilitiesCurrent"]
+    assert [e["element_name"] for e in svc.search_elements("accounts pay")] == ["AccountsPayableCurrent"]
+
+
+def test_service_only_opens_a_prebuilt_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(xbrl_taxonomy_service, "INDEX_FILE", tmp_path / "missing.sqlite")
+    monkeypatch.setattr(xbrl_taxonomy_service, "compile_taxonomy_index",
+                        lambda *a, **k: pytest.fail("compiled on the request path"))
+    with pytest.raises(FileNotFoundError):
+        XBRLTaxonomyService()
+
+    # A fresh checkout (new mtimes, same bytes) keeps matching the index
+    schema = tmp_path / "s.xsd"
+    schema.write_text(SCHEMA)
+    before = source_fingerprint([schema])
+    os.utime(schema, (0, 0))
+    assert source_fingerprint([schema]) == before
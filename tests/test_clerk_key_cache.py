@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from services.api import clerk_auth
+
+ISSUER = "https://clerk.example.test"
+
+
+def _signing_material():
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = private.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk["kid"] = "kid-1"
+    return private_pem, {"keys": [public_jwk]}
+
+
+def test_burst_of_verifications_fetches_jwks_once_and_caches_claims(monkeypatch):
+    private_pem, jwks = _signing_material()
+    monkeypatch.setenv("CLERK_JWKS_URL", "https://clerk.example.test/jwks.json")
+    monkeypatch.setenv("CLERK_ISSUER", ISSUER)
+    monkeypatch.setenv("CLERK_VERIFY_AUDIENCE", "0")
+    clerk_auth.clear_auth_caches()
+    monkeypatch.setattr(clerk_auth, "_async_jwks_lock", None)
+
+    fetches = []
+
+    class _Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return jwks
+
+    class _Client:
+        async def get(self, url):
+            fetches.append(url)
+            await asyncio.sleep(0.01)
+            return _Response()
+
+    monkeypatch.setattr(clerk_auth, "_get_http_client", lambda: _Client())
+    token = jwt.encode(
+        {"sub": "user_1", "iss": ISSUER, "exp": int(time.time()) + 600},
+        private_pem, algorithm="RS256", headers={"kid": "kid-1"},
+    )
+
+    async def burst():
+        return await asyncio.gather(*[clerk_auth.verify_clerk_jwt_async(token) for _ in range(20)])
+
+    results = asyncio.run(burst())
+    assert all(r and r["sub"] == "user_1" for r in results)
+    assert len(fetches) == 1
+
+    # Steady state: claims served from the token-hash cache without decoding
+    monkeypatch.setattr(clerk_auth, "_decode_with_cached_key", lambda *a: pytest.fail("decoded again"))
+    assert clerk_auth.verify_clerk_jwt(token)["sub"] == "user_1"
+    clerk_auth.clear_auth_caches()
@@ -0,0 +1,62 @@
+import csv
+import io
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from services.api.auth_deps import require_clerk_user
+from services.api.database import get_db
+from services.api.routes import employees, investors
+from services.api.routes.employees import _ensure_hr_schema
+from services.api.routes.investors import _ensure_schema as _ensure_investor_schema
+from services.api.services import csv_export
+
+
+def test_exports_stream_csv_in_bounded_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(csv_export, "CSV_EXPORT_CHUNK_ROWS", 100)
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    db = sessionmaker(bind=engine)()
+    _ensure_hr_schema(db)
+    _ensure_investor_schema(db)
+    db.execute(text("INSERT INTO teams (id, entity_id, name) VALUES (1, 1, 'Advisory')"))
+    db.execute(text("INSERT INTO employees (entity_id, name, email, team_id) VALUES (1, 'Comma, Jr.', 'jr@ngi.test', 1)"))
+    for n in range(1, 1000):
+        db.execute(text("INSERT INTO employees (entity_id, name, email) VALUES (1, :n, :em)"),
+                   {"n": f"Analyst {n}", "em": f"a{n}@ngi.test"})
+    db.execute(text("INSERT INTO timesheets (id, entity_id, employee_id, pay_period_start, pay_period_end, total_hours) "
+                    "VALUES (1, 1, 1, '2025-06-01', '2025-06-15', 16)"))
+    db.execute(text("INSERT INTO timesheet_entries (timesheet_id, entry_date, hours) VALUES (1, '2025-06-02', 8), (1, '2025-06-03', 8)"))
+    db.execute(text("INSERT INTO investors (id, legal_name, firm) VALUES ('i1', 'Jane Doe', 'Seed Fund')"))
+    db.execute(text("INSERT INTO investor_pipelines (id, entity_id, investor_id, stage) VALUES ('p1', 1, 'i1', 'Pitched')"))
+    db.commit()
+
+    app = FastAPI()
+    app.include_router(employees.router)
+    app.include_router(investors.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[require_clerk_user] = lambda: {"email": "test@ngicapitaladvisory.com"}
+    client = TestClient(app)
+    try:
+        # Header chunk plus one chunk per 100 rows
+        chunks = list(csv_export.iter_csv(engine, "SELECT id FROM employees", {}, ["id"]))
+        assert len(chunks) == 11 and max(len(c) for c in chunks) < 600
+
+        resp = client.get("/api/employees/export", params={"entity": 1})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/csv")
+        assert resp.headers["content-disposition"] == 'attachment; filename="employees-1.csv"'
+        rows = list(csv.reader(io.StringIO(resp.text)))
+        assert rows[0] == ["name", "email", "type", "start", "entity", "team"]
+        assert rows[1] == ["Comma, Jr.", "jr@ngi.test", "", "", "1", "Advisory"]
+        assert len(rows) == 1001
+
+        timesheets = list(csv.reader(io.StringIO(client.get("/api/timesheets/export", params={"entity": 1}).text)))
+        assert [r[7] for r in timesheets[1:]] == ["2025-06-02", "2025-06-03"]
+        pipeline = list(csv.reader(io.StringIO(client.get("/api/investors/pipeline/export", params={"entity": 1}).text)))
+        assert pipeline[1][:4] == ["p1", "Pitched", "Jane Doe", "Seed Fund"]
+        assert client.get("/api/timesheets/export").status_code == 422
+    finally:
+        db.close()
+        engine.dispose()
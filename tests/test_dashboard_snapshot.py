@@ -0,0 +1,97 @@
+import asyncio
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from services.api import models_accounting_part2, models_accounting_part3  # noqa: F401  (mapper registry)
+from services.api.models_accounting import DashboardSnapshot
+from services.api.services import dashboard_snapshot
+from services.api.services.dashboard_snapshot import (
+    get_dashboard_snapshot,
+    mark_dashboard_stale,
+    mark_dashboard_stale_sync,
+)
+
+
+def test_snapshot_version_moves_only_when_inputs_change(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'dash.db'}")
+    DashboardSnapshot.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        db.execute(text("CREATE TABLE transactions (id INTEGER PRIMARY KEY, entity_id INTEGER, transaction_date TEXT, "
+                        "amount REAL, transaction_type TEXT, description TEXT, approval_status TEXT, created_at TEXT)"))
+        db.commit()
+
+        first = get_dashboard_snapshot(db)
+        assert first.version == 1
+        assert first.payload["pending_approvals"] == 0
+
+        # Nothing changed: stale flag alone does not move the version (ETag stays valid)
+        mark_dashboard_stale_sync(db)
+        db.commit()
+        assert get_dashboard_snapshot(db).version == 1
+
+        db.execute(text("INSERT INTO transactions (amount, transaction_type, approval_status) VALUES (900, 'expense', 'pending')"))
+        mark_dashboard_stale_sync(db)
+        db.commit()
+        latest = get_dashboard_snapshot(db)
+        assert latest.version == 2
+        assert latest.payload["pending_approvals"] == 1
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def test_write_during_recompute_keeps_snapshot_stale(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'race.db'}")
+    DashboardSnapshot.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    try:
+        db.execute(text("CREATE TABLE transactions (id INTEGER PRIMARY KEY, entity_id INTEGER, transaction_date TEXT, "
+                        "amount REAL, transaction_type TEXT, description TEXT, approval_status TEXT, created_at TEXT)"))
+        db.commit()
+        get_dashboard_snapshot(db)
+        mark_dashboard_stale_sync(db)
+        db.commit()
+
+        compute = dashboard_snapshot.compute_dashboard_metrics
+
+        def compute_then_concurrent_write(session):
+            payload = compute(session)
+            writer = Session()
+            writer.execute(text("INSERT INTO transactions (amount, transaction_type, approval_status) "
+                                "VALUES (900, 'expense', 'pending')"))
+            mark_dashboard_stale_sync(writer)
+            writer.commit()
+            writer.close()
+            return payload
+
+        monkeypatch.setattr(dashboard_snapshot, "compute_dashboard_metrics", compute_then_concurrent_write)
+        raced = get_dashboard_snapshot(db)
+        assert raced.is_stale and raced.version == 1
+
+        monkeypatch.setattr(dashboard_snapshot, "compute_dashboard_metrics", compute)
+        latest = get_dashboard_snapshot(db)
+        assert not latest.is_stale and latest.version == 2
+        assert latest.payload["pending_approvals"] == 1
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def test_async_invalidation_skips_missing_snapshot_table(tmp_path):
+    async def write_with_invalidation():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'bare.db'}")
+        try:
+            async with async_sessionmaker(engine)() as db:
+                await db.execute(text("CREATE TABLE journal_entries (id INTEGER PRIMARY KEY)"))
+                await db.execute(text("INSERT INTO journal_entries (id) VALUES (1)"))
+                await mark_dashboard_stale(db)
+                await db.commit()
+                return (await db.execute(text("SELECT COUNT(*) FROM journal_entries"))).scalar()
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(write_with_invalidation()) == 1
@@ -0,0 +1,22 @@
+import sqlite3
+
+from services.api.config import apply_sqlite_pragmas, get_db_pool_settings
+
+
+def test_pool_settings_use_null_pool_under_pytest(monkeypatch):
+    assert get_db_pool_settings()["use_null_pool"] is True
+    monkeypatch.delenv("PYTEST_CURRENT_TEST", raising=False)
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    settings = get_db_pool_settings()
+    assert settings["use_null_pool"] is False
+    assert settings["pool_size"] == 3
+
+
+def test_sqlite_pragmas_enable_wal(tmp_path):
+    conn = sqlite3.connect(tmp_path / "pool.db")
+    try:
+        apply_sqlite_pragmas(conn)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    finally:
+        conn.close()
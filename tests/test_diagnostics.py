@@ -0,0 +1,25 @@
+from fastapi.testclient import TestClient
+
+from services.api import diagnostics
+from services.api.auth_deps import require_admin
+from services.api.main import app
+
+
+def test_diagnostics_registry_is_served_only_to_admins(monkeypatch):
+    def broken():
+        raise RuntimeError("pool gone")
+
+    monkeypatch.setitem(diagnostics._providers, "broken", broken)
+    client = TestClient(app)
+
+    assert client.get("/api/diagnostics").status_code in (401, 403)
+    assert client.get("/api/health/csv-export").status_code == 404
+
+    app.dependency_overrides[require_admin] = lambda: {"email": "admin@ngicapitaladvisory.com"}
+    try:
+        body = client.get("/api/diagnostics").json()
+    finally:
+        app.dependency_overrides.pop(require_admin, None)
+    # One failing source is reported without hiding the others
+    assert body["broken"] == {"error": "pool gone"}
+    assert body["csv_export"].keys() >= {"exports", "rows", "bytes", "failures"}
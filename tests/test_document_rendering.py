@@ -0,0 +1,88 @@
+import asyncio
+import os
+import stat
+import time
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from services.api.services import document_rendering
+from services.api.services.document_rendering import RenderQueueFull, RenderTimeout, render_document
+from services.api.services.invoice_generator import _invoice_payload, render_invoice_pdf
+
+
+def _slow_render(payload):
+    time.sleep(payload["seconds"])
+    return b"done"
+
+
+def _invoice():
+    invoice = SimpleNamespace(invoice_number="INV-0001", invoice_date=date(2025, 12, 1), due_date=date(2025, 12, 31),
+                              memo="Advisory retainer", subtotal=Decimal("1500.00"), tax_rate=Decimal("0"),
+                              tax_amount=Decimal("0"), total_amount=Decimal("1500.00"))
+    customer = SimpleNamespace(customer_name="Acme Corp", email="ap@acme.test", billing_address_line1="1 Main St",
+                               billing_address_line2=None, billing_city="Berkeley", billing_state="CA",
+                               billing_zip="94704")
+    entity = SimpleNamespace(entity_name="NGI Capital LLC", ein="00-0000000", default_payment_terms="Net 30",
+                             invoice_payment_instructions=None, late_payment_fee=None,
+                             late_payment_interest_rate=None)
+    lines = [SimpleNamespace(description="Retainer", quantity=Decimal("1"), unit_price=Decimal("1500.00"),
+                             total_amount=Decimal("1500.00"))]
+    return _invoice_payload(invoice, customer, entity, lines)
+
+
+def test_renders_in_process_pool_with_disk_cache_timeouts_and_backpressure(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "render_cache"
+    monkeypatch.setattr(document_rendering, "RENDER_CACHE_DIR", cache_dir)
+    monkeypatch.setattr(document_rendering, "RENDER_WORKERS", 1)
+    document_rendering.shutdown_render_pool()
+
+    async def scenario():
+        ticks = 0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not done.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        tick_task = asyncio.create_task(ticker())
+        first = await render_document(render_invoice_pdf, _invoice())
+        done.set()
+        await tick_task
+        second = await render_document(render_invoice_pdf, _invoice())
+
+        with pytest.raises(RenderTimeout):
+            await render_document(_slow_render, {"seconds": 30}, timeout=0.5)
+
+        monkeypatch.setattr(document_rendering, "RENDER_MAX_QUEUED", 1)
+        results = await asyncio.gather(
+            *(render_document(_slow_render, {"seconds": 0.2, "n": n}) for n in range(3)),
+            return_exceptions=True,
+        )
+        return first, second, ticks, results
+
+    before = document_rendering.get_render_stats()
+    try:
+        first, second, ticks, results = asyncio.run(scenario())
+    finally:
+        document_rendering.shutdown_render_pool()
+    stats = document_rendering.get_render_stats()
+
+    assert first == second
+    assert first.read_bytes().startswith(b"%PDF")
+    if os.name == "posix":
+        # Cached documents are private to the app user
+        assert stat.S_IMODE(cache_dir.stat().st_mode) == 0o700
+        assert stat.S_IMODE(first.stat().st_mode) == 0o600
+    # The event loop kept running while the worker process rendered
+    assert ticks > 1
+    assert stats["cache_hits"] == before["cache_hits"] + 1
+    assert stats["timeouts"] == before["timeouts"] + 1
+    assert stats["pool_restarts"] == before["pool_restarts"] + 1
+    # One rendering, one waiting, the third is turned away
+    assert [isinstance(r, RenderQueueFull) for r in results].count(True) == 1
+    assert sum(1 for r in results if not isinstance(r, Exception)) == 2
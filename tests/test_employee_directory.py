@@ -0,0 +1,55 @@
+import asyncio
+
+from fastapi import Response
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from services.api.routes.employees import _ensure_hr_schema, list_employees
+
+
+def _list(db, response, cursor=None, page=1, q=None):
+    return asyncio.run(list_employees(response, entity=1, entity_id=None, q=q, status=None, team=None, type=None,
+                                      page=page, pageSize=20, cursor=cursor, partner={}, db=db))
+
+
+def test_directory_pages_by_keyset_in_three_queries(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'hr.db'}")
+    db = sessionmaker(bind=engine)()
+    try:
+        _ensure_hr_schema(db)
+        db.execute(text("INSERT INTO teams (id, entity_id, name) VALUES (1, 1, 'Advisory'), (2, 1, 'Research')"))
+        db.execute(text("INSERT INTO projects (id, entity_id, name) VALUES (7, 1, 'Diligence')"))
+        for n in range(1, 51):
+            db.execute(text("INSERT INTO employees (id, entity_id, name, email, team_id) VALUES (:n, :e, :name, :email, 1)"),
+                       {"n": n, "e": 1 if n <= 45 else 2, "name": f"Analyst {n}", "email": f"a{n}@ngi.test"})
+        # Employee 50 belongs to entity 2 but also works for entity 1
+        db.execute(text("INSERT INTO employee_entity_memberships (employee_id, entity_id) VALUES (50, 1)"))
+        db.execute(text("INSERT INTO team_memberships (team_id, employee_id) VALUES (1, 50), (2, 50)"))
+        db.execute(text("INSERT INTO employee_projects (employee_id, project_id) VALUES (50, 7), (49, 7)"))
+        db.commit()
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        response = Response()
+        first = _list(db, response)
+        assert len(statements) == 3
+        assert response.headers["X-Total-Count"] == "46"
+        assert [e["id"] for e in first[:2]] == [50, 45]
+        assert first[0]["team_name"] == "Advisory"
+        assert first[0]["team_names"] == ["Advisory", "Research"]
+        assert first[0]["projects"] == [{"id": 7, "name": "Diligence"}]
+        assert first[1]["projects"] == [] and first[1]["team_ids"] == []
+
+        seen = [e["id"] for e in first]
+        cursor = response.headers["X-Next-Cursor"]
+        while cursor:
+            response = Response()
+            batch = _list(db, response, cursor=int(cursor))
+            seen += [e["id"] for e in batch]
+            cursor = response.headers.get("X-Next-Cursor")
+        assert seen == [50] + list(range(45, 0, -1))
+        # Offset paging still agrees with the keyset pages
+        assert [e["id"] for e in _list(db, Response(), page=2)] == seen[20:40]
+    finally:
+        db.close()
+        engine.dispose()
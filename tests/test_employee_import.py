@@ -0,0 +1,82 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from services.api.auth_deps import require_clerk_user
+from services.api.database import get_db
+from services.api.routes import employees
+from services.api.routes.employees import _ensure_hr_schema
+
+
+def test_multipart_import_batches_50k_rows_and_reports_bad_rows(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'hr.db'}")
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    _ensure_hr_schema(db)
+    db.execute(text("INSERT INTO teams (id, entity_id, name) VALUES (3, 1, 'Advisory')"))
+    db.execute(text("INSERT INTO employees (entity_id, name, email) VALUES (1, 'Existing', 'Taken@NGI.test')"))
+    db.commit()
+
+    lines = ["Name,Email,Type,Start,Team"]
+    lines += [f"Analyst {n},analyst{n}@ngi.test,intern,2025-06-01,advisory" for n in range(50_000)]
+    lines += [
+        "Dup,ANALYST7@ngi.test,,,",        # duplicate within the file
+        "Taken,taken@ngi.test,,,",         # already an employee
+        ",missing-name@ngi.test,,,",
+        "Bad Date,bad-date@ngi.test,,June 1,",
+        "Ghost Team,ghost@ngi.test,,,Nonexistent",
+    ]
+    body = ("\n".join(lines) + "\n").encode()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    app = FastAPI()
+    app.include_router(employees.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[require_clerk_user] = lambda: {"email": "test@ngicapitaladvisory.com"}
+    try:
+        resp = TestClient(app).post("/api/employees/import", params={"entity": 1},
+                                    files={"file": ("staff.csv", body, "text/csv")})
+    finally:
+        db.close()
+    assert resp.status_code == 200, resp.text
+    report = resp.json()
+    assert report["rows"] == 50_005
+    assert report["created"] == 50_001
+    assert (report["skipped"], report["failed"]) == (2, 2)
+    assert report["rows_per_sec"] > 0
+    issues = {i["email"]: (i["row"], i["level"]) for i in report["issues"]}
+    assert issues["analyst7@ngi.test"] == (50_002, "skipped")
+    assert issues["taken@ngi.test"][1] == "skipped"
+    assert issues["bad-date@ngi.test"][1] == "error"
+    assert issues["ghost@ngi.test"][1] == "warning"
+    # Set-based: a handful of statements per 1000-row batch, not several per row
+    assert len(statements) < 200
+
+    check = Session()
+    try:
+        assert check.execute(text("SELECT count(*) FROM employees WHERE team_id = 3")).scalar() == 50_000
+        assert check.execute(text("SELECT count(*) FROM employees WHERE email = 'ghost@ngi.test' AND team_id IS NULL")).scalar() == 1
+    finally:
+        check.close()
+        engine.dispose()
+
+
+def test_non_utf8_upload_is_rejected_with_an_encoding_error(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'hr.db'}")
+    db = sessionmaker(bind=engine)()
+    _ensure_hr_schema(db)
+    app = FastAPI()
+    app.include_router(employees.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[require_clerk_user] = lambda: {"email": "test@ngicapitaladvisory.com"}
+    try:
+        resp = TestClient(app).post("/api/employees/import", params={"entity": 1},
+                                    files={"file": ("staff.csv", "Name,Email\nJosé,jose@ngi.test\n".encode("latin-1"),
+                                                    "text/csv")})
+    finally:
+        db.close()
+        engine.dispose()
+    assert resp.status_code == 422
+    assert resp.json()["detail"] == "csv must be UTF-8 encoded"
@@ -0,0 +1,104 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from services.api.auth_deps import require_clerk_user
+from services.api.database import get_db
+from services.api.routes import investors
+from services.api.routes.investors import _ensure_schema
+
+
+def test_type_ahead_uses_ranked_fts_index_kept_in_sync_by_triggers(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'inv.db'}")
+    db = sessionmaker(bind=engine)()
+    _ensure_schema(db)
+    db.execute(text("INSERT INTO investors (id, legal_name, firm, email) VALUES (:id, :n, :f, :em)"), [
+        {"id": f"x{n}", "n": f"Contact {n}", "f": f"Fund {n % 50}", "em": f"c{n}@funds.vc"} for n in range(2000)
+    ])
+    db.execute(text("INSERT INTO investors (id, legal_name, firm, email) VALUES "
+                    "('jane', 'Jane Doe', 'Seed Partners', 'jd@seed.vc'), "
+                    "('mail', 'Alex Kim', 'Harbor Capital', 'janet.k@harbor.vc'), "
+                    "('linked', 'Janelle Park', 'Seed Partners', 'jp@seed.vc')"))
+    db.execute(text("INSERT INTO investor_pipelines (id, entity_id, investor_id) VALUES ('p1', 1, 'linked')"))
+    db.commit()
+
+    app = FastAPI()
+    app.include_router(investors.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[require_clerk_user] = lambda: {"email": "test@ngicapitaladvisory.com"}
+    client = TestClient(app)
+
+    def search(q, **params):
+        return [r["id"] for r in client.get("/api/investors/search", params={"q": q, **params}).json()]
+
+    try:
+        # Name matches outrank an email-only match; linked investors are excluded per entity
+        assert search("jan") == ["jane", "linked", "mail"]
+        assert search("jan", entity=1) == ["jane", "mail"]
+        assert search("jane do") == ["jane"]
+        assert search("seed part", entity=1) == ["jane"]
+        assert search("c1999") == ["x1999"]
+
+        db.execute(text("UPDATE investors SET firm = 'Orchard Ventures' WHERE id = 'jane'"))
+        db.execute(text("DELETE FROM investors WHERE id = 'mail'"))
+        db.commit()
+        assert search("orch") == ["jane"]
+        assert search("harbor") == []
+        assert search("seed", entity=1) == ["jane"]  # still matches on jd@seed.vc
+        # Empty query lists the directory alphabetically
+        assert search("", limit=2) == ["x0", "x1"]
+
+        # The best match is found behind more weak hits than any candidate window,
+        # and behind weak hits that are all already linked to the entity
+        db.execute(text("INSERT INTO investors (id, legal_name, email) VALUES (:id, :n, :em)"), [
+            {"id": f"j{n}", "n": f"Contact J{n}", "em": f"john{n}@x.vc"} for n in range(1500)
+        ])
+        db.execute(text("INSERT INTO investors (id, legal_name, email) VALUES ('smith', 'John Smith', 'js@x.vc')"))
+        db.execute(text("INSERT INTO investor_pipelines (id, entity_id, investor_id) VALUES (:id, 1, :inv)"),
+                   [{"id": f"pj{n}", "inv": f"j{n}"} for n in range(1500)])
+        db.commit()
+        assert search("john")[0] == "smith"
+        assert search("john", entity=1) == ["smith"]
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def test_index_survives_rowid_renumbering_and_replaces_legacy_rowid_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(investors, "_search_index_ready", {})
+    engine = create_engine(f"sqlite:///{tmp_path / 'inv.db'}")
+    db = sessionmaker(bind=engine)()
+    # A database indexed by an earlier build, keyed on investors.rowid
+    db.execute(text("CREATE TABLE investors (id TEXT PRIMARY KEY, legal_name TEXT NOT NULL, firm TEXT, email TEXT)"))
+    db.execute(text("CREATE VIRTUAL TABLE investors_fts USING fts5(legal_name, firm, email, content='investors')"))
+    db.execute(text("INSERT INTO investors (id, legal_name, firm) VALUES ('a', 'Ada Lovelace', 'Engine Fund'), "
+                    "('b', 'Brook Taylor', 'Series Capital')"))
+    db.commit()
+    _ensure_schema(db)
+
+    app = FastAPI()
+    app.include_router(investors.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[require_clerk_user] = lambda: {"email": "test@ngicapitaladvisory.com"}
+    client = TestClient(app)
+
+    def search(q):
+        return [r["id"] for r in client.get("/api/investors/search", params={"q": q}).json()]
+
+    try:
+        assert search("ada") == ["a"]
+        assert search("series") == ["b"]
+        # Renumber the implicit rowids the way VACUUM may for a TEXT primary key
+        db.execute(text("UPDATE investors SET rowid = rowid + 1000"))
+        db.commit()
+        db.execute(text("VACUUM"))
+        assert search("ada") == ["a"]
+        assert search("engine") == ["a"]
+        db.execute(text("UPDATE investors SET id = 'a2' WHERE id = 'a'"))
+        db.commit()
+        assert search("lovelace") == ["a2"]
+        db.execute(text("INSERT INTO investors_fts(investors_fts, rank) VALUES ('integrity-check', 1)"))
+    finally:
+        db.close()
+        engine.dispose()
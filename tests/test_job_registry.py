@@ -0,0 +1,42 @@
+import asyncio
+
+from services.api import database_async
+from services.api.services.job_registry import JobRegistry
+
+
+class _Session:
+    rolled_back = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def rollback(self):
+        _Session.rolled_back = True
+
+
+def test_registry_prunes_finished_jobs_and_fails_on_errors(monkeypatch):
+    registry = JobRegistry("Widget", counters=("widgets",), max_finished=2)
+    done = [registry.create(n=n) for n in range(3)]
+    for job in done:
+        registry.complete(job)
+    running = registry.create(n=3, items=[{"rows": 0}])
+    # Oldest finished job dropped, queued/running jobs are never pruned
+    assert registry.get(done[0]["job_id"]) is None
+    assert registry.get_stats()["tracked_jobs"] == 3
+
+    snapshot = registry.snapshot(running["job_id"])
+    running["items"][0]["rows"] = 5
+    assert snapshot["items"][0]["rows"] == 0
+
+    async def work(db, job):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(database_async, "get_async_session_factory", lambda: _Session)
+    asyncio.run(registry.run(running["job_id"], work, on_error=lambda job: {"phase": "failed"}))
+    failed = registry.snapshot(running["job_id"])
+    assert (failed["status"], failed["error"], failed["phase"]) == ("failed", "boom", "failed")
+    assert _Session.rolled_back
+    assert registry.get_stats()["jobs_failed"] == 1
@@ -0,0 +1,67 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from services.api import scheduler
+from services.api.models_accounting import Base
+from services.api.models_accounting_part2 import BankAccount
+from services.api.services.mercury_sync_service import MercurySyncService, mercury_sync_guard
+
+
+def test_sync_fans_out_with_bounded_concurrency_backoff_and_overlap_guard(tmp_path, monkeypatch):
+    monkeypatch.setattr(scheduler, "MERCURY_SYNC_JITTER_SECONDS", 0)
+    monkeypatch.setattr(scheduler, "_backoff", {})
+    monkeypatch.setattr(scheduler, "_run_history", scheduler.deque(maxlen=24))
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'sync.db'}")
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(scheduler, "get_async_session_factory", lambda: factory)
+
+    active = {"now": 0, "peak": 0}
+    sessions = []
+
+    async def fake_sync(self, entity_id, days_back=30):
+        sessions.append(self.session_factory)
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        if entity_id == 3:
+            return {"success": False, "message": "Mercury API returned 503"}
+        return {"success": True, "synced": 10, "new_transactions": 4, "pages": 1}
+
+    monkeypatch.setattr(MercurySyncService, "sync_transactions", fake_sync)
+
+    async def scenario():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as db:
+            for entity_id in range(1, 7):
+                db.add(BankAccount(entity_id=entity_id, bank_name="Mercury", account_name=f"Ops {entity_id}",
+                                   gl_account_id=1, mercury_account_id=f"acct-{entity_id}"))
+            await db.commit()
+
+        first = await scheduler.sync_all_mercury_accounts(concurrency=2)
+        # Entity 5 is mid-sync elsewhere (e.g. the manual sync endpoint)
+        with mercury_sync_guard(5, MercurySyncService().account_id):
+            second = await scheduler.sync_all_mercury_accounts(concurrency=2)
+        await engine.dispose()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first["entities"] == 6
+    assert first["successful"] == 5
+    assert first["inserted"] == 20
+    assert active["peak"] == 2
+    assert all(s is factory for s in sessions)
+    failed = next(r for r in first["results"] if r["entity_id"] == 3)
+    assert failed["error"] == "Mercury API returned 503"
+
+    skipped = {r["entity_id"]: r.get("skipped") for r in second["results"]}
+    assert skipped[3] == "backoff"
+    assert skipped[5] == "overlap"
+    assert second["successful"] == 4
+
+    status = scheduler.get_scheduler_status()
+    assert status["mercury_sync"]["backing_off"] == [3]
+    assert [run["entities"] for run in status["mercury_sync"]["recent_runs"]] == [6, 6]
@@ -0,0 +1,37 @@
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from services.api import partner_identity
+from services.api.models import Partners
+from services.api.partner_identity import get_partner_cache_stats, resolve_partner_by_email
+
+
+def test_partner_lookup_is_cached_and_invalidated_on_update(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'partners.db'}")
+    Partners.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    partner_identity.invalidate_partner()
+    try:
+        partner = Partners(email="cache@ngicapitaladvisory.com", name="Cache Partner",
+                           password_hash="x", ownership_percentage=Decimal("40.00"), is_active=True)
+        db.add(partner)
+        db.commit()
+
+        before = get_partner_cache_stats()
+        first = resolve_partner_by_email("Cache@ngicapitaladvisory.com", db=db)
+        second = resolve_partner_by_email("cache@ngicapitaladvisory.com", db=db)
+        assert first == second
+        assert first["ownership_percentage"] == 40.0
+        after = get_partner_cache_stats()
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 1
+
+        partner.ownership_percentage = Decimal("55.00")
+        db.commit()
+        assert resolve_partner_by_email("cache@ngicapitaladvisory.com", db=db)["ownership_percentage"] == 55.0
+    finally:
+        db.close()
+        engine.dispose()
+        partner_identity.invalidate_partner()
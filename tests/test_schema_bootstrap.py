@@ -0,0 +1,61 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from services.api import schema_bootstrap
+from services.api.schema_bootstrap import bootstrap_schema, schema_check, schema_ensurer
+
+
+def test_ensurer_runs_once_per_database_and_bootstrap_records_fingerprint(tmp_path, monkeypatch):
+    monkeypatch.setattr(schema_bootstrap, "_registry", {})
+    monkeypatch.setattr(schema_bootstrap, "_ensured", set())
+    monkeypatch.setattr(schema_bootstrap, "_checks", {})
+    calls = []
+
+    @schema_ensurer("widgets")
+    def _ensure_widgets(db):
+        calls.append(1)
+        db.execute(text("CREATE TABLE IF NOT EXISTS widgets (id INTEGER PRIMARY KEY)"))
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'boot.db'}")
+    db = sessionmaker(bind=engine)()
+    try:
+        assert bootstrap_schema(db)["status"] == "applied"
+        _ensure_widgets(db)
+        _ensure_widgets(db)
+        assert len(calls) == 1
+
+        # Fresh process against an unchanged database skips the DDL entirely
+        schema_bootstrap._ensured.clear()
+        assert bootstrap_schema(db)["status"] == "unchanged"
+        _ensure_widgets(db)
+        assert len(calls) == 1
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def test_schema_checks_run_even_when_fingerprint_is_unchanged(tmp_path, monkeypatch):
+    monkeypatch.setattr(schema_bootstrap, "_registry", {})
+    monkeypatch.setattr(schema_bootstrap, "_ensured", set())
+    monkeypatch.setattr(schema_bootstrap, "_checks", {})
+    checked = []
+
+    @schema_check("ok")
+    def _check_ok(db):
+        checked.append(1)
+
+    @schema_check("broken")
+    def _check_broken(db):
+        raise RuntimeError("corrupt")
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'boot.db'}")
+    db = sessionmaker(bind=engine)()
+    try:
+        first = bootstrap_schema(db)
+        second = bootstrap_schema(db)
+        assert second["status"] == "unchanged"
+        assert first["failed_checks"] == second["failed_checks"] == ["broken"]
+        assert len(checked) == 2
+    finally:
+        db.close()
+        engine.dispose()
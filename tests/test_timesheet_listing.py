@@ -0,0 +1,61 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from services.api.auth_deps import require_clerk_user
+from services.api.database import get_db
+from services.api.routes import employees
+from services.api.routes.employees import _ensure_hr_schema
+
+
+def test_timesheet_pages_follow_cursor_with_one_query_each(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ts.db'}")
+    db = sessionmaker(bind=engine)()
+    _ensure_hr_schema(db)
+    db.execute(text("INSERT INTO employees (id, entity_id, name, email) VALUES (1, 1, 'Analyst', 'a@ngi.test')"))
+    # Two timesheets per pay period so the cursor has to break ties on id
+    for n in range(60):
+        period = f"2024-{1 + n // 5:02d}-{1 + (n // 2) % 28:02d}"
+        db.execute(text("INSERT INTO timesheets (id, entity_id, employee_id, pay_period_start, pay_period_end, status, "
+                        "submitted_date) VALUES (:id, 1, 1, :p, :p, :st, :sd)"),
+                   {"id": n + 1, "p": period, "st": "submitted" if n % 3 == 0 else "draft", "sd": f"2024-12-{n % 28 + 1:02d}"})
+    db.execute(text("INSERT INTO timesheet_entries (timesheet_id, entry_date, hours) VALUES (60, '2024-12-01', 4), (60, '2024-12-02', 4)"))
+    db.commit()
+
+    app = FastAPI()
+    app.include_router(employees.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[require_clerk_user] = lambda: {"email": "test@ngicapitaladvisory.com"}
+    client = TestClient(app)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    try:
+        seen, cursor, pages = [], None, 0
+        while True:
+            params = {"entity": 1, "limit": 25, **({"cursor": cursor} if cursor else {})}
+            body = client.get("/api/timesheets", params=params).json()
+            seen += body["timesheets"]
+            pages += 1
+            cursor = body["next_cursor"]
+            if not cursor:
+                break
+        assert pages == 3 and len(statements) == 3
+        keys = [(t["pay_period_start"], t["id"]) for t in seen]
+        assert keys == sorted(keys, reverse=True) and len(set(keys)) == 60
+        assert {t["id"]: t["entries_count"] for t in seen}[60] == 2
+
+        first = client.get("/api/timesheets/pending-approval", params={"entity": 1, "limit": 15}).json()
+        rest = client.get("/api/timesheets/pending-approval",
+                          params={"entity": 1, "limit": 15, "cursor": first["next_cursor"]}).json()
+        pending = first["timesheets"] + rest["timesheets"]
+        assert len(pending) == 20 and rest["next_cursor"] is None
+        assert all(t["status"] == "submitted" for t in pending)
+        assert [t["submitted_date"] for t in pending] == sorted(t["submitted_date"] for t in pending)
+
+        # Callers that pass neither limit nor cursor still get every timesheet
+        unpaged = client.get("/api/timesheets", params={"entity": 1}).json()
+        assert unpaged["count"] == 60 and unpaged["next_cursor"] is None
+    finally:
+        db.close()
+        engine.dispose()